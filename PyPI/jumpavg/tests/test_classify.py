@@ -0,0 +1,141 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests comparing NumPy and pure Python implementations of classify.
+
+Run from PyPI/jumpavg directory:
+
+    python3 -m unittest discover tests
+"""
+
+import importlib
+import random
+import unittest
+
+from unittest import mock
+
+from jumpavg import classify
+
+# The package exports the classify function under the name of its module.
+classify_module = importlib.import_module("jumpavg.classify")
+
+
+def random_values(rng: random.Random, length: int) -> list:
+    """Return values with two levels and noise, as in trending data.
+
+    :param rng: Random number generator to use.
+    :param length: Number of values.
+    :type rng: random.Random
+    :type length: int
+    :returns: The values.
+    :rtype: list
+    """
+    return [rng.gauss(1e7 if idx < length // 2 else 1.1e7, 1e5)
+            for idx in range(length)]
+
+
+def tie_values(rng: random.Random, length: int) -> list:
+    """Return values from a small set, leading to many equal bit counts.
+
+    :param rng: Random number generator to use.
+    :param length: Number of values.
+    :type rng: random.Random
+    :type length: int
+    :returns: The values.
+    :rtype: list
+    """
+    return [rng.choice((1.0, 2.0, 3.0)) for _ in range(length)]
+
+
+def run_values(rng: random.Random, length: int) -> list:
+    """Return floats mixed with sequences of floats (runs).
+
+    :param rng: Random number generator to use.
+    :param length: Number of values.
+    :type rng: random.Random
+    :type length: int
+    :returns: The values.
+    :rtype: list
+    """
+    return [
+        rng.choice((1.0, 2.0)) if rng.random() < 0.8 else
+        [rng.gauss(1.5, 0.3) for _ in range(3)]
+        for _ in range(length)
+    ]
+
+
+class TestClassify(unittest.TestCase):
+    """NumPy implementation must give exactly the same group lists."""
+
+    def assert_same(self, values: list) -> None:
+        """Classify the values both ways and compare the group lists.
+
+        The group lists are dataclasses, so also the stats of the groups
+        and the cached bits are compared.
+
+        :param values: Values to classify.
+        :type values: list
+        """
+        expected = classify(values, use_numpy=False)
+        actual = classify(values, use_numpy=True)
+        self.assertEqual(expected, actual)
+        self.assertEqual(
+            [group.comment for group in expected],
+            [group.comment for group in actual]
+        )
+
+    @unittest.skipIf(
+        classify_module.classify_arrays is None, "NumPy is not available."
+    )
+    def test_random(self) -> None:
+        """Noisy values with a level change."""
+        rng = random.Random(0)
+        for length in range(1, 120, 7):
+            self.assert_same(random_values(rng, length))
+
+    @unittest.skipIf(
+        classify_module.classify_arrays is None, "NumPy is not available."
+    )
+    def test_ties(self) -> None:
+        """Values from a small set and constant values."""
+        rng = random.Random(1)
+        for length in range(1, 120, 7):
+            self.assert_same(tie_values(rng, length))
+            self.assert_same([5.0] * length)
+            self.assert_same([float(idx % 2) for idx in range(length)])
+
+    @unittest.skipIf(
+        classify_module.classify_arrays is None, "NumPy is not available."
+    )
+    def test_runs(self) -> None:
+        """Floats mixed with runs."""
+        rng = random.Random(2)
+        for length in range(1, 120, 7):
+            self.assert_same(run_values(rng, length))
+
+    def test_fallback(self) -> None:
+        """Without NumPy, the pure Python implementation is used."""
+        values = tie_values(random.Random(3), 50)
+        expected = classify(values, use_numpy=False)
+        with mock.patch.object(classify_module, "classify_arrays", None):
+            self.assertEqual(expected, classify(values, use_numpy=True))
+
+    def test_zero_max_value(self) -> None:
+        """Both ways fail the same way for all values zero."""
+        for use_numpy in (False, True):
+            with self.assertRaises(ValueError):
+                classify([0.0, 0.0], use_numpy=use_numpy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests comparing IncrementalClassifier with the classify function.
+
+Run from PyPI/jumpavg directory:
+
+    python3 -m unittest discover tests
+"""
+
+import random
+import unittest
+
+from jumpavg import classify, IncrementalClassifier
+
+
+def random_values(rng: random.Random, length: int) -> list:
+    """Return values with level changes and noise, as in trending data.
+
+    :param rng: Random number generator to use.
+    :param length: Number of values.
+    :type rng: random.Random
+    :type length: int
+    :returns: The values.
+    :rtype: list
+    """
+    values = []
+    level = 1e7
+    while len(values) < length:
+        level *= rng.uniform(0.7, 1.3)
+        values.extend(
+            rng.gauss(level, level * 0.01)
+            for _ in range(rng.randint(1, 40))
+        )
+    return values[:length]
+
+
+class TestIncrementalClassifier(unittest.TestCase):
+    """IncrementalClassifier must give the same groups as classify."""
+
+    def assert_same(self, values: list, classifier: IncrementalClassifier):
+        """Compare the result of the classifier with classify of the values.
+
+        Stats are compared up to rounding, as the result is a copy.
+
+        :param values: All values given to the classifier.
+        :param classifier: The classifier to check.
+        :type values: list
+        :type classifier: IncrementalClassifier
+        """
+        expected = classify(values, use_numpy=False)
+        actual = classifier.result
+        self.assertEqual(
+            [(group.run_list, group.comment) for group in expected],
+            [(group.run_list, group.comment) for group in actual]
+        )
+        for exp_group, act_group in zip(expected, actual):
+            self.assertAlmostEqual(
+                exp_group.stats.avg, act_group.stats.avg, delta=1e-6
+            )
+
+    def test_extend(self) -> None:
+        """All values at once, with and without pruning."""
+        rng = random.Random(0)
+        for length in range(1, 300, 23):
+            values = random_values(rng, length)
+            for prune in (True, False):
+                classifier = IncrementalClassifier(prune=prune)
+                self.assert_same(values, classifier.extend(values))
+
+    def test_append(self) -> None:
+        """Values one by one after an initial part, checked after each."""
+        rng = random.Random(1)
+        values = random_values(rng, 200)
+        classifier = IncrementalClassifier().extend(values[:100])
+        self.assert_same(values[:100], classifier)
+        for length in range(101, 201):
+            classifier.append(values[length - 1])
+            self.assert_same(values[:length], classifier)
+
+    def test_ties_and_runs(self) -> None:
+        """Values from a small set, mixed with runs, and a growing maximum."""
+        rng = random.Random(2)
+        values = [
+            rng.choice((1.0, 2.0, 3.0)) if rng.random() < 0.8 else
+            [rng.gauss(2.0, 0.5) for _ in range(3)]
+            for _ in range(150)
+        ]
+        values.append(10.0)
+        classifier = IncrementalClassifier()
+        for value in values:
+            classifier.append(value)
+        self.assert_same(values, classifier)
+
+    def test_unit(self) -> None:
+        """Explicit unit and sbps are used the same way as in classify."""
+        values = random_values(random.Random(3), 100)
+        for unit, sbps in ((1000.0, None), (None, 8.0)):
+            expected = classify(values, unit=unit, sbps=sbps, use_numpy=False)
+            actual = IncrementalClassifier(unit=unit, sbps=sbps).extend(
+                values
+            ).result
+            self.assertEqual(
+                [group.run_list for group in expected],
+                [group.run_list for group in actual]
+            )
+
+    def test_state_not_in_init(self) -> None:
+        """Internal state cannot be passed to the constructor."""
+        with self.assertRaises(TypeError):
+            IncrementalClassifier(values=[5.0, 6.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,6 +22,7 @@ from flask_assets import Environment, Bundle
 
 from .utils.constants import Constants as C
 from .data.data import Data
+from .data.parquet_cache import ParquetCache
 
 
 def init_app():
@@ -62,9 +63,27 @@ def init_app():
         else:
             time_period = C.TIME_PERIOD
 
-        data = Data(
+        data_source = Data(
             data_spec_file=C.DATA_SPEC_FILE,
-        ).read_all_data(days=time_period)
+            cache=ParquetCache(
+                directory=C.DATA_CACHE_DIR,
+                max_size=C.DATA_CACHE_MAX_SIZE
+            ) if C.DATA_CACHE_DIR else None
+        )
+        if C.DATA_SHARED_DIR:
+            data = data_source.read_all_data_shared(
+                path=C.DATA_SHARED_DIR,
+                days=time_period,
+                max_age=C.DATA_SHARED_MAX_AGE
+            )
+        else:
+            data = data_source.read_all_data(days=time_period)
+        if C.DATA_REFRESH_INTERVAL:
+            # The dictionary "data" is updated by the refresh.
+            data_source.start_refresh(
+                interval=C.DATA_REFRESH_INTERVAL,
+                days=time_period
+            )
 
         # Import Dash applications.
         logging.info("\n\nStarting the applications:\n" + "-" * 26 + "\n")
@@ -78,18 +97,12 @@ def init_app():
         else:
             logging.info(C.NEWS_TITLE)
             from .news.news import init_news
-            app = init_news(
-                app,
-                data_stats=data["statistics"],
-                data_trending=data["trending"]
-            )
+            app = init_news(app, data=data, data_source=data_source)
 
             logging.info(C.STATS_TITLE)
             from .stats.stats import init_stats
             app = init_stats(
-                app,
-                data_stats=data["statistics"],
-                data_trending=data["trending"]
+                app, data=data, data_source=data_source
             )
 
         if data["trending"].empty:
@@ -99,7 +112,7 @@ def init_app():
         else:
             logging.info(C.TREND_TITLE)
             from .trending.trending import init_trending
-            app = init_trending(app, data_trending=data["trending"])
+            app = init_trending(app, data=data)
 
         if data["iterative"].empty:
             logging.error(
@@ -21,6 +21,7 @@ from copy import deepcopy
 
 from ..utils.constants import Constants as C
 from ..utils.utils import relative_change_stdev
+from ..utils.data_index import select_tests
 
 
 def select_comparison_data(
@@ -102,35 +103,29 @@ def select_comparison_data(
         else:
             test_type = itm["ttype"].lower()
 
-        dutver = itm["dutver"].split("-", 1)  # 0 -> release, 1 -> dut version
-        tmp_df = pd.DataFrame(data.loc[(
-            (data["passed"] == True) &
-            (data["dut_type"] == itm["dut"]) &
-            (data["dut_version"] == dutver[1]) &
-            (data["test_type"] == test_type) &
-            (data["release"] == dutver[0])
-        )])
-
         drv = "" if itm["driver"] == "dpdk" else itm["driver"].replace("_", "-")
         core = str() if itm["dut"] == "trex" else itm["core"].lower()
         ttype = "ndrpdr" if itm["ttype"] in ("NDR", "PDR", "Latency") \
             else itm["ttype"].lower()
-        tmp_df = tmp_df[
-            (tmp_df.job.str.endswith(itm["tbed"])) &
-            (tmp_df.test_id.str.contains(
-                (
-                    f"^.*[.|-]{itm['nic']}.*{itm['frmsize'].lower()}-"
-                    f"{core}-{drv}.*-{ttype}$"
-                ),
-                regex=True
-            ))
-        ]
-        if itm["driver"] == "dpdk":
-            for drv in C.DRIVERS:
-                tmp_df.drop(
-                    tmp_df[tmp_df.test_id.str.contains(f"-{drv}-")].index,
-                    inplace=True
-                )
+        tmp_df = select_tests(
+            data,
+            (
+                f"^.*[.|-]{itm['nic']}.*{itm['frmsize'].lower()}-"
+                f"{core}-{drv}.*-{ttype}$"
+            ),
+            job_suffix=itm["tbed"],
+            exclude=tuple(f"-{d}-" for d in C.DRIVERS) \
+                if itm["driver"] == "dpdk" else tuple()
+        )
+
+        dutver = itm["dutver"].split("-", 1)  # 0 -> release, 1 -> dut version
+        tmp_df = pd.DataFrame(tmp_df.loc[(
+            (tmp_df["passed"] == True) &
+            (tmp_df["dut_type"] == itm["dut"]) &
+            (tmp_df["dut_version"] == dutver[1]) &
+            (tmp_df["test_type"] == test_type) &
+            (tmp_df["release"] == dutver[0])
+        )])
 
         # Change the data type from ndrpdr to one of ("NDR", "PDR", "Latency")
         if test_type == "ndrpdr":
@@ -24,6 +24,7 @@ from dash import dash_table
 from dash.dash_table.Format import Format, Scheme
 
 from ..utils.constants import Constants as C
+from ..utils.data_index import select_tests
 
 
 def select_coverage_data(
@@ -59,25 +60,19 @@ def select_coverage_data(
     else:
         return l_data
 
-    df = pd.DataFrame(data.loc[(
-        (data["passed"] == True) &
-        (data["dut_type"] == selected["dut"]) &
-        (data["dut_version"] == selected["dutver"]) &
-        (data["release"] == selected["rls"])
+    df = select_tests(
+        data,
+        f"^.*\.{selected['area']}\..*{nic}.*{drv_str}.*$",
+        job_suffix=f"{topo}-{arch}",
+        exclude=tuple(f"-{driver}-" for driver in C.DRIVERS) \
+            if drv == "dpdk" else tuple()
+    )
+    df = pd.DataFrame(df.loc[(
+        (df["passed"] == True) &
+        (df["dut_type"] == selected["dut"]) &
+        (df["dut_version"] == selected["dutver"]) &
+        (df["release"] == selected["rls"])
     )])
-    df = df[
-        (df.job.str.endswith(f"{topo}-{arch}")) &
-        (df.test_id.str.contains(
-            f"^.*\.{selected['area']}\..*{nic}.*{drv_str}.*$",
-            regex=True
-        ))
-    ]
-    if drv == "dpdk":
-        for driver in C.DRIVERS:
-            df.drop(
-                df[df.test_id.str.contains(f"-{driver}-")].index,
-                inplace=True
-            )
 
     ttype = df["test_type"].to_list()[0]
 
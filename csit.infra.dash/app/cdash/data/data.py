@@ -14,45 +14,99 @@
 """Prepare data for Plotly Dash applications.
 """
 
+import os
+import json
+import fcntl
 import logging
 import resource
-import awswrangler as wr
+import boto3
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
 
 from yaml import load, FullLoader, YAMLError
 from datetime import datetime, timedelta
 from time import time
+from threading import Event, Lock, Thread
 from pytz import UTC
-from awswrangler.exceptions import EmptyDataFrame, NoFilesFound
+from botocore.exceptions import BotoCoreError, ClientError
 from pyarrow.lib import ArrowInvalid, ArrowNotImplementedError
 
 from ..utils.constants import Constants as C
+from ..utils.cache import invalidate_caches
+from ..utils.data_index import get_data_index
+from .parquet_cache import ParquetCache
 
 
+# Data types which are refreshed in the background, see Data.refresh().
+REFRESHED_DATA_TYPES = ("trending", "trending_anomalies", "statistics")
+
+# Trend and anomaly columns precomputed by the trending_anomalies ETL are
+# merged to the trending data by these columns, see Data._merge_anomalies().
+ANOMALIES_KEYS = ("job", "build", "test_id")
+ANOMALIES_SUFFIXES = ("_trend_avg", "_trend_stdev", "_anomaly", "_trend_size")
+
+# Partitions with the date of data, used by the refresh.
+DATE_PARTITIONS = ("year", "month", "day")
+
+# String columns with less unique values than this ratio of rows are stored as
+# categoricals.
+CATEGORICAL_RATIO = 0.5
+
+# Files with data shared by processes, see Data.read_all_data_shared().
+SHARED_DATA_FILE = "{data_type}.arrow"
+SHARED_MANIFEST_FILE = "manifest.json"
+SHARED_LOCK_FILE = ".lock"
+
 # If True, pyarrow.Schema is generated. See also condition in the method
 # _write_parquet_schema.
 # To generate schema, select only one data set in data.yaml file.
 GENERATE_SCHEMA = False
 
 
+def _arrow_types_mapper(arrow_type: pa.DataType) -> pd.ArrowDtype:
+    """Map Arrow types to pandas types when converting Arrow tables to pandas
+    data frames: Arrow types are kept (the same as dtype_backend="pyarrow"),
+    except dictionaries which become categoricals.
+
+    :param arrow_type: Arrow type of a column.
+    :type arrow_type: pyarrow.DataType
+    :returns: Pandas type of the column, None for the default conversion.
+    :rtype: pandas.ArrowDtype
+    """
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
 class Data:
     """Gets the data from parquets and stores it for further use by dash
     applications.
     """
 
-    def __init__(self, data_spec_file: str) -> None:
+    def __init__(
+            self,
+            data_spec_file: str,
+            cache: ParquetCache=None
+        ) -> None:
         """Initialize the Data object.
 
         :param data_spec_file: Path to file specifying the data to be read from
             parquets.
+        :param cache: Local cache of parquet files. If None, the files are
+            always read from their source.
         :type data_spec_file: str
+        :type cache: ParquetCache
         :raises RuntimeError: if it is not possible to open data_spec_file or it
             is not a valid yaml file.
         """
 
         # Inputs:
         self._data_spec_file = data_spec_file
+        self._cache = cache
 
         # Specification of data to be read from parquets:
         self._data_spec = list()
@@ -61,10 +115,26 @@ class Data:
         self._data = {
             "statistics": pd.DataFrame(),
             "trending": pd.DataFrame(),
+            "trending_anomalies": pd.DataFrame(),
             "iterative": pd.DataFrame(),
             "coverage": pd.DataFrame()
         }
 
+        # Files loaded from the data sets which are refreshed, indexed by the
+        # position of the data set in the specification:
+        # {data set: {file: (etag, partition)}}
+        self._loaded = dict()
+
+        # Background refresh:
+        self._refresh_lock = Lock()
+        self._refresh_stop = Event()
+        self._refresh_callbacks = list()
+
+        # Directory with the shared data and the time the mapped data was
+        # created, None if the data is not shared:
+        self._shared_path = None
+        self._shared_created = None
+
         # Read from files:
         try:
             with open(self._data_spec_file, "r") as file_read:
@@ -85,57 +155,454 @@ class Data:
         return self._data
 
     @staticmethod
-    def _get_list_of_files(
-            path,
-            last_modified_begin=None,
-            last_modified_end=None,
-            days=None
-        ) -> list:
-        """Get list of interested files stored in S3 compatible storage and
-        returns it.
-
-        :param path: S3 prefix (accepts Unix shell-style wildcards)
-            (e.g. s3://bucket/prefix) or list of S3 objects paths
-            (e.g. [s3://bucket/key0, s3://bucket/key1]).
-        :param last_modified_begin: Filter the s3 files by the Last modified
-            date of the object. The filter is applied only after list all s3
-            files.
-        :param last_modified_end: Filter the s3 files by the Last modified date
-            of the object. The filter is applied only after list all s3 files.
-        :param days: Number of days to filter.
-        :type path: Union[str, List[str]]
-        :type last_modified_begin: datetime, optional
-        :type last_modified_end: datetime, optional
-        :type days: integer, optional
-        :returns: List of file names.
-        :rtype: list
+    def _list_files(path: str) -> dict:
+        """List parquet files in the S3 prefix or in the local directory
+        together with their ETags and last modified times.
+
+        A local directory can be used instead of S3, e.g. for testing. In this
+        case the ETag is made of the file size and modification time.
+
+        :param path: S3 prefix (e.g. s3://bucket/prefix) or local directory.
+        :type path: str
+        :returns: ETag and last modified time of each file.
+        :rtype: dict(str: tuple(str, datetime))
+        """
+        files = dict()
+        if path.startswith("s3://"):
+            bucket, _, prefix = path[len("s3://"):].partition("/")
+            paginator = boto3.client("s3").get_paginator("list_objects_v2")
+            for page in paginator.paginate(
+                    Bucket=bucket,
+                    Prefix=f"{prefix.rstrip('/')}/"
+                ):
+                for obj in page.get("Contents", list()):
+                    if obj["Key"].endswith("parquet"):
+                        files[f"s3://{bucket}/{obj['Key']}"] = \
+                            (obj["ETag"], obj["LastModified"])
+        else:
+            for root, _, file_names in os.walk(path):
+                for file_name in file_names:
+                    if not file_name.endswith("parquet"):
+                        continue
+                    file_path = os.path.join(root, file_name)
+                    stat = os.stat(file_path)
+                    files[file_path] = (
+                        f"{stat.st_size}-{stat.st_mtime_ns}",
+                        datetime.fromtimestamp(stat.st_mtime, tz=UTC)
+                    )
+        return files
+
+    @staticmethod
+    def _get_partition(path: str, file_path: str) -> dict:
+        """Get partition names and values from the path of the file.
+
+        :param path: S3 prefix or local directory with the data set.
+        :param file_path: Path to the file in the data set.
+        :type path: str
+        :type file_path: str
+        :returns: Partition names and values, in the order of the path.
+        :rtype: dict
+        """
+        rel_path = file_path[len(path):].strip("/").split("/")[:-1]
+        return dict(itm.split("=", 1) for itm in rel_path if "=" in itm)
+
+    @staticmethod
+    def _select_files(data_set: dict, days: int=None) -> dict:
+        """Select the files of the data set to be read, the same way as the
+        data set is read in read_all_data.
+
+        :param data_set: Specification of the data set.
+        :param days: Number of days to filter. If None, all files are selected.
+        :type data_set: dict
+        :type days: int
+        :returns: ETag and partition of each selected file. The partition is
+            the relative path to the partition directory.
+        :rtype: dict(str: tuple(str, str))
         """
-        file_list = list()
         if days:
             last_modified_begin = datetime.now(tz=UTC) - timedelta(days=days)
+        selected = dict()
+        for file_path, (etag, last_modified) in \
+                Data._list_files(data_set["path"]).items():
+            partition = Data._get_partition(data_set["path"], file_path)
+            if partition.get(data_set["partition"]) != \
+                    data_set["partition_name"]:
+                continue
+            if days and last_modified < last_modified_begin:
+                continue
+            selected[file_path] = (
+                etag,
+                "/".join(f"{k}={v}" for k, v in partition.items())
+            )
+        return selected
+
+    @staticmethod
+    def _read_files(
+            path: str,
+            files: list,
+            columns: list=None,
+            schema: pa.Schema=None,
+            filters: list=None
+        ) -> pd.DataFrame:
+        """Read the parquet files of the data set, partition columns included.
+
+        The files are read by pyarrow dataset scanner, so the filters are
+        applied while reading (row groups are skipped using their statistics,
+        the rows not matching the filters are not converted to pandas).
+
+        :param path: S3 prefix (s3://bucket/prefix) or local directory with
+            the data set.
+        :param files: Files to read.
+        :param columns: Names of columns to read from the file(s).
+        :param schema: Schema to use when reading data from the parquet. If
+            None, the schema is inferred from the files.
+        :param filters: Row filters in disjunctive normal form, e.g.
+            [["passed", "==", True], ], see pyarrow.parquet.read_table.
+        :type path: str
+        :type files: list
+        :type columns: list
+        :type schema: pyarrow.Schema
+        :type filters: list
+        :returns: Data read from the files.
+        :rtype: pandas.DataFrame
+        """
+        filesystem, root = pa.fs.FileSystem.from_uri(
+            path if path.startswith("s3://") else os.path.abspath(path)
+        )
+        if path.startswith("s3://"):
+            files = [file_path[len("s3://"):] for file_path in files]
+        else:
+            files = [os.path.abspath(file_path) for file_path in files]
+        names = list(Data._get_partition(root, files[0]).keys())
+        partition_schema = None
+        if schema is not None:
+            # Partition values are read as strings, not dictionaries.
+            schema = pa.schema([
+                field.with_type(field.type.value_type) \
+                    if pa.types.is_dictionary(field.type) else field
+                for field in schema
+            ])
+            partition_schema = pa.schema(
+                [schema.field(name) for name in names if name in schema.names]
+            )
+        dataset = ds.dataset(
+            files,
+            schema=schema,
+            format="parquet",
+            filesystem=filesystem,
+            partitioning=ds.HivePartitioning.discover(
+                infer_dictionary=True,
+                schema=partition_schema
+            ),
+            partition_base_dir=root
+        )
+        if columns:
+            columns = list(columns) + [
+                col for col in names if col not in columns
+            ]
+        return dataset.to_table(
+            columns=columns,
+            filter=pq.filters_to_expression(filters) if filters else None
+        ).to_pandas(types_mapper=_arrow_types_mapper, ignore_metadata=True)
+
+    @staticmethod
+    def _read_schema(data_set: dict) -> pa.Schema:
+        """Read the schema of the data set.
+
+        :param data_set: Specification of the data set.
+        :type data_set: dict
+        :returns: The schema or None if it is not specified or it cannot be
+            read.
+        :rtype: pyarrow.Schema
+        """
+        schema_file = data_set.get("schema", None)
+        if not schema_file:
+            return None
+        try:
+            return pa.parquet.read_schema(f"{C.PATH_TO_SCHEMAS}{schema_file}")
+        except FileNotFoundError as err:
+            logging.error(repr(err))
+            logging.error("Proceeding without schema.")
+            return None
+
+    @staticmethod
+    def _get_partition_keys(data: pd.DataFrame, names: list) -> pd.Series:
+        """Get the partition of each row, as the relative path to the partition
+        directory.
+
+        :param data: Data with partition columns.
+        :param names: Names of partition columns, in the order of the path.
+        :type data: pandas.DataFrame
+        :type names: list
+        :returns: Partitions of rows.
+        :rtype: pandas.Series
+        """
+        keys = pd.Series(str(), index=data.index)
+        for idx, name in enumerate(names):
+            keys += ("/" if idx else "") + f"{name}=" + data[name].astype(str)
+        return keys
+
+    def _read_selected_files(
+            self,
+            data_set: dict,
+            files: dict,
+            schema: pa.Schema=None
+        ) -> pd.DataFrame:
+        """Read the selected files of the data set, using the local parquet
+        cache if it is configured.
+
+        :param data_set: Specification of the data set.
+        :param files: Files to read, as returned by _select_files.
+        :param schema: Schema to use when reading data from the parquet.
+        :type data_set: dict
+        :type files: dict
+        :type schema: pyarrow.Schema
+        :returns: Data read from the files.
+        :rtype: pandas.DataFrame
+        """
+        path = data_set["path"]
+        file_list = list(files.keys())
+        if self._cache is not None:
+            file_list = self._cache.get_files(
+                path,
+                {file_path: etag for file_path, (etag, _) in files.items()}
+            )
+            path = self._cache.get_root(path)
+        return Data._read_files(
+            path=path,
+            files=file_list,
+            columns=data_set.get("columns", None),
+            schema=schema,
+            filters=data_set.get("filters", None)
+        )
+
+    def _read_data_set(
+            self,
+            idx: int,
+            data_set: dict,
+            days: int=None,
+            schema: pa.Schema=None
+        ) -> pd.DataFrame:
+        """Read the data set and remember which files were read, so they are
+        not read again by refresh().
+
+        :param idx: Position of the data set in the specification.
+        :param data_set: Specification of the data set.
+        :param days: Number of days to filter. If None, all data is read.
+        :param schema: Schema to use when reading data from the parquet.
+        :type idx: int
+        :type data_set: dict
+        :type days: int
+        :type schema: pyarrow.Schema
+        :returns: Data read from the data set, empty if reading failed.
+        :rtype: pandas.DataFrame
+        """
+        start = time()
         try:
-            file_list = wr.s3.list_objects(
-                path=path,
-                suffix="parquet",
-                last_modified_begin=last_modified_begin,
-                last_modified_end=last_modified_end
+            files = Data._select_files(data_set, days)
+            if not files:
+                logging.error(
+                    f"Reading of data from parquets FAILED.\n"
+                    f"No parquets found in specified time period.\n"
+                    f"Nr of days: {days}\n"
+                )
+                return pd.DataFrame()
+            df = self._read_selected_files(data_set, files, schema)
+        except (ArrowInvalid, ArrowNotImplementedError, OSError,
+                BotoCoreError, ClientError) as err:
+            logging.error(f"Reading of data from parquets FAILED.\n{repr(err)}")
+            return pd.DataFrame()
+
+        self._loaded[idx] = files
+        df.info(verbose=True, memory_usage="deep")
+        logging.debug(
+            f"\nCreation of dataframe {data_set['path']} took: "
+            f"{time() - start}\n"
+        )
+        return df
+
+    @staticmethod
+    def _concat(data: list) -> pd.DataFrame:
+        """Concatenate data frames. Categorical columns stay categorical if the
+        column is categorical in all data frames.
+
+        :param data: Data frames to concatenate.
+        :type data: list
+        :returns: Concatenated data frame.
+        :rtype: pandas.DataFrame
+        """
+        # Shallow copies, columns of the input data frames are not replaced.
+        data = [itm.copy(deep=False) for itm in data]
+        columns = set()
+        for itm in data:
+            columns.update(itm.columns)
+        for col in columns:
+            l_cat = [itm[col] for itm in data if col in itm.columns]
+            if len(l_cat) < 2 or not all(
+                    isinstance(cat.dtype, pd.CategoricalDtype)
+                    for cat in l_cat
+                ):
+                continue
+            if len({cat.cat.categories.dtype for cat in l_cat}) > 1:
+                # E.g. the memory-mapped shared data and the data read by
+                # refresh.
+                l_cat = [
+                    cat.cat.set_categories(cat.cat.categories.astype(object))
+                    for cat in l_cat
+                ]
+            categories = pd.api.types.union_categoricals(
+                l_cat, ignore_order=True
+            ).categories
+            for itm in data:
+                if col in itm.columns:
+                    itm[col] = itm[col].cat.set_categories(categories)
+        return pd.concat(data, ignore_index=True, copy=False)
+
+    def _compact(
+            self,
+            data_type: str,
+            data: pd.DataFrame,
+            verbose: bool=True
+        ) -> pd.DataFrame:
+        """Reduce the memory used by the data frame.
+
+        - Columns not used by any data set of the data type in the
+          specification are removed. Partition columns are kept if the data is
+          refreshed.
+        - String columns with repeated values (test_id, job, dut_version,
+          units, ...) are converted to categoricals.
+        - Integer columns are downcast to the smallest integer type fitting
+          the values.
+
+        Float columns are not downcast, as it changes the displayed values.
+
+        :param data_type: The data type defined in data.yaml
+        :param data: The data to compact.
+        :param verbose: If True, log the memory saved per column.
+        :type data_type: str
+        :type data: pandas.DataFrame
+        :type verbose: bool
+        :returns: The compacted data frame.
+        :rtype: pandas.DataFrame
+        """
+        if data.empty:
+            return data
+
+        used = {"release", }
+        for data_set in self._data_spec:
+            if data_set.get("data_type", str()) == data_type:
+                used.update(data_set.get("columns", list()))
+                used.add(data_set["partition"])
+        if data_type in REFRESHED_DATA_TYPES:
+            used.update(DATE_PARTITIONS)
+
+        mem_before = data.memory_usage(index=False, deep=True)
+        data = data.drop(columns=[c for c in data.columns if c not in used])
+
+        for col in data.columns:
+            dtype = data[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_integer_dtype(dtype):
+                if data[col].hasnans:
+                    continue
+                arrow = isinstance(dtype, pd.ArrowDtype)
+                min_val, max_val = data[col].min(), data[col].max()
+                for int_type in (np.int8, np.int16, np.int32):
+                    info = np.iinfo(int_type)
+                    if info.min <= min_val and max_val <= info.max:
+                        data[col] = data[col].astype(
+                            pd.ArrowDtype(pa.from_numpy_dtype(int_type)) \
+                                if arrow else int_type
+                        )
+                        break
+            elif pd.api.types.is_string_dtype(dtype) and \
+                    pd.api.types.infer_dtype(data[col], skipna=True) == \
+                        "string":
+                if data[col].nunique(dropna=False) < \
+                        CATEGORICAL_RATIO * len(data):
+                    data[col] = data[col].astype("category")
+
+        if verbose:
+            mem_after = data.memory_usage(index=False, deep=True)
+            saved = list()
+            for col, size in mem_before.items():
+                new_size = mem_after.get(col, 0)
+                if new_size < size:
+                    saved.append(
+                        f"{col}: {size} -> {new_size} B, "
+                        f"saved {size - new_size} B"
+                    )
+            logging.info(
+                f"\nCompaction of dataframe {data_type}:\n" +
+                "\n".join(saved) + "\n"
+                f"Total: {mem_before.sum()} -> {mem_after.sum()} B, "
+                f"saved {mem_before.sum() - mem_after.sum()} B\n"
             )
-            logging.debug("\n".join(file_list))
-        except NoFilesFound as err:
-            logging.error(f"No parquets found.\n{err}")
-        except EmptyDataFrame as err:
-            logging.error(f"No data.\n{err}")
+        return data
+
+    @staticmethod
+    def _merge_anomalies(
+            trending: pd.DataFrame,
+            anomalies: pd.DataFrame
+        ) -> pd.DataFrame:
+        """Add the trend and anomaly columns precomputed by the
+        trending_anomalies ETL to the trending data.
 
-        return file_list
+        The rows are matched by job, build and test ID. The columns added by
+        a previous merge are replaced. The trending rows without precomputed
+        values (e.g. not processed by the ETL yet) get missing values, the
+        trending graphs classify such data on the fly.
 
-    def _validate_columns(self, data_type: str) -> str:
+        :param trending: Trending data.
+        :param anomalies: Precomputed trend and anomaly columns with the key
+            columns.
+        :type trending: pandas.DataFrame
+        :type anomalies: pandas.DataFrame
+        :returns: Trending data with the precomputed columns.
+        :rtype: pandas.DataFrame
+        """
+        if trending.empty:
+            return trending
+        trending = trending.drop(columns=[
+            col for col in trending.columns if col.endswith(ANOMALIES_SUFFIXES)
+        ])
+        added = [
+            col for col in anomalies.columns if col.endswith(ANOMALIES_SUFFIXES)
+        ]
+        keys = list(ANOMALIES_KEYS)
+        if not added or any(key not in anomalies.columns for key in keys):
+            return trending
+        right = anomalies[keys + added].copy()
+        for key in keys:
+            # The same types (and categories) are needed for the merge to keep
+            # the types of trending data.
+            if right[key].dtype != trending[key].dtype:
+                right[key] = right[key].astype(trending[key].dtype)
+        right = right.dropna(subset=keys).drop_duplicates(
+            subset=keys,
+            keep="last"
+        )
+        return trending.merge(right, how="left", on=keys, copy=False)
+
+    def _validate_columns(
+            self,
+            data_type: str,
+            data: pd.DataFrame=None
+        ) -> str:
         """Check if all columns are present in the dataframe.
 
         :param data_type: The data type defined in data.yaml
+        :param data: The data to validate. If None, the data of the data type
+            stored in this object is validated.
         :type data_type: str
+        :type data: pandas.DataFrame
         :returns: Error message if validation fails, otherwise empty string.
         :rtype: str
         """
+        if data is None:
+            data = self.data[data_type]
+
         defined_columns = set()
         for data_set in self._data_spec:
             if data_set.get("data_type", str()) == data_type:
@@ -144,12 +611,12 @@ class Data:
         if not defined_columns:
             return "No columns defined in the data set(s)."
 
-        if self.data[data_type].empty:
+        if data.empty:
             return "No data."
 
         ret_msg = str()
         for col in defined_columns:
-            if col not in self.data[data_type].columns:
+            if col not in data.columns:
                 if not ret_msg:
                     ret_msg = "Missing columns: "
                 else:
@@ -158,71 +625,31 @@ class Data:
         return ret_msg
 
     @staticmethod
-    def _write_parquet_schema(
-            path,
-            partition_filter=None,
-            columns=None,
-            validate_schema=False,
-            last_modified_begin=None,
-            last_modified_end=None,
-            days=None
-        ) -> None:
-        """Auxiliary function to write parquet schemas. Use it instead of
-        "_create_dataframe_from_parquet" in "read_all_data".
-
-        :param path: S3 prefix (accepts Unix shell-style wildcards)
-            (e.g. s3://bucket/prefix) or list of S3 objects paths
-            (e.g. [s3://bucket/key0, s3://bucket/key1]).
-        :param partition_filter: Callback Function filters to apply on PARTITION
-            columns (PUSH-DOWN filter). This function MUST receive a single
-            argument (Dict[str, str]) where keys are partitions names and values
-            are partitions values. Partitions values will be always strings
-            extracted from S3. This function MUST return a bool, True to read
-            the partition or False to ignore it. Ignored if dataset=False.
-        :param columns: Names of columns to read from the file(s).
-        :param validate_schema: Check that individual file schemas are all the
-            same / compatible. Schemas within a folder prefix should all be the
-            same. Disable if you have schemas that are different and want to
-            disable this check.
-        :param last_modified_begin: Filter the s3 files by the Last modified
-            date of the object. The filter is applied only after list all s3
-            files.
-        :param last_modified_end: Filter the s3 files by the Last modified date
-            of the object. The filter is applied only after list all s3 files.
-        :param days: Number of days to filter.
-        :type path: Union[str, List[str]]
-        :type partition_filter: Callable[[Dict[str, str]], bool], optional
-        :type columns: List[str], optional
-        :type validate_schema: bool, optional
-        :type last_modified_begin: datetime, optional
-        :type last_modified_end: datetime, optional
-        :type days: integer, optional
-        """
-        if days:
-            last_modified_begin = datetime.now(tz=UTC) - timedelta(days=days)
-
-        df = wr.s3.read_parquet(
-            path=path,
-            path_suffix="parquet",
-            ignore_empty=True,
-            validate_schema=validate_schema,
-            use_threads=True,
-            dataset=True,
-            columns=columns,
-            partition_filter=partition_filter,
-            last_modified_begin=last_modified_begin,
-            last_modified_end=last_modified_end,
-            chunked=1
-        )
+    def _write_parquet_schema(data_set: dict, days: int=None) -> None:
+        """Auxiliary function to write parquet schemas. The files of the data
+        set are read one by one by the same scanner as the data, without a
+        schema, and the schema of the first file meeting the condition is
+        written.
 
-        for itm in df:
+        :param data_set: Specification of the data set.
+        :param days: Number of days to filter. If None, all files are used.
+        :type data_set: dict
+        :type days: int
+        """
+        for file_path in Data._select_files(data_set, days):
+            itm = Data._read_files(
+                path=data_set["path"],
+                files=[file_path, ],
+                columns=data_set.get("columns", None)
+            )
+            schema = pa.Schema.from_pandas(itm)
             try:
                 # Specify the condition or remove it:
                 if all((
-                        pd.api.types.is_string_dtype(itm["column_name"]),
-                        pd.api.types.is_string_dtype(itm["telemetry"][0])
+                        pa.types.is_string(schema.field("column_name").type),
+                        schema.field("telemetry").type == \
+                            pa.list_(pa.string())
                     )):
-                    schema = pa.Schema.from_pandas(itm)
                     pa.parquet.write_metadata(
                         schema, f"{C.PATH_TO_SCHEMAS}_tmp_schema"
                     )
@@ -235,97 +662,6 @@ class Data:
             except KeyError:
                 pass
 
-    @staticmethod
-    def _create_dataframe_from_parquet(
-            path,
-            partition_filter=None,
-            columns=None,
-            validate_schema=False,
-            last_modified_begin=None,
-            last_modified_end=None,
-            days=None,
-            schema=None
-        ) -> pd.DataFrame:
-        """Read parquet stored in S3 compatible storage and returns Pandas
-        Dataframe.
-
-        :param path: S3 prefix (accepts Unix shell-style wildcards)
-            (e.g. s3://bucket/prefix) or list of S3 objects paths
-            (e.g. [s3://bucket/key0, s3://bucket/key1]).
-        :param partition_filter: Callback Function filters to apply on PARTITION
-            columns (PUSH-DOWN filter). This function MUST receive a single
-            argument (Dict[str, str]) where keys are partitions names and values
-            are partitions values. Partitions values will be always strings
-            extracted from S3. This function MUST return a bool, True to read
-            the partition or False to ignore it. Ignored if dataset=False.
-        :param columns: Names of columns to read from the file(s).
-        :param validate_schema: Check that individual file schemas are all the
-            same / compatible. Schemas within a folder prefix should all be the
-            same. Disable if you have schemas that are different and want to
-            disable this check.
-        :param last_modified_begin: Filter the s3 files by the Last modified
-            date of the object. The filter is applied only after list all s3
-            files.
-        :param last_modified_end: Filter the s3 files by the Last modified date
-            of the object. The filter is applied only after list all s3 files.
-        :param days: Number of days to filter.
-        :param schema: Path to schema to use when reading data from the parquet.
-        :type path: Union[str, List[str]]
-        :type partition_filter: Callable[[Dict[str, str]], bool], optional
-        :type columns: List[str], optional
-        :type validate_schema: bool, optional
-        :type last_modified_begin: datetime, optional
-        :type last_modified_end: datetime, optional
-        :type days: integer, optional
-        :type schema: string
-        :returns: Pandas DataFrame or None if DataFrame cannot be fetched.
-        :rtype: DataFrame
-        """
-        df = pd.DataFrame()
-        start = time()
-        if days:
-            last_modified_begin = datetime.now(tz=UTC) - timedelta(days=days)
-        try:
-            df = wr.s3.read_parquet(
-                path=path,
-                path_suffix="parquet",
-                ignore_empty=True,
-                schema=schema,
-                validate_schema=validate_schema,
-                use_threads=True,
-                dataset=True,
-                columns=columns,
-                partition_filter=partition_filter,
-                last_modified_begin=last_modified_begin,
-                last_modified_end=last_modified_end,
-                dtype_backend="pyarrow"
-            )
-
-            df.info(verbose=True, memory_usage="deep")
-            logging.debug(
-                f"\nCreation of dataframe {path} took: {time() - start}\n"
-            )
-        except (ArrowInvalid, ArrowNotImplementedError) as err:
-            logging.error(f"Reading of data from parquets FAILED.\n{repr(err)}")
-        except NoFilesFound as err:
-            logging.error(
-                f"Reading of data from parquets FAILED.\n"
-                f"No parquets found in specified time period.\n"
-                f"Nr of days: {days}\n"
-                f"last_modified_begin: {last_modified_begin}\n"
-                f"{repr(err)}"
-            )
-        except EmptyDataFrame as err:
-            logging.error(
-                f"Reading of data from parquets FAILED.\n"
-                f"No data in parquets in specified time period.\n"
-                f"Nr of days: {days}\n"
-                f"last_modified_begin: {last_modified_begin}\n"
-                f"{repr(err)}"
-            )
-
-        return df
-
     def read_all_data(self, days: int=None) -> dict:
         """Read all data necessary for all applications.
 
@@ -340,59 +676,38 @@ class Data:
         data_lists = {
             "statistics": list(),
             "trending": list(),
+            "trending_anomalies": list(),
             "iterative": list(),
             "coverage": list()
         }
 
         logging.info("\n\nReading data:\n" + "-" * 13 + "\n")
-        for data_set in self._data_spec:
+        for idx, data_set in enumerate(self._data_spec):
             logging.info(
                 f"\n\nReading data for {data_set['data_type']} "
                 f"{data_set['partition_name']} {data_set.get('release', '')}\n"
             )
-            schema_file = data_set.get("schema", None)
-            if schema_file:
-                try:
-                    schema = pa.parquet.read_schema(
-                        f"{C.PATH_TO_SCHEMAS}{schema_file}"
-                    )
-                except FileNotFoundError as err:
-                    logging.error(repr(err))
-                    logging.error("Proceeding without schema.")
-                    schema = None
-            else:
-                schema = None
-            partition_filter = lambda part: True \
-                if part[data_set["partition"]] == data_set["partition_name"] \
-                    else False
-            if data_set["data_type"] in ("trending", "statistics"):
+            if data_set["data_type"] in REFRESHED_DATA_TYPES:
                 time_period = days
             else:
                 time_period = None
 
             if GENERATE_SCHEMA:
                 # Generate schema:
-                Data._write_parquet_schema(
-                    path=data_set["path"],
-                    partition_filter=partition_filter,
-                    columns=data_set.get("columns", None),
-                    days=time_period
-                )
+                Data._write_parquet_schema(data_set, time_period)
                 return
 
+            schema = Data._read_schema(data_set)
+
             # Read data:
-            data = Data._create_dataframe_from_parquet(
-                path=data_set["path"],
-                partition_filter=partition_filter,
-                columns=data_set.get("columns", None),
-                days=time_period,
-                schema=schema
-            )
+            data = self._read_data_set(idx, data_set, time_period, schema)
             if data_set["data_type"] in ("iterative", "coverage"):
                 data["release"] = data_set["release"]
                 data["release"] = data["release"].astype("category")
 
-            data_lists[data_set["data_type"]].append(data)
+            data_lists[data_set["data_type"]].append(
+                self._compact(data_set["data_type"], data, verbose=False)
+            )
 
         logging.info(
             "\n\nData post-processing, validation and summary:\n" +
@@ -400,11 +715,7 @@ class Data:
         )
         for key in self._data.keys():
             logging.info(f"\n\nDataframe {key}:\n")
-            self._data[key] = pd.concat(
-                data_lists[key],
-                ignore_index=True,
-                copy=False
-            )    
+            self._data[key] = self._compact(key, Data._concat(data_lists[key]))
             self._data[key].info(verbose=True, memory_usage="deep")
             err_msg = self._validate_columns(key)
             if err_msg:
@@ -415,6 +726,382 @@ class Data:
                     "Generated dataframe replaced by an empty dataframe."
                 )
 
+        self._data["trending"] = Data._merge_anomalies(
+            self._data["trending"],
+            self._data["trending_anomalies"]
+        )
+        for key in ("trending", "iterative", "coverage"):
+            if not self._data[key].empty:
+                # Build the index used to select tests.
+                get_data_index(self._data[key])
+
+        if self._cache is not None:
+            logging.info(f"\n\nParquet cache: {self._cache.stats}\n")
+
+        mem_alloc = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1000
+        logging.info(f"\n\nMemory allocation: {mem_alloc:.0f}MB\n")
+
+        # Items cached so far were computed from the previous data.
+        invalidate_caches()
+
+        return self._data
+
+    def refresh(self, days: int=None) -> list:
+        """Read new and changed partitions of trending and statistics data.
+
+        Only the files which are new or changed (their ETag differs) since the
+        data was read are read, the rows from the changed partitions and from
+        the partitions which are no longer in the time period are removed. The
+        new data frames then replace the old ones, so the users of the data
+        always see either the old or the new version.
+
+        :param days: Number of days to filter, the same as used to read the
+            data by read_all_data.
+        :type days: int
+        :returns: Data types which were updated.
+        :rtype: list
+        """
+        with self._refresh_lock:
+            updates = dict()
+            for idx, data_set in enumerate(self._data_spec):
+                data_type = data_set["data_type"]
+                if data_type not in REFRESHED_DATA_TYPES:
+                    continue
+                loaded = self._loaded.get(idx, dict())
+                try:
+                    files = Data._select_files(data_set, days)
+                    changed = {
+                        part for file_path, (etag, part) in files.items()
+                        if loaded.get(file_path, (None, ))[0] != etag
+                    }
+                    removed = {
+                        part for file_path, (_, part) in loaded.items()
+                        if file_path not in files
+                    }
+                    to_read = {
+                        file_path: itm for file_path, itm in files.items()
+                        if itm[1] in changed
+                    }
+                    if to_read:
+                        logging.info(
+                            f"Refreshing {data_type} "
+                            f"{data_set['partition_name']}: "
+                            f"{len(changed)} new or changed partition(s)."
+                        )
+                        data = self._read_selected_files(
+                            data_set,
+                            to_read,
+                            Data._read_schema(data_set)
+                        )
+                    elif removed:
+                        data = pd.DataFrame()
+                    else:
+                        continue
+                except (ArrowInvalid, ArrowNotImplementedError, OSError,
+                        BotoCoreError, ClientError) as err:
+                    logging.error(
+                        f"Refresh of {data_type} FAILED.\n{repr(err)}"
+                    )
+                    continue
+                update = updates.setdefault(data_type, (list(), list()))
+                update[0].append(changed | removed)
+                update[1].append(data)
+                self._loaded[idx] = files
+
+            for data_type, (drops, new_data) in updates.items():
+                data = self._data[data_type]
+                for partitions in drops:
+                    if data.empty or not partitions:
+                        continue
+                    names = [
+                        itm.split("=", 1)[0]
+                        for itm in next(iter(partitions)).split("/")
+                    ]
+                    keys = Data._get_partition_keys(data, names)
+                    data = data.loc[~keys.isin(partitions)]
+                data = self._compact(
+                    data_type,
+                    Data._concat(
+                        [data, ] + [
+                            self._compact(data_type, itm, verbose=False)
+                            for itm in new_data
+                        ]
+                    )
+                )
+                err_msg = self._validate_columns(data_type, data)
+                if err_msg:
+                    logging.error(
+                        f"Refresh of {data_type}: Data validation FAILED.\n"
+                        f"{err_msg}\n"
+                        "The data is not updated."
+                    )
+                    continue
+                self._data[data_type] = data
+
+            if "trending" in updates or "trending_anomalies" in updates:
+                self._data["trending"] = Data._merge_anomalies(
+                    self._data["trending"],
+                    self._data["trending_anomalies"]
+                )
+                if not self._data["trending"].empty:
+                    get_data_index(self._data["trending"])
+
+            if updates:
+                invalidate_caches()
+            return list(updates.keys())
+
+    def start_refresh(self, interval: int, days: int=None) -> None:
+        """Start the thread refreshing the data periodically.
+
+        If the data is shared with other processes, it is refreshed by
+        refresh_shared(), otherwise by refresh().
+
+        :param interval: Time between two refreshes in seconds.
+        :param days: Number of days to filter, the same as used to read the
+            data by read_all_data.
+        :type interval: int
+        :type days: int
+        """
+
+        def _refresh_loop() -> None:
+            """Refresh the data until stop_refresh() is called."""
+            while not self._refresh_stop.wait(interval):
+                start = time()
+                try:
+                    if self._shared_path:
+                        updated = self.refresh_shared(interval, days=days)
+                    else:
+                        updated = self.refresh(days=days)
+                except Exception as err:  # pylint: disable=broad-except
+                    # Keep the thread running, the next refresh can succeed.
+                    logging.error(f"Refresh of data FAILED.\n{repr(err)}")
+                    continue
+                logging.info(
+                    f"Data refreshed in {time() - start:.1f}s, "
+                    f"updated: {', '.join(updated) if updated else 'nothing'}"
+                )
+                if not updated:
+                    continue
+                for callback in self._refresh_callbacks:
+                    try:
+                        callback(self._data)
+                    except Exception as err:  # pylint: disable=broad-except
+                        logging.error(
+                            f"Processing of refreshed data FAILED.\n"
+                            f"{repr(err)}"
+                        )
+
+        self._refresh_stop.clear()
+        Thread(target=_refresh_loop, name="data-refresh", daemon=True).start()
+
+    def add_refresh_callback(self, callback) -> None:
+        """Add the function called in the refresh thread each time the data is
+        updated.
+
+        The function gets the dictionary with all data. It is used to process
+        the new data before it is used by the requests, so the request threads
+        only take the reference to the processed data.
+
+        :param callback: The function to call.
+        :type callback: callable
+        """
+        self._refresh_callbacks.append(callback)
+
+    def stop_refresh(self) -> None:
+        """Stop the thread refreshing the data.
+        """
+        self._refresh_stop.set()
+
+    def _write_shared(
+            self,
+            path: str,
+            days: int=None,
+            updated: list=None
+        ) -> None:
+        """Write the data to Arrow IPC files which can be memory-mapped by
+        other processes, together with the manifest describing the data.
+
+        The files are written uncompressed, so they can be memory-mapped
+        without copying. Each file is first written to a temporary file, then
+        renamed, so the processes reading the files never see a partially
+        written file.
+
+        :param path: Directory to write the files to.
+        :param days: Number of days the data was read for.
+        :param updated: Data types updated by the refresh, if the data is
+            written after a refresh.
+        :type path: str
+        :type days: int
+        :type updated: list
+        """
+        for data_type, data in self._data.items():
+            file_path = os.path.join(
+                path, SHARED_DATA_FILE.format(data_type=data_type)
+            )
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            with pa.OSFile(f"{file_path}.tmp", "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(f"{file_path}.tmp", file_path)
+
+        created = time()
+        Data._write_manifest(
+            path,
+            {
+                "created": created,
+                "checked": created,
+                "days": days,
+                "updated": updated or list(),
+                "loaded": {
+                    str(idx): files for idx, files in self._loaded.items()
+                }
+            }
+        )
+
+    @staticmethod
+    def _write_manifest(path: str, manifest: dict) -> None:
+        """Write the manifest of the shared data.
+
+        :param path: Directory with the shared data.
+        :param manifest: The manifest to write.
+        :type path: str
+        :type manifest: dict
+        """
+        file_path = os.path.join(path, SHARED_MANIFEST_FILE)
+        with open(f"{file_path}.tmp", "w") as file_write:
+            json.dump(manifest, file_write)
+        os.replace(f"{file_path}.tmp", file_path)
+
+    @staticmethod
+    def _read_manifest(path: str) -> dict:
+        """Read the manifest of the shared data.
+
+        :param path: Directory with the shared data.
+        :type path: str
+        :returns: The manifest, empty if it does not exist or it is not valid.
+        :rtype: dict
+        """
+        try:
+            with open(os.path.join(path, SHARED_MANIFEST_FILE), "r") as f_read:
+                return json.load(f_read)
+        except (IOError, ValueError):
+            return dict()
+
+    def _read_shared(self, path: str, manifest: dict) -> None:
+        """Memory-map the data written by _write_shared().
+
+        The columns backed by Arrow are not copied, so the memory (page cache)
+        is shared by all processes mapping the files. Only categorical columns
+        (their codes) and numpy columns are copied.
+
+        :param path: Directory with the shared data.
+        :param manifest: The manifest of the shared data.
+        :type path: str
+        :type manifest: dict
+        """
+        for data_type in self._data.keys():
+            source = pa.memory_map(
+                os.path.join(path, SHARED_DATA_FILE.format(data_type=data_type))
+            )
+            table = pa.ipc.open_file(source).read_all()
+            self._data[data_type] = table.to_pandas(
+                types_mapper=_arrow_types_mapper,
+                ignore_metadata=True
+            )
+            if not self._data[data_type].empty and \
+                    data_type in ("trending", "iterative", "coverage"):
+                get_data_index(self._data[data_type])
+
+        self._loaded = {
+            int(idx): {
+                file_path: tuple(itm) for file_path, itm in files.items()
+            }
+            for idx, files in manifest.get("loaded", dict()).items()
+        }
+        self._shared_path = path
+        self._shared_created = manifest.get("created")
+        invalidate_caches()
+
+    def refresh_shared(self, interval: int, days: int=None) -> list:
+        """Refresh the data shared with other processes.
+
+        Only one process reads the new and changed partitions by refresh() and
+        rewrites the shared data, the other processes (and the refreshing one
+        as well) memory-map the new shared data. The data is refreshed by the
+        process which maps the latest shared data, if no other process checked
+        it in the last half of the interval (the processes do not wake up at
+        the same time).
+
+        :param interval: Time between two refreshes in seconds.
+        :param days: Number of days to filter, the same as used to read the
+            data by read_all_data_shared.
+        :type interval: int
+        :type days: int
+        :returns: Data types which were updated.
+        :rtype: list
+        """
+        path = self._shared_path
+        with open(os.path.join(path, SHARED_LOCK_FILE), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            manifest = Data._read_manifest(path)
+            if manifest.get("created") == self._shared_created and \
+                    time() - manifest.get("checked", 0) >= interval / 2:
+                updated = self.refresh(days=days)
+                if updated:
+                    # Map the new shared data instead of the private data.
+                    self._write_shared(path, days, updated)
+                    manifest = Data._read_manifest(path)
+                else:
+                    manifest["checked"] = time()
+                    Data._write_manifest(path, manifest)
+            if manifest.get("created") == self._shared_created:
+                return list()
+            logging.info(f"Using data refreshed in {path}.")
+            self._read_shared(path, manifest)
+            return manifest.get("updated", list())
+
+    def read_all_data_shared(
+            self,
+            path: str,
+            days: int=None,
+            max_age: int=None
+        ) -> dict:
+        """Read all data necessary for all applications, sharing it with other
+        processes (e.g. uWSGI workers) on the same host.
+
+        The first process reads the data from parquets and writes it to Arrow
+        IPC files in the directory, the other processes (and the first one as
+        well) memory-map the files. The data is read from parquets again if
+        the files are older than max_age or they were written for other time
+        period.
+
+        :param path: Directory with the shared data.
+        :param days: Number of days to filter. If None, all data will be
+            downloaded.
+        :param max_age: Maximal age of the shared data in seconds. If None,
+            the shared data is used regardless its age.
+        :type path: str
+        :type days: int
+        :type max_age: int
+        :returns: A dictionary where keys are names of parquets and values are
+            the pandas dataframes with fetched data.
+        :rtype: dict(str: pandas.DataFrame)
+        """
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, SHARED_LOCK_FILE), "w") as lock:
+            # Only one process reads the data, the others wait for it.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            manifest = Data._read_manifest(path)
+            if not manifest or manifest.get("days") != days or \
+                    (max_age and time() - manifest["created"] > max_age):
+                logging.info(f"Reading data to be shared in {path}.")
+                self.read_all_data(days=days)
+                self._write_shared(path, days)
+                manifest = Data._read_manifest(path)
+            else:
+                logging.info(f"Using data shared in {path}.")
+            self._read_shared(path, manifest)
+
         mem_alloc = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1000
         logging.info(f"\n\nMemory allocation: {mem_alloc:.0f}MB\n")
 
@@ -0,0 +1,283 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent local cache of parquet files downloaded from S3.
+"""
+
+import os
+import fcntl
+import logging
+import hashlib
+import tempfile
+import pyarrow.fs
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
+from time import time
+
+
+# Temporary files of downloads older than this are removed at start. Younger
+# ones can be written by other processes using the same directory.
+STALE_TMP_AGE = 3600  # [s]
+
+# Files used more recently than this are not evicted, they can be being read
+# by other processes using the same directory.
+EVICT_MIN_AGE = 3600  # [s]
+
+# The lock file coordinating the processes using the same directory.
+LOCK_FILE = ".lock"
+
+
+class ParquetCache:
+    """Cache of parquet files on the local disk.
+
+    The files are stored in the same directory structure (with partition
+    directories) as in the source, so the cached files can be read as a data
+    set. A cached file is valid only for the ETag it was stored with, the
+    ETag is a part of the file name. When the total size of the cached files
+    exceeds the maximal size, the least recently used files are removed.
+    The versions of a file with old ETags are not used any more, so they are
+    removed this way too.
+
+    More processes (e.g. gunicorn workers) can use the same directory. The
+    state of the cache is the content of the directory, the modification time
+    of a file is its last access time. The processes check and evict the files
+    under a lock (flock on the lock file in the directory), the files used
+    recently are never evicted, so no file is removed while other process
+    reads it.
+
+    The source can be any location pyarrow.fs understands, S3 (s3://) or a
+    local directory, so the cache can be used without S3 too.
+    """
+
+    def __init__(self, directory: str, max_size: int, threads: int=8) -> None:
+        """Initialisation. The files already present in the directory (e.g.
+        from the previous run) are used, stale temporary files are removed.
+
+        :param directory: The directory to store the files in.
+        :param max_size: Maximal total size of cached files in bytes.
+        :param threads: Number of threads used to download the files.
+        :type directory: str
+        :type max_size: int
+        :type threads: int
+        """
+        self._directory = os.path.abspath(directory)
+        self._max_size = max_size
+        self._threads = threads
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+        # Cached files as seen by the last scan of the directory:
+        # {local path: (size, last access time)}
+        self._files = dict()
+        os.makedirs(self._directory, exist_ok=True)
+        with self._flock():
+            self._scan(remove_stale=True)
+
+    @contextmanager
+    def _flock(self):
+        """Lock the cache directory against other threads and processes.
+
+        The lock is taken on a new open file description, so the threads of
+        one process exclude each other too.
+        """
+        with self._lock, \
+                open(os.path.join(self._directory, LOCK_FILE), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _scan(self, remove_stale: bool=False) -> None:
+        """Scan the directory for the cached files. Must be called with the
+        lock held.
+
+        :param remove_stale: If True, remove stale temporary files.
+        :type remove_stale: bool
+        """
+        self._files = dict()
+        now = time()
+        for root, _, file_names in os.walk(self._directory):
+            for file_name in file_names:
+                file_path = os.path.join(root, file_name)
+                if file_path == os.path.join(self._directory, LOCK_FILE):
+                    continue
+                try:
+                    stat = os.stat(file_path)
+                    if file_name.endswith(".tmp"):
+                        if remove_stale and \
+                                now - stat.st_mtime > STALE_TMP_AGE:
+                            os.remove(file_path)
+                        continue
+                except FileNotFoundError:
+                    # Renamed or removed by other process.
+                    continue
+                self._files[file_path] = (stat.st_size, stat.st_mtime)
+
+    def get_root(self, path: str) -> str:
+        """Get the local directory with cached files of the data set.
+
+        :param path: S3 prefix (s3://bucket/prefix) or local directory with
+            the data set.
+        :type path: str
+        :returns: Local directory with the cached files of the data set.
+        :rtype: str
+        """
+        name = path[len("s3://"):] if path.startswith("s3://") else \
+            hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(self._directory, name.strip("/"))
+
+    def _get_local_path(self, path: str, file_path: str, etag: str) -> str:
+        """Get the path to the cached file.
+
+        :param path: S3 prefix or local directory with the data set.
+        :param file_path: Path to the file in the data set.
+        :param etag: ETag of the file.
+        :type path: str
+        :type file_path: str
+        :type etag: str
+        :returns: Local path to the cached file.
+        :rtype: str
+        """
+        rel_dir, file_name = os.path.split(file_path[len(path):].strip("/"))
+        tag = hashlib.sha1(etag.encode()).hexdigest()[:16]
+        return os.path.join(self.get_root(path), rel_dir, f"{tag}-{file_name}")
+
+    def _download(self, file_path: str, local_path: str) -> None:
+        """Download the file to the cache.
+
+        The file is first written to a temporary file with a unique name, then
+        renamed, so no partially written file is ever used, even if more
+        processes download the same file.
+
+        :param file_path: Path to the file in the source.
+        :param local_path: Local path to store the file to.
+        :type file_path: str
+        :type local_path: str
+        """
+        filesystem, src_path = pyarrow.fs.FileSystem.from_uri(
+            file_path if file_path.startswith("s3://") else \
+                os.path.abspath(file_path)
+        )
+        directory, name = os.path.split(local_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{name}.", suffix=".tmp"
+        )
+        try:
+            with filesystem.open_input_stream(src_path) as src, \
+                    os.fdopen(fd, "wb") as dst:
+                while True:
+                    chunk = src.read(1 << 22)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+            os.replace(tmp_path, local_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def get_files(self, path: str, files: dict) -> list:
+        """Get local paths to the files, download the files which are not
+        cached or were changed (have other ETag).
+
+        A file is a hit if it is in the directory, no matter which process
+        downloaded it. A cached file is marked as used, so other processes do
+        not evict it while it is read. A missing file is downloaded, even if
+        it was cached before (e.g. evicted by other process).
+
+        :param path: S3 prefix or local directory with the data set.
+        :param files: Files to get with their ETags.
+        :type path: str
+        :type files: dict(str: str)
+        :returns: Local paths to the files, in the order of the input.
+        :rtype: list
+        """
+        local_paths = list()
+        to_download = list()
+        with self._flock():
+            now = time()
+            for file_path, etag in files.items():
+                local_path = self._get_local_path(path, file_path, etag)
+                local_paths.append(local_path)
+                try:
+                    # The modification time of cached files is their last
+                    # access time, it survives the restart.
+                    os.utime(local_path, (now, now))
+                    self._hits += 1
+                except FileNotFoundError:
+                    self._misses += 1
+                    to_download.append((file_path, local_path))
+
+        if to_download:
+            with ThreadPoolExecutor(max_workers=self._threads) as executor:
+                list(executor.map(
+                    lambda itm: self._download(*itm),
+                    to_download
+                ))
+
+        with self._flock():
+            self._scan()
+            self._evict(keep=set(local_paths))
+
+        return local_paths
+
+    def _evict(self, keep: set) -> None:
+        """Remove the least recently used files until the total size of the
+        cached files is not bigger than the maximal size. Must be called with
+        the lock held, after the directory is scanned.
+
+        The files used in the last EVICT_MIN_AGE seconds are not removed, so
+        the size can stay bigger than the maximal size.
+
+        :param keep: Files not to remove, e.g. the files being read.
+        :type keep: set
+        """
+        size = sum(itm[0] for itm in self._files.values())
+        if size <= self._max_size:
+            return
+        used = time() - EVICT_MIN_AGE
+        for local_path, (file_size, last_access) in sorted(
+                self._files.items(), key=lambda itm: itm[1][1]
+            ):
+            if size <= self._max_size or last_access > used:
+                break
+            if local_path in keep:
+                continue
+            try:
+                os.remove(local_path)
+            except FileNotFoundError:
+                pass
+            self._files.pop(local_path)
+            size -= file_size
+        logging.debug(f"Parquet cache evicted to {size} B.")
+
+    @property
+    def stats(self) -> dict:
+        """Statistics of the cache: number of files, size (as seen by the last
+        scan of the directory), maximal size, hits and misses.
+
+        :returns: Statistics of the cache.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "size": sum(itm[0] for itm in self._files.values()),
+                "max-size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses
+            }
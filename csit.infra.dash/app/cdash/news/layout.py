@@ -37,9 +37,9 @@ class Layout:
     def __init__(
             self,
             app: Flask,
-            data_stats: pd.DataFrame,
-            data_trending: pd.DataFrame,
-            html_layout_file: str
+            data: dict,
+            html_layout_file: str,
+            data_source=None
         ) -> None:
         """Initialization:
         - save the input parameters,
@@ -49,22 +49,105 @@ class Layout:
         - read tooltips from the tooltip file.
 
         :param app: Flask application running the dash application.
-        :param data_stats: Pandas dataframe with staistical data.
-        :param data_trending: Pandas dataframe with trending data.
+        :param data: All data, the statistical and trending data is taken from
+            it on each use as it can be replaced by the background refresh.
         :param html_layout_file: Path and name of the file specifying the HTML
             layout of the dash application.
+        :param data_source: The source of the data, if given, the data is
+            processed again in its refresh thread each time it is updated.
         :type app: Flask
-        :type data_stats: pandas.DataFrame
-        :type data_trending: pandas.DataFrame
+        :type data: dict(str: pandas.DataFrame)
         :type html_layout_file: str
+        :type data_source: Data
         """
 
         # Inputs
         self._app = app
+        self._all_data = data
         self._html_layout_file = html_layout_file
 
+        # Pre-process the data:
+        self._sources = None
+        self._processed = None
+        self._update_data(self._all_data)
+        if data_source is not None:
+            data_source.add_refresh_callback(self._update_data)
+
+        # Read from files:
+        self._html_layout = str()
+
+        try:
+            with open(self._html_layout_file, "r") as file_read:
+                self._html_layout = file_read.read()
+        except IOError as err:
+            raise RuntimeError(
+                f"Not possible to open the file {self._html_layout_file}\n{err}"
+            )
+
+        self._default_period = C.NEWS_SHORT
+        self._default_active = (False, True, False)
+
+        # Callbacks:
+        if self._app is not None and hasattr(self, 'callbacks'):
+            self.callbacks(self._app)
+
+    @property
+    def html_layout(self) -> dict:
+        return self._html_layout
+
+    def _update_data(self, data: dict) -> None:
+        """Process the data again if it was replaced by the background
+        refresh.
+
+        It runs in the refresh thread, the processed data is replaced by one
+        assignment, so the requests always get either the old or the new
+        processed data without waiting.
+
+        :param data: All data.
+        :type data: dict(str: pandas.DataFrame)
+        """
+        sources = (data["statistics"], data["trending"])
+        if self._sources is None or any(
+                new is not old for new, old in zip(sources, self._sources)
+            ):
+            self._processed = Layout._process_data(*sources)
+            self._sources = sources
+
+    @property
+    def job_info(self) -> pd.DataFrame:
+        """Information for the control panel made from the current data.
+
+        :returns: Information about the jobs.
+        :rtype: pandas.DataFrame
+        """
+        return self._processed[0]
+
+    @property
+    def _data(self) -> pd.DataFrame:
+        """The summary of the last builds made from the current data.
+
+        :returns: Summary of the last builds of all jobs.
+        :rtype: pandas.DataFrame
+        """
+        return self._processed[1]
+
+    @staticmethod
+    def _process_data(
+            data_stats: pd.DataFrame,
+            data_trending: pd.DataFrame
+        ) -> tuple:
+        """Prepare information for the control panel and the summary of the
+        last builds of all jobs.
+
+        :param data_stats: Pandas dataframe with staistical data.
+        :param data_trending: Pandas dataframe with trending data.
+        :type data_stats: pandas.DataFrame
+        :type data_trending: pandas.DataFrame
+        :returns: Information about jobs and the summary.
+        :rtype: tuple(pandas.DataFrame, pandas.DataFrame)
+        """
         # Prepare information for the control panel:
-        self._jobs = sorted(list(data_trending["job"].unique()))
+        jobs = sorted(list(data_trending["job"].unique()))
         d_job_info = {
             "job": list(),
             "dut": list(),
@@ -72,14 +155,14 @@ class Layout:
             "cadence": list(),
             "tbed": list()
         }
-        for job in self._jobs:
+        for job in jobs:
             lst_job = job.split("-")
             d_job_info["job"].append(job)
             d_job_info["dut"].append(lst_job[1])
             d_job_info["ttype"].append(lst_job[3])
             d_job_info["cadence"].append(lst_job[4])
             d_job_info["tbed"].append("-".join(lst_job[-2:]))
-        self.job_info = pd.DataFrame.from_dict(d_job_info)
+        job_info = pd.DataFrame.from_dict(d_job_info)
 
         # Pre-process the data:
 
@@ -103,7 +186,7 @@ class Layout:
             "regressions": list(),
             "progressions": list()
         }
-        for job in self._jobs:
+        for job in jobs:
             # Create lists of failed tests:
             df_job = data_trending.loc[(data_trending["job"] == job)]
             last_build = str(max(pd.to_numeric(df_job["build"].unique())))
@@ -215,29 +298,7 @@ class Layout:
             tst_info["progressions"].append(
                 sorted(l_prog, key=lambda k: k[1], reverse=True))
 
-        self._data = pd.DataFrame.from_dict(tst_info)
-
-        # Read from files:
-        self._html_layout = str()
-
-        try:
-            with open(self._html_layout_file, "r") as file_read:
-                self._html_layout = file_read.read()
-        except IOError as err:
-            raise RuntimeError(
-                f"Not possible to open the file {self._html_layout_file}\n{err}"
-            )
-
-        self._default_period = C.NEWS_SHORT
-        self._default_active = (False, True, False)
-
-        # Callbacks:
-        if self._app is not None and hasattr(self, 'callbacks'):
-            self.callbacks(self._app)
-
-    @property
-    def html_layout(self) -> dict:
-        return self._html_layout
+        return job_info, pd.DataFrame.from_dict(tst_info)
 
     def add_content(self):
         """Top level method which generated the web page.
@@ -431,11 +492,12 @@ class Layout:
         :returns: The content of the plotting area.
         :rtype: list
         """
+        data = self._data
         return [
             dbc.Row(
                 id="row-table",
                 class_name="g-0 p-1",
-                children=table_summary(self._data, self._jobs, period)
+                children=table_summary(data, data["job"].to_list(), period)
             ),
             dbc.Row(
                 [
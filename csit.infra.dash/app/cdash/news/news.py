@@ -14,7 +14,6 @@
 """Instantiate the News Dash application.
 """
 import dash
-import pandas as pd
 
 from ..utils.constants import Constants as C
 from .layout import Layout
@@ -22,17 +21,19 @@ from .layout import Layout
 
 def init_news(
         server,
-        data_stats: pd.DataFrame,
-        data_trending: pd.DataFrame
+        data: dict,
+        data_source=None
     ) -> dash.Dash:
     """Create a Plotly Dash dashboard.
 
     :param server: Flask server.
+    :param data: All data, the statistical and trending data is taken from
+        it on each use as it can be replaced by the background refresh.
+    :param data_source: The source of the data, it runs the processing of the
+        data refreshed in the background.
     :type server: Flask
-    :param data_stats: Pandas dataframe with staistical data.
-    :param data_trending: Pandas dataframe with trending data.
-    :type data_stats: pandas.DataFrame
-    :type data_trending: pandas.DataFrame
+    :type data: dict(str: pandas.DataFrame)
+    :type data_source: Data
     :returns: Dash app server.
     :rtype: Dash
     """
@@ -46,8 +47,8 @@ def init_news(
 
     layout = Layout(
         app=dash_app,
-        data_stats=data_stats,
-        data_trending=data_trending,
+        data=data,
+        data_source=data_source,
         html_layout_file=C.HTML_LAYOUT_FILE
     )
     dash_app.index_string = layout.html_layout
@@ -22,6 +22,7 @@ from copy import deepcopy
 
 from ..utils.constants import Constants as C
 from ..utils.utils import get_color, get_hdrh_latencies
+from ..utils.data_index import select_tests
 
 
 def select_iterative_data(data: pd.DataFrame, itm:dict) -> pd.DataFrame:
@@ -53,21 +54,17 @@ def select_iterative_data(data: pd.DataFrame, itm:dict) -> pd.DataFrame:
         test_type = "mrr"
     elif itm["area"] == "hoststack":
         test_type = "hoststack"
-    df = data.loc[(
-        (data["release"] == itm["rls"]) &
-        (data["test_type"] == test_type) &
-        (data["passed"] == True)
-    )]
-
     core = str() if itm["dut"] == "trex" else f"{itm['core']}"
     ttype = "ndrpdr" if itm["testtype"] in ("ndr", "pdr") else itm["testtype"]
     regex_test = \
         f"^.*[.|-]{nic}.*{itm['framesize']}-{core}-{drv}{itm['test']}-{ttype}$"
+    df = select_tests(data, regex_test, job_suffix=f"{topo}-{arch}")
     df = df[
-        (df.job.str.endswith(f"{topo}-{arch}")) &
+        (df["release"] == itm["rls"]) &
+        (df["test_type"] == test_type) &
+        (df["passed"] == True) &
         (df.dut_version.str.contains(itm["dutver"].replace(".r", "-r").\
-            replace("rls", "release"))) &
-        (df.test_id.str.contains(regex_test, regex=True))
+            replace("rls", "release")))
     ]
 
     return df
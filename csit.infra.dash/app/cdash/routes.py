@@ -15,9 +15,10 @@
 """
 
 from flask import current_app as app
-from flask import render_template
+from flask import render_template, jsonify
 
 from .utils.constants import Constants as C
+from .utils.cache import get_cache_stats
 
 
 @app.route(C.APPLICATIN_ROOT)
@@ -35,3 +36,11 @@ def home():
         news_title=C.NEWS_TITLE,
         cov_title=C.COVERAGE_TITLE
     )
+
+
+@app.route(f"{C.APPLICATIN_ROOT.rstrip('/')}/cache-stats")
+def cache_stats():
+    """Statistics (hits, misses, size) of process-wide caches, used to size
+    them.
+    """
+    return jsonify(get_cache_stats())
@@ -41,11 +41,11 @@ class Layout:
     def __init__(
             self,
             app: Flask,
-            data_stats: pd.DataFrame,
-            data_trending: pd.DataFrame,
+            data: dict,
             html_layout_file: str,
             graph_layout_file: str,
-            tooltip_file: str
+            tooltip_file: str,
+            data_source=None
         ) -> None:
         """Initialization:
         - save the input parameters,
@@ -55,96 +55,40 @@ class Layout:
         - read tooltips from the tooltip file.
 
         :param app: Flask application running the dash application.
-        :param data_stats: Pandas dataframe with staistical data.
-        :param data_trending: Pandas dataframe with trending data.
+        :param data: All data, the statistical and trending data is taken from
+            it on each use as it can be replaced by the background refresh.
         :param html_layout_file: Path and name of the file specifying the HTML
             layout of the dash application.
         :param graph_layout_file: Path and name of the file with layout of
             plot.ly graphs.
         :param tooltip_file: Path and name of the yaml file specifying the
             tooltips.
+        :param data_source: The source of the data, if given, the data is
+            processed again in its refresh thread each time it is updated.
         :type app: Flask
-        :type data_stats: pandas.DataFrame
-        :type data_trending: pandas.DataFrame
+        :type data: dict(str: pandas.DataFrame)
         :type html_layout_file: str
         :type graph_layout_file: str
         :type tooltip_file: str
+        :type data_source: Data
         """
 
         # Inputs
         self._app = app
+        self._all_data = data
         self._html_layout_file = html_layout_file
         self._graph_layout_file = graph_layout_file
         self._tooltip_file = tooltip_file
 
         # Pre-process the data:
-        data_stats = data_stats[~data_stats.job.str.contains("-verify-")]
-        data_stats = data_stats[~data_stats.job.str.contains("-coverage-")]
-        data_stats = data_stats[~data_stats.job.str.contains("-iterative-")]
-        data_stats = data_stats[["job", "build", "start_time", "duration"]]
-
-        jobs = sorted(list(data_stats["job"].unique()))
-        d_job_info = {
-            "job": list(),
-            "dut": list(),
-            "ttype": list(),
-            "cadence": list(),
-            "tbed": list()
-        }
-        for job in jobs:
-            lst_job = job.split("-")
-            d_job_info["job"].append(job)
-            d_job_info["dut"].append(lst_job[1])
-            d_job_info["ttype"].append(lst_job[3])
-            d_job_info["cadence"].append(lst_job[4])
-            d_job_info["tbed"].append("-".join(lst_job[-2:]))
-        self._job_info = pd.DataFrame.from_dict(d_job_info)
+        self._sources = None
+        self._processed = None
+        self._update_data(self._all_data)
+        if data_source is not None:
+            data_source.add_refresh_callback(self._update_data)
 
         self._default = set_job_params(self._job_info, C.STATS_DEFAULT_JOB)
 
-        tst_info = {
-            "job": list(),
-            "build": list(),
-            "dut_type": list(),
-            "dut_version": list(),
-            "hosts": list(),
-            "passed": list(),
-            "failed": list(),
-            "lst_failed": list()
-        }
-        for job in jobs:
-            df_job = data_trending.loc[(data_trending["job"] == job)]
-            builds = df_job["build"].unique()
-            for build in builds:
-                df_build = df_job.loc[(df_job["build"] == build)]
-                tst_info["job"].append(job)
-                tst_info["build"].append(build)
-                tst_info["dut_type"].append(df_build["dut_type"].iloc[-1])
-                tst_info["dut_version"].append(df_build["dut_version"].iloc[-1])
-                tst_info["hosts"].append(df_build["hosts"].iloc[-1])
-                try:
-                    passed = df_build.value_counts(subset="passed")[True]
-                except KeyError:
-                    passed = 0
-                try:
-                    failed = df_build.value_counts(subset="passed")[False]
-                    failed_tests = df_build.loc[(df_build["passed"] == False)]\
-                        ["test_id"].to_list()
-                    l_failed = list()
-                    for tst in failed_tests:
-                        lst_tst = tst.split(".")
-                        suite = lst_tst[-2].replace("2n1l-", "").\
-                            replace("1n1l-", "").replace("2n-", "")
-                        l_failed.append(f"{suite.split('-')[0]}-{lst_tst[-1]}")
-                except KeyError:
-                    failed = 0
-                    l_failed = list()
-                tst_info["passed"].append(passed)
-                tst_info["failed"].append(failed)
-                tst_info["lst_failed"].append(sorted(l_failed))
-
-        self._data = data_stats.merge(pd.DataFrame.from_dict(tst_info))
-
         # Read from files:
         self._html_layout = str()
         self._graph_layout = None
@@ -209,6 +153,122 @@ class Layout:
     def html_layout(self) -> dict:
         return self._html_layout
 
+    def _update_data(self, data: dict) -> None:
+        """Process the data again if it was replaced by the background
+        refresh.
+
+        It runs in the refresh thread, the processed data is replaced by one
+        assignment, so the requests always get either the old or the new
+        processed data without waiting.
+
+        :param data: All data.
+        :type data: dict(str: pandas.DataFrame)
+        """
+        sources = (data["statistics"], data["trending"])
+        if self._sources is None or any(
+                new is not old for new, old in zip(sources, self._sources)
+            ):
+            self._processed = Layout._process_data(*sources)
+            self._sources = sources
+
+    @property
+    def _job_info(self) -> pd.DataFrame:
+        """Information about the jobs in the current data.
+
+        :returns: Job, DUT, test type, cadence and testbed of all jobs.
+        :rtype: pandas.DataFrame
+        """
+        return self._processed[0]
+
+    @property
+    def _data(self) -> pd.DataFrame:
+        """The statistics of the builds made from the current data.
+
+        :returns: Statistics of all builds of all jobs.
+        :rtype: pandas.DataFrame
+        """
+        return self._processed[1]
+
+    @staticmethod
+    def _process_data(
+            data_stats: pd.DataFrame,
+            data_trending: pd.DataFrame
+        ) -> tuple:
+        """Prepare information about the jobs and the statistics of the
+        builds.
+
+        :param data_stats: Pandas dataframe with staistical data.
+        :param data_trending: Pandas dataframe with trending data.
+        :type data_stats: pandas.DataFrame
+        :type data_trending: pandas.DataFrame
+        :returns: Information about jobs and the statistics of the builds.
+        :rtype: tuple(pandas.DataFrame, pandas.DataFrame)
+        """
+        data_stats = data_stats[~data_stats.job.str.contains("-verify-")]
+        data_stats = data_stats[~data_stats.job.str.contains("-coverage-")]
+        data_stats = data_stats[~data_stats.job.str.contains("-iterative-")]
+        data_stats = data_stats[["job", "build", "start_time", "duration"]]
+
+        jobs = sorted(list(data_stats["job"].unique()))
+        d_job_info = {
+            "job": list(),
+            "dut": list(),
+            "ttype": list(),
+            "cadence": list(),
+            "tbed": list()
+        }
+        for job in jobs:
+            lst_job = job.split("-")
+            d_job_info["job"].append(job)
+            d_job_info["dut"].append(lst_job[1])
+            d_job_info["ttype"].append(lst_job[3])
+            d_job_info["cadence"].append(lst_job[4])
+            d_job_info["tbed"].append("-".join(lst_job[-2:]))
+        job_info = pd.DataFrame.from_dict(d_job_info)
+
+        tst_info = {
+            "job": list(),
+            "build": list(),
+            "dut_type": list(),
+            "dut_version": list(),
+            "hosts": list(),
+            "passed": list(),
+            "failed": list(),
+            "lst_failed": list()
+        }
+        for job in jobs:
+            df_job = data_trending.loc[(data_trending["job"] == job)]
+            builds = df_job["build"].unique()
+            for build in builds:
+                df_build = df_job.loc[(df_job["build"] == build)]
+                tst_info["job"].append(job)
+                tst_info["build"].append(build)
+                tst_info["dut_type"].append(df_build["dut_type"].iloc[-1])
+                tst_info["dut_version"].append(df_build["dut_version"].iloc[-1])
+                tst_info["hosts"].append(df_build["hosts"].iloc[-1])
+                try:
+                    passed = df_build.value_counts(subset="passed")[True]
+                except KeyError:
+                    passed = 0
+                try:
+                    failed = df_build.value_counts(subset="passed")[False]
+                    failed_tests = df_build.loc[(df_build["passed"] == False)]\
+                        ["test_id"].to_list()
+                    l_failed = list()
+                    for tst in failed_tests:
+                        lst_tst = tst.split(".")
+                        suite = lst_tst[-2].replace("2n1l-", "").\
+                            replace("1n1l-", "").replace("2n-", "")
+                        l_failed.append(f"{suite.split('-')[0]}-{lst_tst[-1]}")
+                except KeyError:
+                    failed = 0
+                    l_failed = list()
+                tst_info["passed"].append(passed)
+                tst_info["failed"].append(failed)
+                tst_info["lst_failed"].append(sorted(l_failed))
+
+        return job_info, data_stats.merge(pd.DataFrame.from_dict(tst_info))
+
     def add_content(self):
         """Top level method which generated the web page.
 
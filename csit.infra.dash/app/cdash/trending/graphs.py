@@ -14,18 +14,52 @@
 """Implementation of graphs for trending data.
 """
 
+import json
 import logging
 import plotly.graph_objects as go
 import pandas as pd
 
 from ..utils.constants import Constants as C
 from ..utils.utils import get_color, get_hdrh_latencies
-from ..utils.anomalies import classify_anomalies
+from ..utils.anomalies import classify_anomalies, get_precomputed_anomalies
+from ..utils.cache import get_cache, LRUCache
+from ..utils.data_index import select_tests
+
+
+# Process-wide caches of selected data and generated graphs.
+DATA_CACHE = get_cache("trending-data", C.CACHE_SIZE_DATA)
+GRAPH_CACHE = get_cache("trending-graphs", C.CACHE_SIZE_GRAPHS)
 
 
 def select_trending_data(data: pd.DataFrame, itm: dict) -> pd.DataFrame:
     """Select the data for graphs from the provided data frame.
 
+    The selected data is cached, a shallow copy of the cached data frame is
+    returned, so the caller can add or replace columns but must not modify
+    the values in place.
+
+    :param data: Data frame with data for graphs.
+    :param itm: Item (in this case job name) which data will be selected from
+        the input data frame.
+    :type data: pandas.DataFrame
+    :type itm: dict
+    :returns: A data frame with selected data.
+    :rtype: pandas.DataFrame
+    """
+
+    key = LRUCache.make_key(id(data), itm)
+    df = DATA_CACHE.get(key)
+    if df is None:
+        df = _select_trending_data(data, itm)
+        if df is None:
+            return None
+        DATA_CACHE.put(key, df, int(df.memory_usage(deep=True).sum()))
+    return df.copy(deep=False)
+
+
+def _select_trending_data(data: pd.DataFrame, itm: dict) -> pd.DataFrame:
+    """Select the data for graphs from the provided data frame, no caching.
+
     :param data: Data frame with data for graphs.
     :param itm: Item (in this case job name) which data will be selected from
         the input data frame.
@@ -52,16 +86,16 @@ def select_trending_data(data: pd.DataFrame, itm: dict) -> pd.DataFrame:
         test_type = "mrr"
     elif itm["area"] == "hoststack":
         test_type = "hoststack"
-    df = data.loc[(
-        (data["test_type"] == test_type) &
-        (data["passed"] == True)
-    )]
-    df = df[df.job.str.endswith(f"{topo}-{arch}")]
     core = str() if itm["dut"] == "trex" else f"{itm['core']}"
     ttype = "ndrpdr" if itm["testtype"] in ("ndr", "pdr") else itm["testtype"]
-    df = df[df.test_id.str.contains(
+    df = select_tests(
+        data,
         f"^.*[.|-]{nic}.*{itm['framesize']}-{core}-{drv}{itm['test']}-{ttype}$",
-        regex=True
+        job_suffix=f"{topo}-{arch}"
+    )
+    df = df.loc[(
+        (df["test_type"] == test_type) &
+        (df["passed"] == True)
     )].sort_values(by="start_time", ignore_index=True)
 
     return df
@@ -85,13 +119,48 @@ def graph_trending(
     :type sel: dict
     :type layout: dict
     :type normalize: bool
-    :returns: Trending graph(s)
-    :rtype: tuple(plotly.graph_objects.Figure, plotly.graph_objects.Figure)
+    :returns: Trending graph(s) as dictionaries (plotly figures converted to
+        JSON and loaded), the graphs are cached.
+    :rtype: tuple(dict, dict, dict)
     """
 
     if not sel:
         return None, None
 
+    key = LRUCache.make_key(id(data), sel, normalize)
+    graphs = GRAPH_CACHE.get(key)
+    if graphs is None:
+        graphs = "[" + ", ".join(
+            fig.to_json() if fig else "null"
+            for fig in _graph_trending(data, sel, layout, normalize)
+        ) + "]"
+        GRAPH_CACHE.put(key, graphs, len(graphs))
+    return tuple(json.loads(graphs))
+
+
+def _graph_trending(
+        data: pd.DataFrame,
+        sel: dict,
+        layout: dict,
+        normalize: bool
+    ) -> tuple:
+    """Generate the trending graph(s), no caching. See graph_trending for
+    details.
+
+    :param data: Data frame with test results.
+    :param sel: Selected tests.
+    :param layout: Layout of plot.ly graph.
+    :param normalize: If True, the data is normalized to CPU frquency
+        Constants.NORM_FREQUENCY.
+    :type data: pandas.DataFrame
+    :type sel: dict
+    :type layout: dict
+    :type normalize: bool
+    :returns: Trending graph(s)
+    :rtype: tuple(plotly.graph_objects.Figure, plotly.graph_objects.Figure,
+        plotly.graph_objects.Figure)
+    """
+
 
     def _generate_trending_traces(
             ttype: str,
@@ -128,13 +197,24 @@ def graph_trending(
             y_data = [(v * norm_factor) for v in df[C.VALUE[ttype]].tolist()]
         units = df[C.UNIT[ttype]].unique().tolist()
 
-        try:
-            anomalies, trend_avg, trend_stdev = classify_anomalies(
-                {k: v for k, v in zip(x_axis, y_data)}
-            )
-        except ValueError as err:
-            logging.error(err)
-            return list(), list()
+        precomputed = get_precomputed_anomalies(df, C.VALUE[ttype])
+        if precomputed:
+            # Classification does not depend on the scale of the data.
+            anomalies, trend_avg, trend_stdev = precomputed
+            if ttype == "latency":
+                trend_avg = [(v / norm_factor) for v in trend_avg]
+                trend_stdev = [(v / norm_factor) for v in trend_stdev]
+            else:
+                trend_avg = [(v * norm_factor) for v in trend_avg]
+                trend_stdev = [(v * norm_factor) for v in trend_stdev]
+        else:
+            try:
+                anomalies, trend_avg, trend_stdev = classify_anomalies(
+                    {k: v for k, v in zip(x_axis, y_data)}
+                )
+            except ValueError as err:
+                logging.error(err)
+                return list(), list()
 
         hover = list()
         customdata = list()
@@ -74,7 +74,7 @@ class Layout:
 
     def __init__(self,
             app: Flask,
-            data_trending: pd.DataFrame,
+            data: dict,
             html_layout_file: str,
             graph_layout_file: str,
             tooltip_file: str
@@ -87,7 +87,8 @@ class Layout:
         - read tooltips from the tooltip file.
 
         :param app: Flask application running the dash application.
-        :param data_trending: Pandas dataframe with trending data.
+        :param data: All data, the trending data is taken from it on each use
+            as it can be replaced by the background refresh.
         :param html_layout_file: Path and name of the file specifying the HTML
             layout of the dash application.
         :param graph_layout_file: Path and name of the file with layout of
@@ -95,7 +96,7 @@ class Layout:
         :param tooltip_file: Path and name of the yaml file specifying the
             tooltips.
         :type app: Flask
-        :type data_trending: pandas.DataFrame
+        :type data: dict(str: pandas.DataFrame)
         :type html_layout_file: str
         :type graph_layout_file: str
         :type tooltip_file: str
@@ -103,7 +104,7 @@ class Layout:
 
         # Inputs
         self._app = app
-        self._data = data_trending
+        self._all_data = data
         self._html_layout_file = html_layout_file
         self._graph_layout_file = graph_layout_file
         self._tooltip_file = tooltip_file
@@ -216,6 +217,15 @@ class Layout:
         if self._app is not None and hasattr(self, "callbacks"):
             self.callbacks(self._app)
 
+    @property
+    def _data(self) -> pd.DataFrame:
+        """The current trending data.
+
+        :returns: Trending data.
+        :rtype: pandas.DataFrame
+        """
+        return self._all_data["trending"]
+
     @property
     def html_layout(self):
         return self._html_layout
@@ -14,7 +14,6 @@
 """Instantiate the Trending Dash application.
 """
 import dash
-import pandas as pd
 
 from ..utils.constants import Constants as C
 from .layout import Layout
@@ -22,12 +21,15 @@ from .layout import Layout
 
 def init_trending(
         server,
-        data_trending: pd.DataFrame
+        data: dict
     ) -> dash.Dash:
     """Create a Plotly Dash dashboard.
 
     :param server: Flask server.
+    :param data: All data, the trending data is taken from it on each use as
+        it can be replaced by the background refresh.
     :type server: Flask
+    :type data: dict(str: pandas.DataFrame)
     :returns: Dash app server.
     :rtype: Dash
     """
@@ -41,7 +43,7 @@ def init_trending(
 
     layout = Layout(
         app=dash_app,
-        data_trending=data_trending,
+        data=data,
         html_layout_file=C.HTML_LAYOUT_FILE,
         graph_layout_file=C.TREND_GRAPH_LAYOUT_FILE,
         tooltip_file=C.TOOLTIP_FILE
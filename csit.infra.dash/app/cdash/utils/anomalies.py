@@ -67,3 +67,38 @@ def classify_anomalies(data):
         stdevs.append(stdv)
         values_left -= 1
     return classification, avgs, stdevs
+
+
+def get_precomputed_anomalies(data, value_column):
+    """Return anomalies and trending values precomputed by the ETL.
+
+    The trending_anomalies ETL post-processing writes the results of
+    classification to its own data set, the columns are merged to the trending
+    data when it is read, so jumpavg does not need to run on each graph
+    render. The precomputed values are usable only if the data
+    is one series (one test), all samples are already classified and the
+    series classified by the ETL has the same samples (e.g. it did not start
+    earlier because the ETL ran at a different time than the data was read).
+
+    :param data: Data of one trace, ordered by time, without missing values.
+    :param value_column: Name of the column with classified values.
+    :type data: pandas.DataFrame
+    :type value_column: str
+    :returns: Classification and trend values, or None if not available.
+    :rtype: 3-tuple, list of strings, list of floats and list of floats
+    """
+    columns = [
+        f"{value_column}_anomaly",
+        f"{value_column}_trend_avg",
+        f"{value_column}_trend_stdev"
+    ]
+    size = f"{value_column}_trend_size"
+    if any(column not in data.columns for column in columns + [size, ]):
+        return None
+    if data["test_id"].nunique() != 1:
+        return None
+    if data[columns].isna().values.any():
+        return None
+    if not data[size].eq(len(data)).all():
+        return None
+    return tuple(data[column].tolist() for column in columns)
@@ -0,0 +1,182 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide caches for results of expensive computations, e.g. selected
+data and generated graphs.
+
+The caches are shared by all threads (and so all users) of the process. All
+cached items are invalidated when the data is (re)read, see
+invalidate_caches().
+"""
+
+import json
+import logging
+
+from collections import OrderedDict
+from threading import Lock
+
+
+# Version of the data the cached items were computed from. Incremented each
+# time the data is (re)read.
+_DATA_VERSION = 0
+
+# All caches created in this process, indexed by name.
+_CACHES = dict()
+
+# Guards the data version and the set of caches, both are changed by the
+# threads refreshing the data and by the threads serving the users.
+_LOCK = Lock()
+
+
+class LRUCache:
+    """Cache bounded by the total size of stored items. When full, the least
+    recently used items are removed.
+
+    The items are immutable for the cache users, if a user needs to modify an
+    item, it must make a copy.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialisation.
+
+        :param max_size: Maximal total size of stored items in bytes.
+        :type max_size: int
+        """
+        self._max_size = max_size
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(*args) -> str:
+        """Make a key from the arguments and the current data version.
+
+        :param args: JSON serializable arguments identifying the item.
+        :type args: tuple
+        :returns: The key.
+        :rtype: str
+        """
+        return json.dumps([_DATA_VERSION, args], sort_keys=True, default=str)
+
+    def get(self, key: str):
+        """Get the item from the cache.
+
+        :param key: The key of the item.
+        :type key: str
+        :returns: The item or None if it is not in the cache.
+        :rtype: any
+        """
+        with self._lock:
+            try:
+                value, _ = self._items[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._items.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value, size: int) -> None:
+        """Put the item to the cache. Items bigger than the cache are not
+        stored.
+
+        :param key: The key of the item.
+        :param value: The item to store.
+        :param size: The size of the item in bytes.
+        :type key: str
+        :type value: any
+        :type size: int
+        """
+        if size > self._max_size:
+            return
+        with self._lock:
+            if key in self._items:
+                self._size -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self._size += size
+            while self._size > self._max_size:
+                _, (_, old_size) = self._items.popitem(last=False)
+                self._size -= old_size
+
+    def clear(self) -> None:
+        """Remove all items from the cache. The counters are kept.
+        """
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    @property
+    def stats(self) -> dict:
+        """Statistics of the cache: number of items, size, maximal size, hits
+        and misses.
+
+        :returns: Statistics of the cache.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "size": self._size,
+                "max-size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+
+def get_cache(name: str, max_size: int) -> LRUCache:
+    """Get the cache with the given name, create it if it does not exist.
+
+    :param name: The name of the cache.
+    :param max_size: Maximal total size of stored items in bytes, used only
+        if the cache is created.
+    :type name: str
+    :type max_size: int
+    :returns: The cache.
+    :rtype: LRUCache
+    """
+    with _LOCK:
+        if name not in _CACHES:
+            _CACHES[name] = LRUCache(max_size)
+        return _CACHES[name]
+
+
+def invalidate_caches() -> None:
+    """Invalidate all cached items. To be called when the data is (re)read.
+
+    The data version is incremented first, so items computed from the old
+    data and stored after the caches are cleared are never used.
+    """
+    global _DATA_VERSION
+    with _LOCK:
+        _DATA_VERSION += 1
+        version = _DATA_VERSION
+        caches = list(_CACHES.values())
+    for cache in caches:
+        cache.clear()
+    logging.info(f"Caches invalidated, data version: {version}")
+
+
+def get_cache_stats() -> dict:
+    """Get statistics of all caches.
+
+    :returns: Statistics of all caches, indexed by name.
+    :rtype: dict
+    """
+    with _LOCK:
+        caches = list(_CACHES.items())
+    stats = {name: cache.stats for name, cache in caches}
+    for name, cache_stats in stats.items():
+        logging.debug(f"Cache {name}: {cache_stats}")
+    return stats
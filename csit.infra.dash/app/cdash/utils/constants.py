@@ -81,6 +81,33 @@ class Constants:
     # TIME_PERIOD = MAX_TIME_PERIOD - is the default value
     TIME_PERIOD = MAX_TIME_PERIOD  # [days]
 
+    # Directory with local cache of parquet files read from S3. The files are
+    # downloaded only if they are not cached or they were changed.
+    # None - no cache.
+    DATA_CACHE_DIR = None
+
+    # Maximal size of the local cache of parquet files.
+    DATA_CACHE_MAX_SIZE = 20 * 1024 * 1024 * 1024  # [B]
+
+    # Directory with data shared by all processes (e.g. uWSGI workers) on the
+    # host. The data is read once and written to Arrow IPC files which are
+    # memory-mapped by all processes. None - each process reads its own data.
+    DATA_SHARED_DIR = None
+
+    # The shared data older than this is read again when a process starts.
+    DATA_SHARED_MAX_AGE = 3600  # [s]
+
+    # Time between two refreshes of trending and statistics data in seconds.
+    # Only new and changed partitions are read. With DATA_SHARED_DIR, only one
+    # process reads them and rewrites the shared data, the other processes
+    # memory-map it again. None or 0 - no refresh.
+    DATA_REFRESH_INTERVAL = 0  # [s]
+
+    # Maximal size of process-wide caches of selected data and generated
+    # graphs. All items are removed when the data is (re)read.
+    CACHE_SIZE_DATA = 256 * 1024 * 1024  # [B]
+    CACHE_SIZE_GRAPHS = 64 * 1024 * 1024  # [B]
+
     ############################################################################
     # General, application wide, layout affecting constants.
 
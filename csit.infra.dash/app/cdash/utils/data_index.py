@@ -0,0 +1,152 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Index of data frame rows by test ID and job.
+
+Selecting tests by applying regular expressions to the test_id column of the
+whole data frame means string operations on each row. As there are much less
+unique test IDs and jobs than rows, the rows are grouped by test ID and job
+when the data is loaded, the regular expressions are applied only to the
+unique test IDs and the rows are then selected by their positions.
+"""
+
+import re
+import weakref
+import numpy as np
+import pandas as pd
+
+from functools import lru_cache
+
+
+# Indexes of data frames, indexed by id of the data frame.
+_INDEXES = dict()
+
+
+class DataIndex:
+    """Positions of rows in the data frame by test ID and job.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        """Initialisation: Group the rows by test ID and job.
+
+        :param data: Data frame to index. It must have columns "test_id" and
+            "job".
+        :type data: pandas.DataFrame
+        """
+        self._rows = dict()
+        groups = data.groupby(
+            ["test_id", "job"],
+            sort=False,
+            observed=True
+        ).indices
+        for (test_id, job), positions in groups.items():
+            self._rows.setdefault(test_id, dict())[job] = positions
+        self._test_ids = tuple(self._rows.keys())
+        self.match_tests = lru_cache(maxsize=1024)(self._match_tests)
+
+    def _match_tests(self, regex: str, exclude: tuple=tuple()) -> tuple:
+        """Get unique test IDs matching the regular expression.
+
+        :param regex: Regular expression to search for in test IDs.
+        :param exclude: Test IDs containing any of these strings are excluded.
+        :type regex: str
+        :type exclude: tuple
+        :returns: Matching test IDs.
+        :rtype: tuple
+        """
+        search = re.compile(regex).search
+        return tuple(
+            test_id for test_id in self._test_ids
+            if search(test_id) and not any(s in test_id for s in exclude)
+        )
+
+    def positions(
+            self,
+            regex: str,
+            job_suffix: str=str(),
+            exclude: tuple=tuple()
+        ) -> np.ndarray:
+        """Get positions of rows with the test ID matching the regular
+        expression and the job ending with the suffix.
+
+        :param regex: Regular expression to search for in test IDs.
+        :param job_suffix: The suffix of job names.
+        :param exclude: Test IDs containing any of these strings are excluded.
+        :type regex: str
+        :type job_suffix: str
+        :type exclude: tuple
+        :returns: Sorted positions of selected rows.
+        :rtype: numpy.ndarray
+        """
+        l_pos = list()
+        for test_id in self.match_tests(regex, tuple(exclude)):
+            for job, positions in self._rows[test_id].items():
+                if job.endswith(job_suffix):
+                    l_pos.append(positions)
+        if not l_pos:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(l_pos))
+
+
+def get_data_index(data: pd.DataFrame) -> DataIndex:
+    """Get the index of the data frame, create it if it does not exist.
+
+    :param data: Data frame with columns "test_id" and "job".
+    :type data: pandas.DataFrame
+    :returns: Index of the data frame.
+    :rtype: DataIndex
+    """
+    try:
+        ref, index = _INDEXES[id(data)]
+        if ref() is data:
+            return index
+    except KeyError:
+        pass
+    index = DataIndex(data)
+    # Remove the index together with the data frame.
+    key = id(data)
+    _INDEXES[key] = (
+        weakref.ref(data, lambda _: _INDEXES.pop(key, None)),
+        index
+    )
+    return index
+
+
+def select_tests(
+        data: pd.DataFrame,
+        regex: str,
+        job_suffix: str=str(),
+        exclude: tuple=tuple()
+    ) -> pd.DataFrame:
+    """Select rows of the data frame with the test ID matching the regular
+    expression and the job ending with the suffix.
+
+    It is equivalent to
+    data[data.job.str.endswith(job_suffix) &
+        data.test_id.str.contains(regex, regex=True)]
+    with rows with test IDs containing strings from exclude dropped, but it
+    uses the index of the data frame.
+
+    :param data: Data frame with columns "test_id" and "job".
+    :param regex: Regular expression to search for in test IDs.
+    :param job_suffix: The suffix of job names.
+    :param exclude: Test IDs containing any of these strings are excluded.
+    :type data: pandas.DataFrame
+    :type regex: str
+    :type job_suffix: str
+    :type exclude: tuple
+    :returns: Selected rows.
+    :rtype: pandas.DataFrame
+    """
+    positions = get_data_index(data).positions(regex, job_suffix, exclude)
+    return data.iloc[positions]
@@ -0,0 +1,202 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of reading a parquet data set through cold and warm cache.
+
+A local fixture data set with partitions by date is generated and read through
+ParquetCache (cdash/data/parquet_cache.py) the way Data does it: the files are
+got from the cache, then read from the cache directory by the pyarrow dataset
+scanner. Scenarios:
+- cold: the cache is empty, all files are downloaded,
+- warm: all files are in the cache,
+- warm, 1 changed: one file has a new ETag, only it is downloaded again.
+
+The source is a local directory, so the link to S3 is modelled: each download
+takes --latency seconds plus the file size divided by --bandwidth.
+
+Run:
+
+    python3 parquet_cache.py --files 20 --rows 100000
+"""
+
+import os
+import argparse
+import importlib.util
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from time import monotonic, sleep
+
+
+def load_parquet_cache(latency, bandwidth):
+    """Load ParquetCache class from the dashboard sources, with downloads
+    taking as long as from S3.
+
+    The module is loaded from its file, importing cdash package would start
+    the application.
+
+    :param latency: Modelled latency of one download in seconds.
+    :param bandwidth: Modelled bandwidth of the link in bytes per second.
+    :type latency: float
+    :type bandwidth: float
+    :returns: ParquetCache class.
+    :rtype: type
+    """
+    spec = importlib.util.spec_from_file_location(
+        "parquet_cache",
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "..", "app", "cdash", "data", "parquet_cache.py"
+        )
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # pylint: disable=protected-access
+    download = module.ParquetCache._download
+
+    def _modelled_download(self, file_path, local_path):
+        """Download the file, waiting as long as S3 would take."""
+        sleep(latency + os.path.getsize(file_path) / bandwidth)
+        download(self, file_path, local_path)
+
+    module.ParquetCache._download = _modelled_download
+    return module.ParquetCache
+
+
+def write_fixture(path, files, rows):
+    """Write the fixture data set to the directory.
+
+    :param path: Directory to write the data set to.
+    :param files: Number of files (date partitions).
+    :param rows: Number of rows in one file.
+    :type path: str
+    :type files: int
+    :type rows: int
+    :returns: Paths to the files with their ETags.
+    :rtype: dict(str: str)
+    """
+    rng = np.random.default_rng(0)
+    etags = dict()
+    for day in range(files):
+        directory = os.path.join(
+            path, "test_type=mrr", "year=2023", "month=1", f"day={day + 1}"
+        )
+        os.makedirs(directory)
+        data = pd.DataFrame({
+            "build": str(day),
+            "test_id": [
+                f"tests.vpp.perf.suite.test-{idx}-mrr" for idx in range(rows)
+            ],
+            "result_receive_rate_rate_avg": rng.uniform(1e6, 1e7, rows),
+            "result_receive_rate_rate_values": list(
+                rng.uniform(1e6, 1e7, (rows, 10))
+            )
+        })
+        file_path = os.path.join(directory, "data.parquet")
+        pq.write_table(
+            pa.Table.from_pandas(data, preserve_index=False), file_path
+        )
+        etags[file_path] = f"etag-{day}"
+    return etags
+
+
+def read(cache, path, etags):
+    """Get the files from the cache and read them.
+
+    :param cache: The cache.
+    :param path: Directory with the data set.
+    :param etags: Paths to the files with their ETags.
+    :type cache: ParquetCache
+    :type path: str
+    :type etags: dict(str: str)
+    :returns: Number of rows read.
+    :rtype: int
+    """
+    root = cache.get_root(path)
+    dataset = ds.dataset(
+        cache.get_files(path, etags),
+        format="parquet",
+        partitioning="hive",
+        partition_base_dir=root
+    )
+    return dataset.to_table().num_rows
+
+
+def run(files, rows, latency, bandwidth):
+    """Write the fixture, read it in all scenarios and print the results.
+
+    :param files: Number of files (date partitions).
+    :param rows: Number of rows in one file.
+    :param latency: Modelled latency of one download in seconds.
+    :param bandwidth: Modelled bandwidth of the link in bytes per second.
+    :type files: int
+    :type rows: int
+    :type latency: float
+    :type bandwidth: float
+    """
+    parquet_cache = load_parquet_cache(latency, bandwidth)
+    with tempfile.TemporaryDirectory() as path:
+        source = os.path.join(path, "source")
+        etags = write_fixture(source, files, rows)
+        size = sum(os.path.getsize(file_path) for file_path in etags)
+        print(f"{files} files, {size / 2 ** 20:.1f} MiB")
+        cache = parquet_cache(os.path.join(path, "cache"), max_size=2 * size)
+        changed = dict(etags)
+        changed[next(iter(changed))] = "etag-changed"
+        print("scenario          time[s]  hits  misses")
+        for name, scenario in (
+                ("cold", etags),
+                ("warm", etags),
+                ("warm, 1 changed", changed)
+            ):
+            before = cache.stats
+            start = monotonic()
+            read(cache, source, scenario)
+            duration = monotonic() - start
+            after = cache.stats
+            hits = after["hits"] - before["hits"]
+            misses = after["misses"] - before["misses"]
+            print(f"{name:16s} {duration:8.3f} {hits:5d} {misses:7d}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument(
+        "--files", type=int, default=20,
+        help="Number of files (date partitions)."
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000,
+        help="Number of rows in one file."
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05,
+        help="Modelled latency of one download in seconds."
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=50e6,
+        help="Modelled bandwidth of the link in bytes per second."
+    )
+    args = parser.parse_args()
+    run(args.files, args.rows, args.latency, args.bandwidth)
+
+
+if __name__ == "__main__":
+    main()
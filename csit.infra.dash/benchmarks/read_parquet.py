@@ -0,0 +1,174 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of reading a parquet data set with and without pushdown.
+
+A local trending-like fixture is generated: partitions by test type and date,
+rows of failed tests clustered in row groups (as failed tests are written by
+the same job), a list-valued column. The data set is then read:
+- before: the columns from data.yaml are read from all files and the rows are
+  filtered in pandas (the way awswrangler read path did),
+- after: the columns are projected and the filter is pushed down to the
+  pyarrow dataset scanner (the way Data._read_files does), so the row groups
+  excluded by their statistics are not decoded.
+
+The time, the size of the Arrow table produced by the scan and the memory
+used by the pandas DataFrame converted from it (before the pandas filter, if
+any) are printed.
+
+Run:
+
+    python3 read_parquet.py --partitions 20 --rows 100000
+"""
+
+import os
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from time import monotonic
+
+
+COLUMNS = ["job", "build", "test_id", "passed", "result_receive_rate_rate_avg"]
+FILTERS = [["passed", "==", True], ]
+
+
+def write_fixture(path, partitions, rows, failed=0.3, row_group=10000):
+    """Write the fixture data set to the directory.
+
+    :param path: Directory to write the data set to.
+    :param partitions: Number of date partitions.
+    :param rows: Number of rows in one partition.
+    :param failed: Ratio of failed tests.
+    :param row_group: Number of rows in one row group.
+    :type path: str
+    :type partitions: int
+    :type rows: int
+    :type failed: float
+    :type row_group: int
+    """
+    rng = np.random.default_rng(0)
+    for day in range(partitions):
+        directory = os.path.join(
+            path, "test_type=mrr", "year=2023", "month=1", f"day={day + 1}"
+        )
+        os.makedirs(directory)
+        passed = np.ones(rows, dtype=bool)
+        passed[:int(rows * failed)] = False
+        data = pd.DataFrame({
+            "job": "csit-vpp-perf-mrr-daily-master-2n-icx",
+            "build": str(day),
+            "test_id": [
+                f"tests.vpp.perf.suite.test-{idx}-mrr" for idx in range(rows)
+            ],
+            "passed": passed,
+            "result_receive_rate_rate_avg": rng.uniform(1e6, 1e7, rows),
+            "result_receive_rate_rate_values": list(
+                rng.uniform(1e6, 1e7, (rows, 10))
+            ),
+            "telemetry": [["metric{a=b} 1 2", ] * 5] * rows
+        })
+        pq.write_table(
+            pa.Table.from_pandas(data, preserve_index=False),
+            os.path.join(directory, "data.parquet"),
+            row_group_size=row_group
+        )
+
+
+def read_before(path):
+    """Read the columns from all files and filter the rows in pandas.
+
+    :param path: Directory with the data set.
+    :type path: str
+    :returns: Number of rows read, the size of Arrow table and the memory
+        used by the DataFrame converted from it.
+    :rtype: tuple(int, int, int)
+    """
+    table = ds.dataset(path, format="parquet", partitioning="hive").to_table(
+        columns=COLUMNS
+    )
+    data = table.to_pandas(types_mapper=pd.ArrowDtype)
+    memory = int(data.memory_usage(deep=True).sum())
+    data = data.loc[data["passed"].eq(True)]
+    return len(data), table.nbytes, memory
+
+
+def read_after(path):
+    """Read the data set with the columns and the filter pushed down.
+
+    :param path: Directory with the data set.
+    :type path: str
+    :returns: Number of rows read, the size of Arrow table and the memory
+        used by the DataFrame converted from it.
+    :rtype: tuple(int, int, int)
+    """
+    table = ds.dataset(path, format="parquet", partitioning="hive").to_table(
+        columns=COLUMNS,
+        filter=pq.filters_to_expression(FILTERS)
+    )
+    data = table.to_pandas(types_mapper=pd.ArrowDtype)
+    return len(data), table.nbytes, int(data.memory_usage(deep=True).sum())
+
+
+def run(partitions, rows, repeat):
+    """Write the fixture, read it both ways and print the results.
+
+    :param partitions: Number of date partitions.
+    :param rows: Number of rows in one partition.
+    :param repeat: Number of reads, the best time is printed.
+    :type partitions: int
+    :type rows: int
+    :type repeat: int
+    """
+    with tempfile.TemporaryDirectory() as path:
+        write_fixture(path, partitions, rows)
+        print("method  time[s]    rows  arrow[MiB]  pandas[MiB]")
+        for name, function in (("before", read_before), ("after", read_after)):
+            durations = list()
+            for _ in range(repeat):
+                start = monotonic()
+                n_rows, n_arrow, n_pandas = function(path)
+                durations.append(monotonic() - start)
+            print(
+                f"{name:6s} {min(durations):8.3f} {n_rows:7d}"
+                f" {n_arrow / 2 ** 20:11.1f} {n_pandas / 2 ** 20:12.1f}"
+            )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument(
+        "--partitions", type=int, default=20,
+        help="Number of date partitions."
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000,
+        help="Number of rows in one partition."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Number of reads, the best time is printed."
+    )
+    args = parser.parse_args()
+    run(args.partitions, args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Post-processing script running on top of the trending parquets in s3://
+
+It must run after the trending_* ETL jobs. For each test series (the same
+test on the same testbed, as selected in the trending dash application),
+jumpavg is run once and the trend values and anomalies are written to their
+own data set, so the dash application does not need to run jumpavg on each
+graph render.
+
+The trending parquets are only read, never rewritten, so their ETags (used by
+the dash application to refresh and cache the data) change only when the
+trending_* jobs write new data, and the jobs writing the same partitions do
+not overwrite each other's columns.
+
+The trending files are selected by their last modified time, the same way
+the dash application selects them, so a series here is the same as the one
+the application would classify.
+
+The output rows are keyed by job, build and test_id (the same as the rows of
+trending data), with start_time kept for reference. For each value column,
+four columns are added:
+<value column>_trend_avg, <value column>_trend_stdev,
+<value column>_anomaly and <value column>_trend_size.
+The last one is the number of samples in the series, the dash application
+uses the precomputed values only if its series has the same samples.
+The output is partitioned by test_type only, each run replaces the whole
+partition, as adding new values can change the classification of older ones.
+
+The jumpavg package is imported from resources/libraries/python of this
+repository (see PYTHONPATH in the nomad job), so the classification is done
+by the same code as in the dash application.
+"""
+
+import logging
+
+from datetime import datetime, timedelta
+from functools import partial
+from os import environ
+
+import awswrangler as wr
+import pandas as pd
+from awswrangler.exceptions import EmptyDataFrame, NoFilesFound
+from boto3 import session
+from pytz import utc
+
+from jumpavg import classify
+
+
+S3_DOCS_BUCKET="fdio-docs-s3-cloudfront-index"
+PATH=f"s3://{S3_DOCS_BUCKET}/csit/parquet/trending"
+OUT_PATH=f"s3://{S3_DOCS_BUCKET}/csit/parquet/trending_anomalies"
+# Keep in sync with MAX_TIME_PERIOD in csit.infra.dash constants.
+TIME_PERIOD=180
+# Files are selected by their last modified time, as in Data._select_files
+# in csit.infra.dash.
+LAST_MODIFIED_BEGIN=datetime.now(tz=utc) - timedelta(days=TIME_PERIOD)
+# Value columns to be classified, per test type.
+VALUE_COLUMNS={
+    "mrr": [
+        "result_receive_rate_rate_avg",
+        "result_receive_rate_bandwidth_avg"
+    ],
+    "ndrpdr": [
+        "result_ndr_lower_rate_value",
+        "result_pdr_lower_rate_value",
+        "result_ndr_lower_bandwidth_value",
+        "result_pdr_lower_bandwidth_value",
+        "result_latency_forward_pdr_50_avg"
+    ],
+    "hoststack": [
+        "result_rate_value",
+        "result_bandwidth_value",
+        "result_latency_value"
+    ]
+}
+# Columns identifying the rows of trending data, and the ones needed to form
+# the series.
+KEY_COLUMNS=["job", "build", "test_id"]
+SERIES_COLUMNS=KEY_COLUMNS + ["start_time", "passed"]
+
+
+def partition_filter(part, test_type):
+    """Decide whether to read the partition.
+
+    :param part: Partition names and values.
+    :param test_type: Test type to read.
+    :type part: dict
+    :type test_type: str
+    :returns: True if the partition is of the test type.
+    :rtype: bool
+    """
+    return part["test_type"] == test_type
+
+
+def classify_series(values):
+    """Classify the series of values using jumpavg.
+
+    This is the same computation as classify_anomalies in csit.infra.dash,
+    but applied to a series without missing values.
+
+    :param values: Values to classify, ordered by time.
+    :type values: list
+    :returns: Classification, trend averages and trend stdevs.
+    :rtype: 3-tuple, list of strings, list of floats and list of floats
+    """
+    anomalies = list()
+    avgs = list()
+    stdevs = list()
+    for group in classify(values):
+        anomalies.append(group.comment)
+        anomalies.extend(["normal"] * (len(group.run_list) - 1))
+        avgs.extend([group.stats.avg] * len(group.run_list))
+        stdevs.extend([group.stats.stdev] * len(group.run_list))
+    return anomalies, avgs, stdevs
+
+
+def compute_trend_columns(data, value_columns):
+    """Compute trend and anomaly columns for the trending data frame.
+
+    A series consists of passed tests with the same test_id run by jobs on the
+    same testbed (the last two parts of the job name, topology and
+    architecture), ordered by start time. Rows not belonging to any series
+    (failed tests, missing values) are not in the output.
+
+    :param data: Trending data of one test type.
+    :param value_columns: Names of columns with values to classify.
+    :type data: pandas.DataFrame
+    :type value_columns: list
+    :returns: Key columns, start_time and the computed columns.
+    :rtype: pandas.DataFrame
+    """
+    data = data.sort_values(by="start_time", ignore_index=True)
+    testbed = data["job"].str.split("-").str[-2:].str.join("-")
+    passed = data["passed"].eq(True)
+    out = data[KEY_COLUMNS + ["start_time"]].copy()
+    for column in value_columns:
+        trend_avg = pd.Series(float("nan"), index=data.index)
+        trend_stdev = pd.Series(float("nan"), index=data.index)
+        anomaly = pd.Series(None, index=data.index, dtype="object")
+        trend_size = pd.Series(pd.NA, index=data.index, dtype="Int64")
+        if column in data.columns:
+            valid = passed & data[column].notna()
+            groups = data.loc[valid].groupby(
+                [testbed[valid], data.loc[valid, "test_id"]],
+                sort=False
+            )
+            for _, series in groups:
+                try:
+                    anomalies, avgs, stdevs = classify_series(
+                        series[column].tolist()
+                    )
+                except ValueError as err:
+                    logging.error(f"{column}: {err}")
+                    continue
+                anomaly.loc[series.index] = anomalies
+                trend_avg.loc[series.index] = avgs
+                trend_stdev.loc[series.index] = stdevs
+                trend_size.loc[series.index] = len(series)
+        out[f"{column}_trend_avg"] = trend_avg
+        out[f"{column}_trend_stdev"] = trend_stdev
+        out[f"{column}_anomaly"] = anomaly
+        out[f"{column}_trend_size"] = trend_size
+    classified = [c for c in out.columns if c.endswith("_anomaly")]
+    return out.loc[out[classified].notna().any(axis=1)]
+
+
+logging.basicConfig(level=logging.INFO)
+
+
+boto3_session = session.Session(
+    aws_access_key_id=environ["OUT_AWS_ACCESS_KEY_ID"],
+    aws_secret_access_key=environ["OUT_AWS_SECRET_ACCESS_KEY"],
+    region_name=environ["OUT_AWS_DEFAULT_REGION"]
+)
+
+for t_type, columns in VALUE_COLUMNS.items():
+    try:
+        in_df = wr.s3.read_parquet(
+            path=PATH,
+            path_suffix="parquet",
+            ignore_empty=True,
+            use_threads=True,
+            dataset=True,
+            columns=SERIES_COLUMNS + columns,
+            partition_filter=partial(partition_filter, test_type=t_type),
+            last_modified_begin=LAST_MODIFIED_BEGIN,
+            boto3_session=boto3_session
+        )
+    except (NoFilesFound, EmptyDataFrame) as err:
+        logging.error(f"No trending data for {t_type}: {err!r}")
+        continue
+
+    out_df = compute_trend_columns(in_df, columns)
+    out_df["test_type"] = t_type
+    out_df.info(verbose=True, memory_usage="deep")
+
+    try:
+        wr.s3.to_parquet(
+            df=out_df,
+            path=OUT_PATH,
+            dataset=True,
+            partition_cols=["test_type"],
+            compression="snappy",
+            use_threads=True,
+            mode="overwrite_partitions",
+            boto3_session=boto3_session
+        )
+    except EmptyDataFrame:
+        pass
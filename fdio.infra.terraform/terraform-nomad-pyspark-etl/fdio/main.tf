@@ -76,6 +76,24 @@ module "etl-trending-ndrpdr" {
   memory                    = 60000
 }
 
+module "etl-trending-anomalies" {
+  providers = {
+    nomad = nomad.yul1
+  }
+  source = "../"
+
+  aws_access_key_id         = data.vault_generic_secret.fdio_logs.data["access_key"]
+  aws_secret_access_key     = data.vault_generic_secret.fdio_logs.data["secret_key"]
+  aws_default_region        = data.vault_generic_secret.fdio_logs.data["region"]
+  out_aws_access_key_id     = data.vault_generic_secret.fdio_docs.data["access_key"]
+  out_aws_secret_access_key = data.vault_generic_secret.fdio_docs.data["secret_key"]
+  out_aws_default_region    = data.vault_generic_secret.fdio_docs.data["region"]
+  cron                      = "0 30 2 * * * *"
+  datacenters               = ["yul1"]
+  job_name                  = "etl-trending-anomalies"
+  memory                    = 60000
+}
+
 module "etl-iterative-hoststack-rls2310" {
   providers = {
     nomad = nomad.yul1
@@ -128,6 +128,17 @@ class Constants:
     # OpenVPP testing directory location at topology nodes
     REMOTE_FW_DIR = "/tmp/openvpp-testing"
 
+    # How to deploy the testing directory to topology nodes.
+    # "tarball" copies the whole packed directory,
+    # "delta" copies only files missing in the cache at the node.
+    FRAMEWORK_DEPLOY_MODE = get_str_from_env(
+        "FRAMEWORK_DEPLOY_MODE", "tarball"
+    )
+
+    # Cache of file contents and unpacked testing directories at topology nodes,
+    # used by the "delta" deploy mode.
+    REMOTE_FW_CACHE_DIR = "/tmp/openvpp-testing-cache"
+
     # shell scripts location
     RESOURCES_LIB_SH = "resources/libraries/bash"
 
@@ -259,6 +270,11 @@ class Constants:
     # Default path to VPP API Stats socket.
     SOCKSTAT_PATH = "/run/vpp/stats.sock"
 
+    # Maximal number of PAPI messages in flight in async handling mode.
+    # When reached, a reply is read before sending the next command.
+    # Zero means no limit.
+    PAPI_ASYNC_WINDOW = get_int_from_env("PAPI_ASYNC_WINDOW", 10000)
+
     # This MTU value is used to force VPP to fragment 1518B packet into two.
     MTU_FOR_FRAGMENTATION = 1043
 
@@ -268,6 +284,14 @@ class Constants:
     # Duration [s] of one trial in MRR test.
     PERF_TRIAL_DURATION = get_float_from_env("PERF_TRIAL_DURATION", 1.0)
 
+    # Kind of sample generator ("pseudo", "sobol" or "halton") PLRsearch
+    # integrator uses to process blocks of samples by array operations.
+    # Empty string means one sample at a time. Sobol and Halton converge
+    # better than pseudo. Trials shorter than 1 s use one sample at a time.
+    PLRSEARCH_SAMPLE_GENERATOR = get_str_from_env(
+        "PLRSEARCH_SAMPLE_GENERATOR", ""
+    )
+
     # Whether to use latency streams in main search trials.
     PERF_USE_LATENCY = get_pessimistic_bool_from_env("PERF_USE_LATENCY")
 
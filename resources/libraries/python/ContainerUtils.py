@@ -17,12 +17,15 @@ from collections import OrderedDict, Counter
 from io import open
 from re import search
 from string import Template
+from threading import Lock
 from time import sleep
 
+from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 
 from resources.libraries.python.Constants import Constants
 from resources.libraries.python.CpuUtils import CpuUtils
+from resources.libraries.python.NodeGroup import run_concurrently
 from resources.libraries.python.PapiExecutor import PapiSocketExecutor
 from resources.libraries.python.ssh import SSH
 from resources.libraries.python.topology import Topology, SocketType
@@ -38,19 +41,34 @@ SUPERVISOR_CONF = u"/etc/supervisor/supervisord.conf"
 
 
 class ContainerManager:
-    """Container lifecycle management class."""
-
-    def __init__(self, engine):
+    """Container lifecycle management class.
+
+    Bulk operations work on up to max_workers containers concurrently,
+    each container is handled by its own engine instance.
+    Only remote commands are run concurrently, PAPI calls
+    and topology updates stay in the calling (Robot main) thread.
+    Robot drops messages logged from other threads, so the output
+    worth logging is returned from the workers and logged afterwards.
+    Acquire is not concurrent, as it works with host-wide state.
+    Errors are aggregated, see run_concurrently in NodeGroup module.
+    """
+
+    def __init__(self, engine, max_workers=8):
         """Initialize Container Manager class.
 
         :param engine: Container technology used (LXC/Docker/...).
+        :param max_workers: Maximal number of containers to work on
+            concurrently in bulk operations. Value 1 means sequentially.
         :type engine: str
+        :type max_workers: int
         :raises NotImplementedError: If container technology is not implemented.
         """
         try:
-            self.engine = globals()[engine]()
+            self.engine_class = globals()[engine]
         except KeyError:
             raise NotImplementedError(f"{engine} is not implemented.")
+        self.engine = self.engine_class()
+        self.max_workers = int(max_workers)
         self.containers = OrderedDict()
 
     def get_container_by_name(self, name):
@@ -104,23 +122,57 @@ class ContainerManager:
             # Create container
             self.construct_container(i=i, **kwargs)
 
+    def engine_for(self, container):
+        """Return a new engine instance working on the container.
+
+        Engine instances are cheap, the container object
+        (with its cached SSH connection) is shared, not copied.
+
+        :param container: Container to work on.
+        :type container: Container
+        :returns: Engine with the container set.
+        :rtype: ContainerEngine
+        """
+        engine = self.engine_class()
+        engine.container = container
+        return engine
+
+    def run_on_all_containers(self, function):
+        """Call function(engine) concurrently for each container.
+
+        :param function: Per-container function taking container's engine.
+        :type function: Callable[[ContainerEngine], object]
+        :returns: Results of the function, in the order of containers.
+        :rtype: list
+        :raises RuntimeError: If the function failed for multiple containers.
+        """
+        calls = [
+            (name, lambda c=container: function(self.engine_for(c)))
+            for name, container in self.containers.items()
+        ]
+        return run_concurrently(calls, max_workers=self.max_workers)
+
     def acquire_all_containers(self):
-        """Acquire all containers."""
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.acquire()
+        """Acquire all containers, one by one.
+
+        Not concurrent, as acquire uses state shared by all containers
+        on the host: the image cache of lxc-create -t download
+        and the cgroup set up by cgcreate and cgset.
+        """
+        for container in self.containers.values():
+            self.engine_for(container).acquire()
 
     def build_all_containers(self):
         """Build all containers."""
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.build()
+        self.run_on_all_containers(lambda engine: engine.build())
 
     def create_all_containers(self):
-        """Create all containers."""
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.create()
+        """Create all containers.
+
+        The engine serializes the part of create which works with the cgroup
+        shared by all containers.
+        """
+        self.run_on_all_containers(lambda engine: engine.create())
 
     def execute_on_container(self, name, command):
         """Execute command on container with name.
@@ -130,8 +182,7 @@ class ContainerManager:
         :type name: str
         :type command: str
         """
-        self.engine.container = self.get_container_by_name(name)
-        self.engine.execute(command)
+        self.engine_for(self.get_container_by_name(name)).execute(command)
 
     def execute_on_all_containers(self, command):
         """Execute command on all containers.
@@ -139,16 +190,14 @@ class ContainerManager:
         :param command: Command to execute.
         :type command: str
         """
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.execute(command)
+        self.run_on_all_containers(lambda engine: engine.execute(command))
 
     def start_vpp_in_all_containers(self, verify=True):
         """Start VPP in all containers."""
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            # For multiple containers, delayed verify is faster.
-            self.engine.start_vpp(verify=False)
+        self.run_on_all_containers(lambda engine: engine.start_vpp_process())
+        for container in self.containers.values():
+            self.engine_for(container).add_vpp_sockets()
+        # For multiple containers, delayed verify is faster.
         if verify:
             self.verify_vpp_in_all_containers()
 
@@ -170,25 +219,28 @@ class ContainerManager:
     def restart_vpp_in_all_containers(self, verify=True):
         """Restart VPP in all containers."""
         self._disconnect_papi_to_all_containers()
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            # For multiple containers, delayed verify is faster.
-            self.engine.restart_vpp(verify=False)
+        self.run_on_all_containers(
+            lambda engine: engine.restart_vpp_process()
+        )
+        for container in self.containers.values():
+            self.engine_for(container).add_vpp_sockets()
+        # For multiple containers, delayed verify is faster.
         if verify:
             self.verify_vpp_in_all_containers()
 
     def verify_vpp_in_all_containers(self):
         """Verify that VPP is installed and running in all containers."""
-        # For multiple containers, multiple fors are faster.
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.verify_vppctl()
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.adjust_privileges()
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.verify_vpp_papi()
+        # Waiting for VPPs to come up overlaps, PAPI is checked afterwards
+        # from this thread, as PAPI connection caches are not thread-safe.
+        def verify_cli(engine):
+            output = engine.verify_vppctl()
+            engine.adjust_privileges()
+            return output
+        outputs = self.run_on_all_containers(verify_cli)
+        for name, output in zip(self.containers, outputs):
+            logger.debug(f"PCI interfaces in container {name}:\n{output}")
+        for container in self.containers.values():
+            self.engine_for(container).verify_vpp_papi()
 
     def configure_vpp_in_all_containers(self, chain_topology, **kwargs):
         """Configure VPP in all containers.
@@ -514,17 +566,13 @@ class ContainerManager:
         """Stop all containers."""
         # TODO: Rework if containers can be affected outside ContainerManager.
         self._disconnect_papi_to_all_containers()
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.stop()
+        self.run_on_all_containers(lambda engine: engine.stop())
 
     def destroy_all_containers(self):
         """Destroy all containers."""
         # TODO: Rework if containers can be affected outside ContainerManager.
         self._disconnect_papi_to_all_containers()
-        for container in self.containers:
-            self.engine.container = self.containers[container]
-            self.engine.destroy()
+        self.run_on_all_containers(lambda engine: engine.destroy())
 
 
 class ContainerEngine:
@@ -559,6 +607,8 @@ class ContainerEngine:
 
         :param command: Command to run inside container.
         :type command: str
+        :returns: Standard output of the command.
+        :rtype: str
         """
         raise NotImplementedError
 
@@ -580,9 +630,27 @@ class ContainerEngine:
 
     def start_vpp(self, verify=True):
         """Start VPP inside a container."""
+        self.start_vpp_process()
+        self.add_vpp_sockets()
+        if verify:
+            self.verify_vpp()
+
+    def start_vpp_process(self):
+        """Start VPP process inside a container, do not wait for it."""
         self.execute(
             u"/usr/bin/vpp -c /etc/vpp/startup.conf")
 
+    def restart_vpp_process(self):
+        """Kill VPP process inside a container and start a new one."""
+        self.execute(u"pkill vpp")
+        self.start_vpp_process()
+
+    def add_vpp_sockets(self):
+        """Add sockets of VPP inside a container to topology.
+
+        This accesses the Robot library instance,
+        so it has to be called from the main thread.
+        """
         topo_instance = BuiltIn().get_library_instance(
             u"resources.libraries.python.topology.Topology"
         )
@@ -604,8 +672,6 @@ class ContainerEngine:
             self.container.name,
             self.container.stats_socket,
         )
-        if verify:
-            self.verify_vpp()
 
     def restart_vpp(self, verify=True):
         """Restart VPP service inside a container."""
@@ -623,30 +689,33 @@ class ContainerEngine:
         """Verify that VPP is installed and running inside container.
 
         This function waits a while so VPP can start.
-        PCI interfaces are listed for debug purposes.
+        PCI interfaces are listed for debug purposes, the list is returned,
+        as this can run in a thread the Robot log does not see.
         When the check passes, VPP API socket is created on remote side,
         but perhaps its directory does not have the correct access rights yet.
 
         :param retries: Check for VPP for this number of times Default: 120
         :param retry_wait: Wait for this number of seconds between retries.
+        :returns: The list of PCI interfaces printed by VPP.
+        :rtype: str
+        :raises RuntimeError: If VPP did not come up, with VPP log.
         """
         for _ in range(retries + 1):
             try:
                 # Execute puts the command into single quotes,
                 # so inner arguments are enclosed in qouble quotes here.
-                self.execute(
+                return self.execute(
                     u'/usr/bin/vppctl show pci 2>&1 | '
                     u'fgrep -v "Connection refused" | '
                     u'fgrep -v "No such file or directory"'
                 )
-                break
             except (RuntimeError, AssertionError):
                 sleep(retry_wait)
-        else:
-            self.execute(u"cat /tmp/vppd.log")
-            raise RuntimeError(
-                f"VPP did not come up in container: {self.container.name}"
-            )
+        vppd_log = self.execute(u"cat /tmp/vppd.log")
+        raise RuntimeError(
+            f"VPP did not come up in container: {self.container.name}\n"
+            f"{vppd_log}"
+        )
 
     def adjust_privileges(self):
         """Adjust privileges to control VPP without sudo."""
@@ -829,6 +898,11 @@ class LXC(ContainerEngine):
 
     # Implicit constructor is inherited.
 
+    # Containers are created concurrently, but all of them share the lxc
+    # cgroup, create() copies it from the root cgroup before setting
+    # the cpus of the container, so that part runs one container at a time.
+    _cgroup_lock = Lock()
+
     def acquire(self, force=True):
         """Acquire a privileged system object where configuration is stored.
 
@@ -904,6 +978,19 @@ class LXC(ContainerEngine):
             f"{cpu!s}" for cpu in self.container.cpuset_cpus) \
             if self.container.cpuset_cpus else u""
 
+        with LXC._cgroup_lock:
+            self._start_in_cgroup(cpuset_cpus)
+
+    def _start_in_cgroup(self, cpuset_cpus):
+        """Start the container and set its cpus in the shared lxc cgroup.
+
+        Must be called with the cgroup lock held.
+
+        :param cpuset_cpus: Comma separated cpus of the container.
+        :type cpuset_cpus: str
+        :raises RuntimeError: If starting the container or setting its cgroup
+            fails.
+        """
         ret, _, _ = self.container.ssh.exec_command_sudo(
             f"lxc-start --name {self.container.name} --daemon"
         )
@@ -936,6 +1023,8 @@ class LXC(ContainerEngine):
 
         :param command: Command to run inside container.
         :type command: str
+        :returns: Standard output of the command.
+        :rtype: str
         :raises RuntimeError: If running the command failed.
         """
         env = u"--keep-env " + u" ".join(
@@ -945,11 +1034,12 @@ class LXC(ContainerEngine):
         cmd = f"lxc-attach {env} --name {self.container.name} " \
             f"-- /bin/sh -c '{command}'"
 
-        ret, _, _ = self.container.ssh.exec_command_sudo(cmd, timeout=180)
+        ret, stdout, _ = self.container.ssh.exec_command_sudo(cmd, timeout=180)
         if int(ret) != 0:
             raise RuntimeError(
                 f"Failed to run command inside container {self.container.name}."
             )
+        return stdout
 
     def stop(self):
         """Stop a container.
@@ -1134,16 +1224,19 @@ class Docker(ContainerEngine):
 
         :param command: Command to run inside container.
         :type command: str
+        :returns: Standard output of the command.
+        :rtype: str
         :raises RuntimeError: If running the command in a container failed.
         """
         cmd = f"docker exec --interactive {self.container.name} " \
             f"/bin/sh -c '{command}'"
 
-        ret, _, _ = self.container.ssh.exec_command_sudo(cmd, timeout=180)
+        ret, stdout, _ = self.container.ssh.exec_command_sudo(cmd, timeout=180)
         if int(ret) != 0:
             raise RuntimeError(
                 f"Failed to execute command in container {self.container.name}."
             )
+        return stdout
 
     def stop(self):
         """Stop running container.
@@ -18,7 +18,8 @@ from random import choice
 from robot.libraries.BuiltIn import BuiltIn
 
 from resources.libraries.python.Constants import Constants
-from resources.libraries.python.ssh import exec_cmd_no_error
+from resources.libraries.python.NodeGroup import NodeGroup
+from resources.libraries.python.ssh import exec_cmd_batch_no_error
 from resources.libraries.python.topology import Topology, NodeType
 
 __all__ = [u"CpuUtils"]
@@ -63,10 +64,33 @@ class CpuUtils:
                 count += 1
         return bool(count == cpu_mems_len)
 
+    @staticmethod
+    def get_cpu_info_from_node(node):
+        """Assuming the node is a Linux node, retrieve the following
+           cpu information from the node:
+               - cpu architecture
+               - cpu layout
+
+        :param node: Node from topology.
+        :type node: dict
+        :raises RuntimeError: If an ssh command retrieving cpu information
+            fails.
+        """
+        (arch, _), (stdout, _) = exec_cmd_batch_no_error(
+            node, [u"uname -m", u"lscpu -p"]
+        )
+        node[u"arch"] = arch.strip()
+        node[u"cpuinfo"] = list()
+        for line in stdout.split(u"\n"):
+            if line and line[0] != u"#":
+                node[u"cpuinfo"].append(
+                    [CpuUtils.__str2int(x) for x in line.split(u",")]
+                )
+
     @staticmethod
     def get_cpu_info_from_all_nodes(nodes):
         """Assuming all nodes are Linux nodes, retrieve the following
-           cpu information from all nodes:
+           cpu information from all nodes (concurrently):
                - cpu architecture
                - cpu layout
 
@@ -75,16 +99,7 @@ class CpuUtils:
         :raises RuntimeError: If an ssh command retrieving cpu information
             fails.
         """
-        for node in nodes.values():
-            stdout, _ = exec_cmd_no_error(node, u"uname -m")
-            node[u"arch"] = stdout.strip()
-            stdout, _ = exec_cmd_no_error(node, u"lscpu -p")
-            node[u"cpuinfo"] = list()
-            for line in stdout.split(u"\n"):
-                if line and line[0] != u"#":
-                    node[u"cpuinfo"].append(
-                        [CpuUtils.__str2int(x) for x in line.split(u",")]
-                    )
+        NodeGroup(nodes).map(CpuUtils.get_cpu_info_from_node)
 
     @staticmethod
     def cpu_node_count(node):
@@ -16,7 +16,8 @@
 from time import sleep
 from robot.api import logger
 
-from resources.libraries.python.ssh import exec_cmd, exec_cmd_no_error
+from resources.libraries.python.ssh import exec_cmd, exec_cmd_no_error, \
+    exec_cmd_batch_no_error
 from resources.libraries.python.topology import NodeType, Topology
 
 
@@ -389,25 +390,17 @@ class DUTSetup:
         message = f"Failed to bind PCI device {pci_addr} to {driver} " \
             f"on host {node[u'host']}"
         pci = pci_addr.replace(u":", r"\:")
-        command = f"sh -c \"echo {driver} | " \
-            f"tee /sys/bus/pci/devices/{pci}/driver_override\""
-
-        exec_cmd_no_error(
-            node, command, timeout=120, sudo=True, message=message
-        )
-
-        command = f"sh -c \"echo {pci_addr} | " \
-            f"tee /sys/bus/pci/drivers/{driver}/bind\""
-
-        exec_cmd_no_error(
-            node, command, timeout=120, sudo=True, message=message
-        )
-
-        command = f"sh -c \"echo  | " \
-            f"tee /sys/bus/pci/devices/{pci}/driver_override\""
-
-        exec_cmd_no_error(
-            node, command, timeout=120, sudo=True, message=message
+        commands = [
+            f"sh -c \"echo {driver} | "
+            f"tee /sys/bus/pci/devices/{pci}/driver_override\"",
+            f"sh -c \"echo {pci_addr} | "
+            f"tee /sys/bus/pci/drivers/{driver}/bind\"",
+            f"sh -c \"echo  | "
+            f"tee /sys/bus/pci/devices/{pci}/driver_override\"",
+        ]
+
+        exec_cmd_batch_no_error(
+            node, commands, timeout=120, sudo=True, message=message
         )
 
     @staticmethod
@@ -453,23 +446,15 @@ class DUTSetup:
 
         message = f"Failed to bind VF {vf_pci_addr} to {driver} " \
             f"on {node[u'host']}"
-        command = f"sh -c \"echo {driver} | tee {vf_path}/driver_override\""
-
-        exec_cmd_no_error(
-            node, command, timeout=120, sudo=True, message=message
-        )
-
-        command = f"sh -c \"echo {vf_pci_addr} | " \
-            f"tee /sys/bus/pci/drivers/{driver}/bind\""
-
-        exec_cmd_no_error(
-            node, command, timeout=120, sudo=True, message=message
-        )
-
-        command = f"sh -c \"echo  | tee {vf_path}/driver_override\""
-
-        exec_cmd_no_error(
-            node, command, timeout=120, sudo=True, message=message
+        commands = [
+            f"sh -c \"echo {driver} | tee {vf_path}/driver_override\"",
+            f"sh -c \"echo {vf_pci_addr} | "
+            f"tee /sys/bus/pci/drivers/{driver}/bind\"",
+            f"sh -c \"echo  | tee {vf_path}/driver_override\"",
+        ]
+
+        exec_cmd_batch_no_error(
+            node, commands, timeout=120, sudo=True, message=message
         )
 
     @staticmethod
@@ -748,14 +748,18 @@ class IPUtil:
             ip_network(f"{network}/{prefix_len}", strict=strict),
             format=u"addr"
         )
+        # Routes differ only in prefix, compose the rest once.
+        args[u"route"] = IPUtil.compose_vpp_route_structure(
+            node, network, prefix_len, **kwargs
+        )
+        overrides = (
+            dict(route=dict(prefix=IPUtil.create_prefix_object(
+                ip_address(netiter.inc_fmt()), prefix_len
+            )))
+            for _ in range(count)
+        )
         with PapiSocketExecutor(node, is_async=True) as papi_exec:
-            for i in range(count):
-                args[u"route"] = IPUtil.compose_vpp_route_structure(
-                    node, netiter.inc_fmt(), prefix_len, **kwargs
-                )
-                history = bool(not 0 < i < count - 1)
-                papi_exec.add(cmd, history=history, **args)
-            papi_exec.get_replies(err_msg)
+            papi_exec.add_bulk(cmd, args, overrides).get_replies(err_msg)
 
     @staticmethod
     def flush_ip_addresses(node, interface):
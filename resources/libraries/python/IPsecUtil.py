@@ -573,21 +573,19 @@ class IPsecUtil:
             udp_dst_port=4500,  # default value in api
         )
         args = dict(entry=sad_entry)
+        overrides = (
+            dict(entry=dict(
+                sad_id=int(sad_id) + i,
+                spi=int(spi) + i,
+                tunnel=dict(
+                    src=str(src_addr + i * addr_incr),
+                    dst=str(dst_addr + i * addr_incr),
+                ) if tunnel_src and tunnel_dst else dict(),
+            ))
+            for i in range(n_entries)
+        )
         with PapiSocketExecutor(node, is_async=True) as papi_exec:
-            for i in range(n_entries):
-                args[u"entry"][u"sad_id"] = int(sad_id) + i
-                args[u"entry"][u"spi"] = int(spi) + i
-                args[u"entry"][u"tunnel"][u"src"] = (
-                    str(src_addr + i * addr_incr)
-                    if tunnel_src and tunnel_dst else src_addr
-                )
-                args[u"entry"][u"tunnel"][u"dst"] = (
-                    str(dst_addr + i * addr_incr)
-                    if tunnel_src and tunnel_dst else dst_addr
-                )
-                history = bool(not 1 < i < n_entries - 2)
-                papi_exec.add(cmd, history=history, **args)
-            papi_exec.get_replies(err_msg)
+            papi_exec.add_bulk(cmd, args, overrides).get_replies(err_msg)
 
     @staticmethod
     def vpp_ipsec_set_ip_route(
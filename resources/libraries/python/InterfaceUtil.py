@@ -26,7 +26,8 @@ from resources.libraries.python.IPAddress import IPAddress
 from resources.libraries.python.L2Util import L2Util
 from resources.libraries.python.PapiExecutor import PapiSocketExecutor
 from resources.libraries.python.parsers.JsonParser import JsonParser
-from resources.libraries.python.ssh import SSH, exec_cmd, exec_cmd_no_error
+from resources.libraries.python.ssh import SSH, exec_cmd_no_error, \
+    exec_cmd_batch, exec_cmd_batch_no_error
 from resources.libraries.python.topology import NodeType, Topology
 from resources.libraries.python.VPPUtil import VPPUtil
 
@@ -156,6 +157,29 @@ class InterfaceUtil:
 
         return stdout.strip()
 
+    @staticmethod
+    def pcis_to_eths(node, pci_strs):
+        """Convert PCI addresses on DUT to Linux ethernet names.
+
+        All conversions are done in one batch of commands.
+
+        :param node: DUT node
+        :param pci_strs: PCI addresses.
+        :type node: dict
+        :type pci_strs: list
+        :returns: Ethernet names, in the order of PCI addresses.
+        :rtype: list of str
+        :raises RuntimeError: If some address cannot be converted.
+        """
+        cmds = [
+            f"basename /sys/bus/pci/devices/{pci_str}/net/*"
+            for pci_str in pci_strs
+        ]
+        results = exec_cmd_batch_no_error(
+            node, cmds, message=f"Cannot convert {pci_strs} to ethernet names!"
+        )
+        return [stdout.strip() for stdout, _ in results]
+
     @staticmethod
     def get_interface_index(node, interface):
         """Get interface sw_if_index from topology file.
@@ -252,12 +276,14 @@ class InterfaceUtil:
         :type pf_pcis: list
         :type namespace: str
         :type state: str
+        :raises RuntimeError: If failed to set state on interface.
         """
-        for pf_pci in pf_pcis:
-            pf_eth = InterfaceUtil.pci_to_eth(node, pf_pci)
-            InterfaceUtil.set_linux_interface_state(
-                node, pf_eth, namespace=namespace, state=state
-            )
+        ns_str = f"ip netns exec {namespace}" if namespace else u""
+        cmds = [
+            f"{ns_str} ip link set dev {pf_eth} {state}"
+            for pf_eth in InterfaceUtil.pcis_to_eths(node, pf_pcis)
+        ]
+        exec_cmd_batch_no_error(node, cmds, sudo=True)
 
     @staticmethod
     def set_interface_mtu(node, pf_pcis, mtu=9200):
@@ -271,10 +297,11 @@ class InterfaceUtil:
         :type mtu: int
         :raises RuntimeError: If failed to set MTU on interface.
         """
-        for pf_pci in pf_pcis:
-            pf_eth = InterfaceUtil.pci_to_eth(node, pf_pci)
-            cmd = f"ip link set {pf_eth} mtu {mtu}"
-            exec_cmd_no_error(node, cmd, sudo=True)
+        cmds = [
+            f"ip link set {pf_eth} mtu {mtu}"
+            for pf_eth in InterfaceUtil.pcis_to_eths(node, pf_pcis)
+        ]
+        exec_cmd_batch_no_error(node, cmds, sudo=True)
 
     @staticmethod
     def set_interface_channels(
@@ -290,10 +317,11 @@ class InterfaceUtil:
         :type num_queues: int
         :type channel: str
         """
-        for pf_pci in pf_pcis:
-            pf_eth = InterfaceUtil.pci_to_eth(node, pf_pci)
-            cmd = f"ethtool --set-channels {pf_eth} {channel} {num_queues}"
-            exec_cmd_no_error(node, cmd, sudo=True)
+        cmds = [
+            f"ethtool --set-channels {pf_eth} {channel} {num_queues}"
+            for pf_eth in InterfaceUtil.pcis_to_eths(node, pf_pcis)
+        ]
+        exec_cmd_batch_no_error(node, cmds, sudo=True)
 
     @staticmethod
     def set_interface_xdp_off(node, pf_pcis):
@@ -305,10 +333,11 @@ class InterfaceUtil:
         :type nodes: dict
         :type pf_pcis: list
         """
-        for pf_pci in pf_pcis:
-            pf_eth = InterfaceUtil.pci_to_eth(node, pf_pci)
-            cmd = f"ip link set dev {pf_eth} xdp off"
-            exec_cmd_no_error(node, cmd, sudo=True)
+        cmds = [
+            f"ip link set dev {pf_eth} xdp off"
+            for pf_eth in InterfaceUtil.pcis_to_eths(node, pf_pcis)
+        ]
+        exec_cmd_batch_no_error(node, cmds, sudo=True)
 
     @staticmethod
     def set_interface_flow_control(node, pf_pcis, rxf=u"off", txf=u"off"):
@@ -323,12 +352,14 @@ class InterfaceUtil:
         :type rxf: str
         :type txf: str
         """
-        for pf_pci in pf_pcis:
-            pf_eth = InterfaceUtil.pci_to_eth(node, pf_pci)
-            cmd = f"ethtool -A {pf_eth} rx {rxf} tx {txf}"
-            ret_code, _, _ = exec_cmd(node, cmd, sudo=True)
+        pf_eths = InterfaceUtil.pcis_to_eths(node, pf_pcis)
+        cmds = [f"ethtool -A {pf_eth} rx {rxf} tx {txf}" for pf_eth in pf_eths]
+        results = exec_cmd_batch(node, cmds, sudo=True)
+        if len(results) < len(pf_eths):
+            raise RuntimeError(f"Failed to set flow control on {pf_eths}!")
+        for pf_eth, (ret_code, _, _) in zip(pf_eths, results):
             if int(ret_code) not in (0, 78):
-                raise RuntimeError("Failed to set flow control on {pf_eth}!")
+                raise RuntimeError(f"Failed to set flow control on {pf_eth}!")
 
     @staticmethod
     def set_pci_parameter(node, pf_pcis, key, value):
@@ -343,9 +374,8 @@ class InterfaceUtil:
         :type key: str
         :type value: str
         """
-        for pf_pci in pf_pcis:
-            cmd = f"setpci -s {pf_pci} {key}={value}"
-            exec_cmd_no_error(node, cmd, sudo=True)
+        cmds = [f"setpci -s {pf_pci} {key}={value}" for pf_pci in pf_pcis]
+        exec_cmd_batch_no_error(node, cmds, sudo=True)
 
     @staticmethod
     def vpp_set_interface_mtu(node, interface, mtu):
@@ -25,6 +25,11 @@ __init__ file for Python package "MLRsearch".
 from .config import Config
 from .goal_result import GoalResult
 from .multiple_loss_ratio_search import MultipleLossRatioSearch
+from .parallel_search import ParallelSearch
 from .pep3140 import Pep3140Dict
 from .search_goal import SearchGoal
-from .trial_measurement import AbstractMeasurer, MeasurementResult
+from .trial_measurement import (
+    AbstractMeasurer, AbstractParallelMeasurer, MeasurementResult,
+    SimulatedMeasurer, SutProfile, ThreadedMeasurer, VirtualClock,
+)
+from .warm_start import WarmStart
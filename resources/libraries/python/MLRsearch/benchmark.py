@@ -0,0 +1,525 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of MLRsearch controller overhead, using a synthetic measurer.
+
+The synthetic measurer returns immediately, so the wall time of the search
+is spent purely in the controller logic (measurement database,
+selectors and strategies). Many search goals with narrow widths
+and noisy results make the search perform thousands of trials,
+so the scaling of the controller with the number of trials
+and the number of goals becomes visible.
+
+With --parallel, the given number of searches is performed one after another
+and then concurrently by ParallelSearch. The measurers sleep
+for a fraction (--time-scale) of the intended trial duration,
+so the wall times show how much the concurrency saves.
+
+With --suite, searches for sets of goals typical in CSIT
+are performed against a matrix of simulated SUT profiles.
+The simulated measurer advances a virtual clock instead of waiting,
+so the whole suite takes seconds. For each goal set and profile,
+the simulated search time (including trial overheads),
+the number of trials, the sum of trial durations and the relative error
+of conditional throughput (against the critical load of the nominal curve)
+are printed, averaged over repetitions with different seeds.
+With --output, the same values are written to a JSON file,
+so the efficiency of the search can be compared between versions.
+
+With --warm-start, a simulated SUT without random effects
+simulates daily trending of one test with NDR and PDR goals,
+the SUT capacity drifting a little each day (and dropping once).
+Each day is searched cold and warm-started from the previous day results,
+the sums of trial durations are compared.
+
+Run from the directory containing MLRsearch package:
+
+    python3 -m MLRsearch.benchmark --goals 4 16 64
+    python3 -m MLRsearch.benchmark --goals 4 --parallel 4
+    python3 -m MLRsearch.benchmark --suite --repetitions 5
+    python3 -m MLRsearch.benchmark --warm-start
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import random
+import statistics
+import time
+
+from dataclasses import dataclass
+
+from .config import Config
+from .dataclass import secondary_field
+from .multiple_loss_ratio_search import MultipleLossRatioSearch
+from .parallel_search import ParallelSearch
+from .search_goal import SearchGoal
+from .warm_start import WarmStart
+from .trial_measurement import (
+    AbstractMeasurer, MeasurementResult, SimulatedMeasurer, SutProfile,
+    ThreadedMeasurer, VirtualClock,
+)
+
+
+_NDR_GOAL = SearchGoal(
+    loss_ratio=0.0,
+    exceed_ratio=0.5,
+    relative_width=0.005,
+    initial_trial_duration=1.0,
+    final_trial_duration=1.0,
+    duration_sum=21.0,
+    preceding_targets=2,
+    expansion_coefficient=2,
+)
+"""NDR goal as used by CSIT trending."""
+_PDR_GOAL = dataclasses.replace(_NDR_GOAL, loss_ratio=0.005)
+"""PDR goal as used by CSIT trending."""
+
+GOAL_SETS = {
+    "ndr": [dataclasses.replace(_NDR_GOAL, exceed_ratio=0.0)],
+    "ndrpdr": [_NDR_GOAL, _PDR_GOAL],
+    "ndrpdr-long": [
+        dataclasses.replace(
+            goal, final_trial_duration=10.0, duration_sum=60.0
+        )
+        for goal in (_NDR_GOAL, _PDR_GOAL)
+    ],
+    "multi": [
+        dataclasses.replace(_NDR_GOAL, loss_ratio=loss_ratio)
+        for loss_ratio in (0.0, 1e-4, 1e-3, 5e-3)
+    ],
+}
+"""Sets of search goals for the suite, by name."""
+
+SUT_PROFILES = {
+    "ideal": SutProfile(),
+    "knee": SutProfile(knee=0.8, knee_loss=0.01),
+    "noisy": SutProfile(knee=0.8, knee_loss=0.01, noise=0.02, background=1e-8),
+    "inversions": SutProfile(
+        knee=0.9, knee_loss=0.01, inversion_probability=0.1,
+        inversion_loss=0.02,
+    ),
+    "overhead": SutProfile(knee=0.8, knee_loss=0.01, trial_overhead=5.0),
+}
+"""Simulated SUT profiles for the suite, by name."""
+
+
+@dataclass
+class SyntheticMeasurer(AbstractMeasurer):
+    """Measurer returning noisy results of a simple loss model immediately.
+
+    Above the capacity, all excess load is lost. Capacity of each trial
+    is randomly perturbed, and random background loss is added,
+    so results at the same load differ and loss ratios rarely repeat.
+    """
+
+    capacity: float = 1e7
+    """Average load [tps] the simulated SUT forwards without loss."""
+    noise: float = 0.01
+    """Relative standard deviation of the capacity in a trial."""
+    background: float = 1e-6
+    """Average loss ratio of randomly lost packets, at any load."""
+    seed: int = 0
+    """Seed for the random generator."""
+    time_scale: float = 0.0
+    """Sleep for intended duration multiplied by this [1]."""
+    # Primary fields above, computed fields below.
+    rng: random.Random = secondary_field()
+    """Random generator, created from the seed."""
+    trials: int = secondary_field()
+    """Number of trials measured so far."""
+
+    def __post_init__(self) -> None:
+        """Create the random generator and zero the trial counter."""
+        self.rng = random.Random(self.seed)
+        self.trials = 0
+
+    def measure(
+        self, intended_duration: float, intended_load: float
+    ) -> MeasurementResult:
+        """Return a synthetic result without waiting.
+
+        :param intended_duration: Intended trial duration [s].
+        :param intended_load: Intended rate of transactions (packets) [tps].
+        :type intended_duration: float
+        :type intended_load: float
+        :returns: Structure detailing the result of the measurement.
+        :rtype: MeasurementResult
+        """
+        self.trials += 1
+        if self.time_scale:
+            time.sleep(intended_duration * self.time_scale)
+        offered = int(intended_load * intended_duration)
+        capacity = self.capacity * self.rng.gauss(1.0, self.noise)
+        excess = max(0, offered - int(capacity * intended_duration))
+        background = int(self.rng.expovariate(1.0) * self.background * offered)
+        return MeasurementResult(
+            intended_duration=intended_duration,
+            intended_load=intended_load,
+            offered_count=offered,
+            loss_count=min(offered, excess + background),
+        )
+
+
+def generate_goals(count: int) -> list:
+    """Return the given number of distinct search goals.
+
+    Goals differ in loss ratio, exceed ratio and relative width,
+    all use the same durations, so the number of trials grows with the count.
+
+    :param count: Number of goals to generate.
+    :type count: int
+    :returns: The goals.
+    :rtype: List[SearchGoal]
+    """
+    combinations = itertools.product(
+        (0.002, 0.001, 0.0005, 0.0002),
+        (0.0, 1e-6, 1e-4, 1e-3, 5e-3, 1e-2, 2e-2, 5e-2),
+        (0.0, 0.1, 0.25, 0.5),
+    )
+    return [
+        SearchGoal(
+            loss_ratio=loss_ratio,
+            exceed_ratio=exceed_ratio,
+            relative_width=width,
+            initial_trial_duration=1.0,
+            final_trial_duration=1.0,
+            duration_sum=21.0,
+            preceding_targets=2,
+        )
+        for width, loss_ratio, exceed_ratio in itertools.islice(
+            combinations, count
+        )
+    ]
+
+
+def generate_config(goal_count: int) -> Config:
+    """Return config for searching the given number of goals.
+
+    :param goal_count: Number of search goals.
+    :type goal_count: int
+    :returns: The config.
+    :rtype: Config
+    """
+    config = Config()
+    config.goals = generate_goals(goal_count)
+    config.min_load = 1e4
+    config.max_load = 2e7
+    config.warmup_duration = None
+    return config
+
+
+def run(goal_counts: list, seed: int) -> None:
+    """Perform a search for each goal count, print trials and durations.
+
+    :param goal_counts: Numbers of search goals to search for at once.
+    :param seed: Seed for the synthetic measurer.
+    :type goal_counts: List[int]
+    :type seed: int
+    """
+    print("goals  trials  duration[s]  per trial[us]")
+    for count in goal_counts:
+        config = generate_config(count)
+        measurer = SyntheticMeasurer(seed=seed)
+        start = time.perf_counter()
+        MultipleLossRatioSearch(config).search(measurer, debug=lambda _: None)
+        duration = time.perf_counter() - start
+        print(
+            f"{count:5d} {measurer.trials:7d} {duration:12.3f}"
+            f" {duration / measurer.trials * 1e6:14.1f}"
+        )
+
+
+def run_parallel(
+    goal_counts: list, seed: int, searches: int, time_scale: float
+) -> None:
+    """Perform searches sequentially and in parallel, print wall times.
+
+    Each search has its own measurer (with its own seed),
+    so the results of both ways have to be the same.
+
+    :param goal_counts: Numbers of search goals of each search.
+    :param seed: Seed for the synthetic measurer of the first search.
+    :param searches: Number of searches to perform.
+    :param time_scale: Fraction of intended duration the measurers sleep.
+    :type goal_counts: List[int]
+    :type seed: int
+    :type searches: int
+    :type time_scale: float
+    :raises RuntimeError: If the results differ.
+    """
+    print("goals  searches  trials  sequential[s]  parallel[s]")
+    for count in goal_counts:
+        configs = [generate_config(count) for _ in range(searches)]
+        measurers = [
+            SyntheticMeasurer(seed=seed + index, time_scale=time_scale)
+            for index in range(searches)
+        ]
+        start = time.perf_counter()
+        sequential = [
+            MultipleLossRatioSearch(config).search(
+                measurer, debug=lambda _: None
+            )
+            for config, measurer in zip(configs, measurers)
+        ]
+        sequential_duration = time.perf_counter() - start
+        trials = sum(measurer.trials for measurer in measurers)
+        measurers = [
+            SyntheticMeasurer(seed=seed + index, time_scale=time_scale)
+            for index in range(searches)
+        ]
+        parallel_measurer = ThreadedMeasurer(measurers)
+        start = time.perf_counter()
+        try:
+            parallel = ParallelSearch(configs).search(
+                parallel_measurer, debug=lambda _: None
+            )
+        finally:
+            parallel_measurer.close()
+        parallel_duration = time.perf_counter() - start
+        if str(parallel) != str(sequential):
+            raise RuntimeError(f"Results differ: {parallel} {sequential}")
+        print(
+            f"{count:5d} {searches:9d} {trials:7d} {sequential_duration:14.3f}"
+            f" {parallel_duration:12.3f}"
+        )
+
+
+def _suite_row(
+    goal_set_name: str, profile_name: str, repetitions: int, seed: int
+) -> dict:
+    """Search the goal set with the SUT profile repeatedly, return stats.
+
+    :param goal_set_name: Name of the goal set (key of GOAL_SETS) to search.
+    :param profile_name: Name of the SUT profile (key of SUT_PROFILES).
+    :param repetitions: Number of searches with different seeds.
+    :param seed: Seed for the simulated measurer of the first repetition.
+    :type goal_set_name: str
+    :type profile_name: str
+    :type repetitions: int
+    :type seed: int
+    :returns: Averaged stats, None values if all searches failed.
+    :rtype: dict
+    """
+    goals = GOAL_SETS[goal_set_name]
+    profile = SUT_PROFILES[profile_name]
+    critical_loads = [profile.critical_load(g.loss_ratio) for g in goals]
+    times, trials, trial_seconds, errors = [], [], [], []
+    failed = 0
+    for index in range(repetitions):
+        config = Config()
+        config.goals = goals
+        config.min_load = 1e4
+        config.max_load = 2.0 * profile.capacity
+        clock = VirtualClock()
+        measurer = SimulatedMeasurer(
+            profile=profile, seed=seed + index, clock=clock
+        )
+        try:
+            results = MultipleLossRatioSearch(config, clock=clock).search(
+                measurer, debug=lambda _: None
+            )
+        except RuntimeError:
+            failed += 1
+            continue
+        times.append(clock.now)
+        trials.append(measurer.trials)
+        trial_seconds.append(measurer.trial_seconds)
+        for goal, critical_load in zip(goals, critical_loads):
+            throughput = results[goal].conditional_throughput
+            throughput = 0.0 if throughput is None else float(throughput)
+            errors.append(100.0 * (throughput / critical_load - 1.0))
+    return dict(
+        goals=goal_set_name,
+        profile=profile_name,
+        time=statistics.mean(times) if times else None,
+        trials=statistics.mean(trials) if trials else None,
+        trial_seconds=(
+            statistics.mean(trial_seconds) if trial_seconds else None
+        ),
+        avg_error=(
+            statistics.mean(abs(err) for err in errors) if errors else None
+        ),
+        max_error=max(errors, key=abs) if errors else None,
+        failed=failed,
+    )
+
+
+def run_suite(
+    goal_set_names: list, profile_names: list, repetitions: int, seed: int,
+    output: str = None,
+) -> None:
+    """Search each goal set with each SUT profile, print averaged stats.
+
+    A search failing (timeout in simulated time, or min load
+    becoming an upper bound) is counted, and excluded from the averages.
+
+    :param goal_set_names: Names of goal sets (keys of GOAL_SETS) to search.
+    :param profile_names: Names of SUT profiles (keys of SUT_PROFILES).
+    :param repetitions: Number of searches with different seeds per cell.
+    :param seed: Seed for the simulated measurer of the first repetition.
+    :param output: Path to write the stats to as JSON, None means no file.
+    :type goal_set_names: List[str]
+    :type profile_names: List[str]
+    :type repetitions: int
+    :type seed: int
+    :type output: Optional[str]
+    """
+    print(
+        "goals        profile     time[s]  trials  trial[s]  avg err[%]"
+        "  max err[%]  failed"
+    )
+    rows = []
+    for goal_set_name, profile_name in itertools.product(
+        goal_set_names, profile_names
+    ):
+        row = _suite_row(goal_set_name, profile_name, repetitions, seed)
+        rows.append(row)
+        values = (
+            row["time"], row["trials"], row["trial_seconds"],
+            row["avg_error"], row["max_error"],
+        )
+        failed = row["failed"]
+        if None in values:
+            print(f"{goal_set_name:12s} {profile_name:10s} {'-':>8s}"
+                  f" {'-':>7s} {'-':>9s} {'-':>11s} {'-':>11s} {failed:7d}")
+            continue
+        print(
+            f"{goal_set_name:12s} {profile_name:10s} {values[0]:8.0f}"
+            f" {values[1]:7.1f} {values[2]:9.0f} {values[3]:11.3f}"
+            f" {values[4]:11.3f} {failed:7d}"
+        )
+    times = [row["time"] for row in rows if row["time"] is not None]
+    trials = [row["trials"] for row in rows if row["trials"] is not None]
+    print(f"Total: time {sum(times):.0f} s, trials {sum(trials):.1f}")
+    if output:
+        with open(output, "wt", encoding="utf-8") as file_out:
+            json.dump(rows, file_out, indent=1)
+
+
+def run_warm_start(drifts: list) -> None:
+    """Search each day cold and warm-started, print trial seconds.
+
+    The goals are NDR and PDR goals as used by CSIT trending.
+    The first day has no previous results, so it is searched cold only.
+
+    :param drifts: Relative change of capacity for each day.
+    :type drifts: List[float]
+    """
+    print("day  capacity  cold[s]  warm[s]  cold ndr,pdr  warm ndr,pdr")
+    capacity = 1e7
+    warm_start = None
+    cold_sum, warm_sum = 0.0, 0.0
+    for day, drift in enumerate(drifts):
+        capacity *= 1.0 + drift
+        config = Config()
+        config.goals = [_NDR_GOAL, _PDR_GOAL]
+        config.min_load = 1e4
+        config.max_load = 2e7
+        config.warmup_duration = None
+        measurer = SimulatedMeasurer(profile=dataclasses.replace(
+            SUT_PROFILES["knee"], capacity=capacity
+        ))
+        cold = MultipleLossRatioSearch(config).search(
+            measurer, debug=lambda _: None
+        )
+        cold_seconds = measurer.trial_seconds
+        line = f"{day:3d} {capacity:9.0f} {cold_seconds:8.0f}"
+        cold_loads = ",".join(
+            f"{float(result.conditional_throughput):.0f}"
+            for result in cold.values()
+        )
+        if warm_start:
+            config.warm_start = warm_start
+            measurer = SimulatedMeasurer(profile=dataclasses.replace(
+            SUT_PROFILES["knee"], capacity=capacity
+        ))
+            warm = MultipleLossRatioSearch(config).search(
+                measurer, debug=lambda _: None
+            )
+            warm_loads = ",".join(
+                f"{float(result.conditional_throughput):.0f}"
+                for result in warm.values()
+            )
+            cold_sum += cold_seconds
+            warm_sum += measurer.trial_seconds
+            line += f" {measurer.trial_seconds:8.0f}"
+            line += f"  {cold_loads}  {warm_loads}"
+        else:
+            warm = cold
+            line += f" {'-':>8s}  {cold_loads}"
+        print(line)
+        warm_start = WarmStart.from_goal_results(warm)
+    print(f"Days with warm start: cold {cold_sum:.0f} s, warm {warm_sum:.0f} s")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--goals", type=int, nargs="+", default=[4, 16, 64],
+        help="Numbers of search goals to search for at once (at most 128).",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Seed for the synthetic measurer.",
+    )
+    parser.add_argument(
+        "--parallel", type=int, default=0,
+        help="Number of searches to compare sequential and parallel runs.",
+    )
+    parser.add_argument(
+        "--time-scale", type=float, default=0.001,
+        help="Fraction of intended trial duration the measurers sleep.",
+    )
+    parser.add_argument(
+        "--suite", action="store_true",
+        help="Search goal sets against simulated SUT profiles.",
+    )
+    parser.add_argument(
+        "--goal-sets", nargs="+", default=list(GOAL_SETS),
+        choices=list(GOAL_SETS), help="Goal sets for the suite.",
+    )
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(SUT_PROFILES),
+        choices=list(SUT_PROFILES), help="SUT profiles for the suite.",
+    )
+    parser.add_argument(
+        "--repetitions", type=int, default=3,
+        help="Number of searches (with different seeds) in each suite cell.",
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Path to write the suite stats to, as JSON.",
+    )
+    parser.add_argument(
+        "--warm-start", action="store_true",
+        help="Compare cold and warm-started searches of simulated days.",
+    )
+    args = parser.parse_args()
+    if args.suite:
+        run_suite(
+            args.goal_sets, args.profiles, args.repetitions, args.seed,
+            args.output,
+        )
+    elif args.warm_start:
+        run_warm_start([0.0, 0.01, -0.005, 0.002, -0.2, 0.01, 0.0, 0.3])
+    elif args.parallel:
+        run_parallel(args.goals, args.seed, args.parallel, args.time_scale)
+    else:
+        run(args.goals, args.seed)
+
+
+if __name__ == "__main__":
+    main()
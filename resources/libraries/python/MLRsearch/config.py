@@ -20,6 +20,7 @@ from typing import Optional
 from .dataclass import DataclassProperty
 from .search_goal import SearchGoal
 from .search_goal_tuple import SearchGoalTuple
+from .warm_start import WarmStart
 
 
 @dataclass
@@ -61,6 +62,9 @@ class Config:
     """If specified, one trial at max load and this duration is performed
     before the usual search starts. None converts to zero and means no warmup.
     The results of that one trial are ignored."""
+    warm_start: Optional[WarmStart] = None
+    """If specified, goals with known loads start searching around them,
+    see WarmStart. None means all goals start from initial trials."""
 
     @DataclassProperty
     def goals(self) -> SearchGoalTuple:
@@ -177,3 +181,24 @@ class Config:
         else:
             duration = 0.0
         self._warmup_duration = duration
+
+    @DataclassProperty
+    def warm_start(self) -> Optional[WarmStart]:
+        """Getter for warm start, no logic here.
+
+        :returns: Currently set known loads, or None.
+        :rtype: Optional[WarmStart]
+        """
+        return self._warm_start
+
+    @warm_start.setter
+    def warm_start(self, warm_start: Optional[WarmStart]) -> None:
+        """Set warm start after checking type.
+
+        :param warm_start: Known loads to start from, or None.
+        :type warm_start: Optional[WarmStart]
+        :raises TypeError: If the argument is not a WarmStart instance.
+        """
+        if warm_start is not None and not isinstance(warm_start, WarmStart):
+            raise TypeError(f"Must be a WarmStart instance: {warm_start!r}")
+        self._warm_start = warm_start
@@ -16,7 +16,7 @@
 import math
 
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from .dataclass import secondary_field
 
@@ -67,6 +67,8 @@ class LoadRounding:
     """Integer for max load (min load int is zero)."""
     _int2load: List[Tuple[int, float]] = secondary_field()
     """Known int values (sorted) and their float equivalents."""
+    _int2float_cache: Dict[int, float] = secondary_field()
+    """Results of int2float calls so far, to avoid repeated bisection."""
 
     def __post_init__(self) -> None:
         """Ensure types, perform checks, initialize conversion structures.
@@ -92,6 +94,7 @@ class LoadRounding:
         self._int2load = []
         self._int2load.append((0, self.min_load))
         self._int2load.append((self.max_int_load, self.max_load))
+        self._int2float_cache = {}
 
     def _find_ints(self) -> int:
         """Find and return value for max_int_load.
@@ -144,6 +147,8 @@ class LoadRounding:
             return self.min_load
         if int_load >= self.max_int_load:
             return self.max_load
+        if int_load in self._int2float_cache:
+            return self._int2float_cache[int_load]
         lo_index, hi_index = 0, len(self._int2load)
         lo_int, hi_int = 0, self.max_int_load
         lo_load, hi_load = self.min_load, self.max_load
@@ -163,6 +168,7 @@ class LoadRounding:
             if mid_int > int_load:
                 hi_index, hi_int, hi_load = mid_index, mid_int, mid_load
                 continue
+            self._int2float_cache[int_load] = mid_load
             return mid_load
         raise RuntimeError("Bisect in int2float failed.")
 
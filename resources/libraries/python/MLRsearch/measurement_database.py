@@ -16,12 +16,13 @@
 from dataclasses import dataclass
 from typing import Dict, Tuple
 
+from .dataclass import secondary_field
 from .discrete_load import DiscreteLoad
 from .discrete_result import DiscreteResult
 from .load_stats import LoadStats
 from .relevant_bounds import RelevantBounds
+from .target_bounds import TargetBounds
 from .target_spec import TargetSpec
-from .trimmed_stat import TrimmedStat
 
 
 @dataclass
@@ -45,9 +46,12 @@ class MeasurementDatabase:
     """Targets to track stats for."""
     load_to_stats: Dict[DiscreteLoad, LoadStats] = None
     """Mapping from loads to stats."""
+    # Cache.
+    target_to_bounds: Dict[TargetSpec, TargetBounds] = secondary_field()
+    """Mapping from targets to their (sorted) bound loads."""
 
     def __post_init__(self) -> None:
-        """Check and sort initial values.
+        """Check initial values, classify loads for all targets.
 
         If no stats yet, initialize empty ones.
 
@@ -57,11 +61,12 @@ class MeasurementDatabase:
             raise ValueError(f"Database needs targets: {self.targets!r}")
         if not self.load_to_stats:
             self.load_to_stats = {}
-        self._sort()
-
-    def _sort(self) -> None:
-        """Sort keys from low to high load."""
-        self.load_to_stats = dict(sorted(self.load_to_stats.items()))
+        self.target_to_bounds = {
+            target: TargetBounds(target) for target in self.targets
+        }
+        for load_stats in self.load_to_stats.values():
+            for bounds in self.target_to_bounds.values():
+                bounds.update(load_stats)
 
     def __getitem__(self, key: DiscreteLoad) -> LoadStats:
         """Allow access to stats as if self was load_to_stats.
@@ -79,6 +84,9 @@ class MeasurementDatabase:
     def add(self, result: DiscreteResult) -> None:
         """Incorporate given trial measurement result.
 
+        Only the load of the result can change its classification,
+        so only that load is classified again (for each target).
+
         :param result: Measurement result to add to the database.
         :type result: DiscreteResult
         """
@@ -90,8 +98,10 @@ class MeasurementDatabase:
                 load=discrete_load,
                 targets=self.targets,
             )
-            self._sort()
-        self.load_to_stats[discrete_load].add(result)
+        load_stats = self.load_to_stats[discrete_load]
+        load_stats.add(result)
+        for bounds in self.target_to_bounds.values():
+            bounds.update(load_stats)
 
     def get_relevant_bounds(self, target: TargetSpec) -> RelevantBounds:
         """Return None or a valid trimmed stat, for the two relevant bounds.
@@ -101,26 +111,15 @@ class MeasurementDatabase:
         If some value is not available, None is returned instead.
         The returned stats are trimmed to the argument target.
 
-        The implementation starts from low loads
-        and the search stops at lowest upper bound,
+        The lowest upper bound is found first, and the lower bound
+        is the highest one below it,
         thus conforming to the conservative definition of relevant bounds.
+        The bound loads are kept sorted (and the result cached)
+        by TargetBounds, so this does not iterate over all loads.
 
         :param target: Target to classify loads when finding bounds.
         :type target: TargetSpec
         :returns: Relevant lower bound, relevant upper bound.
         :rtype: RelevantBounds
         """
-        lower_bound, upper_bound = None, None
-        for load_stats in self.load_to_stats.values():
-            opt, pes = load_stats.estimates(target)
-            if opt != pes:
-                continue
-            if not opt:
-                upper_bound = load_stats
-                break
-            lower_bound = load_stats
-        if lower_bound:
-            lower_bound = TrimmedStat.for_target(lower_bound, target)
-        if upper_bound:
-            upper_bound = TrimmedStat.for_target(upper_bound, target)
-        return RelevantBounds(clo=lower_bound, chi=upper_bound)
+        return self.target_to_bounds[target].get_relevant_bounds()
@@ -17,7 +17,7 @@ import logging
 import time
 
 from dataclasses import dataclass
-from typing import Callable, Optional, Tuple
+from typing import Callable, Dict, Generator, Optional, Tuple
 
 from .candidate import Candidate
 from .config import Config
@@ -33,7 +33,7 @@ from .pep3140 import Pep3140Dict
 from .search_goal import SearchGoal
 from .selector import Selector
 from .target_scaling import TargetScaling
-from .trial_measurement import AbstractMeasurer
+from .trial_measurement import AbstractMeasurer, MeasurementResult
 
 
 @dataclass
@@ -99,11 +99,19 @@ class MultipleLossRatioSearch:
     measuring a load as soon as it becomes a lower bound,
     so conditional throughput is usually based on forwarding rate
     of the worst on the good long trials.
+
+    Internally, the search is a generator (see search_steps)
+    yielding inputs for the next trial and waiting for its result.
+    The search method drives the generator with a synchronous measurer,
+    ParallelSearch drives multiple generators with trials
+    of different searches running concurrently.
     """
 
     config: Config
     """Arguments required at construction time."""
     # End of fields required at intance creation.
+    clock: Callable[[], float] = time.monotonic
+    """Source of time values for the search timeout, e.g. a virtual clock."""
     measurer: AbstractMeasurer = secondary_field()
     """Measurer to use, set at calling search()."""
     debug: Callable[[str], None] = secondary_field()
@@ -120,7 +128,7 @@ class MultipleLossRatioSearch:
     database: MeasurementDatabase = secondary_field()
     """Storage for (stats of) measurement results so far."""
     stop_time: float = secondary_field()
-    """Monotonic time value at which the search should end with failure."""
+    """Clock value at which the search should end with failure."""
 
     def search(
         self,
@@ -145,6 +153,49 @@ class MultipleLossRatioSearch:
             that has fail fast true.
         """
         self.measurer = measurer
+        steps = self.search_steps(debug=debug)
+        try:
+            duration, load = next(steps)
+            while 1:
+                result = self.measurer.measure(
+                    intended_duration=duration,
+                    intended_load=load,
+                )
+                duration, load = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def search_steps(
+        self,
+        debug: Optional[Callable[[str], None]] = None,
+    ) -> Generator[
+        Tuple[float, float],
+        MeasurementResult,
+        Pep3140Dict[SearchGoal, GoalResult],
+    ]:
+        """Return generator performing the search without a measurer.
+
+        The generator yields intended duration and intended load
+        (both float) of the next trial, and expects the caller
+        to send the measurement result back.
+        When the search is done, the generator returns the same structure
+        search() returns (as the value of StopIteration).
+
+        This way, the caller decides when and how the trials are measured,
+        e.g. concurrently with trials of other searches.
+
+        :param debug: Callable to optionally use instead of logging.debug().
+        :type debug: Optional[Callable[[str], None]]
+        :returns: Generator of trial inputs, returning the goal results.
+        :rtype: Generator[
+            Tuple[float, float],
+            MeasurementResult,
+            Pep3140Dict[SearchGoal, GoalResult],
+        ]
+        :raises RuntimeError: If total duration is larger than timeout,
+            or if min load becomes an upper bound for a search goal
+            that has fail fast true.
+        """
         self.debug = logging.debug if debug is None else debug
         self.rounding = LoadRounding(
             min_load=self.config.min_load,
@@ -161,9 +212,20 @@ class MultipleLossRatioSearch:
             rounding=self.rounding,
         )
         self.database = MeasurementDatabase(self.scaling.targets)
-        self.stop_time = time.monotonic() + self.config.search_duration_max
-        result0, result1 = self.run_initial_trials()
-        self.main_loop(result0.discrete_load, result1.discrete_load)
+        self.stop_time = self.clock() + self.config.search_duration_max
+        goal_to_loads = self.get_warm_start_loads()
+        if any(goal not in goal_to_loads for goal in self.config.goals):
+            result0, result1 = yield from self.run_initial_trials()
+            load0, load1 = result0.discrete_load, result1.discrete_load
+        else:
+            self.debug("All goals have known loads, skipping initial trials.")
+            yield from self.run_warmup_trial()
+            # The narrowest known interval is used for the global width.
+            load0, load1 = min(
+                ((lo, hi if hi else lo) for lo, hi in goal_to_loads.values()),
+                key=lambda loads: int(loads[1] - loads[0]),
+            )
+        yield from self.main_loop(load0, load1, goal_to_loads)
         ret_dict = Pep3140Dict()
         for goal in self.config.goals:
             target = self.scaling.goal_to_final_target[goal]
@@ -171,18 +233,25 @@ class MultipleLossRatioSearch:
             ret_dict[goal] = GoalResult.from_bounds(bounds=bounds)
         return ret_dict
 
-    def measure(self, duration: float, load: DiscreteLoad) -> DiscreteResult:
-        """Call measurer and put the result to appropriate form in database.
+    def measure(
+        self, duration: float, load: DiscreteLoad
+    ) -> Generator[Tuple[float, float], MeasurementResult, DiscreteResult]:
+        """Yield trial inputs, put the result to appropriate form in database.
 
         Also check the argument types and load roundness,
         and return the result to the caller.
 
+        This is a generator, callers use "yield from",
+        the result (sent by whoever drives search_steps) is its return value.
+
         :param duration: Intended duration for the trial measurement.
         :param load: Intended load for the trial measurement:
         :type duration: float
         :type load: DiscreteLoad
-        :returns: The trial results.
-        :rtype: DiscreteResult
+        :returns: Generator returning the trial results.
+        :rtype: Generator[
+            Tuple[float, float], MeasurementResult, DiscreteResult
+        ]
         :raises RuntimeError: If an argument doed not have the required type.
         """
         if not isinstance(duration, float):
@@ -192,16 +261,83 @@ class MultipleLossRatioSearch:
         if not load.is_round:
             raise RuntimeError(f"Told to measure unrounded: {load!r}")
         self.debug(f"Measuring at d={duration},il={int(load)}")
-        result = self.measurer.measure(
-            intended_duration=duration,
-            intended_load=float(load),
-        )
+        result = yield duration, float(load)
+        if not isinstance(result, MeasurementResult):
+            raise RuntimeError(f"Result has wrong type: {result!r}")
         self.debug(f"Measured lr={result.loss_ratio}")
         result = DiscreteResult.with_load(result=result, load=load)
         self.database.add(result)
         return result
 
-    def run_initial_trials(self) -> Tuple[DiscreteResult, DiscreteResult]:
+    def get_warm_start_loads(
+        self,
+    ) -> Dict[SearchGoal, Tuple[DiscreteLoad, Optional[DiscreteLoad]]]:
+        """Convert known loads from config warm start to initial loads.
+
+        Goals without known loads are not present in the returned mapping.
+
+        The lower load is rounded and adjusted by limit handler,
+        using the final target width, so tight intervals from previous
+        searches stay tight. If the upper load is missing
+        (or not above the lower one), the width of the initial target
+        (the one without preceding target) is added to the lower load.
+        Upper load is None if the lower load is the max load.
+
+        :returns: Mapping from goal to initial lower and upper load.
+        :rtype: Dict[SearchGoal, Tuple[DiscreteLoad, Optional[DiscreteLoad]]]
+        """
+        goal_to_loads = {}
+        if not self.config.warm_start:
+            return goal_to_loads
+        known = self.config.warm_start.goal_to_loads
+        max_load = self.limit_handler.max_load
+        for goal in self.config.goals:
+            if goal not in known:
+                continue
+            lower, upper = known[goal]
+            final_target = initial_target = self.scaling.goal_to_final_target[
+                goal
+            ]
+            while initial_target.preceding:
+                initial_target = initial_target.preceding
+            width = final_target.discrete_width
+            lower = self.from_float(lower)
+            lower = self.limit_handler.handle(lower, width, None, None)
+            if lower >= max_load:
+                upper = None
+            else:
+                upper = self.from_float(upper).rounded_down() if upper else None
+                if not upper or upper <= lower:
+                    upper = lower + initial_target.discrete_width
+                upper = self.limit_handler.handle(upper, width, lower, None)
+            self.debug(f"Goal {goal} known loads: {lower} {upper}")
+            goal_to_loads[goal] = (lower, upper)
+        return goal_to_loads
+
+    def run_warmup_trial(
+        self,
+    ) -> Generator[Tuple[float, float], MeasurementResult, None]:
+        """Perform warmup trial if configured, reset the database after it.
+
+        This is a generator, see measure.
+
+        :returns: Generator returning None.
+        :rtype: Generator[Tuple[float, float], MeasurementResult, None]
+        """
+        if self.config.warmup_duration:
+            self.debug("Warmup trial.")
+            max_load = self.limit_handler.max_load
+            yield from self.measure(self.config.warmup_duration, max_load)
+            # Warmup should not affect the real results, reset the database.
+            self.database = MeasurementDatabase(self.scaling.targets)
+
+    def run_initial_trials(
+        self,
+    ) -> Generator[
+        Tuple[float, float],
+        MeasurementResult,
+        Tuple[DiscreteResult, DiscreteResult],
+    ]:
         """Perform trials to get enough data to start the selectors.
 
         Measurements are done with all initial targets in mind,
@@ -222,8 +358,15 @@ class MultipleLossRatioSearch:
         and compute width later. The "one value twice" happens when max load
         has small loss, or when min load has big loss.
 
-        :returns: Two last measured values, in any order. Or one value twice.
-        :rtype: Tuple[DiscreteResult, DiscreteResult]
+        This is a generator, see measure.
+
+        :returns: Generator returning two last measured values, in any order.
+            Or one value twice.
+        :rtype: Generator[
+            Tuple[float, float],
+            MeasurementResult,
+            Tuple[DiscreteResult, DiscreteResult],
+        ]
         """
         max_load = self.limit_handler.max_load
         ratio, duration, width = None, None, None
@@ -237,13 +380,9 @@ class MultipleLossRatioSearch:
             if not width or width < target.discrete_width:
                 width = target.discrete_width
         self.debug(f"Init ratio {ratio} duration {duration} width {width}")
-        if self.config.warmup_duration:
-            self.debug("Warmup trial.")
-            self.measure(self.config.warmup_duration, max_load)
-            # Warmup should not affect the real results, reset the database.
-            self.database = MeasurementDatabase(self.scaling.targets)
+        yield from self.run_warmup_trial()
         self.debug(f"First trial at max rate: {max_load}")
-        result0 = self.measure(duration, max_load)
+        result0 = yield from self.measure(duration, max_load)
         rfr = result0.relative_forwarding_rate
         corrected_rfr = (self.from_float(rfr) / (1.0 - ratio)).rounded_down()
         if corrected_rfr >= max_load:
@@ -251,7 +390,7 @@ class MultipleLossRatioSearch:
             return result0, result0
         mrr = self.limit_handler.handle(corrected_rfr, width, None, max_load)
         self.debug(f"Second trial at (corrected) mrr: {mrr}")
-        result1 = self.measure(duration, mrr)
+        result1 = yield from self.measure(duration, mrr)
         # Attempt to get narrower width.
         result_ratio = result1.loss_ratio
         if result_ratio > ratio:
@@ -265,13 +404,22 @@ class MultipleLossRatioSearch:
             self.debug("Close enough, measuring at mrr2 is not needed.")
             return result1, result1
         self.debug(f"Third trial at (corrected) mrr2: {mrr2}")
-        result2 = self.measure(duration, mrr2)
+        result2 = yield from self.measure(duration, mrr2)
         return result1, result2
 
-    def main_loop(self, load0: DiscreteLoad, load1: DiscreteLoad) -> None:
+    def main_loop(
+        self,
+        load0: DiscreteLoad,
+        load1: DiscreteLoad,
+        goal_to_loads: Optional[
+            Dict[SearchGoal, Tuple[DiscreteLoad, Optional[DiscreteLoad]]]
+        ] = None,
+    ) -> Generator[Tuple[float, float], MeasurementResult, None]:
         """Initialize selectors and keep measuring the winning candidate.
 
         Selectors are created, the two input loads are useful starting points.
+        Selectors for goals with known loads (from warm start)
+        start from those loads instead.
 
         The search ends when no selector nominates any candidate,
         or if the search takes too long (or if a selector raises).
@@ -282,29 +430,39 @@ class MultipleLossRatioSearch:
         As a selector is only allowed to update current width as the winner,
         the update is done here explicitly.
 
+        This is a generator, see measure.
+
         :param load0: Discrete load of one of results from run_initial_trials.
         :param load1: Discrete load of other of results from run_initial_trials.
+        :param goal_to_loads: Initial lower and upper loads for some goals.
         :type load0: DiscreteLoad
         :type load1: DiscreteLoad
+        :type goal_to_loads: Optional[
+            Dict[SearchGoal, Tuple[DiscreteLoad, Optional[DiscreteLoad]]]
+        ]
+        :returns: Generator returning None when the search is done.
+        :rtype: Generator[Tuple[float, float], MeasurementResult, None]
         :raises RuntimeError: If the search takes too long,
             or if min load becomes an upper bound for any search goal
         """
         if load1 < load0:
             load0, load1 = load1, load0
         global_width = GlobalWidth.from_loads(load0, load1)
+        goal_to_loads = goal_to_loads or {}
         selectors = []
-        for target in self.scaling.goal_to_final_target.values():
+        for goal, target in self.scaling.goal_to_final_target.items():
+            lower, upper = goal_to_loads.get(goal, (load0, load1))
             selector = Selector(
                 final_target=target,
                 global_width=global_width,
-                initial_lower_load=load0,
-                initial_upper_load=load1,
+                initial_lower_load=lower,
+                initial_upper_load=upper,
                 database=self.database,
                 handler=self.limit_handler,
                 debug=self.debug,
             )
             selectors.append(selector)
-        while time.monotonic() < self.stop_time:
+        while self.clock() < self.stop_time:
             winner = Candidate()
             for selector in selectors:
                 # Order of arguments is important
@@ -315,7 +473,7 @@ class MultipleLossRatioSearch:
             # We do not check duration versus stop_time here,
             # as some measurers can be unpredictably faster
             # than their intended duration suggests.
-            self.measure(duration=winner.duration, load=winner.load)
+            yield from self.measure(duration=winner.duration, load=winner.load)
             # Delayed updates.
             if winner.width:
                 global_width.width = winner.width
@@ -0,0 +1,150 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining ParallelSearch class."""
+
+import logging
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from .config import Config
+from .goal_result import GoalResult
+from .multiple_loss_ratio_search import MultipleLossRatioSearch
+from .pep3140 import Pep3140Dict
+from .search_goal import SearchGoal
+from .trial_measurement import AbstractParallelMeasurer, MeasurementResult
+
+
+@dataclass
+class ParallelSearch:
+    """Driver performing several independent searches at the same time.
+
+    Each search is an ordinary MLRsearch with its own config,
+    for example one for each port pair of a traffic generator,
+    or one for each test on a multi-link testbed.
+    Searches are not aware of each other, the driver only interleaves
+    their trials, so the results are the same as if the searches
+    were performed one after another (except for the influence
+    the concurrent traffic may have on the SUTs).
+
+    Trial inputs nominated by searches wait in one queue (first come,
+    first served), and are started on a parallel measurer,
+    with the index of the search acting as the channel.
+    If the traffic generator can run only a limited number
+    of trials at once, max_parallel limits how many trials
+    are in progress.
+
+    As trial durations dominate the overall duration of searches,
+    running trials concurrently increases the number of tests per hour
+    on shared testbeds.
+    """
+
+    configs: Tuple[Config, ...]
+    """Config for each search, the index is the channel for the measurer."""
+    max_parallel: Optional[int] = None
+    """Maximal number of trials in progress, None means no limit."""
+
+    def __post_init__(self) -> None:
+        """Check and convert the fields.
+
+        :raises ValueError: If there are no configs or the limit is too low.
+        """
+        self.configs = tuple(self.configs)
+        if not self.configs:
+            raise ValueError(f"No configs to search with: {self.configs!r}")
+        if self.max_parallel is not None:
+            self.max_parallel = int(self.max_parallel)
+            if self.max_parallel < 1:
+                raise ValueError(f"Max parallel too low: {self.max_parallel}")
+
+    def search(
+        self,
+        measurer: AbstractParallelMeasurer,
+        debug: Optional[Callable[[str], None]] = None,
+    ) -> List[Pep3140Dict[SearchGoal, GoalResult]]:
+        """Perform all searches, return their results.
+
+        Each search is started, its first trial is queued.
+        Whenever a trial finishes, its result is sent to the search
+        which nominated it, and the next trial of that search is queued.
+        Queued trials are started as long as the parallel limit allows.
+
+        If a search raises, no more trials are started,
+        trials in progress are waited for (so the traffic generator
+        is idle when this returns), and the exception is re-raised.
+        Failures of those trials are only logged, not to mask it.
+
+        :param measurer: Provider of concurrent trial measurements.
+        :param debug: Callable to optionally use instead of logging.debug().
+            The messages are prefixed by the index of the search.
+        :type measurer: AbstractParallelMeasurer
+        :type debug: Optional[Callable[[str], None]]
+        :returns: Goal results of each search, in the order of configs.
+        :rtype: List[Pep3140Dict[SearchGoal, GoalResult]]
+        :raises RuntimeError: If any of the searches fails.
+        """
+        debug = logging.debug if debug is None else debug
+        steps = [
+            MultipleLossRatioSearch(config).search_steps(
+                debug=lambda text, index=index: debug(f"Search {index}: {text}")
+            )
+            for index, config in enumerate(self.configs)
+        ]
+        results = [None] * len(steps)
+        queue = deque()
+
+        def advance(channel: int, value: Optional[MeasurementResult]) -> None:
+            """Send value to the search, queue its next trial or store result.
+
+            :param channel: Index of the search to advance.
+            :param value: The measurement result, or None to start the search.
+            :type channel: int
+            :type value: Optional[MeasurementResult]
+            """
+            try:
+                duration, load = steps[channel].send(value)
+            except StopIteration as stop:
+                results[channel] = stop.value
+                debug(f"Search {channel} done.")
+                return
+            queue.append((channel, duration, load))
+
+        running = 0
+        try:
+            for channel in range(len(steps)):
+                advance(channel, None)
+            while queue or running:
+                limit = self.max_parallel
+                while queue and (limit is None or running < limit):
+                    channel, duration, load = queue.popleft()
+                    measurer.start(
+                        channel=channel,
+                        intended_duration=duration,
+                        intended_load=load,
+                    )
+                    running += 1
+                running -= 1
+                channel, result = measurer.wait()
+                advance(channel, result)
+        finally:
+            # Collect the trials still running, so the measurer is reusable.
+            # Their failures must not mask the exception being propagated.
+            while running:
+                running -= 1
+                try:
+                    measurer.wait()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logging.warning(f"Collecting running trial failed: {exc!r}")
+        return results
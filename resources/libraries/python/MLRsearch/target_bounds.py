@@ -0,0 +1,102 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining TargetBounds class."""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .load_stats import LoadStats
+from .relevant_bounds import RelevantBounds
+from .target_spec import TargetSpec
+from .trimmed_stat import TrimmedStat
+
+
+@dataclass
+class TargetBounds:
+    """Loads classified as lower or upper bounds for a single target.
+
+    MeasurementDatabase keeps one instance for each target,
+    and calls update with stats of the load a new result was added to.
+    Only that load can change its classification,
+    so the sorted lists of bound loads are updated by bisection,
+    without iterating over all loads.
+
+    The relevant bounds are computed from the sorted lists,
+    and cached until a classification changes.
+    """
+
+    target: TargetSpec
+    """The target to classify loads for."""
+    lower_loads: List[float] = field(repr=False, default_factory=list)
+    """Sorted float values of loads classified as lower bounds."""
+    upper_loads: List[float] = field(repr=False, default_factory=list)
+    """Sorted float values of loads classified as upper bounds."""
+    load_to_bound: Dict[float, Tuple[bool, LoadStats]] = field(
+        repr=False, default_factory=dict
+    )
+    """Mapping from float values of bound loads to whether the load
+    is a lower bound (or upper bound), and to the stats of the load."""
+    relevant_bounds: Optional[RelevantBounds] = field(repr=False, default=None)
+    """Cached relevant bounds, None if a classification has changed since."""
+
+    def update(self, load_stats: LoadStats) -> None:
+        """Classify the load again, move it between the lists if needed.
+
+        :param load_stats: Stats of the load to classify.
+        :type load_stats: LoadStats
+        """
+        float_load = float(load_stats)
+        opt, pes = load_stats.estimates(self.target)
+        is_lower = opt if opt == pes else None
+        was_lower, _ = self.load_to_bound.get(float_load, (None, None))
+        if is_lower is was_lower:
+            return
+        if was_lower is not None:
+            loads = self.lower_loads if was_lower else self.upper_loads
+            del loads[bisect_left(loads, float_load)]
+            del self.load_to_bound[float_load]
+        if is_lower is not None:
+            loads = self.lower_loads if is_lower else self.upper_loads
+            insort(loads, float_load)
+            self.load_to_bound[float_load] = (is_lower, load_stats)
+        self.relevant_bounds = None
+
+    def get_relevant_bounds(self) -> RelevantBounds:
+        """Return the (cached) relevant bounds, trimmed to the target.
+
+        The relevant upper bound is the first of upper loads,
+        the relevant lower bound is the last of lower loads below that.
+
+        :returns: Relevant lower bound, relevant upper bound.
+        :rtype: RelevantBounds
+        """
+        if self.relevant_bounds is None:
+            lower_bound, upper_bound = None, None
+            index = len(self.lower_loads)
+            if self.upper_loads:
+                upper_load = self.upper_loads[0]
+                upper_bound = TrimmedStat.for_target(
+                    self.load_to_bound[upper_load][1], self.target
+                )
+                index = bisect_left(self.lower_loads, upper_load)
+            if index:
+                lower_bound = TrimmedStat.for_target(
+                    self.load_to_bound[self.lower_loads[index - 1]][1],
+                    self.target,
+                )
+            self.relevant_bounds = RelevantBounds(
+                clo=lower_bound, chi=upper_bound
+            )
+        return self.relevant_bounds
@@ -13,8 +13,9 @@
 
 """Module defining LoadStat class."""
 
+from bisect import insort
 from dataclasses import dataclass, field
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 from .target_spec import TargetSpec
 from .discrete_result import DiscreteResult
@@ -48,6 +49,8 @@ class TargetStat:
     """Sum of durations of shorter trials not satisfying target loss ratio."""
     long_losses: Dict[float, float] = field(repr=False, default_factory=dict)
     """If a loss ratio value occured in a long trial, map it to duration sum."""
+    long_ratios: List[float] = field(repr=False, default_factory=list)
+    """Keys of long_losses, kept sorted from low to high loss ratio."""
 
     def __str__(self) -> str:
         """Convert into a short human-readable string.
@@ -74,7 +77,7 @@ class TargetStat:
         if result.intended_duration >= self.target.trial_duration:
             if rlr not in self.long_losses:
                 self.long_losses[rlr] = 0.0
-                self.long_losses = dict(sorted(self.long_losses.items()))
+                insort(self.long_ratios, rlr)
             self.long_losses[rlr] += dwo
             if rlr > self.target.loss_ratio:
                 self.bad_long += dwo
@@ -141,10 +144,10 @@ class TargetStat:
         all_long = max(self.target.duration_sum, self.good_long + self.bad_long)
         remaining = all_long * (1.0 - self.target.exceed_ratio)
         ret = None
-        for ratio, dursum in self.long_losses.items():
+        for ratio in self.long_ratios:
             if ret is None or remaining > 0.0:
                 ret = ratio
-                remaining -= dursum
+                remaining -= self.long_losses[ratio]
             else:
                 break
         else:
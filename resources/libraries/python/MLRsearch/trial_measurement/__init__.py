@@ -16,4 +16,9 @@ __init__ file for Python package "trial_measurement".
 """
 
 from .abstract_measurer import AbstractMeasurer
+from .abstract_parallel_measurer import AbstractParallelMeasurer
 from .measurement_result import MeasurementResult
+from .simulated_measurer import SimulatedMeasurer
+from .sut_profile import SutProfile
+from .threaded_measurer import ThreadedMeasurer
+from .virtual_clock import VirtualClock
@@ -0,0 +1,59 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining AbstractParallelMeasurer class."""
+
+from abc import ABCMeta, abstractmethod
+from typing import Tuple
+
+from .measurement_result import MeasurementResult as Result
+
+
+class AbstractParallelMeasurer(metaclass=ABCMeta):
+    """Abstract class defining API for providers of concurrent trials.
+
+    Compared to AbstractMeasurer, starting a trial and getting its result
+    are separate calls, so trials of multiple independent searches
+    can be in progress at the same time.
+
+    Each search gets a channel, an integer identifying the part
+    of the traffic generator the search uses (e.g. a port pair,
+    or a link on a multi-link testbed).
+    At most one trial is in progress on a channel at any time.
+    """
+
+    @abstractmethod
+    def start(
+        self, channel: int, intended_duration: float, intended_load: float
+    ) -> None:
+        """Start trial measurement on the channel and return immediately.
+
+        :param channel: Index of the search the trial is measured for.
+        :param intended_duration: Intended trial duration [s].
+        :param intended_load: Intended rate of transactions (packets) [tps].
+            It is a per-port rate, e.g. uni-directional for SUTs
+            with two ports.
+        :type channel: int
+        :type intended_duration: float
+        :type intended_load: float
+        """
+
+    @abstractmethod
+    def wait(self) -> Tuple[int, Result]:
+        """Wait until any of the started trials finishes, return its result.
+
+        Each started trial is returned exactly once.
+
+        :returns: Channel of the finished trial and its measurement result.
+        :rtype: Tuple[int, measurement_result.MeasurementResult]
+        """
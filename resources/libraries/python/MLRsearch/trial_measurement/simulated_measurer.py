@@ -0,0 +1,100 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining SimulatedMeasurer class."""
+
+import math
+import random
+
+from dataclasses import dataclass
+from typing import Optional
+
+from ..dataclass import secondary_field
+from .abstract_measurer import AbstractMeasurer
+from .measurement_result import MeasurementResult as Result
+from .sut_profile import SutProfile
+from .virtual_clock import VirtualClock
+
+
+@dataclass
+class SimulatedMeasurer(AbstractMeasurer):
+    """Measurer simulating a SUT, returning results immediately.
+
+    The losses follow the given profile, random effects use a generator
+    created from the seed, so the results are reproducible.
+    Instead of waiting, the virtual clock is advanced by intended duration
+    plus trial overhead. When the clock is also given
+    to MultipleLossRatioSearch, the search timeout applies
+    to the simulated time, and the clock value after the search
+    is the time the search would take on a real testbed.
+
+    Useful for evaluating changes to the search logic without a testbed.
+    """
+
+    profile: SutProfile = SutProfile()
+    """Behavior of the simulated SUT."""
+    seed: int = 0
+    """Seed for the random generator."""
+    clock: Optional[VirtualClock] = None
+    """Clock to advance, None means a new clock starting at zero."""
+    # Primary fields above, computed fields below.
+    rng: random.Random = secondary_field()
+    """Random generator, created from the seed."""
+    trials: int = secondary_field()
+    """Number of trials measured so far."""
+    trial_seconds: float = secondary_field()
+    """Sum of intended durations of trials measured so far [s]."""
+
+    def __post_init__(self) -> None:
+        """Create the random generator and clock if needed, zero the counters.
+        """
+        self.rng = random.Random(self.seed)
+        if self.clock is None:
+            self.clock = VirtualClock()
+        self.trials = 0
+        self.trial_seconds = 0.0
+
+    def measure(self, intended_duration: float, intended_load: float) -> Result:
+        """Advance the clock and return the simulated result.
+
+        :param intended_duration: Intended trial duration [s].
+        :param intended_load: Intended rate of transactions (packets) [tps].
+        :type intended_duration: float
+        :type intended_load: float
+        :returns: Structure detailing the result of the measurement.
+        :rtype: MeasurementResult
+        """
+        profile = self.profile
+        self.trials += 1
+        self.trial_seconds += intended_duration
+        duration_with_overheads = intended_duration + profile.trial_overhead
+        self.clock.advance(duration_with_overheads)
+        capacity = profile.capacity
+        if profile.noise:
+            capacity *= max(0.01, self.rng.gauss(1.0, profile.noise))
+        ratio = profile.nominal_loss_ratio(intended_load, capacity)
+        if profile.inversion_probability:
+            if self.rng.random() < profile.inversion_probability:
+                ratio += profile.inversion_loss
+        offered = int(intended_load * intended_duration)
+        loss = math.ceil(offered * ratio)
+        if profile.background:
+            ratio = self.rng.expovariate(1.0) * profile.background
+            loss += int(offered * ratio)
+        return Result(
+            intended_duration=intended_duration,
+            intended_load=intended_load,
+            offered_count=offered,
+            loss_count=min(offered, loss),
+            duration_with_overheads=duration_with_overheads,
+        )
@@ -0,0 +1,115 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining SutProfile class."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SutProfile:
+    """Parameters describing behavior of a simulated SUT and testbed.
+
+    The nominal loss curve is deterministic. Above the capacity,
+    all excess load is lost. Above the knee, small losses grow linearly,
+    reaching knee_loss ratio at capacity. Below the knee there is no loss.
+
+    Random effects are added on top of the nominal curve.
+    Noise perturbs the capacity of each trial, background loss
+    adds a few packets lost at any load, and inversions are trials
+    with a loss spike, so a lower load can see more loss than a higher one.
+    When all the random effects are zero, no random numbers are used.
+
+    Trial overhead is the time a real testbed spends besides
+    the traffic itself (e.g. traffic generator start and stop).
+    It is reported as a part of duration with overheads,
+    which also counts towards duration sums of search targets.
+    """
+
+    capacity: float = 1e7
+    """Load [tps] above which all excess load is lost."""
+    knee: float = 1.0
+    """Relative load (in units of capacity) where small losses start."""
+    knee_loss: float = 0.0
+    """Loss ratio of the small losses at capacity."""
+    noise: float = 0.0
+    """Relative standard deviation of the capacity in a trial."""
+    background: float = 0.0
+    """Average loss ratio of randomly lost packets, at any load."""
+    inversion_probability: float = 0.0
+    """Probability of a trial being affected by a loss spike."""
+    inversion_loss: float = 0.0
+    """Loss ratio added by a loss spike."""
+    trial_overhead: float = 0.0
+    """Time [s] spent by each trial in addition to its intended duration."""
+
+    def __post_init__(self) -> None:
+        """Check the values are meaningful.
+
+        :raises ValueError: If any value is out of its range.
+        """
+        if self.capacity <= 0.0:
+            raise ValueError(f"Capacity has to be positive: {self!r}")
+        if not 0.0 < self.knee <= 1.0:
+            raise ValueError(f"Knee has to be in (0, 1]: {self!r}")
+        if not 0.0 <= self.inversion_probability <= 1.0:
+            raise ValueError(f"Probability not in [0, 1]: {self!r}")
+        for value in (
+            self.knee_loss, self.noise, self.background,
+            self.inversion_loss, self.trial_overhead,
+        ):
+            if value < 0.0:
+                raise ValueError(f"Negative value {value!r} in {self!r}")
+
+    def nominal_loss_ratio(
+        self, intended_load: float, capacity: Optional[float] = None
+    ) -> float:
+        """Return loss ratio given by the nominal curve.
+
+        :param intended_load: Intended rate of transactions (packets) [tps].
+        :param capacity: Capacity to use instead of the nominal one [tps].
+        :type intended_load: float
+        :type capacity: Optional[float]
+        :returns: Ratio of lost packets, without random effects.
+        :rtype: float
+        """
+        if capacity is None:
+            capacity = self.capacity
+        relative_load = intended_load / capacity
+        ratio = max(0.0, 1.0 - 1.0 / relative_load)
+        if self.knee < 1.0 and relative_load > self.knee:
+            knee_part = (relative_load - self.knee) / (1.0 - self.knee)
+            ratio += self.knee_loss * min(1.0, knee_part)
+        return ratio
+
+    def critical_load(self, loss_ratio: float) -> float:
+        """Return the highest load with nominal loss ratio not above given.
+
+        This is the value an ideal search would find
+        for a goal with the given loss ratio, if there were no random effects.
+        Computed by bisection, as the curve is monotonic.
+
+        :param loss_ratio: Loss ratio of the search goal.
+        :type loss_ratio: float
+        :returns: The critical load [tps].
+        :rtype: float
+        """
+        low, high = 0.0, self.capacity / (1.0 - min(loss_ratio, 0.99))
+        for _ in range(100):
+            middle = (low + high) / 2.0
+            if self.nominal_loss_ratio(middle) > loss_ratio:
+                high = middle
+            else:
+                low = middle
+        return low
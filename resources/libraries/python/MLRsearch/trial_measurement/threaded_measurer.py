@@ -0,0 +1,88 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining ThreadedMeasurer class."""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Sequence, Tuple
+
+from .abstract_measurer import AbstractMeasurer
+from .abstract_parallel_measurer import AbstractParallelMeasurer
+from .measurement_result import MeasurementResult as Result
+
+
+@dataclass
+class ThreadedMeasurer(AbstractParallelMeasurer):
+    """Parallel measurer calling ordinary measurers in threads.
+
+    Each channel has its own (blocking) measurer, for example
+    one traffic generator instance per port pair.
+    Trials on different channels run in separate threads,
+    so the measurers have to be independent of each other.
+    """
+
+    measurers: Sequence[AbstractMeasurer]
+    """Measurer to use for each channel, indexed by channel."""
+    executor: ThreadPoolExecutor = field(init=False, repr=False)
+    """Thread pool with one thread for each channel."""
+    future_to_channel: Dict[Future, int] = field(init=False, repr=False)
+    """Trials in progress, mapped to their channels."""
+
+    def __post_init__(self) -> None:
+        """Create the thread pool.
+
+        :raises ValueError: If there are no measurers.
+        """
+        if not self.measurers:
+            raise ValueError(f"No measurers: {self.measurers!r}")
+        self.executor = ThreadPoolExecutor(max_workers=len(self.measurers))
+        self.future_to_channel = {}
+
+    def start(
+        self, channel: int, intended_duration: float, intended_load: float
+    ) -> None:
+        """Call measure of the channel measurer in a thread.
+
+        :param channel: Index of the measurer to use.
+        :param intended_duration: Intended trial duration [s].
+        :param intended_load: Intended rate of transactions (packets) [tps].
+        :type channel: int
+        :type intended_duration: float
+        :type intended_load: float
+        """
+        future = self.executor.submit(
+            self.measurers[channel].measure,
+            intended_duration=intended_duration,
+            intended_load=intended_load,
+        )
+        self.future_to_channel[future] = channel
+
+    def wait(self) -> Tuple[int, Result]:
+        """Wait for the first of trials in progress to finish.
+
+        :returns: Channel of the finished trial and its measurement result.
+        :rtype: Tuple[int, measurement_result.MeasurementResult]
+        :raises RuntimeError: If no trial is in progress.
+        """
+        if not self.future_to_channel:
+            raise RuntimeError("No trial in progress.")
+        done, _ = wait(self.future_to_channel, return_when=FIRST_COMPLETED)
+        future = next(iter(done))
+        channel = self.future_to_channel.pop(future)
+        return channel, future.result()
+
+    def close(self) -> None:
+        """Wait for trials in progress and stop the threads."""
+        self.executor.shutdown(wait=True)
+        self.future_to_channel = {}
@@ -0,0 +1,49 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining VirtualClock class."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class VirtualClock:
+    """Clock advanced explicitly instead of following the real time.
+
+    Instances are callable, so they can replace time.monotonic
+    where the search reads time. A simulated measurer advances the clock
+    by the duration the trial would take on a real testbed,
+    so search timeouts apply to the simulated time.
+    """
+
+    now: float = 0.0
+    """Current time value [s]."""
+
+    def __call__(self) -> float:
+        """Return the current time value.
+
+        :returns: Current time value [s].
+        :rtype: float
+        """
+        return self.now
+
+    def advance(self, duration: float) -> None:
+        """Move the clock forward.
+
+        :param duration: Time to add to the current value [s].
+        :type duration: float
+        :raises ValueError: If the duration is negative.
+        """
+        if duration < 0.0:
+            raise ValueError(f"Clock cannot go back: {duration!r}")
+        self.now += duration
@@ -0,0 +1,157 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module defining WarmStart class."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from .goal_result import GoalResult
+from .search_goal import SearchGoal
+
+
+@dataclass
+class WarmStart:
+    """Bound loads known from previous searches, used as starting points.
+
+    For daily trending, results of the previous run of the same test
+    on the same testbed are usually close to the current ones.
+    When a search goal has known loads, the search starts
+    with selectors focusing on the interval between them
+    (instead of initial trials at max load and external search),
+    the loads are verified by the usual strategies,
+    and the search continues as usual if they turn out to be wrong.
+
+    The loads are intended loads [tps] as used by the search
+    (not aggregated rates as usually reported).
+    The upper load is optional, if missing, the search uses the lower load
+    plus the width of the initial target of the goal.
+    Goals are matched by equality, so the known loads are used only
+    if all goal attributes are the same as in the previous search.
+    """
+
+    goal_to_loads: Dict[SearchGoal, Tuple[float, Optional[float]]] = field(
+        default_factory=dict
+    )
+    """Mapping from search goal to known lower and (maybe) upper load."""
+
+    def __post_init__(self) -> None:
+        """Check and convert the loads.
+
+        :raises TypeError: If a key is not a SearchGoal.
+        :raises ValueError: If a lower load is not positive.
+        """
+        goal_to_loads = {}
+        for goal, (lower, upper) in self.goal_to_loads.items():
+            if not isinstance(goal, SearchGoal):
+                raise TypeError(f"Must be a SearchGoal instance: {goal}")
+            lower = float(lower)
+            if lower <= 0.0:
+                raise ValueError(f"Lower load must be positive: {lower}")
+            upper = None if upper is None else float(upper)
+            goal_to_loads[goal] = (lower, upper)
+        self.goal_to_loads = goal_to_loads
+
+    @staticmethod
+    def from_goal_results(
+        goal_results: Mapping[SearchGoal, GoalResult]
+    ) -> WarmStart:
+        """Factory creating instance from results of a previous search.
+
+        Goals without relevant lower bound are skipped.
+
+        :param goal_results: The result of MultipleLossRatioSearch.search().
+        :type goal_results: Mapping[SearchGoal, GoalResult]
+        :returns: Newly created instance with relevant bounds as the loads.
+        :rtype: WarmStart
+        """
+        goal_to_loads = {}
+        for goal, result in goal_results.items():
+            if not (lower := result.relevant_lower_bound):
+                continue
+            upper = result.relevant_upper_bound
+            upper = float(upper) if upper else None
+            goal_to_loads[goal] = (float(lower), upper)
+        return WarmStart(goal_to_loads)
+
+    @staticmethod
+    def from_file(path: str) -> WarmStart:
+        """Factory creating instance from a file written by to_file().
+
+        :param path: Path to the JSON file to read.
+        :type path: str
+        :returns: Newly created instance with loads from the file.
+        :rtype: WarmStart
+        """
+        with open(path, "rt", encoding="utf-8") as file_in:
+            items = json.load(file_in)
+        return WarmStart({
+            SearchGoal(**item["goal"]): (item["lower"], item["upper"])
+            for item in items
+        })
+
+    @staticmethod
+    def from_export_json(
+        path: str, goals: Iterable[SearchGoal], ppta: float = 1.0
+    ) -> WarmStart:
+        """Factory creating instance from CSIT ExportJson output of a test.
+
+        The file is the info.json (or output.json) of a previous run
+        of an NDRPDR test. Only conditional throughput is exported there,
+        as the rate value of "lower" item of "ndr" and "pdr" results.
+        The goal with zero loss ratio gets the NDR value,
+        other goals get the PDR value. Upper loads remain unknown.
+
+        The exported rates are aggregated, the intended load
+        is computed by dividing by packets per transaction aggregated.
+
+        :param path: Path to the JSON file exported by a previous run.
+        :param goals: Search goals to assign the exported values to.
+        :param ppta: Packets per transaction, aggregated over directions.
+        :type path: str
+        :type goals: Iterable[SearchGoal]
+        :type ppta: float
+        :returns: Newly created instance, empty if the test was not NDRPDR.
+        :rtype: WarmStart
+        """
+        with open(path, "rt", encoding="utf-8") as file_in:
+            result = json.load(file_in).get("result", {})
+        goal_to_loads = {}
+        if result.get("type") != "ndrpdr":
+            return WarmStart(goal_to_loads)
+        for goal in goals:
+            key = "ndr" if goal.loss_ratio == 0.0 else "pdr"
+            try:
+                rate = float(result[key]["lower"]["rate"]["value"])
+            except KeyError:
+                continue
+            goal_to_loads[goal] = (rate / ppta, None)
+        return WarmStart(goal_to_loads)
+
+    def to_file(self, path: str) -> None:
+        """Write the loads to a local JSON file, for use by a later search.
+
+        :param path: Path to the JSON file to (over)write.
+        :type path: str
+        """
+        items = [
+            dict(goal=dataclasses.asdict(goal), lower=lower, upper=upper)
+            for goal, (lower, upper) in self.goal_to_loads.items()
+        ]
+        with open(path, "wt", encoding="utf-8") as file_out:
+            json.dump(items, file_out, indent=1)
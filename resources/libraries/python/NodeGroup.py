@@ -0,0 +1,181 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Library for running the same work on multiple nodes concurrently.
+
+Most of the time of "on all DUTs" keywords is spent waiting
+for remote commands, so running the per-node work in threads
+makes multi-node setups take as long as the slowest node.
+SSH connections are cached per node (see ssh.SSH),
+and each node is handled by a single thread, so connections are reused.
+
+Beware, Robot ignores log messages from non-main threads.
+Per-node functions should return what is to be logged
+(or exported), and the caller should log it from the main thread.
+Functions using PAPI (PapiSocketExecutor caches are not thread-safe)
+or Robot variables should not be run in a node group.
+"""
+
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from robot.api import logger
+
+from resources.libraries.python.ssh import exec_cmd, exec_cmd_no_error
+
+
+__all__ = ["NodeGroup", "run_concurrently"]
+
+
+def run_concurrently(calls, max_workers=None):
+    """Run the calls in threads, return results or raise errors.
+
+    A single call (or max_workers of one) is run directly
+    in the calling thread. All calls finish before any error is raised.
+
+    :param calls: Label (for logging) and zero-argument callable for each call.
+    :param max_workers: Maximal number of threads, None means one per call.
+    :type calls: List[Tuple[str, Callable[[], object]]]
+    :type max_workers: Optional[int]
+    :returns: Results of the calls, in order.
+    :rtype: list
+    :raises RuntimeError: If more than one call failed.
+    :raises Exception: The error, if exactly one call failed.
+    """
+    if len(calls) < 2 or max_workers == 1:
+        return [call() for _, call in calls]
+    labels = [label for label, _ in calls]
+    time_start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers or len(calls)) as executor:
+        futures = [executor.submit(call) for _, call in calls]
+    errors = [
+        (label, future.exception())
+        for label, future in zip(labels, futures)
+        if future.exception() is not None
+    ]
+    duration = time.monotonic() - time_start
+    logger.debug(f"Parallel run on {labels} took {duration} seconds.")
+    for label, error in errors:
+        logger.info(f"Run on {label} failed: {error!r}")
+    if len(errors) == 1:
+        raise errors[0][1]
+    if errors:
+        raise RuntimeError(
+            "\n".join(f"{label}: {error}" for label, error in errors)
+        ) from errors[0][1]
+    return [future.result() for future in futures]
+
+
+class NodeGroup:
+    """Nodes (optionally of one type) to run per-node functions on.
+
+    Results are returned in the order of nodes in the topology.
+    Errors are aggregated, all nodes finish their work before raising.
+    A single error is re-raised as is, multiple errors are combined
+    into one RuntimeError (chained from the first one).
+    """
+
+    def __init__(self, nodes, node_type=None):
+        """Select the nodes.
+
+        :param nodes: Nodes in the topology.
+        :param node_type: If set, only nodes of this type are used.
+        :type nodes: dict
+        :type node_type: Optional[str]
+        """
+        self.items = [
+            (key, node) for key, node in nodes.items()
+            if node_type is None or node["type"] == node_type
+        ]
+
+    def __len__(self):
+        """Return the number of nodes in the group.
+
+        :returns: Number of nodes.
+        :rtype: int
+        """
+        return len(self.items)
+
+    def __iter__(self):
+        """Iterate over nodes of the group, in topology order.
+
+        :returns: Iterator over nodes.
+        :rtype: Iterator[dict]
+        """
+        return (node for _, node in self.items)
+
+    def _run(self, calls):
+        """Run the calls concurrently, return results or raise errors.
+
+        :param calls: Node and zero-argument callable for each node.
+        :type calls: List[Tuple[dict, Callable[[], object]]]
+        :returns: Results of the calls, in order.
+        :rtype: list
+        """
+        return run_concurrently([(node["host"], call) for node, call in calls])
+
+    def map(self, function, *args, **kwargs):
+        """Call function(node, *args, **kwargs) for each node concurrently.
+
+        :param function: Per-node function to call.
+        :param args: Positional arguments after the node.
+        :param kwargs: Keyword arguments.
+        :type function: Callable[..., object]
+        :returns: Results of the function, in the order of nodes.
+        :rtype: list
+        """
+        return self._run([
+            (node, lambda node=node: function(node, *args, **kwargs))
+            for node in self
+        ])
+
+    def map_items(self, function, *args, **kwargs):
+        """Call function(node, node_key, *args, **kwargs) for each node.
+
+        Useful for functions which update topology by the node key.
+
+        :param function: Per-node function to call.
+        :param args: Positional arguments after the node key.
+        :param kwargs: Keyword arguments.
+        :type function: Callable[..., object]
+        :returns: Results of the function, in the order of nodes.
+        :rtype: list
+        """
+        return self._run([
+            (node, lambda k=key, n=node: function(n, k, *args, **kwargs))
+            for key, node in self.items
+        ])
+
+    def exec_cmd(self, cmd, **kwargs):
+        """Execute the command on all nodes concurrently.
+
+        :param cmd: Command to execute.
+        :param kwargs: Keyword arguments for ssh.exec_cmd.
+        :type cmd: str or OptionString
+        :returns: RC, Stdout, Stderr for each node.
+        :rtype: List[Tuple[int, str, str]]
+        """
+        return self.map(exec_cmd, cmd, **kwargs)
+
+    def exec_cmd_no_error(self, cmd, **kwargs):
+        """Execute the command on all nodes concurrently, check RCs.
+
+        :param cmd: Command to execute.
+        :param kwargs: Keyword arguments for ssh.exec_cmd_no_error.
+        :type cmd: str or OptionString
+        :returns: Stdout, Stderr for each node.
+        :rtype: List[Tuple[str, str]]
+        :raises RuntimeError: If the command failed on some node.
+        """
+        return self.map(exec_cmd_no_error, cmd, **kwargs)
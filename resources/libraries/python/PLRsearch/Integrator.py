@@ -20,11 +20,15 @@ TODO: Separate optimizations specific to PLRsearch and distribute the rest
 """
 
 import copy
+import math
 import traceback
 
 import dill
+import numpy
 
 from numpy import random
+from scipy.special import ndtri
+from scipy.stats import qmc
 
 # TODO: Teach FD.io CSIT to use multiple dirs in PYTHONPATH,
 # then switch to absolute imports within PLRsearch package.
@@ -32,6 +36,13 @@ from numpy import random
 from . import stat_trackers
 
 
+# Integrations expected to be shorter than this [s] process one sample
+# at a time even if a sample generator is set. Blocks only move the focus
+# once per block, so short integrations starting far from the important
+# region give worse estimates than the one sample at a time loop.
+BATCH_MIN_DURATION = 1.0
+
+
 def try_estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
     """Call estimate_nd but catch any exception and send traceback.
 
@@ -98,6 +109,79 @@ def generate_sample(averages, covariance_matrix, dimension, scale_coeff):
             return sample_point
 
 
+class SampleGenerator:
+    """Generator of blocks of sample points for integrate_batches.
+
+    The points are drawn from the multivariate normal "focus" distribution,
+    points outside the unit area are filtered out.
+    Standard normal points are generated either pseudo-randomly,
+    or from a (scrambled) low-discrepancy sequence, which covers
+    the space more evenly, so the integral converges faster.
+    """
+
+    KINDS = (u"pseudo", u"sobol", u"halton")
+
+    def __init__(self, kind, dimension, seed=0):
+        """Create the underlying generator.
+
+        :param kind: One of KINDS.
+        :param dimension: Number of coordinates of each point.
+        :param seed: Seed to make the points reproducible.
+        :type kind: str
+        :type dimension: int
+        :type seed: int
+        :raises ValueError: If the kind is not known.
+        """
+        self.dimension = dimension
+        if kind == u"pseudo":
+            self._rng = numpy.random.default_rng(seed)
+            self._engine = None
+        elif kind == u"sobol":
+            self._engine = qmc.Sobol(dimension, scramble=True, seed=seed)
+        elif kind == u"halton":
+            self._engine = qmc.Halton(dimension, scramble=True, seed=seed)
+        else:
+            raise ValueError(f"Unknown sample generator: {kind!r}")
+
+    def standard_normal(self, count):
+        """Return points from the standard normal distribution.
+
+        :param count: Number of points, a power of two for Sobol.
+        :type count: int
+        :returns: The points, one row per point.
+        :rtype: numpy.ndarray
+        """
+        if self._engine is None:
+            return self._rng.standard_normal((count, self.dimension))
+        uniform = self._engine.random(count)
+        # Keep away from 0.0 and 1.0, which would map to infinities.
+        return ndtri(numpy.clip(uniform, 1e-12, 1.0 - 1e-12))
+
+    def generate(self, averages, covariance_matrix, scale_coeff, count):
+        """Return a block of points from the focus inside the unit area.
+
+        :param averages: Coordinates of the focus center.
+        :param covariance_matrix: Matrix controlling the spread around
+            the average.
+        :param scale_coeff: Coefficient to conformally multiply the spread.
+        :param count: Number of points to draw, before filtering.
+        :type averages: Indexable of N floats
+        :type covariance_matrix: Indexable of N indexables of N floats
+        :type scale_coeff: float
+        :type count: int
+        :returns: The points inside the unit area, one row per point.
+        :rtype: numpy.ndarray
+        """
+        # Square root by eigen-decomposition handles also singular matrices.
+        eigenvalues, eigenvectors = numpy.linalg.eigh(
+            numpy.array(covariance_matrix) * scale_coeff
+        )
+        root = eigenvectors * numpy.sqrt(numpy.maximum(eigenvalues, 0.0))
+        points = self.standard_normal(count) @ root.T + numpy.array(averages)
+        # Multivariate Gauss can fall outside (-1, 1) interval
+        return points[numpy.all(numpy.abs(points) < 1.0, axis=1)]
+
+
 def estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
     """Use Bayesian inference from control queue, put result to result queue.
 
@@ -189,12 +273,162 @@ def estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
     :raises numpy.linalg.LinAlgError: If the focus shape gets singular
         (due to rounding errors). Try changing scale_coeff.
     """
-    debug_list = list()
-    trace_list = list()
     # Block until input object appears.
     dimension, dilled_function, param_focus_tracker, max_samples = (
         communication_pipe.recv()
     )
+    value_logweight_function = dill.loads(dilled_function)
+    communication_pipe.send(
+        integrate(
+            communication_pipe, dimension, value_logweight_function,
+            param_focus_tracker, max_samples, scale_coeff, trace_enabled
+        )
+    )
+
+
+def try_estimate_nd_persistent(
+        communication_pipe, scale_coeff=8.0, trace_enabled=False):
+    """Call estimate_nd_persistent but catch any exception and send traceback.
+
+    This function does not return anything, computation results
+    are sent via the communication pipe instead.
+
+    :param communication_pipe: Endpoint for communication with parent process.
+    :param scale_coeff: Float number to tweak convergence speed with.
+    :param trace_enabled: Whether to emit trace level debugs.
+    :type communication_pipe: multiprocessing.Connection
+    :type scale_coeff: float
+    :type trace_enabled: bool
+    :raises BaseException: Anything raised by interpreter
+        or estimate_nd_persistent.
+    """
+    try:
+        estimate_nd_persistent(communication_pipe, scale_coeff, trace_enabled)
+    except BaseException:
+        traceback_string = traceback.format_exc()
+        communication_pipe.send(traceback_string)
+        raise
+
+
+def estimate_nd_persistent(
+        communication_pipe, scale_coeff=8.0, trace_enabled=False):
+    """Perform estimate_nd computations for many iterations of the search.
+
+    Starting a new process (and deserializing the function) for each
+    iteration takes time which is then missing from the integration.
+    This function is meant to run in a long-lived worker process instead.
+    The function and the initial focus are received only once,
+    the worker keeps its own list of trial results and its own focus tracker,
+    so each iteration only the newly measured trial results are received.
+
+    Initialization object (received from pipe) is a 4-tuple:
+    - dimension: Integer, number of parameters to consider.
+    - dilled_function: Function (serialized using dill), which:
+    - - Takes the list of trial results
+        and the dimension number of float parameters from (-1, 1)
+        (or arrays of them, if generator is not None).
+    - - Returns float 2-tuple of dependent value and parameter log-likelihood
+        (or arrays of them, for arrays of parameters).
+    - param_focus_tracker: VectorStatTracker to use for initial focus.
+    - generator: None for sampling one point at a time,
+        or kind of SampleGenerator for batched sampling.
+
+    Then, for each iteration, the following 3-tuple is received:
+    - new_trial_results: List of trial results to append to the list.
+    - max_samples: None or a limit for samples to use.
+    - duration: None or the expected duration of the computation [s].
+    The computation stops when another item (stop object) is received,
+    and the result (the same as in estimate_nd) is sent.
+    The worker then waits for the next iteration.
+    If None is received instead of the iteration tuple, the function returns.
+
+    :param communication_pipe: Endpoint for communication with parent process.
+    :param scale_coeff: Float number to tweak convergence speed with.
+    :param trace_enabled: Whether trace list should be populated at all.
+    :type communication_pipe: multiprocessing.Connection
+    :type scale_coeff: float
+    :type trace_enabled: bool
+    :raises OverflowError: If one sample dominates the rest too much.
+    :raises numpy.linalg.LinAlgError: If the focus shape gets singular.
+    """
+    dimension, dilled_function, param_focus_tracker, generator = (
+        communication_pipe.recv()
+    )
+    value_logweight_function = dill.loads(dilled_function)
+    trial_result_list = list()
+
+    def value_logweight_function_for_trials(trace, *sample_point):
+        """Call the received function with the current list of trial results.
+
+        :param trace: A multiprocessing-friendly logging function (closure).
+        :param sample_point: The dimension number of float parameters.
+        :type trace: function (str, object) -> None
+        :type sample_point: tuple of float
+        :returns: Dependent value and parameter log-likelihood.
+        :rtype: 2-tuple of float
+        """
+        return value_logweight_function(trace, trial_result_list, *sample_point)
+
+    while 1:
+        message = communication_pipe.recv()
+        if message is None:
+            return
+        new_trial_results, max_samples, duration = message
+        trial_result_list.extend(new_trial_results)
+        result = integrate(
+            communication_pipe, dimension, value_logweight_function_for_trials,
+            param_focus_tracker, max_samples, scale_coeff, trace_enabled,
+            generator, duration=duration
+        )
+        param_focus_tracker = result[1]
+        # Consume the stop object, it may not have arrived yet
+        # if the computation was stopped by max_samples.
+        communication_pipe.recv()
+        communication_pipe.send(result)
+
+
+def integrate(
+        communication_pipe, dimension, value_logweight_function,
+        param_focus_tracker, max_samples, scale_coeff, trace_enabled,
+        generator=None, seed=0, duration=None):
+    """Perform the computation of estimate_nd, until stop object is detected.
+
+    See estimate_nd for description of the computation and the result.
+    If generator is not None, the samples are processed in blocks,
+    see integrate_batches, unless the computation is expected to be shorter
+    than BATCH_MIN_DURATION.
+
+    :param communication_pipe: Endpoint for communication with parent process,
+        only polled for the stop object.
+    :param dimension: Number of parameters to consider.
+    :param value_logweight_function: Function which takes trace function
+        and the dimension number of float parameters from (-1, 1),
+        returns float 2-tuple of dependent value and parameter log-likelihood.
+        If generator is not None, it must also accept arrays of parameters
+        and return arrays.
+    :param param_focus_tracker: Tracker to use for initial focus.
+    :param max_samples: None or a limit for samples to use.
+    :param scale_coeff: Float number to tweak convergence speed with.
+    :param trace_enabled: Whether trace list should be populated at all.
+    :param generator: None or kind of SampleGenerator.
+    :param seed: Seed for the random generator.
+    :param duration: Expected duration of the computation [s],
+        None if not known.
+    :type communication_pipe: multiprocessing.Connection
+    :type dimension: int
+    :type value_logweight_function: function
+    :type param_focus_tracker: None or stat_trackers.VectorStatTracker
+    :type max_samples: None or int
+    :type scale_coeff: float
+    :type trace_enabled: bool
+    :type generator: None or str
+    :type seed: int
+    :type duration: None or float
+    :returns: Value tracker, focus tracker, debug list, trace list, samples.
+    :rtype: 5-tuple
+    """
+    debug_list = list()
+    trace_list = list()
     debug_list.append(
         f"Called with param_focus_tracker {param_focus_tracker!r}"
     )
@@ -215,7 +449,6 @@ def estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
         if trace_enabled:
             trace_list.append(f"{name} {value!r}")
 
-    value_logweight_function = dill.loads(dilled_function)
     samples = 0
     # Importance sampling produces samples of higher weight (important)
     # more frequently, and corrects that by adding weight bonus
@@ -232,13 +465,71 @@ def estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
     else:
         # Focus tracker has probably too high weight.
         param_focus_tracker.log_sum_weight = None
-    random.seed(0)
+    if generator and (duration is None or duration >= BATCH_MIN_DURATION):
+        samples = integrate_batches(
+            communication_pipe, value_logweight_function, param_focus_tracker,
+            value_tracker, param_sampled_tracker, max_samples, scale_coeff,
+            SampleGenerator(generator, dimension, seed), trace
+        )
+    else:
+        random.seed(seed)
+        samples = integrate_samples(
+            communication_pipe, value_logweight_function, param_focus_tracker,
+            value_tracker, param_sampled_tracker, max_samples, scale_coeff,
+            trace
+        )
+    debug_list.append(f"integrator used {samples!s} samples")
+    debug_list.append(
+        u" ".join([
+            u"value_avg", str(value_tracker.average),
+            u"param_sampled_avg", repr(param_sampled_tracker.averages),
+            u"param_sampled_cov", repr(param_sampled_tracker.covariance_matrix),
+            u"value_log_variance", str(value_tracker.log_variance),
+            u"value_log_secondary_variance",
+            str(value_tracker.secondary.log_variance)
+        ])
+    )
+    return value_tracker, param_focus_tracker, debug_list, trace_list, samples
+
+
+def integrate_samples(
+        communication_pipe, value_logweight_function, param_focus_tracker,
+        value_tracker, param_sampled_tracker, max_samples, scale_coeff,
+        trace):
+    """Perform the sampling loop of integrate, one sample at a time.
+
+    Each sample is drawn from the focus, which is updated by each sample.
+
+    :param communication_pipe: Endpoint for communication with parent process,
+        only polled for the stop object.
+    :param value_logweight_function: Function which takes trace function
+        and the dimension number of float parameters from (-1, 1),
+        returns float 2-tuple of dependent value and parameter log-likelihood.
+    :param param_focus_tracker: Tracker to use for focus, updated in-place.
+    :param value_tracker: Tracker of the value, updated in-place.
+    :param param_sampled_tracker: Tracker of the samples, updated in-place.
+    :param max_samples: None or a limit for samples to use.
+    :param scale_coeff: Float number to tweak convergence speed with.
+    :param trace: Function to add a variable to trace list (if enabled).
+    :type communication_pipe: multiprocessing.Connection
+    :type value_logweight_function: function
+    :type param_focus_tracker: stat_trackers.VectorStatTracker
+    :type value_tracker: stat_trackers.ScalarDualStatTracker
+    :type param_sampled_tracker: stat_trackers.VectorStatTracker
+    :type max_samples: None or int
+    :type scale_coeff: float
+    :type trace: function (str, object) -> None
+    :returns: Number of samples used.
+    :rtype: int
+    """
+    samples = 0
     while not communication_pipe.poll():
         if max_samples and samples >= max_samples:
             break
         sample_point = generate_sample(
-            param_focus_tracker.averages, param_focus_tracker.covariance_matrix,
-            dimension, scale_coeff
+            param_focus_tracker.averages,
+            param_focus_tracker.covariance_matrix,
+            param_focus_tracker.dimension, scale_coeff
         )
         trace(u"sample_point", sample_point)
         samples += 1
@@ -248,8 +539,10 @@ def estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
         trace(u"log_weight", log_weight)
         trace(u"focus tracker before adding", param_focus_tracker)
         # Update focus related statistics.
-        param_distance = param_focus_tracker.add_without_dominance_get_distance(
-            sample_point, log_weight
+        param_distance = (
+            param_focus_tracker.add_without_dominance_get_distance(
+                sample_point, log_weight
+            )
         )
         # The code above looked at weight (not importance).
         # The code below looks at importance (not weight).
@@ -260,17 +553,84 @@ def estimate_nd(communication_pipe, scale_coeff=8.0, trace_enabled=False):
         value_tracker.add(value, log_importance)
         # Update sampled statistics.
         param_sampled_tracker.add_get_shift(sample_point, log_importance)
-    debug_list.append(f"integrator used {samples!s} samples")
-    debug_list.append(
-        u" ".join([
-            u"value_avg", str(value_tracker.average),
-            u"param_sampled_avg", repr(param_sampled_tracker.averages),
-            u"param_sampled_cov", repr(param_sampled_tracker.covariance_matrix),
-            u"value_log_variance", str(value_tracker.log_variance),
-            u"value_log_secondary_variance",
-            str(value_tracker.secondary.log_variance)
-        ])
-    )
-    communication_pipe.send(
-        (value_tracker, param_focus_tracker, debug_list, trace_list, samples)
-    )
+    return samples
+
+
+def integrate_batches(
+        communication_pipe, value_logweight_function, param_focus_tracker,
+        value_tracker, param_sampled_tracker, max_samples, scale_coeff,
+        generator, trace):
+    """Perform the sampling loop of integrate, processing blocks of samples.
+
+    Each block is drawn from the focus at the start of the block,
+    the function is called once for the whole block (with arrays of
+    parameters) and each tracker is updated once per block.
+    As the focus does not move within a block, the blocks start small
+    (so the focus can find the important region quickly) and grow.
+
+    :param communication_pipe: Endpoint for communication with parent process,
+        only polled for the stop object.
+    :param value_logweight_function: Function which takes trace function
+        and the dimension number of arrays of parameters from (-1, 1),
+        returns 2-tuple of arrays of dependent values
+        and parameter log-likelihoods.
+    :param param_focus_tracker: Tracker to use for focus, updated in-place.
+    :param value_tracker: Tracker of the value, updated in-place.
+    :param param_sampled_tracker: Tracker of the samples, updated in-place.
+    :param max_samples: None or a limit for samples to use.
+    :param scale_coeff: Float number to tweak convergence speed with.
+    :param generator: Generator of sample points.
+    :param trace: Function to add a variable to trace list (if enabled).
+    :type communication_pipe: multiprocessing.Connection
+    :type value_logweight_function: function
+    :type param_focus_tracker: stat_trackers.VectorStatTracker
+    :type value_tracker: stat_trackers.ScalarDualStatTracker
+    :type param_sampled_tracker: stat_trackers.VectorStatTracker
+    :type max_samples: None or int
+    :type scale_coeff: float
+    :type generator: SampleGenerator
+    :type trace: function (str, object) -> None
+    :returns: Number of samples used.
+    :rtype: int
+    """
+    samples = 0
+    # Powers of two, as Sobol sequence is balanced only for those.
+    block_size = 16
+    while not communication_pipe.poll():
+        if max_samples and samples >= max_samples:
+            break
+        sample_points = generator.generate(
+            param_focus_tracker.averages, param_focus_tracker.covariance_matrix,
+            scale_coeff, block_size
+        )
+        if max_samples:
+            sample_points = sample_points[:max_samples - samples]
+        if sample_points.size == 0:
+            continue
+        samples += len(sample_points)
+        trace(u"samples", samples)
+        values, log_weights = value_logweight_function(trace, *sample_points.T)
+        # Update focus related statistics.
+        param_distances = (
+            param_focus_tracker.add_batch_without_dominance_get_distances(
+                sample_points, log_weights
+            )
+        )
+        # The code above looked at weight (not importance).
+        # The code below looks at importance (not weight).
+        log_importances = log_weights + param_distances / 2.0 / scale_coeff
+        # If few samples dominate the block, the focus is far from
+        # the important region, use smaller blocks to move it faster.
+        effective_samples = math.exp(
+            2 * numpy.logaddexp.reduce(log_weights)
+            - numpy.logaddexp.reduce(2 * log_weights)
+        )
+        if effective_samples * 8 >= len(sample_points):
+            block_size = min(2 * block_size, 1024)
+        else:
+            block_size = max(block_size // 2, 16)
+        value_tracker.add_batch(values, log_importances)
+        # Update sampled statistics.
+        param_sampled_tracker.add_batch(sample_points, log_importances)
+        trace(u"focus tracker after block", param_focus_tracker)
+    return samples
@@ -21,6 +21,7 @@ import time
 from collections import namedtuple
 
 import dill
+import numpy
 
 from scipy.special import erfcx, erfc
 
@@ -28,6 +29,7 @@ from scipy.special import erfcx, erfc
 # then switch to absolute imports within PLRsearch package.
 # Current usage of relative imports is just a short term workaround.
 from . import Integrator
+from . import fitting_arrays
 from . import stat_trackers
 from .log_plus import log_plus, log_minus
 
@@ -54,7 +56,8 @@ class PLRsearch:
 
     def __init__(
             self, measurer, trial_duration_per_trial, packet_loss_ratio_target,
-            trial_number_offset=0, timeout=7200.0, trace_enabled=False):
+            trial_number_offset=0, timeout=7200.0, trace_enabled=False,
+            sample_generator=None):
         """Store rate measurer and additional parameters.
 
         The measurer must never report negative loss count.
@@ -71,18 +74,29 @@ class PLRsearch:
             Use this to ensure first iterations have enough time to compute
             reasonable estimates for later trials to use.
         :param timeout: The search ends if it lasts more than this many seconds.
+        :param trace_enabled: Whether to emit trace level debugs.
+        :param sample_generator: None to let the integrator process
+            one sample at a time, or the kind of generator
+            ("pseudo", "sobol" or "halton") to process blocks of samples
+            by array operations.
         :type measurer: MLRsearch.AbstractMeasurer
         :type trial_duration_per_trial: float
         :type packet_loss_ratio_target: float
         :type trial_number_offset: int
         :type timeout: float
+        :type trace_enabled: bool
+        :type sample_generator: None or str
+        :raises ValueError: If the sample generator is not known.
         """
+        if sample_generator not in (None,) + Integrator.SampleGenerator.KINDS:
+            raise ValueError(f"Unknown sample generator: {sample_generator!r}")
         self.measurer = measurer
         self.trial_duration_per_trial = float(trial_duration_per_trial)
         self.packet_loss_ratio_target = float(packet_loss_ratio_target)
         self.trial_number_offset = int(trial_number_offset)
         self.timeout = float(timeout)
         self.trace_enabled = bool(trace_enabled)
+        self.sample_generator = sample_generator
 
     def search(self, min_rate, max_rate):
         """Perform the search, return average and stdev for throughput estimate.
@@ -182,48 +196,90 @@ class PLRsearch:
         transmit_rate = (min_rate + max_rate) / 2.0
         lossy_loads = [max_rate]
         zeros = 0  # How many consecutive zero loss results are happening.
-        while 1:
-            trial_number += 1
-            logging.info(f"Trial {trial_number!r}")
-            results = self.measure_and_compute(
-                self.trial_duration_per_trial * trial_number, transmit_rate,
-                trial_result_list, min_rate, max_rate, focus_trackers
-            )
-            measurement, average, stdev, avg1, avg2, focus_trackers = results
-            zeros += 1
-            # TODO: Ratio of fill rate to drain rate seems to have
-            # exponential impact. Make it configurable, or is 4:3 good enough?
-            if measurement.loss_ratio >= self.packet_loss_ratio_target:
-                for _ in range(4 * zeros):
-                    lossy_loads.append(measurement.intended_load)
-            if measurement.loss_ratio > 0.0:
-                zeros = 0
-            lossy_loads.sort()
-            if stop_time <= time.time():
-                return average, stdev
-            trial_result_list.append(measurement)
-            if (trial_number - self.trial_number_offset) <= 1:
-                next_load = max_rate
-            elif (trial_number - self.trial_number_offset) <= 3:
-                next_load = (measurement.relative_forwarding_rate / (
-                    1.0 - self.packet_loss_ratio_target))
-            else:
-                next_load = (avg1 + avg2) / 2.0
-                if zeros > 0:
-                    if lossy_loads[0] > next_load:
-                        diminisher = math.pow(2.0, 1 - zeros)
-                        next_load = lossy_loads[0] + diminisher * next_load
-                        next_load /= (1.0 + diminisher)
-                    # On zero measurement, we need to drain obsoleted low losses
-                    # even if we did not use them to increase next_load,
-                    # in order to get to usable loses at higher loads.
-                    if len(lossy_loads) > 3:
-                        lossy_loads = lossy_loads[3:]
-                logging.debug(
-                    f"Zeros {zeros!r} orig {(avg1 + avg2) / 2.0!r} "
-                    f"next {next_load!r} loads {lossy_loads!r}"
+        # The workers live for the whole search.
+        workers = self.start_workers(min_rate, max_rate, focus_trackers)
+        try:
+            while 1:
+                trial_number += 1
+                logging.info(f"Trial {trial_number!r}")
+                results = self.measure_and_compute(
+                    self.trial_duration_per_trial * trial_number, transmit_rate,
+                    trial_result_list, min_rate, max_rate, focus_trackers,
+                    workers=workers
+                )
+                measurement, average, stdev, avg1, avg2, focus_trackers = (
+                    results
+                )
+                zeros += 1
+                # TODO: Ratio of fill rate to drain rate seems to have
+                # exponential impact.
+                # Make it configurable, or is 4:3 good enough?
+                if measurement.loss_ratio >= self.packet_loss_ratio_target:
+                    for _ in range(4 * zeros):
+                        lossy_loads.append(measurement.intended_load)
+                if measurement.loss_ratio > 0.0:
+                    zeros = 0
+                lossy_loads.sort()
+                if stop_time <= time.time():
+                    return average, stdev
+                trial_result_list.append(measurement)
+                next_load, lossy_loads = self._next_load(
+                    trial_number, measurement, (avg1 + avg2) / 2.0, zeros,
+                    lossy_loads, max_rate
                 )
-            transmit_rate = min(max_rate, max(min_rate, next_load))
+                transmit_rate = min(max_rate, max(min_rate, next_load))
+        finally:
+            for worker in workers:
+                worker.close()
+
+    def _next_load(
+            self, trial_number, measurement, avg, zeros, lossy_loads,
+            max_rate):
+        """Return the load to offer in the next trial.
+
+        The first trial is at max rate, the next two at the forwarding rate
+        of the previous trial. Then the average of the estimates is used,
+        raised towards the lowest lossy load after zero loss results.
+
+        :param trial_number: Number of the trial just measured.
+        :param measurement: Result of the trial just measured.
+        :param avg: Average of the estimates of both fitting functions.
+        :param zeros: How many consecutive zero loss results are happening.
+        :param lossy_loads: Sorted loads of lossy trials, some repeated.
+        :param max_rate: Practical maximum of possible offered load.
+        :type trial_number: int
+        :type measurement: MLRsearch.MeasurementResult
+        :type avg: float
+        :type zeros: int
+        :type lossy_loads: list of float
+        :type max_rate: float
+        :returns: The next load (not limited to the rate interval yet)
+            and the lossy loads with the obsoleted ones drained.
+        :rtype: 2-tuple of float and list of float
+        """
+        if (trial_number - self.trial_number_offset) <= 1:
+            return max_rate, lossy_loads
+        if (trial_number - self.trial_number_offset) <= 3:
+            next_load = (measurement.relative_forwarding_rate / (
+                1.0 - self.packet_loss_ratio_target))
+            return next_load, lossy_loads
+        next_load = avg
+        if zeros > 0:
+            if lossy_loads[0] > next_load:
+                diminisher = math.pow(2.0, 1 - zeros)
+                next_load = lossy_loads[0] + diminisher * next_load
+                next_load /= (1.0 + diminisher)
+            # On zero measurement, we need to drain obsoleted
+            # low losses even if we did not use them
+            # to increase next_load, in order to get
+            # to usable loses at higher loads.
+            if len(lossy_loads) > 3:
+                lossy_loads = lossy_loads[3:]
+        logging.debug(
+            f"Zeros {zeros!r} orig {avg!r} "
+            f"next {next_load!r} loads {lossy_loads!r}"
+        )
+        return next_load, lossy_loads
 
     @staticmethod
     def lfit_stretch(trace, load, mrr, spread):
@@ -441,6 +497,9 @@ class PLRsearch:
         Instead, the expected average loss is scaled according to the number
         of packets actually sent.
 
+        The array form (fitting_arrays.log_weight) is faster
+        for longer lists, but it does not emit traces.
+
         TODO: Copy MeasurementResult from MLRsearch.
 
         :param trace: A multiprocessing-friendly logging function (closure).
@@ -481,13 +540,13 @@ class PLRsearch:
             trace(u"log_trial_likelihood", log_trial_likelihood)
         return log_likelihood
 
-    def measure_and_compute(
-            self, trial_duration, transmit_rate, trial_result_list,
-            min_rate, max_rate, focus_trackers=(None, None), max_samples=None):
-        """Perform both measurement and computation at once.
+    def start_workers(self, min_rate, max_rate, focus_trackers=(None, None)):
+        """Start persistent integrator worker processes.
 
-        High level steps: Prepare and launch computation worker processes,
-        perform the measurement, stop computation and combine results.
+        One worker per fitting function is started. The workers survive
+        across iterations of the search, keeping their own list
+        of trial results and their own focus trackers,
+        so each iteration only the new trial results are sent to them.
 
         Integrator needs a specific function to process (-1, 1) parameters.
         As our fitting functions use dimensional parameters,
@@ -495,8 +554,202 @@ class PLRsearch:
         distribution over the dimensional parameters.
         Maximal rate (line rate) is needed for that transformation.
 
-        Two fitting functions are used, computation is started
-        on temporary worker process per fitting function. After the measurement,
+        Focus trackers are only used for initialization of the workers.
+        If a focus tracker in None, new instance is created.
+
+        The caller is responsible for closing the workers.
+
+        :param min_rate: Practical minimum of possible ofered load.
+        :param max_rate: Practical maximum of possible ofered load.
+        :param focus_trackers: Pair of trackers initialized
+            to speed up the numeric computation.
+        :type min_rate: float
+        :type max_rate: float
+        :type focus_trackers: 2-tuple of None or stat_trackers.VectorStatTracker
+        :returns: Stretch worker and erf worker.
+        :rtype: 2-tuple of _IntegratorWorker
+        """
+        dimension = 2
+        stretch_focus_tracker, erf_focus_tracker = focus_trackers
+        if stretch_focus_tracker is None:
+            stretch_focus_tracker = stat_trackers.VectorStatTracker(dimension)
+            stretch_focus_tracker.unit_reset()
+        if erf_focus_tracker is None:
+            erf_focus_tracker = stat_trackers.VectorStatTracker(dimension)
+            erf_focus_tracker.unit_reset()
+
+        stretch_worker = _IntegratorWorker(
+            u"stretch", dimension, dill.dumps(
+                self.make_value_logweight_function(
+                    self.lfit_stretch, fitting_arrays.lfit_stretch,
+                    min_rate, max_rate
+                )
+            ), stretch_focus_tracker, self.trace_enabled, self.sample_generator
+        )
+        erf_worker = _IntegratorWorker(
+            u"erf", dimension, dill.dumps(
+                self.make_value_logweight_function(
+                    self.lfit_erf, fitting_arrays.lfit_erf, min_rate, max_rate
+                )
+            ), erf_focus_tracker, self.trace_enabled, self.sample_generator
+        )
+        return stretch_worker, erf_worker
+
+    def make_value_logweight_function(
+            self, fitting_function, array_function, min_rate, max_rate):
+        """Define function for integrator.
+
+        If sample_generator is set, the function works also with arrays
+        of parameters (see Integrator.integrate_batches).
+
+        :param fitting_function: lfit_erf or lfit_stretch.
+        :param array_function: Array form of the fitting function.
+        :param min_rate: Practical minimum of possible ofered load.
+        :param max_rate: Practical maximum of possible ofered load.
+        :type fitting_function: Function from 3 floats to float.
+        :type array_function: Function from 3 arrays to array.
+        :type min_rate: float
+        :type max_rate: float
+        :returns: Function computing log of critical rate and log weight.
+        :rtype: function (trace, list, float, float) -> 2-tuple of float
+        """
+        # Worker process gets its own copy, updated by new trial results.
+        trial_arrays = fitting_arrays.TrialArrays()
+
+        def value_logweight_func(trace, trial_result_list, x_mrr, x_spread):
+            """Return log of critical rate and log of likelihood.
+
+            This is a closure. The ancestor function got
+            the rates as parameters, and we are accessing them.
+            As the function is sent to the worker only once,
+            trial_result_list (kept by the worker) is an explicit argument.
+
+            Unless trace is enabled (or there are only few trial
+            results), the log weight is computed by the array form,
+            for all trial results at once.
+
+            The dimensional spread parameter is the (dimensional) mrr
+            raised to the power of x_spread scaled to interval (0, 1).
+            The dimensional mrr parameter distribution has shape of
+            1/(1+x^2), but x==1 corresponds to max_rate
+            and 1.0 pps is added to avoid numerical problems in fitting
+            functions.
+
+            TODO: x^-2 (for x>1.0) might be simpler/nicer prior.
+
+            :param trace: Multiprocessing-safe logging function (closure).
+            :param trial_result_list: Results of previous measurements.
+            :param x_mrr: The first dimensionless param
+                from (-1, 1) interval.
+            :param x_spread: The second dimensionless param
+                from (-1, 1) interval.
+            :type trace: function (str, object) -> None
+            :type trial_result_list: list of MLRsearch.MeasurementResult
+            :type x_mrr: float
+            :type x_spread: float
+            :returns: Log of critical rate [pps] and log of likelihood.
+            :rtype: 2-tuple of float
+            """
+            mrr = max_rate * (1.0 / (x_mrr + 1.0) - 0.5) + 1.0
+            spread = math.exp((x_spread + 1.0) / 2.0 * math.log(mrr))
+            if self.trace_enabled or (
+                    len(trial_result_list) < fitting_arrays.MIN_TRIALS):
+                logweight = self.log_weight(
+                    trace, fitting_function, trial_result_list, mrr, spread
+                )
+            else:
+                logweight = float(fitting_arrays.log_weight(
+                    array_function, trial_arrays.update(trial_result_list),
+                    mrr, spread
+                ))
+            value = math.log(
+                self.find_critical_rate(
+                    trace, fitting_function, min_rate, max_rate,
+                    self.packet_loss_ratio_target, mrr, spread
+                )
+            )
+            return value, logweight
+
+        def value_logweight_batch_func(
+                trace, trial_result_list, x_mrr, x_spread):
+            """Return logs of critical rates and logs of likelihoods.
+
+            The same as value_logweight_func, but for arrays of parameters,
+            only the array forms of functions are used.
+            Only the number of samples is traced.
+
+            :param trace: Multiprocessing-safe logging function (closure).
+            :param trial_result_list: Results of previous measurements.
+            :param x_mrr: The first dimensionless params
+                from (-1, 1) interval.
+            :param x_spread: The second dimensionless params
+                from (-1, 1) interval.
+            :type trace: function (str, object) -> None
+            :type trial_result_list: list of MLRsearch.MeasurementResult
+            :type x_mrr: numpy.ndarray
+            :type x_spread: numpy.ndarray
+            :returns: Logs of critical rates [pps] and logs of likelihoods.
+            :rtype: 2-tuple of numpy.ndarray
+            """
+            trace(u"batch of samples", len(x_mrr))
+            mrr = max_rate * (1.0 / (x_mrr + 1.0) - 0.5) + 1.0
+            spread = numpy.exp((x_spread + 1.0) / 2.0 * numpy.log(mrr))
+            logweight = fitting_arrays.log_weight(
+                array_function, trial_arrays.update(trial_result_list),
+                mrr, spread
+            )
+            value = numpy.log(
+                fitting_arrays.find_critical_rate(
+                    array_function, min_rate, max_rate,
+                    self.packet_loss_ratio_target, mrr, spread
+                )
+            )
+            return value, logweight
+
+        def value_logweight_any_func(
+                trace, trial_result_list, x_mrr, x_spread):
+            """Call the array form for arrays, the scalar form for floats.
+
+            The integrator processes one sample at a time if the computation
+            is short, even if the sample generator is set.
+
+            :param trace: Multiprocessing-safe logging function (closure).
+            :param trial_result_list: Results of previous measurements.
+            :param x_mrr: The first dimensionless param(s)
+                from (-1, 1) interval.
+            :param x_spread: The second dimensionless param(s)
+                from (-1, 1) interval.
+            :type trace: function (str, object) -> None
+            :type trial_result_list: list of MLRsearch.MeasurementResult
+            :type x_mrr: float or numpy.ndarray
+            :type x_spread: float or numpy.ndarray
+            :returns: Log(s) of critical rate [pps] and log(s) of likelihood.
+            :rtype: 2-tuple of float or numpy.ndarray
+            """
+            if isinstance(x_mrr, numpy.ndarray):
+                return value_logweight_batch_func(
+                    trace, trial_result_list, x_mrr, x_spread
+                )
+            return value_logweight_func(
+                trace, trial_result_list, x_mrr, x_spread
+            )
+
+        if self.sample_generator:
+            return value_logweight_any_func
+        return value_logweight_func
+
+    def measure_and_compute(
+            self, trial_duration, transmit_rate, trial_result_list,
+            min_rate, max_rate, focus_trackers=(None, None), max_samples=None,
+            workers=None):
+        """Perform both measurement and computation at once.
+
+        High level steps: Let computation worker processes compute
+        with the current trial results, perform the measurement,
+        stop computation and combine results.
+
+        Two fitting functions are used, computation is performed
+        on a worker process per fitting function. After the measurement,
         average and stdev of the critical rate (not log) of each worker
         are combined and returned. Raw averages are also returned,
         offered load for next iteration is chosen based on them.
@@ -504,11 +757,12 @@ class PLRsearch:
         measurements at its avg are best for relevant results (for both),
         but we do not know which fitting function it is.
 
-        Focus trackers are updated in-place. If a focus tracker in None,
-        new instance is created.
+        If workers are not given, temporary workers are started
+        (see start_workers) and closed after the computation.
+        Persistent workers keep their own focus trackers,
+        focus_trackers argument is then only used for logging.
 
         TODO: Define class for result object, so that fields are documented.
-        TODO: Re-use processes, instead creating on each computation?
         TODO: As only one result is needed fresh, figure out a way
         how to keep the other worker running. This will alow shorter
         duration per trial. Special handling at first and last measurement
@@ -522,6 +776,7 @@ class PLRsearch:
         :param focus_trackers: Pair of trackers initialized
             to speed up the numeric computation.
         :param max_samples: Limit for integrator samples, for debugging.
+        :param workers: Persistent stretch and erf workers, if any.
         :type trial_duration: float
         :type transmit_rate: float
         :type trial_result_list: list of MLRsearch.MeasurementResult
@@ -529,6 +784,7 @@ class PLRsearch:
         :type max_rate: float
         :type focus_trackers: 2-tuple of None or stat_trackers.VectorStatTracker
         :type max_samples: None or int
+        :type workers: None or 2-tuple of _IntegratorWorker
         :returns: Measurement and computation results.
         :rtype: _ComputeResult
         """
@@ -538,152 +794,33 @@ class PLRsearch:
             f"trial_result_list {trial_result_list!r}, max_rate {max_rate!r}, "
             f"focus_trackers {focus_trackers!r}, max_samples {max_samples!r}"
         )
-        # Preparation phase.
-        dimension = 2
-        stretch_focus_tracker, erf_focus_tracker = focus_trackers
-        if stretch_focus_tracker is None:
-            stretch_focus_tracker = stat_trackers.VectorStatTracker(dimension)
-            stretch_focus_tracker.unit_reset()
-        if erf_focus_tracker is None:
-            erf_focus_tracker = stat_trackers.VectorStatTracker(dimension)
-            erf_focus_tracker.unit_reset()
-        old_trackers = stretch_focus_tracker.copy(), erf_focus_tracker.copy()
-
-        def start_computing(fitting_function, focus_tracker):
-            """Just a block of code to be used for each fitting function.
-
-            Define function for integrator, create process and pipe ends,
-            start computation, return the boss pipe end.
-
-            :param fitting_function: lfit_erf or lfit_stretch.
-            :param focus_tracker: Tracker initialized to speed up the numeric
-                computation.
-            :type fitting_function: Function from 3 floats to float.
-            :type focus_tracker: None or stat_trackers.VectorStatTracker
-            :returns: Boss end of communication pipe.
-            :rtype: multiprocessing.Connection
-            """
-
-            boss_pipe_end, worker_pipe_end = multiprocessing.Pipe()
-            # Starting the worker first. Contrary to documentation
-            # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.connection.Connection
-            # sending of large object without active listener on the other side
-            # results in a deadlock, not in a ValueError.
-            # See https://stackoverflow.com/questions/15137292/large-objects-and-multiprocessing-pipes-and-send
-            worker = multiprocessing.Process(
-                target=Integrator.try_estimate_nd,
-                args=(worker_pipe_end, 5.0, self.trace_enabled)
+        old_trackers = tuple(
+            None if tracker is None else tracker.copy()
+            for tracker in focus_trackers
+        )
+        temporary_workers = workers is None
+        if temporary_workers:
+            workers = self.start_workers(min_rate, max_rate, focus_trackers)
+        stretch_worker, erf_worker = workers
+        try:
+            # Computation phase, workers only get the new trial results.
+            erf_worker.start_computing(
+                trial_result_list, max_samples, trial_duration
             )
-            worker.daemon = True
-            worker.start()
-
-            # Only now it is safe to send the function to compute with.
-            def value_logweight_func(trace, x_mrr, x_spread):
-                """Return log of critical rate and log of likelihood.
-
-                This is a closure. The ancestor function got
-                trial_result_list as a parameter, and we are accessing it.
-                As integrator has strict conditions on function signature,
-                trial_result_list cannot be an explicit argument
-                of the current function.
-                This is also why we have to define this closure
-                at each invocation of the ancestor function anew.
-
-                The dimensional spread parameter is the (dimensional) mrr
-                raised to the power of x_spread scaled to interval (0, 1).
-                The dimensional mrr parameter distribution has shape of
-                1/(1+x^2), but x==1 corresponds to max_rate
-                and 1.0 pps is added to avoid numerical problems in fitting
-                functions.
-
-                TODO: x^-2 (for x>1.0) might be simpler/nicer prior.
-
-                :param trace: Multiprocessing-safe logging function (closure).
-                :param x_mrr: The first dimensionless param
-                    from (-1, 1) interval.
-                :param x_spread: The second dimensionless param
-                    from (-1, 1) interval.
-                :type trace: function (str, object) -> None
-                :type x_mrr: float
-                :type x_spread: float
-                :returns: Log of critical rate [pps] and log of likelihood.
-                :rtype: 2-tuple of float
-                """
-                mrr = max_rate * (1.0 / (x_mrr + 1.0) - 0.5) + 1.0
-                spread = math.exp((x_spread + 1.0) / 2.0 * math.log(mrr))
-                logweight = self.log_weight(
-                    trace, fitting_function, trial_result_list, mrr, spread
-                )
-                value = math.log(
-                    self.find_critical_rate(
-                        trace, fitting_function, min_rate, max_rate,
-                        self.packet_loss_ratio_target, mrr, spread
-                    )
-                )
-                return value, logweight
-
-            dilled_function = dill.dumps(value_logweight_func)
-            boss_pipe_end.send(
-                (dimension, dilled_function, focus_tracker, max_samples)
+            stretch_worker.start_computing(
+                trial_result_list, max_samples, trial_duration
             )
-            return boss_pipe_end
-
-        erf_pipe = start_computing(self.lfit_erf, erf_focus_tracker)
-        stretch_pipe = start_computing(self.lfit_stretch, stretch_focus_tracker)
-
-        # Measurement phase.
-        measurement = self.measurer.measure(trial_duration, transmit_rate)
-
-        # Processing phase.
-        def stop_computing(name, pipe):
-            """Just a block of code to be used for each worker.
-
-            Send stop object, poll for result, then either
-            unpack response, log messages and return, or raise traceback.
 
-            TODO: Define class/structure for the return value?
+            # Measurement phase.
+            measurement = self.measurer.measure(trial_duration, transmit_rate)
 
-            :param name: Human friendly worker identifier for logging purposes.
-            :param pipe: Boss end of connection towards worker to stop.
-            :type name: str
-            :type pipe: multiprocessing.Connection
-            :returns: Computed value tracker, actual focus tracker,
-                and number of samples used for this iteration.
-            :rtype: _PartialResult
-            """
-            # If worker encountered an exception, we get it in the recv below,
-            # but send will report a broken pipe.
-            # EAFP says we should ignore the error (instead of polling first).
-            # https://devblogs.microsoft.com/python
-            #   /idiomatic-python-eafp-versus-lbyl/
-            try:
-                pipe.send(None)
-            except BrokenPipeError:
-                pass
-            if not pipe.poll(10.0):
-                raise RuntimeError(f"Worker {name} did not finish!")
-            result_or_traceback = pipe.recv()
-            try:
-                value_tracker, focus_tracker, debug_list, trace_list, sampls = (
-                    result_or_traceback
-                )
-            except ValueError:
-                raise RuntimeError(
-                    f"Worker {name} failed with the following traceback:\n"
-                    f"{result_or_traceback}"
-                )
-            logging.info(f"Logs from worker {name!r}:")
-            for message in debug_list:
-                logging.info(message)
-            for message in trace_list:
-                logging.debug(message)
-            logging.debug(
-                f"trackers: value {value_tracker!r} focus {focus_tracker!r}"
-            )
-            return _PartialResult(value_tracker, focus_tracker, sampls)
-
-        stretch_result = stop_computing(u"stretch", stretch_pipe)
-        erf_result = stop_computing(u"erf", erf_pipe)
+            # Processing phase.
+            stretch_result = stretch_worker.stop_computing()
+            erf_result = erf_worker.stop_computing()
+        finally:
+            if temporary_workers:
+                stretch_worker.close()
+                erf_worker.close()
         result = PLRsearch._get_result(measurement, stretch_result, erf_result)
         logging.info(
             f"measure_and_compute finished with trial result "
@@ -728,6 +865,129 @@ class PLRsearch:
         return _ComputeResult(measurement, avg, stdev, sea, eea, trackers)
 
 
+class _IntegratorWorker:
+    """Persistent worker process computing integrals for one fitting function.
+
+    Forking a process, importing and deserializing the function
+    for each iteration takes time, which is then missing
+    from the integration window. The worker process lives
+    for the whole search, it receives the function once
+    and only new trial results for each iteration.
+    See Integrator.estimate_nd_persistent for the protocol.
+    """
+
+    def __init__(
+            self, name, dimension, dilled_function, focus_tracker,
+            trace_enabled=False, sample_generator=None):
+        """Start the worker process and send the function to compute with.
+
+        :param name: Human friendly worker identifier for logging purposes.
+        :param dimension: Number of parameters to consider.
+        :param dilled_function: Function (serialized using dill) taking
+            trace function, trial result list and dimensionless parameters.
+        :param focus_tracker: Tracker to use for the initial focus.
+        :param trace_enabled: Whether to emit trace level debugs.
+        :param sample_generator: None or kind of generator for batches.
+        :type name: str
+        :type dimension: int
+        :type dilled_function: bytes
+        :type focus_tracker: stat_trackers.VectorStatTracker
+        :type trace_enabled: bool
+        :type sample_generator: None or str
+        """
+        self.name = name
+        self.sent_trials = 0
+        self.pipe, worker_pipe_end = multiprocessing.Pipe()
+        # Starting the worker first. Contrary to documentation
+        # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.connection.Connection
+        # sending of large object without active listener on the other side
+        # results in a deadlock, not in a ValueError.
+        # See https://stackoverflow.com/questions/15137292/large-objects-and-multiprocessing-pipes-and-send
+        self.process = multiprocessing.Process(
+            target=Integrator.try_estimate_nd_persistent,
+            args=(worker_pipe_end, 5.0, trace_enabled)
+        )
+        self.process.daemon = True
+        self.process.start()
+        # Only now it is safe to send the function to compute with.
+        self.pipe.send(
+            (dimension, dilled_function, focus_tracker, sample_generator)
+        )
+
+    def start_computing(
+            self, trial_result_list, max_samples=None, duration=None):
+        """Send the trial results not sent yet, the worker starts computing.
+
+        The list is assumed to only grow between calls.
+
+        :param trial_result_list: Results of all measurements so far.
+        :param max_samples: Limit for integrator samples, for debugging.
+        :param duration: Expected duration of the computation [s],
+            the integrator processes blocks of samples only if it is long.
+        :type trial_result_list: list of MLRsearch.MeasurementResult
+        :type max_samples: None or int
+        :type duration: None or float
+        """
+        new_trial_results = trial_result_list[self.sent_trials:]
+        self.sent_trials = len(trial_result_list)
+        self.pipe.send((new_trial_results, max_samples, duration))
+
+    def stop_computing(self):
+        """Send stop object, poll for result, then either
+        unpack response, log messages and return, or raise traceback.
+
+        :returns: Computed value tracker, actual focus tracker,
+            and number of samples used for this iteration.
+        :rtype: _PartialResult
+        :raises RuntimeError: If the worker failed or did not finish.
+        """
+        # If worker encountered an exception, we get it in the recv below,
+        # but send will report a broken pipe.
+        # EAFP says we should ignore the error (instead of polling first).
+        # https://devblogs.microsoft.com/python
+        #   /idiomatic-python-eafp-versus-lbyl/
+        try:
+            self.pipe.send(None)
+        except BrokenPipeError:
+            pass
+        if not self.pipe.poll(10.0):
+            raise RuntimeError(f"Worker {self.name} did not finish!")
+        result_or_traceback = self.pipe.recv()
+        try:
+            value_tracker, focus_tracker, debug_list, trace_list, sampls = (
+                result_or_traceback
+            )
+        except ValueError as exc:
+            raise RuntimeError(
+                f"Worker {self.name} failed with the following traceback:\n"
+                f"{result_or_traceback}"
+            ) from exc
+        logging.info(f"Logs from worker {self.name!r}:")
+        for message in debug_list:
+            logging.info(message)
+        for message in trace_list:
+            logging.debug(message)
+        logging.debug(
+            f"trackers: value {value_tracker!r} focus {focus_tracker!r}"
+        )
+        return _PartialResult(value_tracker, focus_tracker, sampls)
+
+    def close(self):
+        """Tell the worker to exit, terminate it if it does not.
+
+        The worker is expected to be idle (not computing).
+        """
+        try:
+            self.pipe.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(10.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.pipe.close()
+
+
 # Named tuples, for multiple local variables to be passed as return value.
 _PartialResult = namedtuple(
     u"_PartialResult", u"value_tracker focus_tracker samples"
@@ -0,0 +1,375 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of sample evaluation used by PLRsearch integrator.
+
+Each integrator sample needs the log weight (likelihood of all trial results)
+and the critical rate for one pair of parameters.
+This measures how many samples per second are evaluated by the scalar
+methods of PLRsearch class, by the array forms from fitting_arrays module
+called for one sample at a time, and by the array forms called for batches.
+
+With --integrator, whole integrations are compared instead.
+For each sample generator (and for the one sample at a time integrator),
+integrations limited to the same wall time are repeated with different seeds,
+the spread of their estimates shows which one converges better.
+Integrations shorter than Integrator.BATCH_MIN_DURATION process one sample
+at a time for all generators, the same way as in PLRsearch.
+
+Synthetic trial results are used, so no traffic generator is needed.
+Run from the directory containing PLRsearch package:
+
+    python3 -m PLRsearch.benchmark --trials 10 100 1000
+    python3 -m PLRsearch.benchmark --integrator --trials 100 --duration 0.5
+"""
+
+import argparse
+import math
+import statistics
+import time
+
+from collections import namedtuple
+from functools import partial
+
+import numpy
+
+from . import fitting_arrays
+from . import Integrator
+from .PLRsearch import PLRsearch
+
+
+_TrialResult = namedtuple(
+    u"_TrialResult",
+    u"intended_duration intended_load offered_count loss_count"
+)
+"""The part of MeasurementResult used by log_weight.
+
+:param intended_duration: Duration of the trial [s].
+:param intended_load: Offered load [pps].
+:param offered_count: Number of packets offered.
+:param loss_count: Number of packets lost.
+:type intended_duration: float
+:type intended_load: float
+:type offered_count: int
+:type loss_count: int
+"""
+
+
+def generate_trials(count, mrr, duration=1.0, seed=0):
+    """Return synthetic trial results of a system with the given mrr.
+
+    :param count: Number of trial results to generate.
+    :param mrr: Rate above which packets are lost [pps].
+    :param duration: Duration of each trial [s].
+    :param seed: Seed for the random generator.
+    :type count: int
+    :type mrr: float
+    :type duration: float
+    :type seed: int
+    :returns: Trial results.
+    :rtype: list of _TrialResult
+    """
+    rng = numpy.random.default_rng(seed)
+    trials = list()
+    for load in rng.uniform(0.5 * mrr, 2.0 * mrr, count):
+        offered = int(load * duration)
+        avg_loss = max(load - mrr, 1.0) * duration
+        loss = min(offered, int(rng.poisson(avg_loss)))
+        trials.append(_TrialResult(duration, float(load), offered, loss))
+    return trials
+
+
+def generate_params(count, max_rate, seed=0):
+    """Return mrr and spread arrays for random integrator samples.
+
+    The same transformation from (-1, 1) parameters is used
+    as in PLRsearch.start_workers.
+
+    :param count: Number of samples.
+    :param max_rate: Maximal rate used in the transformation [pps].
+    :param seed: Seed for the random generator.
+    :type count: int
+    :type max_rate: float
+    :type seed: int
+    :returns: The mrr and spread parameters.
+    :rtype: 2-tuple of numpy.ndarray
+    """
+    rng = numpy.random.default_rng(seed)
+    x_mrr, x_spread = rng.uniform(-1.0, 1.0, (2, count))
+    mrr = max_rate * (1.0 / (x_mrr + 1.0) - 0.5) + 1.0
+    spread = numpy.exp((x_spread + 1.0) / 2.0 * numpy.log(mrr))
+    return mrr, spread
+
+
+def measure(function, samples, min_duration):
+    """Call the function repeatedly, return samples evaluated per second.
+
+    :param function: Function evaluating the given number of samples.
+    :param samples: Number of samples evaluated by one call.
+    :param min_duration: Keep calling for at least this long [s].
+    :type function: Callable[[], None]
+    :type samples: int
+    :type min_duration: float
+    :returns: Evaluated samples per second.
+    :rtype: float
+    """
+    calls = 0
+    start = time.perf_counter()
+    while 1:
+        function()
+        calls += 1
+        duration = time.perf_counter() - start
+        if duration >= min_duration:
+            return calls * samples / duration
+
+
+def ignore_trace(_name, _value):
+    """Ignore the trace.
+
+    :param _name: Any string identifying the value.
+    :param _value: Any object to log repr of.
+    :type _name: str
+    :type _value: object
+    """
+
+
+def evaluate_scalar(scalar_func, trials, index, params):
+    """Evaluate the next sample by the scalar methods.
+
+    :param scalar_func: Fitting function of PLRsearch class.
+    :param trials: Trial results to evaluate against.
+    :param index: One-item list with the index of the last sample, updated.
+    :param params: Minimal rate, maximal rate, target loss ratio,
+        mrr and spread arrays of the samples.
+    :type scalar_func: Callable
+    :type trials: list of _TrialResult
+    :type index: List[int]
+    :type params: 5-tuple
+    """
+    min_rate, max_rate, target, mrr, spread = params
+    i = index[0] = (index[0] + 1) % len(mrr)
+    PLRsearch.log_weight(ignore_trace, scalar_func, trials, mrr[i], spread[i])
+    math.log(PLRsearch.find_critical_rate(
+        ignore_trace, scalar_func, min_rate, max_rate, target,
+        mrr[i], spread[i]
+    ))
+
+
+def evaluate_array(scalar_func, array_func, trial_arrays, index, params):
+    """Evaluate the next sample by the array forms.
+
+    :param scalar_func: Fitting function of PLRsearch class.
+    :param array_func: Fitting function from fitting_arrays module.
+    :param trial_arrays: Trial results to evaluate against.
+    :param index: One-item list with the index of the last sample, updated.
+    :param params: Minimal rate, maximal rate, target loss ratio,
+        mrr and spread arrays of the samples.
+    :type scalar_func: Callable
+    :type array_func: Callable
+    :type trial_arrays: fitting_arrays.TrialArrays
+    :type index: List[int]
+    :type params: 5-tuple
+    """
+    min_rate, max_rate, target, mrr, spread = params
+    i = index[0] = (index[0] + 1) % len(mrr)
+    float(fitting_arrays.log_weight(
+        array_func, trial_arrays, mrr[i], spread[i]
+    ))
+    math.log(PLRsearch.find_critical_rate(
+        ignore_trace, scalar_func, min_rate, max_rate, target,
+        mrr[i], spread[i]
+    ))
+
+
+def evaluate_batch(array_func, trial_arrays, params):
+    """Evaluate the whole batch of samples by the array forms.
+
+    :param array_func: Fitting function from fitting_arrays module.
+    :param trial_arrays: Trial results to evaluate against.
+    :param params: Minimal rate, maximal rate, target loss ratio,
+        mrr and spread arrays of the samples.
+    :type array_func: Callable
+    :type trial_arrays: fitting_arrays.TrialArrays
+    :type params: 5-tuple
+    """
+    min_rate, max_rate, target, mrr, spread = params
+    fitting_arrays.log_weight(array_func, trial_arrays, mrr, spread)
+    numpy.log(fitting_arrays.find_critical_rate(
+        array_func, min_rate, max_rate, target, mrr, spread
+    ))
+
+
+def run(trial_counts, batch_size, min_duration, max_rate=1e7):
+    """Measure and print samples per second for each trial count.
+
+    :param trial_counts: Numbers of trial results to evaluate against.
+    :param batch_size: Number of samples evaluated by one array call.
+    :param min_duration: Minimal duration of each measurement [s].
+    :param max_rate: Maximal rate for parameters and critical rate [pps].
+    :type trial_counts: Iterable[int]
+    :type batch_size: int
+    :type min_duration: float
+    :type max_rate: float
+    """
+    params = (max_rate / 1000.0, max_rate, 1e-7) + generate_params(
+        batch_size, max_rate
+    )
+    print(u"trials function  scalar[1/s]  array[1/s]  batch[1/s]")
+    for count in trial_counts:
+        trials = generate_trials(count, max_rate / 10.0)
+        trial_arrays = fitting_arrays.TrialArrays().update(trials)
+        functions = (
+            (u"stretch", PLRsearch.lfit_stretch, fitting_arrays.lfit_stretch),
+            (u"erf", PLRsearch.lfit_erf, fitting_arrays.lfit_erf),
+        )
+        for name, scalar_func, array_func in functions:
+            index = [0]
+            scalar = partial(
+                evaluate_scalar, scalar_func, trials, index, params
+            )
+            array = partial(
+                evaluate_array, scalar_func, array_func, trial_arrays, index,
+                params
+            )
+            batch = partial(evaluate_batch, array_func, trial_arrays, params)
+            print(
+                f"{count:6d} {name:8s} {measure(scalar, 1, min_duration):12.0f}"
+                f" {measure(array, 1, min_duration):11.0f}"
+                f" {measure(batch, batch_size, min_duration):11.0f}"
+            )
+
+
+def bind_trials(function, trials, trace, *point):
+    """Call the value and log weight function for the given trials.
+
+    Used with partial, as the integrator passes trace and the point only.
+
+    :param function: Function made by make_value_logweight_function.
+    :param trials: Trial results to integrate against.
+    :param trace: Function to log the trace with.
+    :param point: Coordinates of the sample.
+    :type function: Callable
+    :type trials: list of _TrialResult
+    :type trace: Callable
+    :type point: Tuple[float]
+    :returns: Value and log weight of the sample.
+    :rtype: 2-tuple of float
+    """
+    return function(trace, trials, *point)
+
+
+class _Deadline:  # pylint: disable=too-few-public-methods
+    """Replacement of the communication pipe, stopping the integrator."""
+
+    def __init__(self, duration):
+        """Set the deadline.
+
+        :param duration: Time from now when poll starts returning True [s].
+        :type duration: float
+        """
+        self.deadline = time.perf_counter() + duration
+
+    def poll(self):
+        """Return whether the deadline has passed.
+
+        :returns: True if the integrator should stop.
+        :rtype: bool
+        """
+        return time.perf_counter() >= self.deadline
+
+
+def compare_integrators(
+        trial_counts, duration, repetitions, max_rate=1e7, scale_coeff=5.0):
+    """Print spread of integrator estimates limited to the same wall time.
+
+    The estimated value is the log of critical rate (as in PLRsearch),
+    for the erf fitting function, starting from the default focus.
+    The stdev over repetitions (each with a different seed)
+    estimates the integration error.
+
+    :param trial_counts: Numbers of trial results to integrate against.
+    :param duration: Wall time of each integration [s].
+    :param repetitions: Number of integrations for each generator.
+    :param max_rate: Maximal rate for parameters and critical rate [pps].
+    :param scale_coeff: Coefficient to conformally multiply the focus spread.
+    :type trial_counts: Iterable[int]
+    :type duration: float
+    :type repetitions: int
+    :type max_rate: float
+    :type scale_coeff: float
+    """
+    min_rate = max_rate / 1000.0
+    print(u"trials generator  samples  avg[log pps]  stdev[log pps]")
+    for count in trial_counts:
+        trials = generate_trials(count, max_rate / 10.0)
+        for generator in (None,) + Integrator.SampleGenerator.KINDS:
+            plrsearch = PLRsearch(
+                None, 1.0, 1e-7, sample_generator=generator
+            )
+            function = plrsearch.make_value_logweight_function(
+                PLRsearch.lfit_erf, fitting_arrays.lfit_erf,
+                min_rate, max_rate
+            )
+            averages = list()
+            samples = list()
+            for seed in range(repetitions):
+                value_tracker, _, _, _, used = Integrator.integrate(
+                    _Deadline(duration), 2,
+                    partial(bind_trials, function, trials),
+                    None, None, scale_coeff, False, generator, seed,
+                    duration
+                )
+                averages.append(value_tracker.average)
+                samples.append(used)
+            print(
+                f"{count:6d} {str(generator):9s} "
+                f"{statistics.mean(samples):8.0f} "
+                f"{statistics.mean(averages):13.6f} "
+                f"{statistics.stdev(averages):15.6f}"
+            )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.split(u"\n", maxsplit=1)[0]
+    )
+    parser.add_argument(
+        u"--trials", type=int, nargs=u"+", default=[10, 100, 1000],
+        help=u"Numbers of trial results to evaluate against."
+    )
+    parser.add_argument(
+        u"--batch", type=int, default=1000,
+        help=u"Number of samples evaluated by one array call."
+    )
+    parser.add_argument(
+        u"--duration", type=float, default=1.0,
+        help=u"Minimal duration of each measurement [s]."
+    )
+    parser.add_argument(
+        u"--integrator", action=u"store_true",
+        help=u"Compare whole integrations instead of sample evaluation."
+    )
+    parser.add_argument(
+        u"--repetitions", type=int, default=10,
+        help=u"Number of integrations for each generator."
+    )
+    args = parser.parse_args()
+    if args.integrator:
+        compare_integrators(args.trials, args.duration, args.repetitions)
+    else:
+        run(args.trials, args.batch, args.duration)
+
+
+if __name__ == u"__main__":
+    main()
@@ -0,0 +1,261 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module holding array forms of PLRsearch fitting functions.
+
+These are alternative implementations of lfit_stretch, lfit_erf,
+find_critical_rate and log_weight methods of PLRsearch class.
+Instead of computing one load for one pair of parameters
+(and looping in pure Python over trial results),
+the arguments are NumPy arrays and the computation is done
+for all elements at once, so many samples (pairs of mrr and spread)
+can be evaluated against all trial results by array operations.
+
+Branches of the scalar implementations are computed for all elements
+and the right one is selected by numpy.where, so warnings
+from the branches not selected are suppressed.
+
+Instead of None, -inf is used as logarithm of zero,
+numpy.logaddexp is the array form of log_plus.
+The results are the same as from the scalar implementations,
+up to rounding errors.
+"""
+
+import math
+
+import numpy
+
+from scipy.special import erfcx, erfc
+
+
+LOG_2 = math.log(2)
+LOG_3 = math.log(3)
+XERFCX_LIMIT = math.pow(math.acos(0), -0.5)
+LOG_XERFCX_10 = math.log(XERFCX_LIMIT - math.exp(10) * erfcx(math.exp(10)))
+# For shorter lists of trial results, array overhead makes log_weight
+# of a single sample slower than the scalar implementation.
+MIN_TRIALS = 10
+
+
+class TrialArrays:  # pylint: disable=too-few-public-methods
+    """Trial results stored in arrays, for use with log_weight.
+
+    The list of trial results only grows during the search,
+    so the arrays are extended by new results only.
+    """
+
+    def __init__(self):
+        """Initialize empty arrays."""
+        self.loads = numpy.empty(0)
+        self.offered_counts = numpy.empty(0)
+        self.loss_counts = numpy.empty(0)
+
+    def update(self, trial_result_list):
+        """Append trial results not stored yet.
+
+        :param trial_result_list: List of all trial measurement results.
+        :type trial_result_list: list of MLRsearch.MeasurementResult
+        :returns: Self, for chaining.
+        :rtype: TrialArrays
+        """
+        new_results = trial_result_list[self.loads.size:]
+        if new_results:
+            self.loads = numpy.append(
+                self.loads, [res.intended_load for res in new_results]
+            )
+            self.offered_counts = numpy.append(
+                self.offered_counts, [res.offered_count for res in new_results]
+            )
+            self.loss_counts = numpy.append(
+                self.loss_counts, [res.loss_count for res in new_results]
+            )
+        return self
+
+
+def log_minus(first, second):
+    """Return logarithm of the difference of two exponents.
+
+    Array form of log_plus.log_minus, NaN is returned
+    where the difference would be non-positive.
+
+    :param first: Logarithm of the number to subtract from.
+    :param second: Logarithm of the number to subtract.
+    :type first: numpy.ndarray
+    :type second: numpy.ndarray
+    :returns: Logarithm of the difference.
+    :rtype: numpy.ndarray
+    """
+    return first + numpy.log(-numpy.expm1(second - first))
+
+
+def lfit_stretch(load, mrr, spread):
+    """Stretch-based fitting function, array form.
+
+    See PLRsearch.lfit_stretch for description.
+
+    :param load: Offered load (positive), in packets per second.
+    :param mrr: Parameter of this fitting function.
+    :param spread: The x-scaling parameter (positive).
+    :type load: numpy.ndarray
+    :type mrr: numpy.ndarray
+    :type spread: numpy.ndarray
+    :returns: Logarithm of average number of packets lost per second.
+    :rtype: numpy.ndarray
+    """
+    with numpy.errstate(all=u"ignore"):
+        log_spread = numpy.log(spread)
+        chi = (load - mrr) / spread
+        chi0 = -mrr / spread
+        big_loss = numpy.log(
+            load - mrr + spread * (
+                numpy.logaddexp(0.0, -chi) - numpy.logaddexp(0.0, chi0)
+            )
+        )
+        two_positive = numpy.logaddexp(chi, 2 * chi0 - LOG_2)
+        two_negative = numpy.logaddexp(chi0, 2 * chi - LOG_2)
+        crude = log_minus(chi, chi0) + log_spread
+        two = log_minus(two_positive, two_negative)
+        three_positive = numpy.logaddexp(two_positive, 3 * chi - LOG_3)
+        three_negative = numpy.logaddexp(two_negative, 3 * chi0 - LOG_3)
+        three = log_minus(three_positive, three_negative)
+        direct = numpy.log(
+            numpy.logaddexp(0.0, chi) - numpy.logaddexp(0.0, chi0)
+        ) + log_spread
+        small_loss = numpy.where(
+            two_positive <= two_negative,
+            crude,
+            numpy.where(two == three, two + log_spread, direct)
+        )
+        return numpy.where(chi > 0, big_loss, small_loss)
+
+
+def lfit_erf(load, mrr, spread):
+    """Erf-based fitting function, array form.
+
+    See PLRsearch.lfit_erf for description.
+
+    :param load: Offered load (positive), in packets per second.
+    :param mrr: Parameter of this fitting function.
+    :param spread: The x-scaling parameter (positive).
+    :type load: numpy.ndarray
+    :type mrr: numpy.ndarray
+    :type spread: numpy.ndarray
+    :returns: Logarithm of average number of packets lost per second.
+    :rtype: numpy.ndarray
+    """
+    with numpy.errstate(all=u"ignore"):
+        # Beware, this chi has the sign opposite to the stretch function chi.
+        chi = (mrr - load) / spread
+        chi0 = mrr / spread
+        second = numpy.log(XERFCX_LIMIT - chi * erfcx(chi0))
+        second -= chi0 * chi0
+        first = numpy.where(
+            chi > math.exp(10),
+            LOG_XERFCX_10 + 2 * (numpy.log(chi) - 10),
+            numpy.log(XERFCX_LIMIT - chi * erfcx(chi))
+        )
+        first -= chi * chi
+        positive = log_minus(first, second)
+        exp_first = XERFCX_LIMIT + chi * erfcx(-chi)
+        exp_first *= numpy.exp(-chi * chi)
+        exp_first -= 2 * chi
+        negative = numpy.log(exp_first - numpy.exp(second))
+        intermediate = numpy.where(chi >= -1.0, positive, negative)
+        return intermediate + numpy.log(spread) - numpy.log(erfc(-chi0))
+
+
+def find_critical_rate(
+        lfit_func, min_rate, max_rate, loss_ratio_target, mrr, spread):
+    """Given ratio target and parameters, return the achieving offered loads.
+
+    Array form of PLRsearch.find_critical_rate, the binary search
+    is performed for all pairs of parameters at once.
+    Bisection of an element stops when its interval becomes degenerate
+    (or the target is hit exactly), the loop stops when all elements stop.
+
+    :param lfit_func: Array fitting function, lfit_stretch or lfit_erf.
+    :param min_rate: Lower bound for binary search [pps].
+    :param max_rate: Upper bound for binary search [pps].
+    :param loss_ratio_target: Fitting function should return loss rate
+        giving this ratio at the returned load and parameters [1].
+    :param mrr: The mrr parameter for the fitting function [pps].
+    :param spread: The spread parameter for the fitting function [pps].
+    :type lfit_func: Function from 3 arrays to array.
+    :type min_rate: float
+    :type max_rate: float
+    :type loss_ratio_target: float
+    :type mrr: numpy.ndarray
+    :type spread: numpy.ndarray
+    :returns: Loads [pps] which achieve the target with given parameters.
+    :rtype: numpy.ndarray
+    """
+    mrr, spread = numpy.broadcast_arrays(mrr, spread)
+    rate_lo = numpy.full(mrr.shape, min_rate)
+    rate_hi = numpy.full(mrr.shape, max_rate)
+    rate = (rate_hi + rate_lo) / 2.0
+    active = numpy.ones(mrr.shape, dtype=bool)
+    while 1:
+        rate = numpy.where(active, (rate_hi + rate_lo) / 2.0, rate)
+        active &= (rate != rate_hi) & (rate != rate_lo)
+        if not active.any():
+            return rate
+        index = active.nonzero()
+        sub_rate = rate[index]
+        with numpy.errstate(all=u"ignore"):
+            loss_ratio = numpy.exp(
+                lfit_func(sub_rate, mrr[index], spread[index])
+            ) / sub_rate
+        high = loss_ratio > loss_ratio_target
+        low = loss_ratio < loss_ratio_target
+        rate_hi[index] = numpy.where(high, sub_rate, rate_hi[index])
+        rate_lo[index] = numpy.where(low, sub_rate, rate_lo[index])
+        # Exact hit (or NaN) stops the bisection, as in the scalar loop.
+        hit = numpy.zeros(mrr.shape, dtype=bool)
+        hit[index] = ~(high | low)
+        active &= ~hit
+
+
+def log_weight(lfit_func, trial_arrays, mrr, spread):
+    """Return log of weight of trial results by the function and parameters.
+
+    Array form of PLRsearch.log_weight. The parameters may be arrays
+    of any (equal) shape, each pair is evaluated against all trial results.
+    The per-trial log-likelihoods are computed as a 2D array
+    (samples times trials) and summed over trials.
+
+    :param lfit_func: Array fitting function, lfit_stretch or lfit_erf.
+    :param trial_arrays: Trial results in arrays.
+    :param mrr: The mrr parameter for the fitting function.
+    :param spread: The spread parameter for the fitting function.
+    :type lfit_func: Function from 3 arrays to array.
+    :type trial_arrays: TrialArrays
+    :type mrr: numpy.ndarray
+    :type spread: numpy.ndarray
+    :returns: Logarithm of result weight for given function and parameters.
+    :rtype: numpy.ndarray
+    """
+    mrr, spread = numpy.broadcast_arrays(mrr, spread)
+    loads = trial_arrays.loads
+    # _rel_ values use units of intended_load (transactions per second).
+    log_avg_rel_loss_per_second = lfit_func(
+        loads, mrr[..., numpy.newaxis], spread[..., numpy.newaxis]
+    )
+    # _abs_ values use units of loss count (maybe packets).
+    log_avg_abs_loss_per_trial = log_avg_rel_loss_per_second + numpy.log(
+        trial_arrays.offered_counts / loads
+    )
+    # Geometric probability computation for logarithms.
+    log_trial_likelihood = numpy.logaddexp(0.0, -log_avg_abs_loss_per_trial)
+    log_trial_likelihood *= -trial_arrays.loss_counts
+    log_trial_likelihood -= numpy.logaddexp(0.0, log_avg_abs_loss_per_trial)
+    return log_trial_likelihood.sum(axis=-1)
@@ -118,6 +118,79 @@ class ScalarStatTracker:
         self.log_variance = log_variance
         return self
 
+    def add_batch(self, scalar_values, log_weights):
+        """Return updated stats corresponding to addition of many samples.
+
+        The samples are first combined into stats of their own,
+        which are then merged into self in one update.
+        The result is the same as from calling add for each sample,
+        up to rounding errors.
+
+        :param scalar_values: The scalar values of the samples.
+        :param log_weights: Natural logarithms of weights of the samples.
+        :type scalar_values: numpy.ndarray
+        :type log_weights: numpy.ndarray
+        :returns: Updated self.
+        :rtype: ScalarStatTracker
+        """
+        log_weights = numpy.asarray(log_weights, dtype=float)
+        if not log_weights.size:
+            return self
+        scalar_values = numpy.asarray(scalar_values, dtype=float)
+        log_sum_weight = float(numpy.logaddexp.reduce(log_weights))
+        sample_ratios = numpy.exp(log_weights - log_sum_weight)
+        average = float(numpy.dot(sample_ratios, scalar_values))
+        deviations = scalar_values - average
+        variance = float(numpy.dot(sample_ratios, deviations * deviations))
+        log_variance = math.log(variance) if variance > 0.0 else None
+        return self.merge(log_sum_weight, average, log_variance)
+
+    def merge(self, log_sum_weight, average, log_variance):
+        """Return updated stats corresponding to addition of other stats.
+
+        The other stats describe a set of samples, as if tracked
+        by another instance.
+
+        :param log_sum_weight: Natural logarithm of sum of weights
+            of the other samples.
+        :param average: Weighted average of the other samples.
+        :param log_variance: Natural logarithm of variance
+            of the other samples.
+        :type log_sum_weight: float or None
+        :type average: float
+        :type log_variance: float or None
+        :returns: Updated self.
+        :rtype: ScalarStatTracker
+        """
+        if log_sum_weight is None:
+            return self
+        old_log_sum_weight = self.log_sum_weight
+        if old_log_sum_weight is None:
+            self.log_sum_weight = log_sum_weight
+            self.average = average
+            self.log_variance = log_variance
+            return self
+        new_log_sum_weight = log_plus(old_log_sum_weight, log_sum_weight)
+        log_data_ratio = old_log_sum_weight - new_log_sum_weight
+        log_other_ratio = log_sum_weight - new_log_sum_weight
+        shift = average - self.average
+        new_average = self.average + shift * math.exp(log_other_ratio)
+        new_log_variance = log_plus(
+            None if self.log_variance is None
+            else self.log_variance + log_data_ratio,
+            None if log_variance is None else log_variance + log_other_ratio
+        )
+        absolute_shift = abs(shift)
+        if absolute_shift > 0.0:
+            new_log_variance = log_plus(
+                new_log_variance,
+                2 * math.log(absolute_shift) + log_data_ratio + log_other_ratio
+            )
+        self.log_sum_weight = new_log_sum_weight
+        self.average = new_average
+        self.log_variance = new_log_variance
+        return self
+
 
 class ScalarDualStatTracker(ScalarStatTracker):
     """Class for tracking one-dimensional samples, offering dual stats.
@@ -197,7 +270,7 @@ class ScalarDualStatTracker(ScalarStatTracker):
         """
         # Using super() as copy() and add() are not expected to change
         # signature, so this way diamond inheritance will be supported.
-        primary = super(ScalarDualStatTracker, self)
+        primary = super()
         if self.max_log_weight is None or log_weight >= self.max_log_weight:
             self.max_log_weight = log_weight
             self.secondary = primary.copy()
@@ -206,6 +279,39 @@ class ScalarDualStatTracker(ScalarStatTracker):
         primary.add(scalar_value, log_weight)
         return self
 
+    def add_batch(self, scalar_values, log_weights):
+        """Return updated both stats after addition of many samples.
+
+        The result is the same as from calling add for each sample,
+        up to rounding errors.
+
+        :param scalar_values: The scalar values of the samples.
+        :param log_weights: Natural logarithms of weights of the samples.
+        :type scalar_values: numpy.ndarray
+        :type log_weights: numpy.ndarray
+        :returns: Updated self.
+        :rtype: ScalarDualStatTracker
+        """
+        log_weights = numpy.asarray(log_weights, dtype=float)
+        if not log_weights.size:
+            return self
+        scalar_values = numpy.asarray(scalar_values, dtype=float)
+        primary = super()
+        # The weightest sample, the later one if tied.
+        index = log_weights.size - 1 - int(numpy.argmax(log_weights[::-1]))
+        max_log_weight = float(log_weights[index])
+        if self.max_log_weight is None or max_log_weight >= self.max_log_weight:
+            self.max_log_weight = max_log_weight
+            self.secondary = primary.copy()
+            self.secondary.add_batch(
+                numpy.delete(scalar_values, index),
+                numpy.delete(log_weights, index)
+            )
+        else:
+            self.secondary.add_batch(scalar_values, log_weights)
+        primary.add_batch(scalar_values, log_weights)
+        return self
+
     def get_pessimistic_variance(self):
         """Return estimate of variance reflecting weight effects.
 
@@ -402,3 +508,96 @@ class VectorStatTracker:
         gradient = numpy.linalg.solve(old_metric, shift)
         distance = numpy.vdot(shift, gradient)
         return distance
+
+    def add_batch(self, vector_values, log_weights, log_sum_weight=None):
+        """Update state to addition of many samples.
+
+        The samples are first combined into stats of their own,
+        which are then merged into self in one update.
+        The result is the same as from calling add_get_shift for each sample,
+        up to rounding errors.
+
+        :param vector_values: The values of the samples, one row per sample.
+        :param log_weights: Natural logarithms of weights of the samples.
+        :param log_sum_weight: If not None, the weights are scaled
+            so that the logarithm of their sum is exactly this.
+        :type vector_values: numpy.ndarray
+        :type log_weights: numpy.ndarray
+        :type log_sum_weight: float or None
+        :returns: Updated self.
+        :rtype: VectorStatTracker
+        """
+        log_weights = numpy.asarray(log_weights, dtype=float)
+        if not log_weights.size:
+            return self
+        vector_values = numpy.asarray(vector_values, dtype=float)
+        if self.log_sum_weight is None:
+            # The first sample keeps the covariance matrix, as in add_get_shift.
+            self.add_get_shift(vector_values[0], float(log_weights[0]))
+            vector_values = vector_values[1:]
+            log_weights = log_weights[1:]
+            if not log_weights.size:
+                return self
+        sample_ratios = numpy.exp(
+            log_weights - numpy.logaddexp.reduce(log_weights)
+        )
+        if log_sum_weight is None:
+            log_sum_weight = float(numpy.logaddexp.reduce(log_weights))
+        averages = sample_ratios @ vector_values
+        deviations = vector_values - averages
+        covariance_matrix = (deviations.T * sample_ratios) @ deviations
+        new_log_sum_weight = log_plus(self.log_sum_weight, log_sum_weight)
+        data_ratio = math.exp(self.log_sum_weight - new_log_sum_weight)
+        other_ratio = math.exp(log_sum_weight - new_log_sum_weight)
+        shift = averages - numpy.array(self.averages)
+        new_averages = numpy.array(self.averages) + shift * other_ratio
+        new_covariance_matrix = numpy.array(self.covariance_matrix) * data_ratio
+        new_covariance_matrix += covariance_matrix * other_ratio
+        new_covariance_matrix += (
+            numpy.outer(shift, shift) * data_ratio * other_ratio
+        )
+        self.log_sum_weight = new_log_sum_weight
+        self.averages = new_averages.tolist()
+        self.covariance_matrix = new_covariance_matrix.tolist()
+        return self
+
+    def add_batch_without_dominance_get_distances(
+            self, vector_values, log_weights):
+        """Update stats, avoid having the samples dominate, return distances.
+
+        This is add_without_dominance_get_distance for many samples.
+        The samples are treated as a whole, if the sum of their weights
+        is far bigger than the weight of all the previous data together,
+        both weights are manipulated the same way as for a single sample.
+
+        All the distances use the metric and average before the update.
+
+        :param vector_values: The values of the samples, one row per sample.
+        :param log_weights: Natural logarithms of weights of the samples.
+        :type vector_values: numpy.ndarray
+        :type log_weights: numpy.ndarray
+        :returns: Distances of the samples from the old average.
+        :rtype: numpy.ndarray
+        """
+        vector_values = numpy.asarray(vector_values, dtype=float)
+        log_weights = numpy.asarray(log_weights, dtype=float)
+        shifts = vector_values - numpy.array(self.averages)
+        gradients = numpy.linalg.solve(self.covariance_matrix, shifts.T).T
+        distances = numpy.sum(shifts * gradients, axis=1)
+        if log_weights.size and self.log_sum_weight is None:
+            # The first sample is added as a single sample.
+            self.add_get_shift(vector_values[0], float(log_weights[0]))
+            vector_values = vector_values[1:]
+            log_weights = log_weights[1:]
+        if not log_weights.size:
+            return distances
+        lsw = self.log_sum_weight
+        log_sum_weight = float(numpy.logaddexp.reduce(log_weights))
+        if lsw < log_sum_weight - 1.0:
+            # Set exactly, rescaled weights could differ by rounding errors,
+            # which are big for big logarithms.
+            lsw = (lsw + log_sum_weight) / 2.0
+            log_sum_weight = lsw
+            self.log_sum_weight = lsw
+        self.add_batch(vector_values, log_weights, log_sum_weight)
+        return distances
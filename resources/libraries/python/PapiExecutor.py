@@ -20,13 +20,12 @@ import copy
 import glob
 import json
 import logging
-import shutil
+import queue
 import struct  # vpp-papi can raise struct.error
-import subprocess
 import sys
 import tempfile
 import time
-from collections import deque, UserDict
+from collections import UserDict
 
 from pprint import pformat
 from robot.api import logger
@@ -35,6 +34,7 @@ from resources.libraries.python.Constants import Constants
 from resources.libraries.python.LocalExecution import run
 from resources.libraries.python.FilteredLogger import FilteredLogger
 from resources.libraries.python.PapiHistory import PapiHistory
+from resources.libraries.python.SshTunnel import SshTunnel
 from resources.libraries.python.ssh import (
     SSH,
     SSHTimeout,
@@ -104,6 +104,131 @@ def dictize_and_check_retval(obj, err_msg):
     return ret
 
 
+def merge_args(base, override):
+    """Return base arguments with fields replaced by the override.
+
+    Nested dicts present in both are merged recursively,
+    so the override can contain just the fields that differ,
+    e.g. dict(entry=dict(sad_id=5)) keeps other fields of the entry.
+    New dicts are created only along the overridden paths,
+    the base dict is not modified.
+
+    :param base: Arguments common to all commands.
+    :param override: Fields to replace.
+    :type base: dict
+    :type override: dict
+    :returns: Merged arguments.
+    :rtype: dict
+    """
+    ret = dict(base)
+    for key, value in override.items():
+        old = ret.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            value = merge_args(old, value)
+        ret[key] = value
+    return ret
+
+
+def flatten_override(base, override, prefix=()):
+    """Return leaf fields of the override, as merge_args would apply them.
+
+    :param base: Arguments common to all commands.
+    :param override: Fields to replace.
+    :param prefix: Path to the override within the whole arguments.
+    :type base: dict
+    :type override: dict
+    :type prefix: Tuple[str]
+    :returns: Paths (tuples of field names) and values of the leaf fields.
+    :rtype: List[Tuple[Tuple[str], object]]
+    """
+    ret = list()
+    for key, value in override.items():
+        old = base.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            ret.extend(flatten_override(old, value, prefix + (key,)))
+        else:
+            ret.append((prefix + (key,), value))
+    return ret
+
+
+class PackedTemplate:
+    """Packed message with known locations of fields to replace.
+
+    Packing a whole message by PAPI serializer for each command is slow
+    when most fields are the same. The template is the message packed once,
+    the replaced fields (overrides and context) are packed separately
+    by their (fixed size) packers and written to their offsets.
+
+    The offsets are computed from the serializer types
+    (fields, packers and their sizes), which works only
+    if fields before the replaced ones are of fixed size.
+    This is verified by comparing with the whole message packing
+    for the first few commands, any mismatch (or error)
+    makes the template invalid and the caller has to pack whole messages.
+    """
+
+    VERIFY_COUNT = 3
+    """How many commands to pack both ways before trusting the template."""
+
+    def __init__(self, msg, kwargs, paths):
+        """Pack the message, compute and check field locations.
+
+        :param msg: PAPI message definition (serializer type).
+        :param kwargs: Whole arguments of the first command, incl. context.
+        :param paths: Paths of fields to replace, context path last.
+        :type msg: vpp_papi.vpp_serializer.VPPMessage
+        :type kwargs: dict
+        :type paths: Tuple[Tuple[str]]
+        """
+        self.msg = msg
+        self.valid = True
+        self.to_verify = self.VERIFY_COUNT
+        self.template = bytes(msg.pack(kwargs))
+        self.locations = list()
+        try:
+            for path in paths:
+                offset, packer = 0, msg
+                for name in path:
+                    index = packer.fields.index(name)
+                    offset += sum(p.size for p in packer.packers[:index])
+                    packer = packer.packers[index]
+                self.locations.append((offset, packer.size, packer.pack))
+        except (AttributeError, ValueError, TypeError):
+            self.valid = False
+
+    def pack(self, values, kwargs_getter):
+        """Return the packed message with values written to their locations.
+
+        :param values: Values of the fields, in the order of paths.
+        :param kwargs_getter: Function returning whole arguments,
+            used for verification and when the template is not usable.
+        :type values: List[object]
+        :type kwargs_getter: Callable[[], dict]
+        :returns: Packed message.
+        :rtype: bytes
+        """
+        if not self.valid:
+            return self.msg.pack(kwargs_getter())
+        buffer = bytearray(self.template)
+        try:
+            for (offset, size, pack), value in zip(self.locations, values):
+                packed = pack(value)
+                if len(packed) != size:
+                    return self.msg.pack(kwargs_getter())
+                buffer[offset:offset + size] = packed
+        except Exception:  # pylint: disable=broad-except
+            # Any serializer surprise means the template is not usable.
+            self.valid = False
+            return self.msg.pack(kwargs_getter())
+        if self.to_verify:
+            self.to_verify -= 1
+            expected = self.msg.pack(kwargs_getter())
+            if expected != buffer:
+                self.valid = False
+                return expected
+        return bytes(buffer)
+
+
 class PapiSocketExecutor:
     """Methods for executing VPP Python API commands on forwarded socket.
 
@@ -163,10 +288,19 @@ class PapiSocketExecutor:
             replies = papi_exec.add(cmd1, **args1).add(cmd2, **args2).\
                 add(cmd2, **args3).get_replies(err_msg)
 
-    The "is_async=True" part in the last example enables "async handling mode",
+    4. Many requests of the same message, differing in few fields:
+
+        with PapiSocketExecutor(node, is_async=True) as papi_exec:
+            overrides = (dict(entry=dict(sad_id=i)) for i in range(count))
+            replies = papi_exec.add_bulk(cmd, args, overrides).\
+                get_replies(err_msg)
+
+    The "is_async=True" part in the last examples enables "async handling mode",
     which imposes limitations but gains speed and saves memory.
     This is different than async mode of VPP PAPI, as the default handling mode
     also uses async PAPI connections.
+    The number of messages in flight is limited by the "window" argument,
+    when reached, .add() reads a reply before sending the next command.
 
     The implementation contains more hidden details, such as
     support for old VPP PAPI async mode behavior, API CRC checking
@@ -196,22 +330,32 @@ class PapiSocketExecutor:
     """Mapping from node key to connected client instance."""
 
     def __init__(
-        self, node, remote_vpp_socket=Constants.SOCKSVR_PATH, is_async=False
+        self,
+        node,
+        remote_vpp_socket=Constants.SOCKSVR_PATH,
+        is_async=False,
+        window=Constants.PAPI_ASYNC_WINDOW,
     ):
         """Store the given arguments, declare managed variables.
 
         :param node: Node to connect to and forward unix domain socket from.
         :param remote_vpp_socket: Path to remote socket to tunnel to.
         :param is_async: Whether to use async handling.
+        :param window: Maximal number of messages in flight in async handling.
+            Zero means no limit.
         :type node: dict
         :type remote_vpp_socket: str
         :type is_async: bool
+        :type window: int
         """
         self._node = node
         self._remote_vpp_socket = remote_vpp_socket
         self._is_async = is_async
+        self._window = window
         # The list of PAPI commands to be executed on the node.
         self._api_command_list = list()
+        # Async handling: Replies already read to keep the window.
+        self._async_reply_list = list()
 
     def ensure_api_dirs(self):
         """Copy files from DUT to local temporary directory.
@@ -392,24 +536,24 @@ class PapiSocketExecutor:
         return ret
 
     def __enter__(self):
-        """Create a tunnel, connect VPP instance.
+        """Ensure a tunnel, connect VPP instance.
 
         If the connected client is in cache, return it.
         Only if not, create a new (or reuse a disconnected) client instance.
 
-        Only at this point a local socket names are created
-        in a temporary directory, as CSIT can connect to multiple VPPs.
+        The SSH tunnel to the node is shared (see SshTunnel),
+        it is started only on first connect to the node,
+        and the remote socket is forwarded only on first connect to it.
+        Reconnects after VPP restart reuse the existing forward.
 
         The following attributes are added to the client instance
         to simplify caching and cleanup:
-        csit_temp_dir
-            - Temporary socket files are created here.
-        csit_control_socket
-            - This socket controls the local ssh process doing the forwarding.
         csit_local_vpp_socket
             - This is the forwarded socket to talk with remote VPP.
-        csit_deque
-            - Queue for responses.
+        csit_queue
+            - Queue for responses, filled by the PAPI reader thread.
+        csit_bulk
+            - Whether add_bulk can pack and send commands directly.
 
         The attribute names do not start with underscore,
         so pylint does not complain about accessing private attribute.
@@ -431,87 +575,11 @@ class PapiSocketExecutor:
         # Store into cache as soon as possible.
         # If connection fails, it is better to attempt disconnect anyway.
         self.set_connected_client(vpp_instance)
-        # Set additional attributes.
-        vpp_instance.csit_temp_dir = tempfile.TemporaryDirectory(dir="/tmp")
-        temp_path = vpp_instance.csit_temp_dir.name
-        api_socket = temp_path + "/vpp-api.sock"
+        # The tunnel (with its SSH master connection) is shared and reused,
+        # usually it only needs a new forward, or nothing at all.
+        tunnel = SshTunnel.for_node(node)
+        api_socket = tunnel.forward(self._remote_vpp_socket)
         vpp_instance.csit_local_vpp_socket = api_socket
-        ssh_socket = temp_path + "/ssh.sock"
-        vpp_instance.csit_control_socket = ssh_socket
-        # Cleanup possibilities.
-        ret_code, _ = run(["ls", ssh_socket], check=False)
-        if ret_code != 2:
-            # This branch never seems to be hit in CI,
-            # but may be useful when testing manually.
-            run(
-                ["ssh", "-S", ssh_socket, "-O", "exit", "0.0.0.0"],
-                check=False,
-                log=True,
-            )
-            # TODO: Is any sleep necessary? How to prove if not?
-            run(["sleep", "0.1"])
-            run(["rm", "-vrf", ssh_socket])
-        # Even if ssh can perhaps reuse this file,
-        # we need to remove it for readiness detection to work correctly.
-        run(["rm", "-rvf", api_socket])
-        # We use sleep command. The ssh command will exit in 30 second,
-        # unless a local socket connection is established,
-        # in which case the ssh command will exit only when
-        # the ssh connection is closed again (via control socket).
-        # The log level is to suppress "Warning: Permanently added" messages.
-        ssh_cmd = [
-            "ssh",
-            "-S",
-            ssh_socket,
-            "-M",
-            "-L",
-            f"{api_socket}:{self._remote_vpp_socket}",
-            "-p",
-            str(node["port"]),
-            "-o",
-            "LogLevel=ERROR",
-            "-o",
-            "UserKnownHostsFile=/dev/null",
-            "-o",
-            "StrictHostKeyChecking=no",
-            "-o",
-            "ExitOnForwardFailure=yes",
-            f"{node['username']}@{node['host']}",
-            "sleep",
-            "30",
-        ]
-        priv_key = node.get("priv_key")
-        if priv_key:
-            # This is tricky. We need a file to pass the value to ssh command.
-            # And we need ssh command, because paramiko does not support sockets
-            # (neither ssh_socket, nor _remote_vpp_socket).
-            key_file = tempfile.NamedTemporaryFile()
-            key_file.write(priv_key)
-            # Make sure the content is written, but do not close yet.
-            key_file.flush()
-            ssh_cmd[1:1] = ["-i", key_file.name]
-        password = node.get("password")
-        if password:
-            # Prepend sshpass command to set password.
-            ssh_cmd[:0] = ["sshpass", "-p", password]
-        time_stop = time.monotonic() + 10.0
-        # subprocess.Popen seems to be the best way to run commands
-        # on background. Other ways (shell=True with "&" and ssh with -f)
-        # seem to be too dependent on shell behavior.
-        # In particular, -f does NOT return values for run().
-        subprocess.Popen(ssh_cmd)
-        # Check socket presence on local side.
-        while time.monotonic() < time_stop:
-            # It can take a moment for ssh to create the socket file.
-            ret_code, _ = run(["ls", "-l", api_socket], check=False)
-            if not ret_code:
-                break
-            time.sleep(0.01)
-        else:
-            raise RuntimeError("Local side socket has not appeared.")
-        if priv_key:
-            # Socket up means the key has been read. Delete file by closing it.
-            key_file.close()
         # Everything is ready, set the local socket address and connect.
         vpp_instance.transport.server_address = api_socket
         # It seems we can get read error even if every preceding check passed.
@@ -525,14 +593,20 @@ class PapiSocketExecutor:
             else:
                 break
         else:
+            # The forward may be broken, let the next attempt set it again.
+            tunnel.cancel(self._remote_vpp_socket)
             raise RuntimeError("Failed to connect to VPP over a socket.")
         # Only after rls2302 all relevant VPP builds should have do_async.
         if hasattr(vpp_instance.transport, "do_async"):
-            deq = deque()
-            vpp_instance.csit_deque = deq
-            vpp_instance.register_event_callback(lambda x, y: deq.append(y))
+            reply_queue = queue.SimpleQueue()
+            vpp_instance.csit_queue = reply_queue
+            vpp_instance.register_event_callback(
+                lambda x, y: reply_queue.put(y)
+            )
         else:
-            vpp_instance.csit_deque = None
+            vpp_instance.csit_queue = None
+        vpp_instance.csit_bulk = vpp_instance.csit_queue is not None \
+            and self._supports_bulk(vpp_instance)
         duration_conn = time.monotonic() - time_enter
         logger.trace(f"Establishing socket connection took {duration_conn}s.")
         return self
@@ -544,7 +618,7 @@ class PapiSocketExecutor:
     def disconnect_by_key(cls, key):
         """Disconnect a connected client instance, noop it not connected.
 
-        Also remove the local sockets by deleting the temporary directory.
+        The SSH tunnel is kept, so reconnect after VPP restart is quick.
         Put disconnected client instances to the reuse list.
         The added attributes are not cleaned up,
         as their values will get overwritten on next connect.
@@ -559,25 +633,7 @@ class PapiSocketExecutor:
             return
         logger.debug(f"Disconnecting by key: {key}")
         client_instance.disconnect()
-        run(
-            [
-                "ssh",
-                "-S",
-                client_instance.csit_control_socket,
-                "-O",
-                "exit",
-                "0.0.0.0",
-            ],
-            check=False,
-        )
-        # Temp dir has autoclean, but deleting explicitly
-        # as an error can happen.
-        try:
-            client_instance.csit_temp_dir.cleanup()
-        except FileNotFoundError:
-            # There is a race condition with ssh removing its ssh.sock file.
-            # Single retry should be enough to ensure the complete removal.
-            shutil.rmtree(client_instance.csit_temp_dir.name)
+        # The SSH tunnel is kept, the forward works also with restarted VPP.
         # Finally, put disconnected clients to reuse list.
         cls.reusable_vpp_client_list.append(client_instance)
         # Invalidate cache last. Repeated errors are better than silent leaks.
@@ -589,7 +645,7 @@ class PapiSocketExecutor:
     ):
         """Disconnect a connected client instance, noop it not connected.
 
-        Also remove the local sockets by deleting the temporary directory.
+        The SSH tunnel is kept, so reconnect after VPP restart is quick.
         Put disconnected client instances to the reuse list.
         The added attributes are not cleaned up,
         as their values will get overwritten on next connect.
@@ -605,7 +661,7 @@ class PapiSocketExecutor:
 
         Noop if not connected.
 
-        Also remove the local sockets by deleting the temporary directory.
+        The SSH tunnel is kept, so reconnect after VPP restart is quick.
         Put disconnected client instances to the reuse list.
         The added attributes are not cleaned up,
         as their values will get overwritten on next connect.
@@ -624,7 +680,7 @@ class PapiSocketExecutor:
     def disconnect_all_papi_connections():
         """Disconnect all connected client instances, tear down the SSH tunnels.
 
-        Also remove the local sockets by deleting the temporary directory.
+        Also close the SSH tunnels, removing the local sockets.
         Put disconnected client instances to the reuse list.
         The added attributes are not cleaned up,
         as their values will get overwritten on next connect.
@@ -639,6 +695,7 @@ class PapiSocketExecutor:
         keys_copy = list(cls.conn_cache.keys())
         for key in keys_copy:
             cls.disconnect_by_key(key)
+        SshTunnel.close_all()
 
     def add(self, csit_papi_command, history=True, **kwargs):
         """Add next command to internal command list; return self.
@@ -658,6 +715,8 @@ class PapiSocketExecutor:
         With async handling mode, this method also serializes and sends
         the command, skips CRC check to gain speed, and saves memory
         by putting a sentinel (instead of deepcopy) to api command list.
+        If the window of messages in flight is full,
+        one reply is read (and stored for later processing) first.
 
         For scale tests, the call sites are responsible to set history values
         in a way that hints what is done without overwhelming the papi history.
@@ -673,7 +732,8 @@ class PapiSocketExecutor:
         :type kwargs: dict
         :returns: self, so that method chaining is possible.
         :rtype: PapiSocketExecutor
-        :raises RuntimeError: If unverified or conflicting CRC is encountered.
+        :raises RuntimeError: If unverified or conflicting CRC is encountered,
+            or if a reply needed to keep the window does not arrive in time.
         """
         self.crc_checker.report_initial_conflicts()
         if history:
@@ -683,10 +743,12 @@ class PapiSocketExecutor:
             )
         self.crc_checker.check_api_name(csit_papi_command)
         if self._is_async:
+            vpp_instance = self.get_connected_client(check_connected=False)
+            if self._window_full():
+                self._keep_window(vpp_instance)
             # Save memory but still count the number of expected replies.
             self._api_command_list.append(0)
-            api_object = self.get_connected_client(check_connected=False).api
-            func = getattr(api_object, csit_papi_command)
+            func = getattr(vpp_instance.api, csit_papi_command)
             # No need for deepcopy yet, serialization isolates from edits.
             func(**kwargs)
         else:
@@ -696,6 +758,199 @@ class PapiSocketExecutor:
             )
         return self
 
+    def add_bulk(self, csit_papi_command, base_args, overrides, history=True):
+        """Add many commands of the same message to the list; return self.
+
+        This is a faster equivalent of calling .add() for each item
+        of overrides, with arguments merged from base_args and the item
+        (see merge_args). Only async handling mode is supported.
+
+        The first command is sent by the usual PAPI function
+        (checking the arguments), the subsequent ones are packed directly,
+        using a PackedTemplate (or PAPI message serializer if not usable),
+        and the packed messages are sent in batches,
+        so per-command overhead of PAPI calls, argument merging
+        and socket writes is avoided.
+        The in-flight window is kept the same way as in .add().
+
+        Unless disabled, only the first and the last command
+        are added to papi history, to hint what is done.
+
+        With old PAPI (without async connection support),
+        or PAPI lacking the internals used for direct sending
+        (see _supports_bulk), this falls back to calling .add()
+        for each item, which sends by the usual PAPI function.
+
+        :param csit_papi_command: VPP API command.
+        :param base_args: Arguments common to all commands.
+        :param overrides: Fields differing for each command.
+        :param history: Enable/disable adding commands to PAPI history.
+        :type csit_papi_command: str
+        :type base_args: dict
+        :type overrides: Iterable[dict]
+        :type history: bool
+        :returns: self, so that method chaining is possible.
+        :rtype: PapiSocketExecutor
+        :raises RuntimeError: If not in async handling mode,
+            if unverified or conflicting CRC is encountered,
+            or if a reply needed to keep the window does not arrive in time.
+        """
+        if not self._is_async:
+            raise RuntimeError("Sync handling does not suport add_bulk.")
+        vpp_instance = self.get_connected_client(check_connected=False)
+        overrides = iter(overrides)
+        for override in overrides:
+            kwargs = merge_args(base_args, override)
+            self.add(csit_papi_command, history=history, **kwargs)
+            break
+        else:
+            return self
+        if not vpp_instance.csit_bulk:
+            kwargs = None
+            for override in overrides:
+                kwargs = merge_args(base_args, override)
+                self.add(csit_papi_command, history=False, **kwargs)
+        else:
+            kwargs = self._send_bulk(
+                vpp_instance, csit_papi_command, base_args, overrides
+            )
+        if history and kwargs is not None:
+            PapiHistory.add_to_papi_history(
+                self._node, csit_papi_command, **kwargs
+            )
+        return self
+
+    @staticmethod
+    def _supports_bulk(vpp_instance):
+        """Return whether the client has internals _send_bulk relies on.
+
+        PAPI code is copied from the DUT, so its version is not pinned.
+        The internals are those used by PAPI _call_vpp_async
+        of socket transport, this checks they are still there
+        and the message header has the expected size.
+
+        :param vpp_instance: Connected client instance.
+        :type vpp_instance: vpp_papi.VPPApiClient
+        :returns: True if commands can be packed and sent directly.
+        :rtype: bool
+        """
+        transport = vpp_instance.transport
+        for obj, name in (
+                (vpp_instance, "messages"),
+                (vpp_instance, "get_context"),
+                (transport, "get_msg_index"),
+                (transport, "socket_index"),
+                (transport, "header"),
+                (transport, "socket"),
+        ):
+            if not hasattr(obj, name):
+                logger.debug(f"PAPI lacks {name}, bulk sending disabled.")
+                return False
+        if not hasattr(transport.socket, "sendall"):
+            logger.debug("PAPI socket lacks sendall, bulk sending disabled.")
+            return False
+        if getattr(transport.header, "size", None) != 16:
+            logger.debug("PAPI header size differs, bulk sending disabled.")
+            return False
+        return True
+
+    def _send_bulk(self, vpp_instance, csit_papi_command, base_args, overrides):
+        """Pack and send commands in batches, return the last arguments.
+
+        :param vpp_instance: Client instance to send commands through.
+        :param csit_papi_command: VPP API command.
+        :param base_args: Arguments common to all commands.
+        :param overrides: Fields differing for each command.
+        :type vpp_instance: vpp_papi.VPPApiClient
+        :type csit_papi_command: str
+        :type base_args: dict
+        :type overrides: Iterator[dict]
+        :returns: Arguments of the last command sent, None if none was sent.
+        :rtype: Optional[dict]
+        :raises RuntimeError: If a reply needed to keep the window
+            does not arrive in time.
+        """
+        transport = vpp_instance.transport
+        msg = vpp_instance.messages[csit_papi_command]
+        full_args = dict(
+            base_args,
+            _vl_msg_id=transport.get_msg_index(
+                f"{csit_papi_command}_{msg.crc[2:]}"
+            ),
+            client_index=transport.socket_index,
+        )
+        header = transport.header
+        get_context = vpp_instance.get_context
+        # Commands may override different fields, one template for each set.
+        path_to_template = dict()
+        buffer = bytearray()
+        override = None
+        for override in overrides:
+            if self._window_full():
+                transport.socket.sendall(buffer)
+                buffer.clear()
+                self._keep_window(vpp_instance)
+            leaves = flatten_override(full_args, override)
+            leaves.append((("context",), get_context()))
+
+            def kwargs_getter(override=override, context=leaves[-1][1]):
+                """Return whole arguments of the current command.
+
+                :returns: Merged arguments with context.
+                :rtype: dict
+                """
+                return merge_args(full_args, dict(override, context=context))
+
+            paths = tuple(path for path, _ in leaves)
+            template = path_to_template.get(paths)
+            if template is None:
+                template = PackedTemplate(msg, kwargs_getter(), paths)
+                path_to_template[paths] = template
+            packed = template.pack([v for _, v in leaves], kwargs_getter)
+            buffer += header.pack(0, len(packed), 0)
+            buffer += packed
+            self._api_command_list.append(0)
+            if len(buffer) >= 65536:
+                transport.socket.sendall(buffer)
+                buffer.clear()
+        transport.socket.sendall(buffer)
+        if override is None:
+            return None
+        return merge_args(base_args, override)
+
+    def _window_full(self):
+        """Return whether the async in-flight window is full.
+
+        :returns: True if a reply should be read before sending more.
+        :rtype: bool
+        """
+        in_flight = len(self._api_command_list)
+        in_flight -= len(self._async_reply_list)
+        return bool(self._window) and in_flight >= self._window
+
+    def _keep_window(self, vpp_instance):
+        """Read replies down to half of the window, store them for later.
+
+        The reads happen in batches (mostly without waiting),
+        not after each send.
+
+        :param vpp_instance: Client instance to read from.
+        :type vpp_instance: vpp_papi.VPPApiClient
+        :raises RuntimeError: If a reply does not arrive in time.
+        """
+        in_flight = len(self._api_command_list)
+        in_flight -= len(self._async_reply_list)
+        while in_flight > self._window // 2:
+            reply = PapiSocketExecutor._read(vpp_instance)
+            if reply is None:
+                index = len(self._async_reply_list)
+                self._api_command_list = list()
+                self._async_reply_list = list()
+                PapiSocketExecutor._drain(vpp_instance, "Timeout.")
+                raise RuntimeError(f"PAPI async timeout: idx {index}")
+            self._async_reply_list.append(reply)
+            in_flight -= 1
+
     def get_replies(self, err_msg="Failed to get replies."):
         """Get reply for each command from VPP Python API.
 
@@ -873,17 +1128,14 @@ class PapiSocketExecutor:
         :rtype: Optional[namedtuple]
         """
         timeout = vpp_instance.read_timeout if timeout is None else timeout
-        if vpp_instance.csit_deque is None:
+        if vpp_instance.csit_queue is None:
             return vpp_instance.read_blocking(timeout=timeout)
-        time_stop = time.monotonic() + timeout
-        while 1:
-            try:
-                return vpp_instance.csit_deque.popleft()
-            except IndexError:
-                # We could busy-wait but that seems to starve the reader thread.
-                time.sleep(0.01)
-            if time.monotonic() > time_stop:
-                return None
+        # The queue wakes us up as soon as the reader thread puts a reply,
+        # without busy-waiting (which starves the reader thread).
+        try:
+            return vpp_instance.csit_queue.get(timeout=max(timeout, 0.0))
+        except queue.Empty:
+            return None
 
     @staticmethod
     def _read(vpp_instance, tries=3):
@@ -965,12 +1217,14 @@ class PapiSocketExecutor:
         :raises RuntimeError: If the replies are not all correct.
         """
         local_list = self._api_command_list
+        read_list = self._async_reply_list
         # Clear first as execution may fail.
         self._api_command_list = list()
+        self._async_reply_list = list()
         if do_async:
             if not single_reply:
                 raise RuntimeError("Async papi needs one reply per request.")
-            return self._execute_async(local_list, err_msg=err_msg)
+            return self._execute_async(local_list, read_list, err_msg=err_msg)
         return self._execute_sync(
             local_list, err_msg=err_msg, single_reply=single_reply
         )
@@ -1039,11 +1293,13 @@ class PapiSocketExecutor:
                 ret_list.append(dictized_reply)
         return ret_list
 
-    def _execute_async(self, local_list, err_msg):
+    def _execute_async(self, local_list, read_list, err_msg):
         """Read, process and return replies.
 
         The messages were already sent by .add() in this mode,
         local_list is used just so we know how many replies to read.
+        Some replies may have been already read by .add() (to keep the window),
+        those are processed first.
 
         Beware: It is not clear what to do when socket read fails
         in the middle of async processing.
@@ -1054,13 +1310,15 @@ class PapiSocketExecutor:
 
         To speed processing up, reply CRC values are not checked.
 
-        The current implementation does not limit the number of messages
-        in-flight, we rely on VPP PAPI background thread to move replies
+        The number of messages in-flight is limited by .add(),
+        we rely on VPP PAPI background thread to move replies
         from socket to queue fast enough.
 
         :param local_list: The list of PAPI commands to get replies for.
+        :param read_list: Replies already read, in order.
         :param err_msg: The message used if the PAPI command(s) execution fails.
         :type local_list: list
+        :type read_list: list
         :type err_msg: str
         :returns: Papi replies parsed into a dict-like object, with fields
             according to API (possibly including retval).
@@ -1070,7 +1328,9 @@ class PapiSocketExecutor:
         vpp_instance = self.get_connected_client()
         ret_list = list()
         try:
-            for index, _ in enumerate(local_list):
+            for reply in read_list:
+                ret_list.append(dictize_and_check_retval(reply, err_msg))
+            for index in range(len(read_list), len(local_list)):
                 # Blocks up to timeout.
                 reply = PapiSocketExecutor._read(vpp_instance)
                 if reply is None:
@@ -1090,7 +1350,7 @@ class Disconnector:
     def disconnect_all_papi_connections():
         """Disconnect all connected client instances, tear down the SSH tunnels.
 
-        Also remove the local sockets by deleting the temporary directory.
+        Also close the SSH tunnels, removing the local sockets.
         Put disconnected client instances to the reuse list.
         The added attributes are not cleaned up,
         as their values will get overwritten on next connect.
@@ -1107,6 +1367,7 @@ class Disconnector:
         # Iterate over copy of entries so deletions do not mess with iterator.
         for key in list(cls.conn_cache.keys()):
             cls.disconnect_by_key(key)
+        SshTunnel.close_all()
 
 
 class PapiExecutor:
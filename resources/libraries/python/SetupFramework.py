@@ -16,11 +16,20 @@ nodes. All tasks required to be run before the actual tests are started is
 supposed to end up here.
 """
 
-from os import environ, remove
-from tempfile import NamedTemporaryFile
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import shlex
+import stat
+import tarfile
 import threading
 import traceback
 
+from os import environ, remove
+from tempfile import NamedTemporaryFile
+
 from robot.api import logger
 
 from resources.libraries.python.Constants import Constants as con
@@ -30,15 +39,100 @@ from resources.libraries.python.topology import NodeType
 
 __all__ = [u"SetupFramework"]
 
+# Names tar --exclude-vcs excludes, the ones likely to appear in CSIT tree,
+# and .gitreview, which tar is told to exclude explicitly.
+VCS_NAMES = (
+    u".git", u".gitattributes", u".gitignore", u".gitmodules", u".gitreview",
+    u".svn", u".hg", u".hgignore", u".bzr", u".bzrignore", u"CVS",
+)
+
+# Top level directories not deployed, same as tar excludes below.
+EXCLUDED_TOP_DIRS = (u"tmp", u"env", u".git")
+
+# Lock file in the cache directory at the node. Building and pruning trees
+# hold it exclusively, listing and copying from the cache hold it shared.
+CACHE_LOCK = u"lock"
+
+# Run by python3 at the node, builds the cached tree from uploaded content.
+# Arguments: cache directory, manifest hash, staging directory with
+# manifest.json and objects/ extracted from the uploaded tarball.
+# Only the most recently deployed trees (and their objects) are kept.
+# Objects listed as present can be pruned by other deployment before
+# this one builds, then nothing is built and their hashes are printed,
+# the caller uploads them and runs the builder again.
+# Run with CACHE_LOCK held exclusively.
+TREE_BUILDER = u"""
+import json, os, shutil, sys
+cache, name, staging = sys.argv[1:4]
+objects = os.path.join(cache, "objects")
+trees = os.path.join(cache, "trees")
+for obj in os.listdir(os.path.join(staging, "objects")):
+    os.replace(
+        os.path.join(staging, "objects", obj), os.path.join(objects, obj)
+    )
+# Moved first, so the objects stay referenced even if some are missing.
+manifest = os.path.join(trees, name + ".json")
+os.replace(os.path.join(staging, "manifest.json"), manifest)
+# Modification time orders trees for pruning, extracted one is zero.
+os.utime(manifest)
+with open(manifest) as file:
+    entries = json.load(file)
+missing = sorted(
+    set(v[2] for v in entries.values() if v[0] == "f")
+    - set(os.listdir(objects))
+)
+if missing:
+    shutil.rmtree(staging)
+    print(" ".join(missing))
+    sys.exit(0)
+tree = os.path.join(staging, "tree")
+os.mkdir(tree)
+for path, (kind, mode, value) in sorted(entries.items()):
+    target = os.path.join(tree, path)
+    if kind == "d":
+        os.makedirs(target, exist_ok=True)
+        continue
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if kind == "l":
+        os.symlink(value, target)
+        continue
+    shutil.copyfile(os.path.join(objects, value), target)
+    os.chmod(target, mode)
+for path, (kind, mode, value) in sorted(entries.items(), reverse=True):
+    if kind == "d":
+        os.chmod(os.path.join(tree, path), mode)
+try:
+    os.rename(tree, os.path.join(trees, name))
+except OSError:
+    # Already built by other deployment to the same host since listed.
+    pass
+shutil.rmtree(staging)
+kept = sorted(
+    (f for f in os.listdir(trees) if f.endswith(".json")),
+    key=lambda f: os.path.getmtime(os.path.join(trees, f)), reverse=True
+)
+used = set()
+for index, manifest in enumerate(kept):
+    if index >= 4:
+        os.remove(os.path.join(trees, manifest))
+        shutil.rmtree(os.path.join(trees, manifest[:-5]), ignore_errors=True)
+        continue
+    with open(os.path.join(trees, manifest)) as file:
+        used.update(v[2] for v in json.load(file).values() if v[0] == "f")
+for obj in os.listdir(objects):
+    if obj not in used:
+        os.remove(os.path.join(objects, obj))
+"""
+
 
-def pack_framework_dir():
-    """Pack the testing WS into temp file, return its name.
+def _temp_file_name(suffix):
+    """Return a name for a new local temporary file, respecting TMPDIR.
 
-    :returns: Tarball file name.
+    :param suffix: Suffix of the file name.
+    :type suffix: str
+    :returns: Path to the (not yet existing) file.
     :rtype: str
-    :raises Exception: When failed to pack testing framework.
     """
-
     try:
         directory = environ[u"TMPDIR"]
     except KeyError:
@@ -46,16 +140,28 @@ def pack_framework_dir():
 
     if directory is not None:
         tmpfile = NamedTemporaryFile(
-            suffix=u".tgz", prefix=u"csit-testing-", dir=f"{directory}"
+            suffix=suffix, prefix=u"csit-testing-", dir=f"{directory}"
         )
     else:
-        tmpfile = NamedTemporaryFile(suffix=u".tgz", prefix=u"csit-testing-")
+        tmpfile = NamedTemporaryFile(suffix=suffix, prefix=u"csit-testing-")
     file_name = tmpfile.name
     tmpfile.close()
+    return file_name
+
+
+def pack_framework_dir():
+    """Pack the testing WS into temp file, return its name.
+
+    :returns: Tarball file name.
+    :rtype: str
+    :raises Exception: When failed to pack testing framework.
+    """
+    file_name = _temp_file_name(u".tgz")
 
     run(
         [
-            u"tar", u"--sparse", u"--exclude-vcs", u"--exclude=output*.xml",
+            u"tar", u"--sparse", u"--exclude-vcs", u"--exclude=.gitreview",
+            u"--exclude=output*.xml",
             u"--exclude=./tmp", u"--exclude=./env", u"--exclude=./.git",
             u"-zcf", file_name, u"."
         ], msg=u"Could not pack testing framework"
@@ -64,6 +170,178 @@ def pack_framework_dir():
     return file_name
 
 
+def _hash_file(path):
+    """Return hex SHA-256 digest of the file content.
+
+    :param path: Path to the file.
+    :type path: str
+    :returns: Content hash.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    with open(path, u"rb") as file_in:
+        for chunk in iter(lambda: file_in.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_framework_manifest(directory=u"."):
+    """Describe the testing WS by content hashes, excluding as tar does.
+
+    Manifest maps relative paths to [kind, mode, value] lists,
+    kind is "f" for files (value is content hash), "l" for symlinks
+    (value is the link target) and "d" for directories (value is empty).
+    Manifest hash identifies the whole tree (including modes).
+
+    :param directory: Root of the tree to describe.
+    :type directory: str
+    :returns: Serialized manifest, its hash,
+        and mapping from content hash to a local file with that content.
+    :rtype: bytes, str, Dict[str, str]
+    """
+    entries = dict()
+    objects = dict()
+    for root, dirs, files in os.walk(directory):
+        rel_root = os.path.relpath(root, directory)
+        top = rel_root == u"."
+        # Pruning in place stops os.walk from descending.
+        dirs[:] = sorted(
+            name for name in dirs if name not in VCS_NAMES
+            and not (top and name in EXCLUDED_TOP_DIRS)
+        )
+        for name in dirs + sorted(files):
+            if name in VCS_NAMES or fnmatch.fnmatch(name, u"output*.xml"):
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            info = os.lstat(path)
+            mode = stat.S_IMODE(info.st_mode)
+            if stat.S_ISLNK(info.st_mode):
+                entries[rel_path] = [u"l", mode, os.readlink(path)]
+            elif stat.S_ISDIR(info.st_mode):
+                entries[rel_path] = [u"d", mode, u""]
+            elif stat.S_ISREG(info.st_mode):
+                content_hash = _hash_file(path)
+                objects.setdefault(content_hash, path)
+                entries[rel_path] = [u"f", mode, content_hash]
+    manifest = json.dumps(
+        entries, sort_keys=True, separators=(u",", u":")
+    ).encode()
+    return manifest, hashlib.sha256(manifest).hexdigest(), objects
+
+
+def _upload_objects(manifest, hashes, objects, node, remote_tarball):
+    """Pack the manifest and the objects, copy the tarball to the node.
+
+    :param manifest: Serialized manifest, as from compute_framework_manifest.
+    :param hashes: Content hashes of the objects to upload.
+    :param objects: Mapping from content hash to local file.
+    :param node: Node to upload to.
+    :param remote_tarball: Remote path of the tarball.
+    :type manifest: bytes
+    :type hashes: List[str]
+    :type objects: Dict[str, str]
+    :type node: dict
+    :type remote_tarball: str
+    """
+    tarball = _temp_file_name(u".tgz")
+    try:
+        with tarfile.open(tarball, u"w:gz") as tar:
+            info = tarfile.TarInfo(u"manifest.json")
+            info.size = len(manifest)
+            tar.addfile(info, io.BytesIO(manifest))
+            info = tarfile.TarInfo(u"objects")
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            tar.addfile(info)
+            for obj in hashes:
+                tar.add(objects[obj], arcname=f"objects/{obj}")
+        scp_node(node, tarball, remote_tarball, timeout=600)
+    finally:
+        delete_local_tarball(tarball)
+
+
+def deploy_delta_to_node(manifest, manifest_hash, objects, node):
+    """Make the testing WS described by manifest appear on the node.
+
+    The node keeps a cache of file contents (by content hash)
+    and of unpacked trees (by manifest hash). If the tree is cached,
+    nothing is uploaded. Otherwise only files with content missing
+    in the cache are packed and uploaded, together with the manifest,
+    and the tree is built at the node. The cached tree is then copied
+    to the framework directory, so tests cannot modify the cache.
+
+    More deployments (e.g. from parallel jobs) can use the cache at once,
+    the commands at the node lock the cache (see CACHE_LOCK). If the files
+    listed as present are pruned by other deployment before the tree
+    is built, they are uploaded again.
+
+    This runs in a thread, so nothing is logged, the summary is returned.
+
+    :param manifest: Serialized manifest, as from compute_framework_manifest.
+    :param manifest_hash: Hash of the manifest.
+    :param objects: Mapping from content hash to local file.
+    :param node: Node to deploy to.
+    :type manifest: bytes
+    :type manifest_hash: str
+    :type objects: Dict[str, str]
+    :type node: dict
+    :returns: Human readable summary of what was uploaded.
+    :rtype: str
+    :raises RuntimeError: When a remote command fails.
+    """
+    node_str = f"{node[u'type']} host {node[u'host']}, port {node[u'port']}"
+    cache = con.REMOTE_FW_CACHE_DIR
+    lock = f"{cache}/{CACHE_LOCK}"
+    tree = f"{cache}/trees/{manifest_hash}"
+    stdout, _ = exec_cmd_no_error(
+        node, f"mkdir -p {cache}/objects {cache}/trees && "
+        f"flock -s {lock} sh -c "
+        + shlex.quote(
+            f"if test -d {tree}; then touch {tree}.json; echo CACHED; "
+            f"else ls {cache}/objects; fi"
+        ),
+        message=f"Failed to list framework cache at {node_str}",
+        include_reason=True, log_stdout_err=False
+    )
+    if stdout.strip() == u"CACHED":
+        summary = f"Tree {manifest_hash} is cached at {node_str}."
+    else:
+        present = set(stdout.split())
+        missing = sorted(set(objects) - present)
+        size = sum(os.path.getsize(objects[obj]) for obj in missing)
+        summary = f"Uploaded {len(missing)} of {len(objects)} files " \
+            f"({size} bytes uncompressed) to {node_str}."
+        remote_tarball = f"/tmp/{os.path.basename(_temp_file_name(u'.tgz'))}"
+        for _ in range(3):
+            _upload_objects(manifest, missing, objects, node, remote_tarball)
+            stdout, _ = exec_cmd_no_error(
+                node, f"staging=$(mktemp -d {cache}/staging.XXXXXX) && "
+                f"tar -zxf {remote_tarball} -C $staging && "
+                f"rm -f {remote_tarball} && "
+                f"flock {lock} python3 -c {shlex.quote(TREE_BUILDER)} "
+                f"{cache} {manifest_hash} $staging",
+                message=f"Failed to build framework tree at {node_str}",
+                timeout=600, include_reason=True
+            )
+            pruned = stdout.split()
+            if not pruned:
+                break
+            summary += f" Uploaded {len(pruned)} files pruned meanwhile."
+            missing = pruned
+        else:
+            raise RuntimeError(
+                f"Framework files keep being pruned at {node_str}."
+            )
+    exec_cmd_no_error(
+        node, f"sudo rm -rf {con.REMOTE_FW_DIR} && "
+        f"flock -s {lock} cp -a {tree} {con.REMOTE_FW_DIR}",
+        message=f"Failed to copy framework tree at {node_str}",
+        timeout=600, include_reason=True
+    )
+    return summary
+
+
 def copy_tarball_to_node(tarball, node):
     """Copy tarball file from local host to remote node.
 
@@ -146,25 +424,41 @@ def create_env_directory_at_node(node):
     return stdout, stderr
 
 
-def setup_node(node, tarball, remote_tarball, results=None, logs=None):
+def setup_node(
+        node, tarball, remote_tarball, results=None, logs=None,
+        manifest=None, summaries=None):
     """Copy a tarball to a node and extract it.
 
+    If manifest is given, deploy only the missing files instead.
+
     :param node: A node where the tarball will be copied and extracted.
     :param tarball: Local path of tarball to be copied.
     :param remote_tarball: Remote path of the tarball.
     :param results: A list where to store the result of node setup, optional.
     :param logs: A list where to store anything that should be logged.
+    :param manifest: Result of compute_framework_manifest, if delta deploy.
+    :param summaries: A list where to store the delta deploy summary,
+        to be printed to console from the main thread.
     :type node: dict
     :type tarball: str
     :type remote_tarball: str
     :type results: list
     :type logs: list
+    :type manifest: Optional[Tuple[bytes, str, Dict[str, str]]]
+    :type summaries: list
     :returns: True - success, False - error
     :rtype: bool
     """
     try:
-        copy_tarball_to_node(tarball, node)
-        extract_tarball_at_node(remote_tarball, node)
+        if manifest is not None:
+            summary = deploy_delta_to_node(*manifest, node)
+            if isinstance(logs, list):
+                logs.append(summary)
+            if isinstance(summaries, list):
+                summaries.append(summary)
+        else:
+            copy_tarball_to_node(tarball, node)
+            extract_tarball_at_node(remote_tarball, node)
         if node[u"type"] == NodeType.TG:
             stdout, stderr = create_env_directory_at_node(node)
             if isinstance(logs, list):
@@ -262,6 +556,8 @@ class SetupFramework:
     Some tests need the scripts at remote hosts before executing them.
     This class packs the whole testing directory and copies it over
     to all nodes in topology under /tmp/.
+    In "delta" deploy mode (see Constants.FRAMEWORK_DEPLOY_MODE),
+    only files missing in the cache at the node are copied.
     """
 
     @staticmethod
@@ -273,18 +569,26 @@ class SetupFramework:
         :raises RuntimeError: If setup framework failed.
         """
 
-        tarball = pack_framework_dir()
-        msg = f"Framework packed to {tarball}"
+        if con.FRAMEWORK_DEPLOY_MODE == u"delta":
+            manifest = compute_framework_manifest()
+            tarball = None
+            msg = f"Framework manifest {manifest[1]} computed"
+        else:
+            manifest = None
+            tarball = pack_framework_dir()
+            msg = f"Framework packed to {tarball}"
         logger.console(msg)
         logger.trace(msg)
         remote_tarball = f"{tarball}"
 
         results = list()
         logs = list()
+        summaries = list()
         threads = list()
 
         for node in nodes.values():
-            args = node, tarball, remote_tarball, results, logs
+            args = node, tarball, remote_tarball, results, logs, manifest, \
+                summaries
             thread = threading.Thread(target=setup_node, args=args)
             thread.start()
             threads.append(thread)
@@ -298,10 +602,13 @@ class SetupFramework:
 
         logger.info(f"Results: {results}")
 
+        for summary in summaries:
+            logger.console(summary)
         for log in logs:
             logger.trace(log)
 
-        delete_local_tarball(tarball)
+        if tarball is not None:
+            delete_local_tarball(tarball)
         if all(results):
             logger.console(u"All nodes are ready.")
             for node in nodes.values():
@@ -0,0 +1,310 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Library for long-lived SSH tunnels forwarding remote unix sockets.
+
+Paramiko does not support forwarding of unix domain sockets,
+so the ssh command is used, in master mode with a control socket.
+One master process is kept per node, forwards of remote sockets
+are added to (and cancelled from) the running master via the control socket,
+so VPP restarts do not need a new SSH handshake.
+"""
+
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from robot.api import logger
+
+from resources.libraries.python.LocalExecution import run
+
+
+__all__ = ["SshTunnel"]
+
+
+def wait_for_path(path, timeout=10.0, process=None):
+    """Wait until a local file (usually a socket) appears.
+
+    Only stat calls are used (no subprocess is forked),
+    the polling interval starts short and grows up to 0.1 seconds.
+
+    :param path: Local path to wait for.
+    :param timeout: Maximal time to wait [s].
+    :param process: If set, stop waiting when this process exits.
+    :type path: str
+    :type timeout: float
+    :type process: Optional[subprocess.Popen]
+    :returns: Whether the path exists.
+    :rtype: bool
+    """
+    time_stop = time.monotonic() + timeout
+    interval = 0.001
+    while not os.path.exists(path):
+        if process is not None and process.poll() is not None:
+            return False
+        if time.monotonic() >= time_stop:
+            return False
+        time.sleep(interval)
+        interval = min(interval * 2, 0.1)
+    return True
+
+
+class SshTunnel:
+    """SSH master connection to one node, forwarding remote unix sockets.
+
+    Instances are cached per node (host, port and username),
+    use SshTunnel.for_node(node) instead of the constructor.
+    The master stays connected across tests and suites,
+    until close_all() (or exit of the Python process).
+
+    The master runs "cat" remotely, reading from a pipe only this process
+    holds. If the process dies without cleanup, the pipe gets closed,
+    remote cat exits and the master exits as soon as the forwarded
+    connections (also belonging to the dead process) are closed,
+    so no ssh process is leaked for long.
+    """
+
+    tunnels = dict()
+    """Mapping from node key to connected tunnel instance."""
+
+    def __init__(self, node):
+        """Store the node, declare managed variables.
+
+        :param node: Node to connect to.
+        :type node: dict
+        """
+        self._node = node
+        self._temp_dir = None
+        self._control_socket = None
+        self._process = None
+        # Mapping from remote socket path to local socket path.
+        self._forwards = dict()
+        # Number of the next local socket, never reused,
+        # as a cancelled forward can still be bound by the master.
+        self._next_forward = 0
+
+    @staticmethod
+    def key_for_node(node):
+        """Return a hashable object to distinguish nodes.
+
+        The fields to include are chosen by what ssh needs.
+
+        :param node: The node object to distinguish.
+        :type node: dict
+        :returns: Tuple of values distinguishing this node from similar ones.
+        :rtype: tuple of str
+        """
+        return node["host"], node["port"], node["username"]
+
+    @classmethod
+    def for_node(cls, node):
+        """Return the cached tunnel to the node, create if not cached.
+
+        The master connection is (re)started lazily, by forward().
+
+        :param node: The node to get tunnel to.
+        :type node: dict
+        :returns: Tunnel instance.
+        :rtype: SshTunnel
+        """
+        key = cls.key_for_node(node)
+        tunnel = cls.tunnels.get(key)
+        if tunnel is None:
+            tunnel = cls.tunnels[key] = cls(node)
+        return tunnel
+
+    @classmethod
+    def close_all(cls):
+        """Close all master connections, removing all local sockets."""
+        for key in list(cls.tunnels.keys()):
+            cls.tunnels.pop(key).close()
+
+    def is_alive(self):
+        """Return whether the master process is running.
+
+        :returns: True if the master is up.
+        :rtype: bool
+        """
+        return self._process is not None and self._process.poll() is None
+
+    def _ssh_base(self):
+        """Return the ssh command prefix addressing the master.
+
+        :returns: Command parts, to be followed by node address.
+        :rtype: list of str
+        """
+        return ["ssh", "-S", self._control_socket]
+
+    def _address(self):
+        """Return the user@host argument for ssh.
+
+        :returns: The ssh destination.
+        :rtype: str
+        """
+        return f"{self._node['username']}@{self._node['host']}"
+
+    def _start(self):
+        """Start the master process, wait for its control socket.
+
+        :raises RuntimeError: If the master does not connect in time.
+        """
+        self.close()
+        node = self._node
+        # Lives as long as the tunnel, close() cleans it up.
+        # pylint: disable-next=consider-using-with
+        self._temp_dir = tempfile.TemporaryDirectory(dir="/tmp")
+        self._control_socket = self._temp_dir.name + "/ssh.sock"
+        # The log level is to suppress "Warning: Permanently added" messages.
+        ssh_cmd = self._ssh_base() + [
+            "-M",
+            "-p",
+            str(node["port"]),
+            "-o",
+            "LogLevel=ERROR",
+            "-o",
+            "UserKnownHostsFile=/dev/null",
+            "-o",
+            "StrictHostKeyChecking=no",
+            "-o",
+            "ServerAliveInterval=10",
+            self._address(),
+            "cat",
+        ]
+        key_file = None
+        priv_key = node.get("priv_key")
+        if priv_key:
+            # We need a file to pass the value to ssh command.
+            # Closed in the finally block below, after ssh has read it.
+            # pylint: disable-next=consider-using-with
+            key_file = tempfile.NamedTemporaryFile()
+            key_file.write(priv_key)
+            # Make sure the content is written, but do not close yet.
+            key_file.flush()
+            ssh_cmd[1:1] = ["-i", key_file.name]
+        password = node.get("password")
+        if password:
+            # Prepend sshpass command to set password.
+            ssh_cmd[:0] = ["sshpass", "-p", password]
+        time_start = time.monotonic()
+        # Long-lived master process, close() stops it.
+        # pylint: disable-next=consider-using-with
+        self._process = subprocess.Popen(
+            ssh_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL
+        )
+        try:
+            if not wait_for_path(self._control_socket, process=self._process):
+                raise RuntimeError(
+                    f"SSH master to {self._address()} has not started."
+                )
+        finally:
+            if key_file:
+                # Control socket means the key has been read, or never will.
+                key_file.close()
+        duration = time.monotonic() - time_start
+        logger.trace(f"Starting SSH master {self._address()} took {duration}s.")
+
+    def forward(self, remote_socket):
+        """Forward the remote unix socket, return the local socket path.
+
+        If already forwarded (and the master is alive), return the path
+        without any remote operation. Otherwise the master is started
+        if needed, and the forward is added via the control socket.
+
+        :param remote_socket: Path to remote socket to forward.
+        :type remote_socket: str
+        :returns: Path to the local socket.
+        :rtype: str
+        :raises RuntimeError: If the master or forward cannot be set up.
+        """
+        if not self.is_alive():
+            self._start()
+        local_socket = self._forwards.get(remote_socket)
+        if local_socket and os.path.exists(local_socket):
+            return local_socket
+        local_socket = f"{self._temp_dir.name}/fwd{self._next_forward}.sock"
+        self._next_forward += 1
+        # The master does not bind an existing path.
+        if os.path.exists(local_socket):
+            os.remove(local_socket)
+        run(
+            self._ssh_base() + [
+                "-O",
+                "forward",
+                "-L",
+                f"{local_socket}:{remote_socket}",
+                self._address(),
+            ]
+        )
+        if not wait_for_path(local_socket, process=self._process):
+            raise RuntimeError("Local side socket has not appeared.")
+        self._forwards[remote_socket] = local_socket
+        return local_socket
+
+    def cancel(self, remote_socket):
+        """Cancel the forward of the remote socket, noop if not forwarded.
+
+        Useful when the forward seems broken, next forward() sets it again.
+
+        :param remote_socket: Path to remote socket forwarded before.
+        :type remote_socket: str
+        """
+        local_socket = self._forwards.pop(remote_socket, None)
+        if local_socket is None:
+            return
+        if self.is_alive():
+            run(
+                self._ssh_base() + [
+                    "-O",
+                    "cancel",
+                    "-L",
+                    f"{local_socket}:{remote_socket}",
+                    self._address(),
+                ],
+                check=False,
+            )
+        if os.path.exists(local_socket):
+            os.remove(local_socket)
+
+    def close(self):
+        """Stop the master process, remove the local sockets.
+
+        Noop if not started.
+        """
+        self._forwards = dict()
+        if self._process is not None:
+            if self._process.poll() is None:
+                run(
+                    self._ssh_base() + ["-O", "exit", self._address()],
+                    check=False,
+                )
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=5.0)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    self._process.wait()
+            self._process = None
+        if self._temp_dir is not None:
+            try:
+                self._temp_dir.cleanup()
+            except FileNotFoundError:
+                # There is a race condition with ssh removing its socket.
+                # Single retry should be enough to ensure the complete removal.
+                shutil.rmtree(self._temp_dir.name, ignore_errors=True)
+            self._temp_dir = None
+
+
+atexit.register(SshTunnel.close_all)
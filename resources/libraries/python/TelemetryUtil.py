@@ -15,6 +15,7 @@
 
 from resources.libraries.python.model.ExportResult import append_telemetry
 from resources.libraries.python.Constants import Constants
+from resources.libraries.python.NodeGroup import NodeGroup
 from resources.libraries.python.ssh import exec_cmd_no_error
 from resources.libraries.python.topology import NodeType
 
@@ -41,6 +42,8 @@ class TelemetryUtil:
         :type spath: str
         :type rate: str
         :type export: bool
+        :returns: Telemetry items to export, empty if not export.
+        :rtype: list of str
         """
         config = ""
         config += f"{Constants.REMOTE_FW_DIR}/"
@@ -58,7 +61,7 @@ class TelemetryUtil:
         exec_cmd_no_error(node, f"{cd_cmd} && {bin_cmd}", sudo=True)
 
         if not export:
-            return
+            return list()
 
         hostname = exec_cmd_no_error(node, "hostname")[0].strip()
         stdout, _ = exec_cmd_no_error(
@@ -69,14 +72,41 @@ class TelemetryUtil:
         if sid:
             prefix += f"hook=\"{sid}\","
         prefix += f"rate=\"{rate}\","
-        for line in stdout.splitlines():
-            if line and not line.startswith("#"):
-                append_telemetry(
-                    prefix.join(line.rsplit("{", 1)).replace("\"", "'")
-                )
+        return [
+            prefix.join(line.rsplit("{", 1)).replace("\"", "'")
+            for line in stdout.splitlines()
+            if line and not line.startswith("#")
+        ]
+
+    def _run_telemetry_on_dut(self, node, profile, rate="", export=False):
+        """Get telemetry read on all CLI sockets of the DUT.
+
+        :param node: DUT node in the topology.
+        :param profile: Telemetry configuration profile.
+        :param rate: Telemetry load, unique within the test (optional).
+        :param export: If false, do not attempt JSON export (default false).
+        :type node: dict
+        :type profile: str
+        :type rate: str
+        :type export: bool
+        :returns: Telemetry items to export, empty if not export.
+        :rtype: list of str
+        """
+        items = list()
+        try:
+            for sid, spath in node["sockets"]["CLI"].items():
+                items.extend(self._run_telemetry(
+                    node, profile=profile, sid=sid, spath=spath,
+                    rate=rate, export=export
+                ))
+        except IndexError:
+            pass
+        return items
 
     def run_telemetry_on_all_duts(self, nodes, profile, rate="", export=False):
-        """Get telemetry read on all DUTs.
+        """Get telemetry read on all DUTs, concurrently.
+
+        Telemetry items are exported (from the main thread) in node order.
 
         :param nodes: Nodes in the topology.
         :param profile: Telemetry configuration profile.
@@ -87,13 +117,9 @@ class TelemetryUtil:
         :type rate: str
         :type export: bool
         """
-        for node in nodes.values():
-            if node["type"] == NodeType.DUT:
-                try:
-                    for sid, spath in node["sockets"]["CLI"].items():
-                        self._run_telemetry(
-                            node, profile=profile, sid=sid, spath=spath,
-                            rate=rate, export=export
-                        )
-                except IndexError:
-                    pass
+        results = NodeGroup(nodes, NodeType.DUT).map(
+            self._run_telemetry_on_dut, profile, rate=rate, export=export
+        )
+        for items in results:
+            for item in items:
+                append_telemetry(item)
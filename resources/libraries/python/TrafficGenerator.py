@@ -1703,6 +1703,7 @@ class OptimizedSearch:
             trial_number_offset=initial_count,
             timeout=timeout,
             trace_enabled=trace_enabled,
+            sample_generator=Constants.PLRSEARCH_SAMPLE_GENERATOR or None,
         )
         result = algorithm.search(
             min_rate=min_load,
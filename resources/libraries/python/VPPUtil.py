@@ -21,6 +21,7 @@ from resources.libraries.python.PapiExecutor import PapiSocketExecutor
 from resources.libraries.python.model.ExportResult import (
     export_dut_type_and_version
 )
+from resources.libraries.python.NodeGroup import NodeGroup
 from resources.libraries.python.ssh import exec_cmd_no_error, exec_cmd
 from resources.libraries.python.topology import Topology, SocketType, NodeType
 
@@ -41,8 +42,22 @@ class VPPUtil:
         """
         # Containers have a separate lifecycle, but better be safe.
         PapiSocketExecutor.disconnect_all_sockets_by_node(node)
+        VPPUtil._restart_vpp_process(node, node_key)
 
-        VPPUtil.stop_vpp_service(node)
+    @staticmethod
+    def _restart_vpp_process(node, node_key=None):
+        """Restart VPP process on the node, without touching PAPI executor.
+
+        Only SSH commands and updates of the node are done, so this is safe
+        to call from worker threads. The caller disconnects PAPI sockets
+        of the node before (from the main thread).
+
+        :param node: Topology node.
+        :param node_key: Topology node key.
+        :type node: dict
+        :type node_key: str
+        """
+        VPPUtil._stop_vpp_process(node)
         command = "/usr/bin/vpp -c /etc/vpp/startup.conf"
         message = f"Node {node[u'host']} failed to start VPP!"
         exec_cmd_no_error(
@@ -59,14 +74,16 @@ class VPPUtil:
 
     @staticmethod
     def restart_vpp_service_on_all_duts(nodes):
-        """Restart VPP service on all DUT nodes.
+        """Restart VPP service on all DUT nodes, concurrently.
 
         :param nodes: Topology nodes.
         :type nodes: dict
         """
-        for node_key, node in nodes.items():
-            if node[u"type"] == NodeType.DUT:
-                VPPUtil.restart_vpp_service(node, node_key)
+        duts = NodeGroup(nodes, NodeType.DUT)
+        # PAPI caches are not thread-safe, disconnect from the main thread.
+        for node in duts:
+            PapiSocketExecutor.disconnect_all_sockets_by_node(node)
+        duts.map_items(VPPUtil._restart_vpp_process)
 
     @staticmethod
     def stop_vpp_service(node, node_key=None):
@@ -80,6 +97,21 @@ class VPPUtil:
         :type node_key: str
         """
         PapiSocketExecutor.disconnect_all_sockets_by_node(node)
+        VPPUtil._stop_vpp_process(node, node_key)
+
+    @staticmethod
+    def _stop_vpp_process(node, node_key=None):
+        """Stop VPP process on the node, without touching PAPI executor.
+
+        Only SSH commands and updates of the node are done, so this is safe
+        to call from worker threads. The caller disconnects PAPI sockets
+        of the node before (from the main thread).
+
+        :param node: Topology node.
+        :param node_key: Topology node key.
+        :type node: dict
+        :type node_key: str
+        """
         command = "pkill -9 vpp; sleep 1"
         exec_cmd(node, command, timeout=180, sudo=True)
         command = (
@@ -95,47 +127,60 @@ class VPPUtil:
 
     @staticmethod
     def stop_vpp_service_on_all_duts(nodes):
-        """Stop VPP service on all DUT nodes.
+        """Stop VPP service on all DUT nodes, concurrently.
 
         :param nodes: Topology nodes.
         :type nodes: dict
         """
-        for node_key, node in nodes.items():
-            if node[u"type"] == NodeType.DUT:
-                VPPUtil.stop_vpp_service(node, node_key)
+        duts = NodeGroup(nodes, NodeType.DUT)
+        # PAPI caches are not thread-safe, disconnect from the main thread.
+        for node in duts:
+            PapiSocketExecutor.disconnect_all_sockets_by_node(node)
+        duts.map_items(VPPUtil._stop_vpp_process)
 
     @staticmethod
-    def install_vpp_on_all_duts(nodes, vpp_pkg_dir):
-        """Install VPP on all DUT nodes.
+    def install_vpp(node, vpp_pkg_dir):
+        """Install VPP on the specified topology node.
 
-        :param nodes: Nodes in the topology.
+        VPP service is expected to be stopped.
+
+        :param node: Topology node.
         :param vpp_pkg_dir: Path to directory where VPP packages are stored.
-        :type nodes: dict
+        :type node: dict
         :type vpp_pkg_dir: str
         """
-        VPPUtil.stop_vpp_service_on_all_duts(nodes)
-        for node in nodes.values():
-            message = f"Failed to install VPP on host {node['host']}!"
-            if node["type"] == NodeType.DUT:
-                command = "mkdir -p /var/log/vpp/"
-                exec_cmd(node, command, sudo=True)
+        message = f"Failed to install VPP on host {node['host']}!"
+        command = "mkdir -p /var/log/vpp/"
+        exec_cmd(node, command, sudo=True)
 
-                command = "ln -s /dev/null /etc/systemd/system/vpp.service"
-                exec_cmd(node, command, sudo=True)
+        command = "ln -s /dev/null /etc/systemd/system/vpp.service"
+        exec_cmd(node, command, sudo=True)
 
-                command = "ln -s /dev/null /etc/sysctl.d/80-vpp.conf"
-                exec_cmd(node, command, sudo=True)
+        command = "ln -s /dev/null /etc/sysctl.d/80-vpp.conf"
+        exec_cmd(node, command, sudo=True)
 
-                command = "apt-get purge -y '*vpp*' || true"
-                exec_cmd_no_error(node, command, timeout=120, sudo=True)
+        command = "apt-get purge -y '*vpp*' || true"
+        exec_cmd_no_error(node, command, timeout=120, sudo=True)
 
-                command = f"dpkg -i --force-all {vpp_pkg_dir}*.deb"
-                exec_cmd_no_error(
-                    node, command, timeout=120, sudo=True, message=message
-                )
+        command = f"dpkg -i --force-all {vpp_pkg_dir}*.deb"
+        exec_cmd_no_error(
+            node, command, timeout=120, sudo=True, message=message
+        )
 
-                command = "dpkg -l | grep vpp"
-                exec_cmd_no_error(node, command, sudo=True)
+        command = "dpkg -l | grep vpp"
+        exec_cmd_no_error(node, command, sudo=True)
+
+    @staticmethod
+    def install_vpp_on_all_duts(nodes, vpp_pkg_dir):
+        """Install VPP on all DUT nodes, concurrently.
+
+        :param nodes: Nodes in the topology.
+        :param vpp_pkg_dir: Path to directory where VPP packages are stored.
+        :type nodes: dict
+        :type vpp_pkg_dir: str
+        """
+        VPPUtil.stop_vpp_service_on_all_duts(nodes)
+        NodeGroup(nodes, NodeType.DUT).map(VPPUtil.install_vpp, vpp_pkg_dir)
 
     @staticmethod
     def verify_vpp_installed(node):
@@ -193,26 +238,51 @@ class VPPUtil:
         """
         DUTSetup.verify_program_installed(node, 'vpp')
         try:
-            # Verify responsiveness of vppctl.
-            VPPUtil.verify_vpp_started(node)
-            # Adjust privileges.
-            VPPUtil.adjust_privileges(node)
+            VPPUtil.verify_vpp_cli(node)
             # Verify responsiveness of PAPI.
             VPPUtil.show_log(node)
             VPPUtil.vpp_show_version(node)
         finally:
             DUTSetup.get_service_logs(node, Constants.VPP_UNIT)
 
+    @staticmethod
+    def verify_vpp_cli(node):
+        """Verify that VPP CLI is responsive. Adjust privileges
+        so user can connect without sudo.
+
+        This is the part of verify_vpp not using PAPI nor logging results,
+        so it can run concurrently on multiple nodes.
+
+        :param node: Topology node.
+        :type node: dict
+        :raises RuntimeError: If VPP service fails to start.
+        """
+        # Verify responsiveness of vppctl.
+        VPPUtil.verify_vpp_started(node)
+        # Adjust privileges.
+        VPPUtil.adjust_privileges(node)
+
     @staticmethod
     def verify_vpp_on_all_duts(nodes):
         """Verify that VPP is installed and started on all DUT nodes.
 
+        Waiting for VPP CLI is done concurrently,
+        PAPI checks and logging are done node by node.
+
         :param nodes: Nodes in the topology.
         :type nodes: dict
         """
-        for node in nodes.values():
-            if node[u"type"] == NodeType.DUT:
-                VPPUtil.verify_vpp(node)
+        duts = NodeGroup(nodes, NodeType.DUT)
+        duts.map(DUTSetup.verify_program_installed, u"vpp")
+        try:
+            duts.map(VPPUtil.verify_vpp_cli)
+            for node in duts:
+                # Verify responsiveness of PAPI.
+                VPPUtil.show_log(node)
+                VPPUtil.vpp_show_version(node)
+        finally:
+            for node in duts:
+                DUTSetup.get_service_logs(node, Constants.VPP_UNIT)
 
     @staticmethod
     def vpp_show_version(
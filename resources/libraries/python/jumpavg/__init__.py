@@ -20,3 +20,4 @@ from .bit_counting_stats import BitCountingStats
 from .bit_counting_group import BitCountingGroup
 from .bit_counting_group_list import BitCountingGroupList
 from .classify import classify
+from .incremental_classifier import IncrementalClassifier
@@ -0,0 +1,374 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module holding the classify_arrays function.
+
+This is an alternative implementation of the main loop of classify function.
+Instead of updating each open group list by appending a run
+(and recomputing stats and bits in pure Python one group at a time),
+stats of the last groups of all open group lists are updated at once,
+and their bits are computed by array operations.
+
+The result is exactly the same as from the pure Python loop.
+Stats are updated by the same floating point operations in the same order
+as in AvgStdevStats.for_runs, so they are the same to the last bit.
+Bits computed by NumPy can differ from the pure Python ones
+in last bits (logarithms are not correctly rounded),
+so whenever more group lists are close to the record,
+their bits are computed in pure Python to choose the same record.
+
+NumPy is needed, so the classify function imports this module
+only if NumPy is available.
+"""
+
+import math
+import typing
+
+import numpy
+
+from .avg_stdev_stats import AvgStdevStats
+from .bit_counting_group import BitCountingGroup
+from .bit_counting_group_list import BitCountingGroupList
+from .bit_counting_stats import BitCountingStats
+
+
+# Relative difference of bits (computed by NumPy) under which
+# the bits are recomputed in pure Python to compare them exactly.
+TIE_TOLERANCE = 1e-9
+
+
+def bits_for_arrays(
+    size: numpy.ndarray,
+    avg: numpy.ndarray,
+    stdev: numpy.ndarray,
+    max_value: float,
+    unit: float,
+    prev_avg: numpy.ndarray,
+    lgamma_table: numpy.ndarray,
+) -> numpy.ndarray:
+    """Return bits of groups described by the arrays of stats.
+
+    This is the same computation as in BitCountingStats.__post_init__,
+    just done for many groups at once, all of them non-empty.
+
+    As NumPy does not have lgamma, the values needed are looked up
+    in a table, indexed by size.
+
+    :param size: Number of samples in each group.
+    :param avg: Population average of each group.
+    :param stdev: Population standard deviation of each group.
+    :param max_value: Maximal sample value.
+    :param unit: Typical resolution of the values.
+    :param prev_avg: Average of the previous group, NaN if no previous group.
+    :param lgamma_table: Value of lgamma((size - 1) / 2) at index size,
+        for sizes at least 2.
+    :type size: numpy.ndarray
+    :type avg: numpy.ndarray
+    :type stdev: numpy.ndarray
+    :type max_value: float
+    :type unit: float
+    :type prev_avg: numpy.ndarray
+    :type lgamma_table: numpy.ndarray
+    :returns: The information content of each group.
+    :rtype: numpy.ndarray
+    """
+    max_value = max_value / unit
+    avg = avg / unit
+    stdev = stdev / unit
+    prev_avg = prev_avg / unit
+    bits = numpy.log2(size * (size + 1.0))
+    first = numpy.isnan(prev_avg)
+    prev_avg = numpy.where(first, 0.0, prev_avg)
+    norm = prev_avg * prev_avg
+    norm -= (prev_avg - 1) * max_value
+    norm += max_value * max_value / 2
+    bits -= numpy.where(
+        first,
+        -math.log(max_value + 1, 2),
+        numpy.log2((numpy.abs(avg - prev_avg) + 1) / norm),
+    )
+    sphere_area_ln = math.log(2)
+    sphere_area_ln += math.log(math.pi) * ((size - 1) / 2)
+    sphere_area_ln -= lgamma_table[size.astype(numpy.int64)]
+    sphere_area_ln += numpy.log(stdev + 1) * (size - 2)
+    sphere_area_ln += numpy.log(size) * ((size - 2) / 2)
+    stdev_bits = numpy.log2((stdev + 1) * (stdev + 2))
+    stdev_bits += math.log(1 - 1 / (max_value + 2), 2)
+    stdev_bits += sphere_area_ln / math.log(2)
+    bits += numpy.where(size < 2, 0.0, stdev_bits)
+    return bits
+
+
+class _OpenGroupLists:
+    """Open group lists of the classify loop, represented by arrays.
+
+    Open group list starting at index j is represented by
+    the bits of the record group list just before j,
+    the average of its last group (as copied when j is appended),
+    and stats of the group from j to the current index.
+    """
+
+    def __init__(
+        self,
+        values: typing.List[typing.Union[float, AvgStdevStats]],
+        max_value: float,
+        unit: float,
+    ) -> None:
+        """Allocate the arrays.
+
+        :param values: Processed values (floats or AvgStdevStats) to classify.
+        :param max_value: Maximal sample value.
+        :param unit: Typical resolution of the values.
+        :type values: List[Union[float, AvgStdevStats]]
+        :type max_value: float
+        :type unit: float
+        """
+        self.values = values
+        self.max_value = max_value
+        self.unit = unit
+        length = len(values)
+        # Stats of the last group of the open group list starting at index.
+        self.sizes = numpy.zeros(length)
+        self.avgs = numpy.zeros(length)
+        self.stdevs = numpy.zeros(length)
+        # Bits of the record group list just before each start index,
+        # and the average of its last group, as copied.
+        self.prev_bits = numpy.zeros(length)
+        self.prev_avgs = numpy.full(length, numpy.nan)
+        total_size = 0
+        for value in values:
+            total_size += 1 if isinstance(value, (float, int)) else value.size
+        self.lgamma_table = numpy.zeros(total_size + 1)
+        for size in range(2, total_size + 1):
+            self.lgamma_table[size] = math.lgamma((size - 1) / 2)
+        # Start of the last group of the record group list at each index,
+        # its stats and cached bits (None if the loop does not compute them).
+        self.records = []
+
+    def prev_avg(self, start: int) -> typing.Optional[float]:
+        """Return the average of the group before the group at start index.
+
+        :param start: Index of the first run of the group.
+        :type start: int
+        :returns: The previous average, None for the first group.
+        :rtype: Optional[float]
+        """
+        return None if start == 0 else float(self.prev_avgs[start])
+
+    def stats(self, start: int) -> AvgStdevStats:
+        """Return stats of the last group of the open group list.
+
+        :param start: Index of the first run of the last group.
+        :type start: int
+        :returns: Stats of the last group.
+        :rtype: AvgStdevStats
+        """
+        return AvgStdevStats(
+            size=int(self.sizes[start]),
+            avg=float(self.avgs[start]),
+            stdev=float(self.stdevs[start]),
+        )
+
+    def group_bits(self, stats: AvgStdevStats, start: int) -> float:
+        """Return bits of the group, computed in pure Python.
+
+        This is the same computation as in BitCountingGroup.bits.
+
+        :param stats: Stats of the group.
+        :param start: Index of the first run of the group.
+        :type stats: AvgStdevStats
+        :type start: int
+        :returns: The information content of the group.
+        :rtype: float
+        """
+        return BitCountingStats.for_runs_and_params(
+            runs=[stats],
+            max_value=self.max_value,
+            unit=self.unit,
+            prev_avg=self.prev_avg(start),
+        ).bits
+
+    def exact_bits(self, start: int) -> float:
+        """Return bits of the open group list, as the loop computes them.
+
+        :param start: Index of the first run of the last group.
+        :type start: int
+        :returns: Bits of the open group list.
+        :rtype: float
+        """
+        return float(self.prev_bits[start]) + self.group_bits(
+            self.stats(start), start
+        )
+
+    def append(self, end: int) -> None:
+        """Append the value at the index to all open group lists.
+
+        Stats of the last groups of the old group lists are updated
+        the same way as AvgStdevStats.for_runs([stats, value]) does,
+        zero terms are skipped. The new group list gets a new group.
+
+        :param end: Index of the value.
+        :type end: int
+        """
+        value = self.values[end]
+        if end:
+            if isinstance(value, (float, int)):
+                run_size, run_avg, run_stdev = 1, value, 0.0
+            else:
+                run_size, run_avg, run_stdev = value.size, value.avg, value.stdev
+            size = self.sizes[:end]
+            avg = 0.0 + self.avgs[:end] * size / size
+            moment_2 = 0.0 + self.stdevs[:end] * self.stdevs[:end] * size
+            delta = run_avg - avg
+            new_size = size + run_size
+            self.avgs[:end] = avg + delta * run_size / new_size
+            moment_2 += run_stdev * run_stdev * run_size
+            moment_2 += delta * delta * size * run_size / new_size
+            self.sizes[:end] = new_size
+            self.stdevs[:end] = numpy.sqrt(moment_2 / new_size)
+        stats = AvgStdevStats.for_runs([value])
+        self.sizes[end] = stats.size
+        self.avgs[end] = stats.avg
+        self.stdevs[end] = stats.stdev
+
+    def choose_record(self, end: int) -> int:
+        """Return the start of the last group of the record group list.
+
+        The loop in classify starts with the new group list (start == end)
+        and replaces the record only if an older one has strictly less bits,
+        so the earliest of the old group lists with the least bits is chosen
+        if it has less bits than the new one.
+        The bits computed by NumPy are used, only the group lists
+        close to the least bits are compared by the exact bits.
+
+        :param end: Index of the last appended value.
+        :type end: int
+        :returns: Start index of the record last group.
+        :rtype: int
+        """
+        bits = self.prev_bits[: end + 1] + bits_for_arrays(
+            size=self.sizes[: end + 1],
+            avg=self.avgs[: end + 1],
+            stdev=self.stdevs[: end + 1],
+            max_value=self.max_value,
+            unit=self.unit,
+            prev_avg=self.prev_avgs[: end + 1],
+            lgamma_table=self.lgamma_table,
+        )
+        least = float(numpy.min(bits))
+        close = numpy.flatnonzero(
+            bits <= least + TIE_TOLERANCE * (abs(least) + 1.0)
+        )
+        if len(close) == 1:
+            return int(close[0])
+        start = end
+        record = self.exact_bits(end)
+        for index in close[close < end]:
+            candidate = self.exact_bits(int(index))
+            if candidate < record:
+                start, record = int(index), candidate
+        return start
+
+    def set_record(self, end: int, start: int) -> None:
+        """Remember the record group list at the index.
+
+        Its bits and the average of its last group (as copied) are stored
+        for the group list starting at the next index.
+
+        :param end: Index of the last appended value.
+        :param start: Start index of the record last group.
+        :type end: int
+        :type start: int
+        """
+        stats = self.stats(start)
+        # The loop compares the bits of the record, so they are cached,
+        # except for the first index with no comparisons.
+        last_bits = None if end == 0 else self.group_bits(stats, start)
+        self.records.append((start, stats, last_bits))
+        if end + 1 < len(self.values):
+            # The last group is copied when the next group is appended.
+            copied = AvgStdevStats.for_runs([stats])
+            if last_bits is None:
+                last_bits = self.group_bits(copied, start)
+            self.prev_bits[end + 1] = float(self.prev_bits[start]) + last_bits
+            self.prev_avgs[end + 1] = copied.avg
+
+    def group_list(self) -> BitCountingGroupList:
+        """Return the record group list at the last index.
+
+        The groups are constructed with the same stats and cached bits
+        as the loop has in the group objects.
+
+        :returns: The record group list.
+        :rtype: BitCountingGroupList
+        """
+        length = len(self.values)
+        boundaries = []
+        end = length - 1
+        while end >= 0:
+            boundaries.append(end)
+            end = self.records[end][0] - 1
+        group_list = []
+        for end in reversed(boundaries):
+            start, stats, cached_bits = self.records[end]
+            if end + 1 < length:
+                stats = AvgStdevStats.for_runs([stats])
+                if cached_bits is None:
+                    cached_bits = self.group_bits(stats, start)
+            group_list.append(
+                BitCountingGroup(
+                    run_list=list(self.values[start : end + 1]),
+                    max_value=self.max_value,
+                    unit=self.unit,
+                    prev_avg=self.prev_avg(start),
+                    stats=stats,
+                    cached_bits=cached_bits,
+                )
+            )
+        return BitCountingGroupList(
+            max_value=self.max_value,
+            unit=self.unit,
+            group_list=group_list,
+            bits_except_last=float(self.prev_bits[self.records[-1][0]]),
+        )
+
+
+def classify_arrays(
+    values: typing.List[typing.Union[float, AvgStdevStats]],
+    max_value: float,
+    unit: float,
+) -> BitCountingGroupList:
+    """Return the values in groups of optimal bit count.
+
+    The values are already processed by the classify function,
+    this only replaces its main loop, comments are not set.
+
+    The returned group list is the same as from the pure Python loop,
+    including the stats of the groups and the cached bits.
+
+    :param values: Processed values (floats or AvgStdevStats) to classify.
+    :param max_value: Maximal sample value.
+    :param unit: Typical resolution of the values.
+    :type values: List[Union[float, AvgStdevStats]]
+    :type max_value: float
+    :type unit: float
+    :returns: Classified group list.
+    :rtype: BitCountingGroupList
+    """
+    if not values:
+        return BitCountingGroupList(max_value=max_value, unit=unit)
+    open_glists = _OpenGroupLists(values, max_value, unit)
+    for end in range(len(values)):
+        open_glists.append(end)
+        open_glists.set_record(end, open_glists.choose_record(end))
+    return open_glists.group_list()
@@ -0,0 +1,113 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of IncrementalClassifier against the classify function.
+
+Synthetic MRR-like series are used: the level changes every 1 to 200 samples
+(by up to 30 percent), each sample has 0.5 to 3 percent noise.
+For each size, the whole series is classified by classify function
+(skipped for sizes above --max-classify, as it is quadratic),
+by default in the pure Python implementation, with --numpy in NumPy one,
+and by IncrementalClassifier.extend. Then a single value
+is appended to the incremental classifier, as trending does daily.
+Group counts are printed, so the results can be compared.
+
+Run from the directory containing jumpavg package:
+
+    python3 -m jumpavg.benchmark --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+from .classify import classify
+from .incremental_classifier import IncrementalClassifier
+
+
+def generate_series(size, seed=0):
+    """Return a synthetic series of values with level changes.
+
+    :param size: Number of values to generate.
+    :param seed: Seed for the random generator.
+    :type size: int
+    :type seed: int
+    :returns: The generated values.
+    :rtype: List[float]
+    """
+    rng = random.Random(seed)
+    values = []
+    level = 1e7
+    while len(values) < size:
+        level *= rng.uniform(0.7, 1.3)
+        noise = rng.uniform(0.005, 0.03)
+        for _ in range(rng.randint(1, 200)):
+            values.append(level * (1.0 + rng.gauss(0.0, noise)))
+    return values[:size]
+
+
+def run(sizes, max_classify, use_numpy=False):
+    """Measure and print durations for each series size.
+
+    :param sizes: Numbers of values to classify.
+    :param max_classify: Largest size to classify by classify function.
+    :param use_numpy: Whether classify function should use NumPy.
+    :type sizes: Iterable[int]
+    :type max_classify: int
+    :type use_numpy: bool
+    """
+    print("  size  classify[s]  groups  extend[s]  groups  append[s]")
+    for size in sizes:
+        values = generate_series(size + 1)
+        if size <= max_classify:
+            start = time.monotonic()
+            groups = len(classify(values[:-1], use_numpy=use_numpy))
+            classify_str = f"{time.monotonic() - start:12.3f} {groups:7d}"
+        else:
+            classify_str = f"{'-':>12s} {'-':>7s}"
+        start = time.monotonic()
+        classifier = IncrementalClassifier().extend(values[:-1])
+        groups = len(classifier.result)
+        extend_duration = time.monotonic() - start
+        start = time.monotonic()
+        classifier.append(values[-1])
+        append_duration = time.monotonic() - start
+        print(
+            f"{size:6d} {classify_str} {extend_duration:10.3f} {groups:7d}"
+            f" {append_duration:10.4f}"
+        )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n", maxsplit=1)[0]
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+        help="Numbers of values to classify.",
+    )
+    parser.add_argument(
+        "--max-classify", type=int, default=1000,
+        help="Largest size to also classify by classify function.",
+    )
+    parser.add_argument(
+        "--numpy", action="store_true",
+        help="Use NumPy implementation of classify function.",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.max_classify, args.numpy)
+
+
+if __name__ == "__main__":
+    main()
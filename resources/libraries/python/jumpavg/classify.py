@@ -20,16 +20,23 @@ for grouping results into the list of groups,
 assuming each group is a population of different Gaussian distribution.
 """
 
-from typing import Iterable, Optional, Union
+from typing import Iterable, List, Optional, Union
 
 from .avg_stdev_stats import AvgStdevStats
 from .bit_counting_group_list import BitCountingGroupList
 
+try:
+    from .array_classify import classify_arrays
+except ImportError:
+    # NumPy is optional, pure Python implementation is used without it.
+    classify_arrays = None
+
 
 def classify(
     values: Iterable[Union[float, Iterable[float]]],
     unit: Optional[float] = None,
     sbps: Optional[float] = None,
+    use_numpy: bool = True,
 ) -> BitCountingGroupList:
     """Return the values in groups of optimal bit count.
 
@@ -49,14 +56,22 @@ def classify(
     to set unit such that maximal sample value is this many ones in binary.
     If neither "unit" nor "sbps" are given, "sbps" of 12 is used by default.
 
+    If "use_numpy" is True (the default) and NumPy is available,
+    bits of all candidate group lists are computed at once
+    using NumPy array operations, which is considerably faster.
+    The result is exactly the same as from the pure Python implementation,
+    which is used if NumPy is not available.
+
     :param values: Sequence of runs to classify.
     :param unit: Typical resolution of the values.
         Zero and None means no unit given.
     :param sbps: Significant Bits Per Sample. None on zero means 12.
         If units is not set, this is used to compute unit from max sample value.
+    :param use_numpy: Whether to use NumPy implementation, if available.
     :type values: Iterable[Union[float, Iterable[float]]]
     :type unit: Optional[float]
     :type sbps: Optional[float]
+    :type use_numpy: bool
     :returns: Classified group list.
     :rtype: BitCountingGroupList
     """
@@ -77,10 +92,44 @@ def classify(
             sbps = 12.0
         max_in_units = pow(2.0, sbps + 1.0) - 1.0
         unit = max_value / max_in_units
+    # Without positive max value, the loop raises ValueError (if it computes
+    # any bits), the NumPy implementation would not.
+    if use_numpy and classify_arrays is not None and max_value > 0.0:
+        record_glist = classify_arrays(processed_values, max_value, unit)
+    else:
+        record_glist = _classify_loop(processed_values, max_value, unit)
+    previous_average = record_glist[0].stats.avg
+    for group in record_glist:
+        if group.stats.avg < previous_average:
+            group.comment = "regression"
+        elif group.stats.avg > previous_average:
+            group.comment = "progression"
+        previous_average = group.stats.avg
+    return record_glist
+
+
+def _classify_loop(
+    values: List[Union[float, AvgStdevStats]],
+    max_value: float,
+    unit: float,
+) -> BitCountingGroupList:
+    """Return the processed values in groups of optimal bit count.
+
+    This is the pure Python implementation, comments are not set.
+
+    :param values: Processed values (floats or AvgStdevStats) to classify.
+    :param max_value: Maximal sample value.
+    :param unit: Typical resolution of the values.
+    :type values: List[Union[float, AvgStdevStats]]
+    :type max_value: float
+    :type unit: float
+    :returns: Classified group list.
+    :rtype: BitCountingGroupList
+    """
     # Glist means group list (BitCountingGroupList).
     open_glists = []
     record_glist = BitCountingGroupList(max_value=max_value, unit=unit)
-    for value in processed_values:
+    for value in values:
         new_open_glist = record_glist.copy_fast().append_group_of_runs([value])
         record_glist = new_open_glist
         for old_open_glist in open_glists:
@@ -88,11 +137,4 @@ def classify(
             if old_open_glist.bits < record_glist.bits:
                 record_glist = old_open_glist
         open_glists.append(new_open_glist)
-    previous_average = record_glist[0].stats.avg
-    for group in record_glist:
-        if group.stats.avg < previous_average:
-            group.comment = "regression"
-        elif group.stats.avg > previous_average:
-            group.comment = "progression"
-        previous_average = group.stats.avg
     return record_glist
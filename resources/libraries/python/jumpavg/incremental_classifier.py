@@ -0,0 +1,252 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module holding IncrementalClassifier class.
+
+The classify function processes the whole sequence of values at once,
+and the work done is quadratic in the number of values,
+as every group list that is still "open" (meaning the values are still
+being appended to its last group) is updated for every new value.
+
+This class keeps the classification state between calls,
+so appending a value only processes that one value,
+and it removes open group lists that provably cannot beat the record
+anymore, regardless of the values to be appended in future.
+The pruning is similar to PELT (Pruned Exact Linear Time) algorithm,
+with the bound derived from the bit counting formula used in this package.
+When the values contain changes, the number of open group lists
+stays proportional to the length of the last few groups,
+instead of growing with the total number of values.
+"""
+
+import dataclasses
+import math
+import typing
+
+from .avg_stdev_stats import AvgStdevStats
+from .bit_counting_group import BitCountingGroup
+from .bit_counting_group_list import BitCountingGroupList
+
+
+@dataclasses.dataclass
+class IncrementalClassifier:
+    """Stateful classifier, giving the same groups as the classify function.
+
+    The bit counts depend on the maximal value (and the unit derived from it
+    if sbps is used), so when a new value exceeds the previous maximum,
+    the state is recomputed from all the (already processed) values.
+    That is why extend() is preferred to calling append() in a loop,
+    as it recomputes at most once.
+
+    The pruning assumes the values are non-negative.
+    If a negative value is seen, pruning is turned off (as it may be unsafe)
+    and the classifier keeps all open group lists, just as classify does.
+    """
+
+    unit: typing.Optional[float] = None
+    """Typical resolution of the values. Zero and None means no unit given."""
+    sbps: typing.Optional[float] = None
+    """Significant Bits Per Sample. None on zero means 12.
+    If unit is not set, this is used to compute unit from max sample value."""
+    prune: bool = True
+    """Whether to discard open group lists that can never win."""
+    values: typing.List[typing.Union[float, AvgStdevStats]] = \
+        dataclasses.field(init=False, default_factory=list)
+    """Processed values seen so far."""
+    max_value: float = dataclasses.field(init=False, default=0.0)
+    """Maximal sample value seen so far."""
+    min_value: float = dataclasses.field(init=False, default=0.0)
+    """Minimal sample value seen so far (or zero), to decide on pruning."""
+    open_glists: typing.List[BitCountingGroupList] = \
+        dataclasses.field(init=False, default_factory=list)
+    """Group lists still open for appending runs to their last group."""
+    record_glist: BitCountingGroupList = \
+        dataclasses.field(init=False, default=None)
+    """The group list with the least bits so far."""
+    margin_base: float = dataclasses.field(init=False, default=0.0)
+    """Part of the pruning margin not depending on the group examined.
+    Recomputed whenever max value changes."""
+
+    def __post_init__(self):
+        """Start classifying with no values."""
+        self._restart()
+
+    @property
+    def effective_unit(self) -> float:
+        """Return the unit to use, either the given one or based on sbps.
+
+        :returns: Typical resolution of the values.
+        :rtype: float
+        """
+        if self.unit:
+            return self.unit
+        sbps = self.sbps if self.sbps else 12.0
+        max_in_units = pow(2.0, sbps + 1.0) - 1.0
+        return self.max_value / max_in_units
+
+    def _restart(self) -> None:
+        """Recompute the whole state from the already processed values."""
+        self.open_glists = []
+        unit = self.effective_unit
+        self.record_glist = BitCountingGroupList(
+            max_value=self.max_value, unit=unit
+        )
+        if self.max_value > 0.0:
+            max_value = self.max_value / unit
+            max_stdev = max_value / 2
+            self.margin_base = math.log(max_value * (1 + max_value / 2), 2)
+            self.margin_base -= 1.0
+            self.margin_base += math.log((max_stdev + 1) * (max_stdev + 2), 2)
+            self.margin_base += 2 * math.log(max_stdev + 1, 2)
+            self.margin_base -= math.log(1 - 1 / (max_value + 2), 2)
+        for value in self.values:
+            self._process(value)
+
+    def _process(self, value: typing.Union[float, AvgStdevStats]) -> None:
+        """Update group lists with the new value, then prune.
+
+        This is the same as the loop body in classify function.
+
+        :param value: The next processed value.
+        :type value: Union[float, AvgStdevStats]
+        """
+        new_open_glist = self.record_glist.copy_fast()
+        new_open_glist.append_group_of_runs([value])
+        record_glist = new_open_glist
+        for old_open_glist in self.open_glists:
+            old_open_glist.append_run_to_to_last_group(value)
+            if old_open_glist.bits < record_glist.bits:
+                record_glist = old_open_glist
+        self.open_glists.append(new_open_glist)
+        self.record_glist = record_glist
+        if self.prune and self.min_value >= 0.0:
+            # Margin is never smaller than the base, cheap check first.
+            limit = record_glist.bits + self.margin_base
+            self.open_glists = [
+                glist for glist in self.open_glists
+                if glist.bits <= limit
+                or glist.bits - limit <= self._margin(glist[-1])
+            ]
+
+    def _margin(self, group: BitCountingGroup) -> float:
+        """Return how many bits behind the record can the group list be.
+
+        Consider the group list ending with the given group,
+        and the record group list at the same time, with a new group added.
+        If future runs are appended to both last groups,
+        the former can gain at most this many bits against the latter.
+        So if the former is behind by more than this, it will never win.
+
+        The bound is a sum of bounds for each term of the bit count
+        computed in BitCountingStats (all values here are in units):
+        + Length: Gain is at most the length bits of the old group.
+        + Average: Gain is at most the current average bits
+          (minus their minimum) plus the maximum for the new group.
+        + Stdev: Similar, the minimum for size 2 and more is one bit.
+        + Sphere: Surface area is superadditive (when stdev grows, logarithm
+          is concave) except two factors of stdev plus one, bounded here.
+        + Cut-off normalization: It is negative, at most one term to cancel.
+
+        This returns only the part depending on the group,
+        the rest is in margin_base.
+
+        :param group: The last group of the open group list to examine.
+        :type group: BitCountingGroup
+        :returns: Upper bound on bits to gain, minus margin_base.
+        :rtype: float
+        """
+        unit = self.effective_unit
+        max_value = self.max_value / unit
+        size = group.stats.size
+        stdev = group.stats.stdev / unit
+        margin = math.log(size * (size + 1), 2)
+        if group.prev_avg is not None:
+            # The norm from BitCountingStats cancels out.
+            prev_avg = group.prev_avg / unit
+            avg = group.stats.avg / unit
+            max_distance = max(prev_avg, max_value - prev_avg)
+            distance = abs(avg - prev_avg)
+            margin += math.log((max_distance + 1) / (distance + 1), 2)
+        if size > 1:
+            margin += math.log((stdev + 1) * (stdev + 2), 2)
+        return margin
+
+    def append(
+        self, value: typing.Union[float, typing.Iterable[float]]
+    ) -> "IncrementalClassifier":
+        """Mutate to classify one more value, return self.
+
+        :param value: Next value, float or an undivisible sequence of floats.
+        :type value: Union[float, Iterable[float]]
+        :returns: The updated self.
+        :rtype: IncrementalClassifier
+        """
+        return self.extend([value])
+
+    def extend(
+        self,
+        values: typing.Iterable[typing.Union[float, typing.Iterable[float]]],
+    ) -> "IncrementalClassifier":
+        """Mutate to classify more values, return self.
+
+        Values are processed the same way as in classify function.
+
+        :param values: Next values, floats or undivisible sequences of floats.
+        :type values: Iterable[Union[float, Iterable[float]]]
+        :returns: The updated self.
+        :rtype: IncrementalClassifier
+        """
+        processed_values = []
+        max_value = self.max_value
+        min_value = self.min_value
+        for value in values:
+            if isinstance(value, (float, int)):
+                subvalues = [value]
+                processed_values.append(value)
+            else:
+                subvalues = list(value)
+                processed_values.append(AvgStdevStats.for_runs(subvalues))
+            for subvalue in subvalues:
+                max_value = max(max_value, subvalue)
+                min_value = min(min_value, subvalue)
+        self.values.extend(processed_values)
+        self.min_value = min_value
+        if max_value > self.max_value:
+            self.max_value = max_value
+            self._restart()
+            return self
+        for value in processed_values:
+            self._process(value)
+        return self
+
+    @property
+    def result(self) -> BitCountingGroupList:
+        """Return a copy of the record group list, with comments set.
+
+        The copy is deep enough for the caller to be allowed
+        to edit the groups without affecting the state of self.
+
+        :returns: Classified group list.
+        :rtype: BitCountingGroupList
+        """
+        group_list = self.record_glist.copy()
+        if not group_list:
+            return group_list
+        previous_average = group_list[0].stats.avg
+        for group in group_list:
+            if group.stats.avg < previous_average:
+                group.comment = "regression"
+            elif group.stats.avg > previous_average:
+                group.comment = "progression"
+            previous_average = group.stats.avg
+        return group_list
@@ -14,9 +14,13 @@
 """Library for SSH connection management."""
 
 
+import re
+import shlex
 import socket
+import uuid
 
 from io import StringIO
+from select import select
 from time import monotonic, sleep
 
 from paramiko import RSAKey, SSHClient, AutoAddPolicy
@@ -27,12 +31,24 @@ from scp import SCPClient, SCPException
 from resources.libraries.python.OptionString import OptionString
 
 __all__ = [
-    u"exec_cmd", u"exec_cmd_no_error", u"SSH", u"SSHTimeout", u"scp_node"
+    u"exec_cmd", u"exec_cmd_no_error", u"exec_cmd_batch",
+    u"exec_cmd_batch_no_error", u"SSH", u"SSHTimeout", u"scp_node"
 ]
 
 # TODO: load priv key
 
 
+def _decode(data):
+    """Decode command output, ignoring invalid UTF-8 sequences.
+
+    :param data: Raw output of a command.
+    :type data: bytes or bytearray
+    :returns: Decoded output.
+    :rtype: str
+    """
+    return data.decode(encoding=u"utf-8", errors=u"ignore")
+
+
 class SSHTimeout(Exception):
     """This exception is raised when a timeout occurs."""
 
@@ -41,6 +57,7 @@ class SSH:
     """Contains methods for managing and using SSH connections."""
 
     __MAX_RECV_BUF = 10 * 1024 * 1024
+    __MAX_SELECT_WAIT = 0.1
     __existing_connections = dict()
 
     def __init__(self):
@@ -97,6 +114,11 @@ class SSH:
                 )
 
                 self._ssh.get_transport().set_keepalive(10)
+                # Commands are short messages waiting for short replies,
+                # Nagle's algorithm would delay them by delayed ACKs.
+                self._ssh.get_transport().sock.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
 
                 SSH.__existing_connections[node_hash] = self._ssh
                 logger.debug(
@@ -162,8 +184,9 @@ class SSH:
         if isinstance(cmd, (list, tuple)):
             cmd = OptionString(cmd)
         cmd = str(cmd)
-        stdout = u""
-        stderr = u""
+        # Appending to bytearray is amortized linear, unlike str +=.
+        stdout = bytearray()
+        stderr = bytearray()
         try:
             chan = self._ssh.get_transport().open_session(timeout=5)
             peer = self._ssh.get_transport().getpeername()
@@ -176,40 +199,33 @@ class SSH:
         logger.trace(f"exec_command on {peer} with timeout {timeout}: {cmd}")
 
         start = monotonic()
+        deadline = None if timeout is None else start + timeout
         chan.exec_command(cmd)
-        while not chan.exit_status_ready() and timeout is not None:
-            if chan.recv_ready():
-                s_out = chan.recv(self.__MAX_RECV_BUF)
-                stdout += s_out.decode(encoding=u'utf-8', errors=u'ignore') \
-                    if isinstance(s_out, bytes) else s_out
-
-            if chan.recv_stderr_ready():
-                s_err = chan.recv_stderr(self.__MAX_RECV_BUF)
-                stderr += s_err.decode(encoding=u'utf-8', errors=u'ignore') \
-                    if isinstance(s_err, bytes) else s_err
-
-            duration = monotonic() - start
-            if duration > timeout:
+        while 1:
+            while chan.recv_ready():
+                stdout += chan.recv(self.__MAX_RECV_BUF)
+            while chan.recv_stderr_ready():
+                stderr += chan.recv_stderr(self.__MAX_RECV_BUF)
+            if chan.exit_status_ready():
+                break
+            wait = None if deadline is None else deadline - monotonic()
+            if wait is not None and wait <= 0.0:
                 raise SSHTimeout(
                     f"Timeout exception during execution of command: {cmd}\n"
                     f"Current contents of stdout buffer: "
-                    f"{stdout}\n"
+                    f"{_decode(stdout)}\n"
                     f"Current contents of stderr buffer: "
-                    f"{stderr}\n"
+                    f"{_decode(stderr)}\n"
                 )
-
-            sleep(0.1)
+            self._wait_for_output(chan, wait)
         return_code = chan.recv_exit_status()
 
         while chan.recv_ready():
-            s_out = chan.recv(self.__MAX_RECV_BUF)
-            stdout += s_out.decode(encoding=u'utf-8', errors=u'ignore') \
-                if isinstance(s_out, bytes) else s_out
-
+            stdout += chan.recv(self.__MAX_RECV_BUF)
         while chan.recv_stderr_ready():
-            s_err = chan.recv_stderr(self.__MAX_RECV_BUF)
-            stderr += s_err.decode(encoding=u'utf-8', errors=u'ignore') \
-                if isinstance(s_err, bytes) else s_err
+            stderr += chan.recv_stderr(self.__MAX_RECV_BUF)
+        stdout = _decode(stdout)
+        stderr = _decode(stderr)
 
         duration = monotonic() - start
         logger.trace(f"exec_command on {peer} took {duration} seconds")
@@ -224,6 +240,25 @@ class SSH:
             )
         return return_code, stdout, stderr
 
+    def _wait_for_output(self, chan, wait):
+        """Wait until the channel has new output, EOF or exit status.
+
+        :param chan: Channel the command is executed on.
+        :param wait: Maximal time to wait in seconds, None means no limit.
+        :type chan: paramiko.Channel
+        :type wait: Optional[float]
+        """
+        if chan.eof_received:
+            # No more output is coming, just wait for the exit status.
+            chan.status_event.wait(wait)
+            return
+        # Channel fileno becomes readable on new output or EOF.
+        # Exit status without EOF (a background process keeping
+        # the output open) is not signalled, hence the cap.
+        if wait is None or wait > self.__MAX_SELECT_WAIT:
+            wait = self.__MAX_SELECT_WAIT
+        select([chan], [], [], wait)
+
     def exec_command_sudo(
             self, cmd, cmd_input=None, timeout=30, log_stdout_err=True):
         """Execute SSH command with sudo on a new channel on the connected Node.
@@ -527,6 +562,163 @@ def exec_cmd_no_error(
     return stdout, stderr
 
 
+def _batch_script(cmds, token, sudo=False, stop_on_error=False):
+    """Return shell script running the commands, with framed outputs.
+
+    Each command runs in its own subshell (so "exit" or a syntax error
+    affects only that command) with stdin from /dev/null.
+    After each command, a line with the token, index and return code
+    is printed to stdout, and a line with the token and index to stderr,
+    so the outputs can be split exactly, including trailing newlines.
+
+    :param cmds: Commands to run.
+    :param token: Random string not appearing in any output.
+    :param sudo: Whether to run each command with sudo, as exec_cmd does.
+    :param stop_on_error: Whether to exit after the first nonzero RC.
+    :type cmds: Iterable[str or OptionString]
+    :type token: str
+    :type sudo: bool
+    :type stop_on_error: bool
+    :returns: Script for the remote shell.
+    :rtype: str
+    """
+    lines = list()
+    for index, cmd in enumerate(cmds):
+        if isinstance(cmd, (list, tuple)):
+            cmd = OptionString(cmd)
+        cmd = f"sudo -E -S {cmd}" if sudo else str(cmd)
+        line = f"( eval {shlex.quote(cmd)} ) </dev/null; rc=$?; " \
+            f"printf '{token}-{index}-%d\\n' $rc; " \
+            f"printf '{token}-{index}\\n' >&2"
+        if stop_on_error:
+            line += "; [ $rc -eq 0 ] || exit $rc"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _split_batch_output(stdout, stderr, token):
+    """Split outputs of a script from _batch_script into command results.
+
+    Output after the last frame (of a command not finished) is ignored.
+
+    :param stdout: Standard output of the whole script.
+    :param stderr: Standard error output of the whole script.
+    :param token: The token the script was created with.
+    :type stdout: str
+    :type stderr: str
+    :type token: str
+    :returns: RC, Stdout, Stderr for each finished command, in order.
+    :rtype: List[Tuple[int, str, str]]
+    """
+    # Split gives: output, rc, output, rc, ..., unframed rest.
+    out_parts = re.split(f"{token}-\\d+-(\\d+)\n", stdout)
+    err_parts = re.split(f"{token}-\\d+\n", stderr)
+    return [
+        (int(ret_code), out, err) for out, ret_code, err
+        in zip(out_parts[0::2], out_parts[1::2], err_parts)
+    ]
+
+
+def exec_cmd_batch(
+        node, cmds, timeout=600, sudo=False, stop_on_error=False,
+        log_stdout_err=True
+    ):
+    """Execute independent commands in one round trip, return their results.
+
+    All commands are sent in one script over a single channel,
+    so the cost of many short commands is close to the cost of one.
+    The commands are run one after another, each in a separate subshell
+    with stdin from /dev/null, so they do not share shell variables.
+
+    If stop_on_error, commands after the first failed one are not executed,
+    so the returned list is shorter than the list of commands.
+    If the connection or the whole script fails (including timeout),
+    results for the commands not finished are missing as well.
+
+    :param node: The node to execute commands on.
+    :param cmds: Commands to execute.
+    :param timeout: Timeout for the whole batch in seconds. Default: 600.
+    :param sudo: Sudo privilege execution flag. Default: False.
+    :param stop_on_error: Whether to skip commands after a failed one.
+    :param log_stdout_err: If True, stdout and stderr are logged. stdout
+        and stderr are logged also if the return code is not zero
+        independently of the value of log_stdout_err.
+    :type node: dict
+    :type cmds: Iterable[str or OptionString]
+    :type timeout: int
+    :type sudo: bool
+    :type stop_on_error: bool
+    :type log_stdout_err: bool
+    :returns: RC, Stdout, Stderr for each executed command, in order.
+    :rtype: List[Tuple[int, str, str]]
+    :raises TypeError: If node is None.
+    :raises ValueError: If some command is empty.
+    """
+    if node is None:
+        raise TypeError(u"Node parameter is None")
+    cmds = list(cmds)
+    if not all(cmds):
+        raise ValueError(u"Empty command parameter")
+    if not cmds:
+        return list()
+    token = f"CSIT-BATCH-{uuid.uuid4().hex}"
+    script = _batch_script(cmds, token, sudo, stop_on_error)
+    _, stdout, stderr = exec_cmd(
+        node, script, timeout=timeout, log_stdout_err=log_stdout_err
+    )
+    if stdout is None:
+        return list()
+    return _split_batch_output(stdout, stderr, token)
+
+
+def exec_cmd_batch_no_error(
+        node, cmds, timeout=600, sudo=False, message=None,
+        include_reason=False, log_stdout_err=True
+    ):
+    """Execute commands in one round trip, stop and raise on first failure.
+
+    See exec_cmd_batch for details, this is the batch form
+    of exec_cmd_no_error (without retries).
+
+    :param node: DUT node.
+    :param cmds: Commands to be executed.
+    :param timeout: Timeout for the whole batch in seconds. Default: 600.
+    :param sudo: Sudo privilege execution flag. Default: False.
+    :param message: Error message in case of failure. Default: None.
+    :param include_reason: Whether default info should be appended to message.
+    :param log_stdout_err: If True, stdout and stderr are logged. stdout
+        and stderr are logged also if the return code is not zero
+        independently of the value of log_stdout_err.
+    :type node: dict
+    :type cmds: Iterable[str or OptionString]
+    :type timeout: int
+    :type sudo: bool
+    :type message: str
+    :type include_reason: bool
+    :type log_stdout_err: bool
+    :returns: Stdout, Stderr for each command, in order.
+    :rtype: List[Tuple[str, str]]
+    :raises RuntimeError: If a return code is not 0 or a command was not run.
+    """
+    cmds = list(cmds)
+    results = exec_cmd_batch(
+        node, cmds, timeout=timeout, sudo=sudo, stop_on_error=True,
+        log_stdout_err=log_stdout_err
+    )
+    if results and results[-1][0] != 0:
+        ret_code, _, stderr = results[-1]
+        cmd = cmds[len(results) - 1]
+        msg = f"Command execution failed: '{cmd}'\nRC: {ret_code}\n{stderr}"
+    elif len(results) < len(cmds):
+        msg = f"Batch execution failed at: '{cmds[len(results)]}'"
+    else:
+        return [(stdout, stderr) for _, stdout, stderr in results]
+    logger.info(msg)
+    if message:
+        msg = f"{message}\n{msg}" if include_reason else message
+    raise RuntimeError(msg)
+
+
 def scp_node(
         node, local_path, remote_path, get=False, timeout=30, disconnect=False):
     """Copy files from local_path to remote_path or vice versa.
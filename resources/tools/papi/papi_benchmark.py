@@ -0,0 +1,568 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Benchmark of PapiSocketExecutor async handling against a fake VPP.
+
+The fake VPP is a local unix socket server answering each request
+with a reply carrying the same context and zero retval.
+Messages are framed by the same header as VPP socket transport uses.
+The client is a minimal stand-in for vpp_papi.VPPApiClient:
+its api methods pack a request and send it over the socket,
+and its reader thread reads replies and passes them to the event callback,
+as VPP PAPI does with async connections.
+The fake serializer packs fields one by one similarly to the real one,
+only for the messages used here (ipsec_sad_entry_add, control_ping).
+So the numbers show the overhead of PapiSocketExecutor
+and message packing (adding commands, reading replies, waiting for them
+and keeping the in-flight window), not the speed of VPP.
+
+The "add" mode adds IPsec SAD entries one by one (as IPsecUtil used to),
+the "bulk" mode adds the same entries by add_bulk,
+the "sync" mode waits for each reply before sending next request.
+
+No executable flag, run from the CSIT root directory, for example:
+
+    PYTHONPATH=. python3 resources/tools/papi/papi_benchmark.py \
+        --count 1000 100000 1000000 --window 0 1000 10000 --sync 1000
+"""
+
+import argparse
+import ipaddress
+import itertools
+import multiprocessing
+import os
+import queue
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+from collections import namedtuple
+
+from resources.libraries.python.PapiExecutor import PapiSocketExecutor
+
+
+_HEADER = struct.Struct(">QII")
+"""Header of VPP socket transport, the middle field is the payload length."""
+_REQUEST = struct.Struct(">HII")
+"""Start of request payload: message ID, client index and context."""
+_REPLY = struct.Struct(">II")
+"""Reply payload: context and retval."""
+_FakeReply = namedtuple("fake_reply", "context retval")
+"""Reply object as returned by PAPI, namedtuple-like."""
+
+
+def _read_messages(sock):
+    """Yield payloads of messages received from the socket until it closes.
+
+    :param sock: Connected socket to read from.
+    :type sock: socket.socket
+    :returns: Generator of message payloads.
+    :rtype: Generator[bytes, None, None]
+    """
+    buf = b""
+    while 1:
+        data = sock.recv(1 << 16)
+        if not data:
+            return
+        buf += data
+        offset = 0
+        while len(buf) - offset >= _HEADER.size:
+            _, length, _ = _HEADER.unpack_from(buf, offset)
+            end = offset + _HEADER.size + length
+            if end > len(buf):
+                break
+            yield buf[offset + _HEADER.size:end]
+            offset = end
+        buf = buf[offset:]
+
+
+class FakeVppServer:  # pylint: disable=too-few-public-methods
+    """Unix socket server answering each request with a zero retval reply.
+
+    The server runs in a separate process (as VPP does),
+    so it does not compete with the client for the GIL.
+    """
+
+    def __init__(self, path):
+        """Listen on the path, start the serving process.
+
+        :param path: Filesystem path of the socket to create.
+        :type path: str
+        """
+        self.path = path
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen(1)
+        self._process = multiprocessing.Process(target=self._serve, daemon=True)
+        self._process.start()
+
+    def _serve(self):
+        """Accept connections one by one, answer all requests."""
+        while 1:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            with conn:
+                for payload in _read_messages(conn):
+                    _, _, context = _REQUEST.unpack_from(payload)
+                    reply = _REPLY.pack(context, 0)
+                    conn.sendall(_HEADER.pack(0, len(reply), 0) + reply)
+
+    def close(self):
+        """Stop the serving process and remove the socket file."""
+        self._process.terminate()
+        self._process.join()
+        self._listener.close()
+        os.unlink(self.path)
+
+
+class _FakeField:  # pylint: disable=too-few-public-methods
+    """Fixed size field packer, similar to vpp_papi base types."""
+
+    def __init__(self, size, pack):
+        """Store the size and the packing function.
+
+        :param size: Size of the packed field in bytes.
+        :param pack: Function packing a value, None means zero.
+        :type size: int
+        :type pack: Callable[[object], bytes]
+        """
+        self.size = size
+        self._pack = pack
+
+    def pack(self, data, _kwargs=None):
+        """Return the value packed into bytes.
+
+        :param data: Value to pack.
+        :param _kwargs: Unused, as in vpp_papi base types.
+        :type data: object
+        :type _kwargs: Optional[dict]
+        :returns: Packed value.
+        :rtype: bytes
+        """
+        return self._pack(data)
+
+
+def _int_field(fmt):
+    """Return packer of an integer field.
+
+    :param fmt: Struct format of the integer.
+    :type fmt: str
+    :returns: The packer.
+    :rtype: _FakeField
+    """
+    packer = struct.Struct(fmt)
+    return _FakeField(packer.size, lambda data: packer.pack(data or 0))
+
+
+def _address_field():
+    """Return packer of an address field (address family and 16 bytes).
+
+    :returns: The packer.
+    :rtype: _FakeField
+    """
+    def pack(data):
+        """Pack string address.
+
+        :param data: Address or None or empty string.
+        :type data: Optional[str]
+        :returns: Packed address.
+        :rtype: bytes
+        """
+        if not data:
+            return bytes(17)
+        addr = ipaddress.ip_address(data)
+        return bytes([addr.version == 6]) + addr.packed.ljust(16, b"\0")
+    return _FakeField(17, pack)
+
+
+def _bytes_field(size):
+    """Return packer of a fixed size bytes field.
+
+    :param size: Size of the field in bytes.
+    :type size: int
+    :returns: The packer.
+    :rtype: _FakeField
+    """
+    return _FakeField(size, lambda data: (data or b"").ljust(size, b"\0"))
+
+
+class _FakeType:  # pylint: disable=too-few-public-methods
+    """Compound type packer, similar to vpp_papi VPPType."""
+
+    def __init__(self, definition):
+        """Store fields and their packers.
+
+        :param definition: Pairs of field name and packer.
+        :type definition: List[Tuple[str, object]]
+        """
+        self.fields = [name for name, _ in definition]
+        self.packers = [packer for _, packer in definition]
+        self.size = sum(packer.size for packer in self.packers)
+        self.crc = "0x12345678"
+
+    def pack(self, data, _kwargs=None):
+        """Pack fields one by one, missing fields are zero.
+
+        :param data: Field values by name.
+        :param _kwargs: Unused, as in vpp_papi types.
+        :type data: Optional[dict]
+        :type _kwargs: Optional[dict]
+        :returns: Packed data.
+        :rtype: bytes
+        """
+        data = data or {}
+        packed = b""
+        for name, packer in zip(self.fields, self.packers):
+            packed += packer.pack(data.get(name))
+        return packed
+
+
+def _header_fields():
+    """Return definition of header fields of request messages.
+
+    :returns: Pairs of field name and packer.
+    :rtype: List[Tuple[str, _FakeField]]
+    """
+    return [
+        ("_vl_msg_id", _int_field(">H")),
+        ("client_index", _int_field(">I")),
+        ("context", _int_field(">I")),
+    ]
+
+
+def _sad_entry_add():
+    """Return definition of ipsec_sad_entry_add message.
+
+    :returns: The message definition.
+    :rtype: _FakeType
+    """
+    key = _FakeType([("length", _int_field(">B")), ("data", _bytes_field(128))])
+    return _FakeType(_header_fields() + [
+        ("entry", _FakeType([
+            ("sad_id", _int_field(">I")),
+            ("spi", _int_field(">I")),
+            ("crypto_algorithm", _int_field(">I")),
+            ("crypto_key", key),
+            ("integrity_algorithm", _int_field(">I")),
+            ("integrity_key", key),
+            ("flags", _int_field(">I")),
+            ("tunnel", _FakeType([
+                ("src", _address_field()),
+                ("dst", _address_field()),
+                ("table_id", _int_field(">I")),
+                ("encap_decap_flags", _int_field(">B")),
+                ("dscp", _int_field(">B")),
+            ])),
+            ("protocol", _int_field(">I")),
+            ("udp_src_port", _int_field(">H")),
+            ("udp_dst_port", _int_field(">H")),
+        ])),
+    ])
+
+
+class _FakeTransport:
+    """Socket transport with the attributes the executor uses."""
+
+    header = _HEADER
+    """Header struct, as in vpp_papi socket transport."""
+    socket_index = 1
+    """Client index assigned by VPP."""
+
+    def __init__(self, path):
+        """Connect to the server.
+
+        :param path: Filesystem path of the server socket.
+        :type path: str
+        """
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+
+    @staticmethod
+    def get_msg_index(_name):
+        """Return message ID for any name with CRC.
+
+        :param _name: API message name with CRC suffix.
+        :type _name: str
+        :returns: The message ID.
+        :rtype: int
+        """
+        return 100
+
+    def write(self, buf):
+        """Send the packed message prefixed by the header.
+
+        :param buf: Packed message.
+        :type buf: bytes
+        """
+        self.socket.sendall(self.header.pack(0, len(buf), 0))
+        self.socket.sendall(buf)
+
+
+class _FakeApi:  # pylint: disable=too-few-public-methods
+    """Namespace of API methods, each packing and sending a request."""
+
+    def __init__(self, client):
+        """Remember the client to send requests through.
+
+        :param client: The client the methods belong to.
+        :type client: FakeVppClient
+        """
+        self._client = client
+
+    def __getattr__(self, name):
+        """Return a function sending the named request.
+
+        :param name: API message name.
+        :type name: str
+        :returns: Function accepting message fields as keyword arguments.
+        :rtype: Callable[..., int]
+        """
+        client = self._client
+        msg = client.messages[name]
+        msg_id = client.transport.get_msg_index(f"{name}_{msg.crc[2:]}")
+
+        def call(**kwargs):
+            """Pack and send the request, return its context.
+
+            :param kwargs: Message fields.
+            :type kwargs: dict
+            :returns: Context of the request.
+            :rtype: int
+            """
+            context = kwargs["context"] = client.get_context()
+            kwargs["client_index"] = client.transport.socket_index
+            kwargs["_vl_msg_id"] = msg_id
+            client.transport.write(msg.pack(kwargs))
+            return context
+
+        return call
+
+
+class FakeVppClient:
+    """Minimal replacement of a connected async vpp_papi.VPPApiClient."""
+
+    def __init__(self, path):
+        """Connect to the server, prepare the reader thread.
+
+        The reader thread is started only after the event callback
+        is registered, see register_event_callback.
+
+        :param path: Filesystem path of the server socket.
+        :type path: str
+        """
+        self.read_timeout = 14
+        self.messages = dict(
+            control_ping=_FakeType(_header_fields()),
+            ipsec_sad_entry_add=_sad_entry_add(),
+        )
+        self.transport = _FakeTransport(path)
+        self.get_context = itertools.count(1).__next__
+        self.api = _FakeApi(self)
+        self.csit_queue = None
+        self.csit_bulk = False
+        self._callback = None
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+
+    def register_event_callback(self, callback):
+        """Store the callback for replies, start the reader thread.
+
+        :param callback: Function called with message name and the reply.
+        :type callback: Callable[[str, namedtuple], None]
+        """
+        self._callback = callback
+        self._thread.start()
+
+    def _reader(self):
+        """Read replies from the socket, pass them to the callback."""
+        for payload in _read_messages(self.transport.socket):
+            self._callback("fake_reply", _FakeReply(*_REPLY.unpack(payload)))
+
+    def close(self):
+        """Shut the socket down, wait for the reader thread, close."""
+        self.transport.socket.shutdown(socket.SHUT_RDWR)
+        if self._callback is not None:
+            self._thread.join()
+        self.transport.socket.close()
+
+
+class _NoCrcChecker:
+    """CRC checker accepting any message, the fake API has no .api.json."""
+
+    def report_initial_conflicts(self):
+        """Nothing to report."""
+
+    def check_api_name(self, api_name):
+        """Accept any name.
+
+        :param api_name: API message name.
+        :type api_name: str
+        """
+
+
+def _sad_entry_args():
+    """Return arguments of ipsec_sad_entry_add, as IPsecUtil creates them.
+
+    :returns: Arguments with nested entry.
+    :rtype: dict
+    """
+    return dict(
+        entry=dict(
+            sad_id=0,
+            spi=0,
+            crypto_algorithm=1,
+            crypto_key=dict(length=16, data=b"0123456789abcdef"),
+            integrity_algorithm=0,
+            integrity_key=dict(length=0, data=0),
+            flags=4,
+            tunnel=dict(
+                src="", dst="", table_id=0, encap_decap_flags=0, dscp=0
+            ),
+            protocol=50,
+            udp_src_port=4500,
+            udp_dst_port=4500,
+        )
+    )
+
+
+def _sad_entry_override(index):
+    """Return fields of the indexed SAD entry differing from the base.
+
+    :param index: Index of the entry.
+    :type index: int
+    :returns: The differing fields.
+    :rtype: dict
+    """
+    return dict(entry=dict(
+        sad_id=index,
+        spi=index + 10000,
+        tunnel=dict(src=f"10.0.{index >> 8 & 255}.{index & 255}"),
+    ))
+
+
+def _measure(server_path, count, mode, window=0):
+    """Send requests through a new executor and client, return duration.
+
+    :param server_path: Filesystem path of the fake VPP socket.
+    :param count: Number of requests to send.
+    :param mode: One of "add", "bulk" or "sync".
+    :param window: In-flight window for async handling, zero means no limit.
+    :type server_path: str
+    :type count: int
+    :type mode: str
+    :type window: int
+    :returns: Duration of sending requests and getting all replies [s].
+    :rtype: float
+    :raises RuntimeError: If the number of replies is wrong.
+    """
+    node = dict(host="fake-vpp", port=0)
+    client = FakeVppClient(server_path)
+    reply_queue = queue.SimpleQueue()
+    client.csit_queue = reply_queue
+    client.register_event_callback(lambda x, y: reply_queue.put(y))
+    # pylint: disable-next=protected-access
+    client.csit_bulk = PapiSocketExecutor._supports_bulk(client)
+    papi_exec = PapiSocketExecutor(
+        node, is_async=mode != "sync", window=window
+    )
+    papi_exec.set_connected_client(client)
+    cmd = "ipsec_sad_entry_add"
+    args = _sad_entry_args()
+    try:
+        start = time.monotonic()
+        if mode == "bulk":
+            overrides = (_sad_entry_override(i) for i in range(count))
+            replies = papi_exec.add_bulk(
+                cmd, args, overrides, history=False
+            ).get_replies()
+        elif mode == "add":
+            for index in range(count):
+                override = _sad_entry_override(index)["entry"]
+                args["entry"]["sad_id"] = override["sad_id"]
+                args["entry"]["spi"] = override["spi"]
+                args["entry"]["tunnel"]["src"] = override["tunnel"]["src"]
+                papi_exec.add(cmd, history=False, **args)
+            replies = papi_exec.get_replies()
+        else:
+            replies = [
+                papi_exec.add(cmd, history=False, **args).get_reply()
+                for _ in range(count)
+            ]
+        duration = time.monotonic() - start
+    finally:
+        PapiSocketExecutor.conn_cache.pop(papi_exec.key_for_self())
+        client.close()
+    if len(replies) != count:
+        raise RuntimeError(f"Got {len(replies)} replies instead of {count}.")
+    return duration
+
+
+def run(counts, windows, sync_count):
+    """Measure and print messages per second for each count and window.
+
+    :param counts: Numbers of requests to send before getting replies.
+    :param windows: Values of in-flight window to use, zero means no limit.
+    :param sync_count: Number of requests to send one by one,
+        zero means no measurement without async handling.
+    :type counts: Iterable[int]
+    :type windows: Iterable[int]
+    :type sync_count: int
+    """
+    PapiSocketExecutor.crc_checker = _NoCrcChecker()
+    print("mode     count  window  duration[s]  messages/s")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = FakeVppServer(os.path.join(temp_dir, "vpp-api.sock"))
+        try:
+            for count, window, mode in itertools.product(
+                counts, windows, ("add", "bulk")
+            ):
+                duration = _measure(server.path, count, mode, window)
+                print(
+                    f"{mode:4s} {count:9d} {window:7d} {duration:12.3f}"
+                    f" {count / duration:11.0f}"
+                )
+            if sync_count:
+                duration = _measure(server.path, sync_count, "sync")
+                print(
+                    f"sync {sync_count:9d} {'-':>7s} {duration:12.3f}"
+                    f" {sync_count / duration:11.0f}"
+                )
+        finally:
+            server.close()
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--count", type=int, nargs="+", default=[1000, 10000, 100000],
+        help="Numbers of requests to send before getting replies.",
+    )
+    parser.add_argument(
+        "--window", type=int, nargs="+", default=[0, 1000, 10000],
+        help="In-flight windows to use, zero means no limit.",
+    )
+    parser.add_argument(
+        "--sync", type=int, default=1000,
+        help="Number of requests to send one by one without async handling.",
+    )
+    args = parser.parse_args()
+    run(args.count, args.window, args.sync)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# Copyright (c) 2023 Cisco and/or its affiliates.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Benchmark of SSH.exec_command against a local paramiko server stub.
+
+The stub server runs in a separate process, accepts any password
+and does not run commands. It answers "seq N" with the same output
+as coreutils seq would give, any other command with empty output.
+Exit code is always zero. Like OpenSSH, the stub sends EOF,
+then exit status, then (a bit later) closes the channel.
+The stub disables Nagle's algorithm on its socket, otherwise
+its small writes waiting for delayed ACKs would dominate the results.
+
+The "ssh" mode uses SSH.exec_command, the "polling" mode uses it too,
+but waits for output as the previous implementation did
+(sleeping 0.1 seconds between checks), for comparison.
+
+No executable flag, run from the CSIT root directory, for example:
+
+    PYTHONPATH=. python3 resources/tools/ssh/ssh_benchmark.py \
+        --count 100 --seq 0 100000 1000000
+"""
+
+import argparse
+import multiprocessing
+import socket
+import threading
+import time
+
+import paramiko
+
+from resources.libraries.python.ssh import SSH
+
+
+class _StubServer(paramiko.ServerInterface):
+    """Server interface accepting any password and exec requests."""
+
+    def check_channel_request(self, kind, chanid):
+        """Allow session channels only.
+
+        :param kind: Channel type requested by client.
+        :param chanid: ID of the requested channel.
+        :type kind: str
+        :type chanid: int
+        :returns: Paramiko result code.
+        :rtype: int
+        """
+        # pylint: disable=unused-argument
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def get_allowed_auths(self, username):
+        """Tell the client only password authentication is supported.
+
+        :param username: Name of the user authenticating.
+        :type username: str
+        :returns: Comma separated authentication methods.
+        :rtype: str
+        """
+        # pylint: disable=unused-argument
+        return "password"
+
+    def check_auth_password(self, username, password):
+        """Accept any user and password.
+
+        :param username: Name of the user authenticating.
+        :param password: Password given by the user.
+        :type username: str
+        :type password: str
+        :returns: Paramiko result code.
+        :rtype: int
+        """
+        # pylint: disable=unused-argument
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_exec_request(self, channel, command):
+        """Answer the command from a new thread, accept the request.
+
+        :param channel: Channel the request came on.
+        :param command: Command to "execute".
+        :type channel: paramiko.Channel
+        :type command: bytes
+        :returns: True, all commands are accepted.
+        :rtype: bool
+        """
+        threading.Thread(
+            target=_answer, args=(channel, command.decode()), daemon=True
+        ).start()
+        return True
+
+
+def _answer(channel, command):
+    """Send output and exit status of the command, close the channel.
+
+    :param channel: Channel to answer on.
+    :param command: Command to "execute".
+    :type channel: paramiko.Channel
+    :type command: str
+    """
+    parts = command.split()
+    if len(parts) == 2 and parts[0] == "seq":
+        lines = (str(i) for i in range(1, int(parts[1]) + 1))
+        output = "".join(f"{line}\n" for line in lines).encode()
+        if output:
+            channel.sendall(output)
+    channel.shutdown_write()
+    channel.send_exit_status(0)
+    # The reply to exec request is sent after this thread is started,
+    # closing before it would make the request fail on client side.
+    # The client does not wait for the close, so the delay is not measured.
+    threading.Timer(0.1, channel.close).start()
+
+
+class StubSshServer:  # pylint: disable=too-few-public-methods
+    """Local SSH server, serving connections in a separate process."""
+
+    def __init__(self):
+        """Listen on a free local port, start the serving process."""
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(4)
+        self.port = self._listener.getsockname()[1]
+        self._process = multiprocessing.Process(target=self._serve, daemon=True)
+        self._process.start()
+
+    def _serve(self):
+        """Generate host key, accept connections and serve them."""
+        host_key = paramiko.RSAKey.generate(2048)
+        transports = list()
+        while 1:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(conn)
+            transport.add_server_key(host_key)
+            transport.start_server(server=_StubServer())
+            # Keep the reference, so the transport is not collected.
+            transports.append(transport)
+
+    def close(self):
+        """Stop the serving process."""
+        self._process.terminate()
+        self._process.join()
+        self._listener.close()
+
+
+class _PollingSSH(SSH):
+    """SSH waiting for command output as exec_command did before."""
+
+    def _wait_for_output(self, chan, wait):
+        """Sleep 0.1 seconds, regardless of the channel and the deadline.
+
+        :param chan: Channel the command is executed on, not used.
+        :param wait: Maximal time to wait in seconds, not used.
+        :type chan: paramiko.Channel
+        :type wait: Optional[float]
+        """
+        # pylint: disable=unused-argument
+        time.sleep(0.1)
+
+
+def run(count, seq_sizes, modes):
+    """Measure and print commands per second for each output size and mode.
+
+    :param count: Number of commands to execute for each measurement.
+    :param seq_sizes: Arguments of "seq" commands, zero means "true" command.
+    :param modes: Modes to measure, "ssh" and/or "polling".
+    :type count: int
+    :type seq_sizes: Iterable[int]
+    :type modes: Iterable[str]
+    """
+    server = StubSshServer()
+    node = dict(
+        host="127.0.0.1", port=server.port, username="csit", password="csit"
+    )
+    try:
+        ssh = dict(ssh=SSH(), polling=_PollingSSH())
+        # Both share the connection, so only the waiting differs.
+        for mode in modes:
+            ssh[mode].connect(node)
+        print("mode        seq  count  duration[s]  commands/s  stdout[B]")
+        for seq_size, mode in ((s, m) for s in seq_sizes for m in modes):
+            cmd = f"seq {seq_size}" if seq_size else "true"
+            start = time.monotonic()
+            for _ in range(count):
+                _, stdout, _ = ssh[mode].exec_command(
+                    cmd, log_stdout_err=False
+                )
+            duration = time.monotonic() - start
+            print(
+                f"{mode:7s} {seq_size:8d} {count:6d} {duration:12.3f}"
+                f" {count / duration:11.1f} {len(stdout):10d}"
+            )
+        for mode in modes:
+            ssh[mode].disconnect()
+    finally:
+        server.close()
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--count", type=int, default=100,
+        help="Number of commands to execute for each measurement.",
+    )
+    parser.add_argument(
+        "--seq", type=int, nargs="+", default=[0, 10000, 1000000],
+        help="Sizes of seq output to request, zero means empty output.",
+    )
+    parser.add_argument(
+        "--modes", nargs="+", default=["ssh", "polling"],
+        choices=["ssh", "polling"], help="Implementations to measure.",
+    )
+    args = parser.parse_args()
+    run(args.count, args.seq, args.modes)
+
+
+if __name__ == "__main__":
+    main()